@@ -0,0 +1,10 @@
+"""
+Бенчмарки производительности Finance Tracker.
+
+Модули пакета запускаются из командной строки и не используются приложением:
+- storage_profiles: сравнение профилей хранения SQLite (Config.STORAGE_PROFILES)
+- uuid_storage: сравнение хранения UUID-ключей в виде текста и BLOB
+- generator: синтетические наборы данных нескольких масштабов
+- service_calls: реестр вызовов публичных функций сервисов
+- runner: микробенчмарк вызовов сервисов на синтетических наборах данных
+"""
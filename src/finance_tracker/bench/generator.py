@@ -0,0 +1,467 @@
+"""
+Генератор синтетических наборов данных для бенчмарков и аудита запросов.
+
+Наполняет пустую БД (после run_migrations) реалистичными данными всех сущностей:
+- Фактические транзакции за несколько лет (несколько десятков в день)
+- Плановые транзакции со смешанными правилами повторения (ежедневные,
+  еженедельные, ежемесячные, ежегодные, кастомные, с условиями окончания)
+  и их вхождения в окне вокруг текущей даты
+- Займодатели, кредиты с полными графиками платежей, передачи долга
+- Отложенные платежи в разных статусах
+
+Генерация детерминирована: одинаковые DatasetSpec и дата запуска дают
+одинаковые данные. Вставка выполняется пачками через Core (executemany).
+
+Пример:
+    >>> engine = create_db_engine("sqlite:///bench.db")
+    >>> run_migrations(engine)
+    >>> context = generate_dataset(engine, SCALES["medium"])
+"""
+
+import json
+import random
+import uuid
+from calendar import monthrange
+from dataclasses import asdict, dataclass, field
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import Connection, Engine, Table
+from sqlalchemy.orm import Session
+
+from finance_tracker.models import (
+    CategoryDB,
+    DebtTransferDB,
+    EndConditionType,
+    IntervalUnit,
+    LenderDB,
+    LenderType,
+    LoanDB,
+    LoanPaymentDB,
+    LoanStatus,
+    LoanType,
+    OccurrenceStatus,
+    PaymentStatus,
+    PendingPaymentDB,
+    PendingPaymentPriority,
+    PendingPaymentStatus,
+    PlannedOccurrenceDB,
+    PlannedTransactionDB,
+    RecurrenceRuleDB,
+    RecurrenceType,
+    TransactionDB,
+    TransactionType,
+)
+from finance_tracker.services.category_service import init_loan_categories
+from finance_tracker.services.recurrence_service import generate_occurrences_for_period
+
+# Размер пачки при вставке
+_CHUNK_SIZE = 20000
+
+# Распределение типов правил повторения плановых транзакций (доли)
+_RECURRENCE_MIX = [
+    (RecurrenceType.NONE, 0.05),
+    (RecurrenceType.DAILY, 0.10),
+    (RecurrenceType.WEEKLY, 0.20),
+    (RecurrenceType.MONTHLY, 0.40),
+    (RecurrenceType.YEARLY, 0.10),
+    (RecurrenceType.CUSTOM, 0.15),
+]
+
+
+@dataclass(frozen=True)
+class DatasetSpec:
+    """
+    Параметры синтетического набора данных.
+
+    Attributes:
+        years: Глубина истории фактических транзакций (лет)
+        transactions_per_day: Среднее количество транзакций в день
+        expense_categories: Количество категорий расходов
+        income_categories: Количество категорий доходов
+        planned_transactions: Количество плановых транзакций
+        occurrence_window_days: Окно вхождений плановых транзакций (дней до и после сегодня)
+        lenders: Количество займодателей
+        loans: Количество кредитов
+        pending_payments: Количество отложенных платежей
+        seed: Зерно генератора случайных чисел
+    """
+    years: int = 10
+    transactions_per_day: int = 50
+    expense_categories: int = 30
+    income_categories: int = 6
+    planned_transactions: int = 500
+    occurrence_window_days: int = 180
+    lenders: int = 20
+    loans: int = 100
+    pending_payments: int = 3000
+    seed: int = 42
+
+
+# Масштабы наборов данных (large - 10 лет по 50 транзакций в день)
+SCALES: Dict[str, DatasetSpec] = {
+    "small": DatasetSpec(years=1, transactions_per_day=5, expense_categories=12, income_categories=4,
+                         planned_transactions=20, occurrence_window_days=60, lenders=6, loans=12,
+                         pending_payments=40),
+    "medium": DatasetSpec(years=3, transactions_per_day=20, planned_transactions=150, lenders=10,
+                          loans=40, pending_payments=800),
+    "large": DatasetSpec(),
+}
+
+
+@dataclass
+class DatasetContext:
+    """Идентификаторы объектов набора данных для вызовов сервисов и количество строк по таблицам."""
+    today: date
+    expense_category_id: str
+    income_category_id: str
+    transaction_id: str
+    planned_transaction_id: str
+    occurrence_ids: List[str]
+    pending_payment_id: str
+    lender_ids: List[str]
+    loan_id: str
+    payment_id: str
+    row_counts: Dict[str, int] = field(default_factory=dict)
+
+
+def _random_id(rnd: random.Random) -> str:
+    return str(uuid.UUID(int=rnd.getrandbits(128), version=4))
+
+
+def _add_months(value: date, months: int) -> date:
+    month_index = value.month - 1 + months
+    year = value.year + month_index // 12
+    month = month_index % 12 + 1
+    return date(year, month, min(value.day, monthrange(year, month)[1]))
+
+
+def _money(rnd: random.Random, low: int, high: int) -> Decimal:
+    """Случайная сумма в рублях с копейками в диапазоне [low, high]."""
+    return Decimal(rnd.randint(low * 100, high * 100)) / 100
+
+
+def _insert(connection: Connection, table: Table, rows: List[Dict[str, Any]]) -> int:
+    for start in range(0, len(rows), _CHUNK_SIZE):
+        connection.execute(table.insert(), rows[start:start + _CHUNK_SIZE])
+    return len(rows)
+
+
+def _choose_recurrence(rnd: random.Random) -> RecurrenceType:
+    point = rnd.random()
+    for recurrence_type, share in _RECURRENCE_MIX:
+        point -= share
+        if point < 0:
+            return recurrence_type
+    return RecurrenceType.MONTHLY
+
+
+def _recurrence_rule(rnd: random.Random, recurrence_type: RecurrenceType, start_date: date) -> RecurrenceRuleDB:
+    """Правило повторения заданного типа со случайными интервалом и условием окончания."""
+    rule = RecurrenceRuleDB(id=_random_id(rnd), recurrence_type=recurrence_type, interval=1)
+    if recurrence_type == RecurrenceType.DAILY:
+        rule.interval = rnd.choice([1, 1, 2, 3])
+        rule.only_workdays = rnd.random() < 0.3
+    elif recurrence_type == RecurrenceType.WEEKLY:
+        rule.interval = rnd.choice([1, 1, 2])
+    elif recurrence_type == RecurrenceType.MONTHLY:
+        rule.interval = rnd.choice([1, 1, 1, 2, 3])
+        rule.only_workdays = rnd.random() < 0.2
+    elif recurrence_type == RecurrenceType.CUSTOM:
+        rule.interval_unit = rnd.choice(list(IntervalUnit))
+        rule.interval = rnd.randint(1, 4)
+        if rule.interval_unit == IntervalUnit.WEEKS and rnd.random() < 0.5:
+            rule.weekdays = json.dumps(sorted(rnd.sample(range(7), rnd.randint(1, 3))))
+
+    ending = rnd.random()
+    if ending < 0.15:
+        rule.end_condition_type = EndConditionType.UNTIL_DATE
+        rule.end_date = start_date + timedelta(days=rnd.randint(180, 3 * 365))
+    elif ending < 0.30:
+        rule.end_condition_type = EndConditionType.AFTER_COUNT
+        rule.occurrences_count = rnd.randint(5, 60)
+    else:
+        rule.end_condition_type = EndConditionType.NEVER
+    return rule
+
+
+def generate_dataset(engine: Engine, spec: Optional[DatasetSpec] = None) -> DatasetContext:
+    """
+    Наполняет пустую БД синтетическими данными и выполняет ANALYZE.
+
+    Args:
+        engine: Engine БД со схемой текущей версии
+        spec: Параметры набора данных (по умолчанию SCALES["large"])
+
+    Returns:
+        Контекст с идентификаторами объектов и количеством строк по таблицам
+    """
+    spec = spec or SCALES["large"]
+    rnd = random.Random(spec.seed)
+    today = date.today()
+    now = datetime.now()
+    counts: Dict[str, int] = {}
+
+    with Session(engine, expire_on_commit=False) as session:
+        init_loan_categories(session)
+
+        expense_categories = [
+            CategoryDB(id=_random_id(rnd), name=f"Расход {i}", type=TransactionType.EXPENSE)
+            for i in range(spec.expense_categories)
+        ]
+        income_categories = [
+            CategoryDB(id=_random_id(rnd), name=f"Доход {i}", type=TransactionType.INCOME)
+            for i in range(spec.income_categories)
+        ]
+        session.add_all(expense_categories + income_categories)
+        session.flush()
+        counts["categories"] = len(expense_categories) + len(income_categories)
+
+        # Плановые транзакции: правила создаются через ORM (нужны для генерации дат)
+        planned: List[PlannedTransactionDB] = []
+        for i in range(spec.planned_transactions):
+            is_income = rnd.random() < 0.2
+            category = rnd.choice(income_categories if is_income else expense_categories)
+            start_date = today - timedelta(days=rnd.randint(0, spec.years * 365))
+            recurrence_type = _choose_recurrence(rnd)
+            planned_tx = PlannedTransactionDB(
+                id=_random_id(rnd),
+                amount=_money(rnd, 100, 50000),
+                category_id=category.id,
+                description=f"План {i}",
+                type=category.type,
+                start_date=start_date,
+                is_active=rnd.random() < 0.9,
+            )
+            if recurrence_type != RecurrenceType.NONE:
+                planned_tx.recurrence_rule = _recurrence_rule(rnd, recurrence_type, start_date)
+            planned.append(planned_tx)
+        session.add_all(planned)
+        session.flush()
+        counts["planned_transactions"] = len(planned)
+
+        window_start = today - timedelta(days=spec.occurrence_window_days)
+        window_end = today + timedelta(days=spec.occurrence_window_days)
+        occurrence_rows = []
+        for planned_tx in planned:
+            for occurrence_date in generate_occurrences_for_period(session, planned_tx, window_start, window_end):
+                status = OccurrenceStatus.PENDING
+                if occurrence_date < today:
+                    status = OccurrenceStatus.EXECUTED if rnd.random() < 0.85 else OccurrenceStatus.SKIPPED
+                occurrence_rows.append({
+                    "id": _random_id(rnd),
+                    "planned_transaction_id": planned_tx.id,
+                    "occurrence_date": occurrence_date,
+                    "amount": planned_tx.amount,
+                    "status": status,
+                    "executed_date": occurrence_date if status == OccurrenceStatus.EXECUTED else None,
+                    "executed_amount": planned_tx.amount if status == OccurrenceStatus.EXECUTED else None,
+                    "skipped_date": occurrence_date if status == OccurrenceStatus.SKIPPED else None,
+                    "created_at": now,
+                    "updated_at": now,
+                })
+        session.commit()
+        planned_transaction_id = planned[0].id
+
+    with engine.begin() as connection:
+        counts["planned_occurrences"] = _insert(connection, PlannedOccurrenceDB.__table__, occurrence_rows)
+
+        # Фактические транзакции: от years лет назад до сегодня
+        transaction_rows = []
+        first_day = today - timedelta(days=spec.years * 365)
+        low = max(0, spec.transactions_per_day // 2)
+        high = spec.transactions_per_day * 3 // 2
+        for day_offset in range((today - first_day).days + 1):
+            day = first_day + timedelta(days=day_offset)
+            for _ in range(rnd.randint(low, high)):
+                is_income = rnd.random() < 0.1
+                category = rnd.choice(income_categories if is_income else expense_categories)
+                transaction_rows.append({
+                    "id": _random_id(rnd),
+                    "amount": _money(rnd, 1000, 100000) if is_income else _money(rnd, 10, 5000),
+                    "type": category.type,
+                    "category_id": category.id,
+                    "description": None,
+                    "transaction_date": day,
+                    "created_at": now,
+                    "updated_at": now,
+                })
+        counts["transactions"] = _insert(connection, TransactionDB.__table__, transaction_rows)
+
+        # Займодатели и кредиты с полными графиками платежей
+        lender_rows = [
+            {
+                "id": _random_id(rnd),
+                "name": f"Займодатель {i}",
+                "lender_type": LenderType.COLLECTOR if i % 5 == 4 else rnd.choice(
+                    [LenderType.BANK, LenderType.MFO, LenderType.INDIVIDUAL, LenderType.OTHER]
+                ),
+                "created_at": now,
+                "updated_at": now,
+            }
+            for i in range(spec.lenders)
+        ]
+        counts["lenders"] = _insert(connection, LenderDB.__table__, lender_rows)
+        collectors = [row for row in lender_rows if row["lender_type"] == LenderType.COLLECTOR] or lender_rows
+
+        loan_rows, payment_rows, transfer_rows = [], [], []
+        for i in range(spec.loans):
+            lender = lender_rows[i % len(lender_rows)]
+            term_months = rnd.choice([6, 12, 24, 36, 60])
+            issue_date = today - timedelta(days=rnd.randint(30, min(spec.years, 6) * 365))
+            amount = Decimal(rnd.randint(10, 3000) * 1000)
+            interest_rate = Decimal(rnd.randint(0, 3000)) / 100
+            loan_id = _random_id(rnd)
+
+            holder_id = lender["id"]
+            transfer_date = None
+            if i % 10 == 9 and collectors:
+                # Долг передан коллектору через половину срока
+                transfer_date = _add_months(issue_date, term_months // 2)
+                if transfer_date < today:
+                    holder = rnd.choice(collectors)
+                    transfer_rows.append({
+                        "id": _random_id(rnd),
+                        "loan_id": loan_id,
+                        "from_lender_id": lender["id"],
+                        "to_lender_id": holder["id"],
+                        "transfer_date": transfer_date,
+                        "transfer_amount": amount / 2,
+                        "previous_amount": amount / 2,
+                        "amount_difference": Decimal("0"),
+                        "created_at": now,
+                        "updated_at": now,
+                    })
+                    holder_id = holder["id"]
+                else:
+                    transfer_date = None
+
+            # Аннуитетный график
+            monthly_rate = interest_rate / 1200
+            remaining = amount
+            if monthly_rate:
+                annuity = amount * monthly_rate / (1 - (1 + monthly_rate) ** -term_months)
+            else:
+                annuity = amount / term_months
+            has_overdue = False
+            all_paid = True
+            for month in range(1, term_months + 1):
+                scheduled = _add_months(issue_date, month)
+                interest = (remaining * monthly_rate).quantize(Decimal("0.01"))
+                principal = remaining if month == term_months else (annuity - interest).quantize(Decimal("0.01"))
+                remaining -= principal
+                status, executed_date, overdue_days = PaymentStatus.PENDING, None, None
+                if scheduled < today:
+                    point = rnd.random()
+                    if point < 0.05:
+                        status, overdue_days, has_overdue = PaymentStatus.OVERDUE, (today - scheduled).days, True
+                    elif point < 0.12:
+                        status, executed_date = PaymentStatus.EXECUTED_LATE, scheduled + timedelta(days=rnd.randint(1, 20))
+                    else:
+                        status, executed_date = PaymentStatus.EXECUTED, scheduled
+                if status in (PaymentStatus.PENDING, PaymentStatus.OVERDUE):
+                    all_paid = False
+                payment_rows.append({
+                    "id": _random_id(rnd),
+                    "loan_id": loan_id,
+                    "holder_id": holder_id if transfer_date and scheduled >= transfer_date else lender["id"],
+                    "scheduled_date": scheduled,
+                    "principal_amount": principal,
+                    "interest_amount": interest,
+                    "total_amount": principal + interest,
+                    "status": status,
+                    "executed_date": executed_date,
+                    "executed_amount": principal + interest if executed_date else None,
+                    "overdue_days": overdue_days,
+                    "created_at": now,
+                    "updated_at": now,
+                })
+
+            loan_rows.append({
+                "id": loan_id,
+                "lender_id": lender["id"],
+                "original_lender_id": lender["id"] if transfer_date else None,
+                "current_holder_id": holder_id,
+                "name": f"Кредит {i}",
+                "loan_type": rnd.choice(list(LoanType)),
+                "amount": amount,
+                "interest_rate": interest_rate,
+                "term_months": term_months,
+                "issue_date": issue_date,
+                "end_date": _add_months(issue_date, term_months),
+                "status": LoanStatus.PAID_OFF if all_paid else (LoanStatus.OVERDUE if has_overdue else LoanStatus.ACTIVE),
+                "created_at": now,
+                "updated_at": now,
+            })
+        counts["loans"] = _insert(connection, LoanDB.__table__, loan_rows)
+        counts["loan_payments"] = _insert(connection, LoanPaymentDB.__table__, payment_rows)
+        counts["debt_transfers"] = _insert(connection, DebtTransferDB.__table__, transfer_rows)
+
+        # Отложенные платежи в разных статусах
+        pending_rows = []
+        for i in range(spec.pending_payments):
+            point = rnd.random()
+            status = PendingPaymentStatus.ACTIVE
+            if point >= 0.85:
+                status = PendingPaymentStatus.CANCELLED
+            elif point >= 0.5:
+                status = PendingPaymentStatus.EXECUTED
+            amount = _money(rnd, 100, 50000)
+            closed_date = today - timedelta(days=rnd.randint(0, 365))
+            pending_rows.append({
+                "id": _random_id(rnd),
+                "amount": amount,
+                "category_id": rnd.choice(expense_categories).id,
+                "description": f"Отложенный платёж {i}",
+                "priority": rnd.choice(list(PendingPaymentPriority)),
+                "planned_date": (
+                    today + timedelta(days=rnd.randint(-10, 90))
+                    if status == PendingPaymentStatus.ACTIVE and rnd.random() < 0.6 else None
+                ),
+                "status": status,
+                "executed_date": closed_date if status == PendingPaymentStatus.EXECUTED else None,
+                "executed_amount": amount if status == PendingPaymentStatus.EXECUTED else None,
+                "cancelled_date": closed_date if status == PendingPaymentStatus.CANCELLED else None,
+                "created_at": now,
+                "updated_at": now,
+            })
+        # Первый платёж - активный (используется в вызовах сервисов)
+        pending_rows[0]["status"] = PendingPaymentStatus.ACTIVE
+        pending_rows[0]["executed_date"] = pending_rows[0]["cancelled_date"] = None
+        pending_rows[0]["executed_amount"] = None
+        counts["pending_payments"] = _insert(connection, PendingPaymentDB.__table__, pending_rows)
+
+        connection.exec_driver_sql("ANALYZE")
+
+    # Кредит для вызовов сервисов: незакрытый, с ожидающими платежами
+    open_loan_ids = {row["id"] for row in loan_rows if row["status"] != LoanStatus.PAID_OFF}
+    pending_payments_by_loan = [
+        row for row in payment_rows
+        if row["loan_id"] in open_loan_ids and row["status"] == PaymentStatus.PENDING
+    ]
+    loan_payment = min(pending_payments_by_loan, key=lambda row: (row["loan_id"] != loan_rows[0]["id"], row["scheduled_date"])) \
+        if pending_payments_by_loan else payment_rows[0]
+    future_occurrences = sorted(
+        (row for row in occurrence_rows if row["status"] == OccurrenceStatus.PENDING),
+        key=lambda row: (row["occurrence_date"], row["id"])
+    )
+
+    return DatasetContext(
+        today=today,
+        expense_category_id=expense_categories[0].id,
+        income_category_id=income_categories[0].id,
+        transaction_id=transaction_rows[-1]["id"],
+        planned_transaction_id=planned_transaction_id,
+        occurrence_ids=[row["id"] for row in future_occurrences[:2]],
+        pending_payment_id=pending_rows[0]["id"],
+        lender_ids=[row["id"] for row in lender_rows],
+        loan_id=loan_payment["loan_id"],
+        payment_id=loan_payment["id"],
+        row_counts=counts,
+    )
+
+
+def describe(spec: DatasetSpec) -> Dict[str, Any]:
+    """Параметры набора данных в виде словаря (для отчётов)."""
+    return asdict(spec)
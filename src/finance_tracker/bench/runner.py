@@ -0,0 +1,242 @@
+"""
+Микробенчмарк публичных функций сервисов на синтетических наборах данных.
+
+Для каждого масштаба (generator.SCALES) создаёт отдельную БД, наполняет её
+генератором и для каждого вызова из service_calls.SERVICE_CALLS измеряет:
+- Количество SQL-запросов и повторяющиеся запросы (прогрев под sql_profiler)
+- Время выполнения: min, медиана, max по нескольким повторам
+
+Каждый вызов выполняется во внешней транзакции соединения, а сессия
+работает в точке сохранения (SAVEPOINT): коммиты сервисов фиксируют только
+точку сохранения, после замера внешняя транзакция откатывается. Поэтому
+изменяющие вызовы (create_transaction, execute_payment и т.п.) на каждом
+повторе видят одни и те же исходные данные. Кэш справочников очищается
+перед каждым повтором.
+
+Запуск:
+    python -m finance_tracker.bench.runner --scales small medium --output bench.json
+    python -m finance_tracker.bench.runner --scales large --repeats 3 --calls balance_forecast loan_statistics
+"""
+
+import argparse
+import json
+import logging
+import os
+import platform
+import sqlite3
+import statistics
+import tempfile
+import time
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import Engine, event
+from sqlalchemy.orm import Session
+
+from finance_tracker.bench.generator import SCALES, DatasetContext, DatasetSpec, describe, generate_dataset
+from finance_tracker.bench.service_calls import SERVICE_CALLS, ServiceCall
+from finance_tracker.database import create_db_engine
+from finance_tracker.migrations import run_migrations
+from finance_tracker.utils import sql_profiler
+from finance_tracker.utils.cache import cache
+
+logger = logging.getLogger(__name__)
+
+# Запросы управления транзакциями, которые добавляет сам бенчмарк (не учитываются)
+_TRANSACTION_CONTROL = ("BEGIN", "SAVEPOINT", "RELEASE", "ROLLBACK")
+
+
+def _enable_savepoints(engine: Engine) -> None:
+    """
+    Передаёт управление транзакциями SQLAlchemy вместо драйвера pysqlite.
+
+    Без этого pysqlite сам открывает и фиксирует транзакции, и откат внешней
+    транзакции не отменяет изменений, зафиксированных в точке сохранения.
+    """
+    @event.listens_for(engine, "connect")
+    def _on_connect(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+
+    @event.listens_for(engine, "begin")
+    def _on_begin(conn):
+        conn.exec_driver_sql("BEGIN")
+
+
+def _run_isolated(engine: Engine, call: ServiceCall, context: DatasetContext) -> float:
+    """Выполняет вызов в точке сохранения с последующим откатом. Возвращает время в секундах."""
+    cache.clear_all()
+    with engine.connect() as connection:
+        outer = connection.begin()
+        session = Session(bind=connection, join_transaction_mode="create_savepoint")
+        try:
+            started = time.perf_counter()
+            call.run(session, context)
+            session.commit()
+            return time.perf_counter() - started
+        finally:
+            session.close()
+            outer.rollback()
+
+
+def measure_call(engine: Engine, call: ServiceCall, context: DatasetContext, repeats: int) -> Dict[str, Any]:
+    """
+    Измеряет вызов сервиса: прогрев с подсчётом запросов и repeats замеров времени.
+
+    Returns:
+        Словарь: mutates, statements, repeated, min_ms, median_ms, max_ms, error
+    """
+    result: Dict[str, Any] = {"mutates": call.mutates, "error": None}
+    try:
+        with sql_profiler.track(call.name) as unit:
+            _run_isolated(engine, call, context)
+        result["statements"] = sum(
+            count for sql, count in unit.statements.items() if not sql.startswith(_TRANSACTION_CONTROL)
+        )
+        result["repeated"] = unit.repeated_statements(sql_profiler.DEFAULT_REPEAT_THRESHOLD)
+        timings = [_run_isolated(engine, call, context) * 1000 for _ in range(repeats)]
+    except Exception as e:
+        result["error"] = f"{type(e).__name__}: {e}"
+        logger.warning(f"Вызов {call.name} завершился ошибкой: {result['error']}")
+        return result
+
+    result["min_ms"] = round(min(timings), 3)
+    result["median_ms"] = round(statistics.median(timings), 3)
+    result["max_ms"] = round(max(timings), 3)
+    return result
+
+
+def run_scale_benchmark(
+    scale: str,
+    spec: DatasetSpec,
+    work_dir: str,
+    calls: List[ServiceCall],
+    repeats: int
+) -> Dict[str, Any]:
+    """Создаёт БД масштаба scale и измеряет на ней все вызовы."""
+    db_path = os.path.join(work_dir, f"bench_{scale}.db")
+    url = f"sqlite:///{db_path}"
+
+    # Миграции управляют транзакциями сами (BEGIN IMMEDIATE), поэтому БД
+    # наполняется отдельным engine без перехвата BEGIN
+    setup_engine = create_db_engine(url)
+    try:
+        run_migrations(setup_engine)
+        started = time.perf_counter()
+        context = generate_dataset(setup_engine, spec)
+        generate_seconds = time.perf_counter() - started
+    finally:
+        setup_engine.dispose()
+    logger.info(f"Набор данных '{scale}' создан за {generate_seconds:.1f} с: {context.row_counts}")
+
+    engine = create_db_engine(url)
+    _enable_savepoints(engine)
+    profiler_was_enabled = sql_profiler.is_enabled()
+    try:
+        if not profiler_was_enabled:
+            sql_profiler.configure(True)
+        sql_profiler.instrument_engine(engine)
+
+        results = {}
+        for call in calls:
+            results[call.name] = measure_call(engine, call, context, repeats)
+
+        return {
+            "parameters": describe(spec),
+            "row_counts": context.row_counts,
+            "generate_seconds": round(generate_seconds, 3),
+            "db_size_mb": round(os.path.getsize(db_path) / (1024 * 1024), 2),
+            "calls": results,
+        }
+    finally:
+        sql_profiler.uninstrument_engine(engine)
+        if not profiler_was_enabled and sql_profiler.is_enabled():
+            sql_profiler.configure(False)
+        engine.dispose()
+
+
+def run_benchmark(
+    scales: Optional[List[str]] = None,
+    repeats: int = 5,
+    calls: Optional[List[ServiceCall]] = None,
+    work_dir: Optional[str] = None,
+    specs: Optional[Dict[str, DatasetSpec]] = None
+) -> Dict[str, Any]:
+    """
+    Выполняет бенчмарк вызовов сервисов для набора масштабов.
+
+    Args:
+        scales: Имена масштабов (по умолчанию все из specs)
+        repeats: Количество замеров каждого вызова
+        calls: Вызовы сервисов (по умолчанию SERVICE_CALLS)
+        work_dir: Директория для временных БД
+        specs: Параметры наборов данных по именам масштабов (по умолчанию SCALES)
+
+    Returns:
+        Словарь {"parameters": ..., "scales": {масштаб: {parameters, row_counts,
+        generate_seconds, db_size_mb, calls: {вызов: результат measure_call}}}}
+    """
+    specs = specs or SCALES
+    scales = scales or list(specs)
+    calls = SERVICE_CALLS if calls is None else calls
+    results = {}
+
+    with tempfile.TemporaryDirectory(dir=work_dir) as tmp_dir:
+        for scale in scales:
+            logger.info(f"Бенчмарк сервисов на наборе данных '{scale}'")
+            results[scale] = run_scale_benchmark(scale, specs[scale], tmp_dir, calls, repeats)
+
+    return {
+        "parameters": {
+            "repeats": repeats,
+            "python": platform.python_version(),
+            "sqlite_version": sqlite3.sqlite_version,
+        },
+        "scales": results,
+    }
+
+
+def _print_table(report: Dict[str, Any]) -> None:
+    """Выводит медианное время и количество запросов вызовов по масштабам."""
+    scales = list(report["scales"])
+    names = list(next(iter(report["scales"].values()))["calls"]) if scales else []
+    width = max((len(name) for name in names), default=10)
+    header = f"{'Вызов':<{width}} " + " ".join(f"{scale:>20}" for scale in scales)
+    print(header)
+    print("-" * len(header))
+    for name in names:
+        cells = []
+        for scale in scales:
+            result = report["scales"][scale]["calls"][name]
+            if result["error"]:
+                cells.append(f"{'ошибка':>20}")
+            else:
+                cells.append(f"{result['median_ms']:>10.2f}мс {result['statements']:>4} SQL")
+        print(f"{name:<{width}} " + " ".join(cells))
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Точка входа командной строки."""
+    parser = argparse.ArgumentParser(description="Бенчмарк публичных функций сервисов")
+    parser.add_argument("--scales", nargs="+", choices=list(SCALES), default=["small", "medium"],
+                        help="Масштабы наборов данных")
+    parser.add_argument("--repeats", type=int, default=5, help="Количество замеров каждого вызова")
+    parser.add_argument("--calls", nargs="+",
+                        help="Подстроки имён вызовов для фильтрации (по умолчанию все)")
+    parser.add_argument("--work-dir", help="Директория для временных БД (по умолчанию системная)")
+    parser.add_argument("--output", help="Путь к JSON-файлу с результатами")
+    args = parser.parse_args(argv)
+
+    calls = SERVICE_CALLS
+    if args.calls:
+        calls = [call for call in SERVICE_CALLS if any(part in call.name for part in args.calls)]
+
+    report = run_benchmark(args.scales, args.repeats, calls, args.work_dir)
+
+    _print_table(report)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, ensure_ascii=False, default=str)
+        print(f"Результаты сохранены в {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,283 @@
+"""
+Реестр вызовов публичных функций сервисов для бенчмарков и аудита запросов.
+
+Каждый вызов получает сессию и DatasetContext синтетического набора данных
+(см. generator). Вызовы, изменяющие данные, помечены mutates=True и
+перечислены после читающих.
+"""
+
+import inspect
+import io
+from dataclasses import dataclass
+from datetime import date, timedelta
+from decimal import Decimal
+from typing import Any, Callable, List, Tuple
+
+from sqlalchemy.orm import Session
+
+from finance_tracker.bench.generator import DatasetContext
+from finance_tracker.models import (
+    LoanStatus,
+    PendingPaymentStatus,
+    TransactionCreate,
+    TransactionType,
+    TransactionUpdate,
+)
+from finance_tracker.services import (
+    balance_forecast_service,
+    balance_ledger_service,
+    category_service,
+    debt_transfer_service,
+    lender_service,
+    loan_payment_service,
+    loan_service,
+    loan_statistics_service,
+    pending_payment_service,
+    plan_fact_service,
+    planned_transaction_service,
+    recurrence_service,
+    search_service,
+    statement_import_service,
+    transaction_service,
+)
+
+# Модули, публичные функции которых вызываются в бенчмарках и аудите
+SERVICE_MODULES = (
+    transaction_service,
+    search_service,
+    statement_import_service,
+    category_service,
+    balance_ledger_service,
+    balance_forecast_service,
+    planned_transaction_service,
+    recurrence_service,
+    plan_fact_service,
+    pending_payment_service,
+    lender_service,
+    loan_service,
+    loan_payment_service,
+    loan_statistics_service,
+    debt_transfer_service,
+)
+
+
+@dataclass(frozen=True)
+class ServiceCall:
+    """
+    Вызов функции сервиса.
+
+    Attributes:
+        name: Имя "модуль.функция"
+        run: Функция вызова (сессия, контекст набора данных)
+        mutates: Вызов изменяет данные
+    """
+    name: str
+    run: Callable[[Session, DatasetContext], Any]
+    mutates: bool = False
+
+
+def _month_bounds(today: date) -> Tuple[date, date]:
+    start = today.replace(day=1)
+    end = (start + timedelta(days=32)).replace(day=1) - timedelta(days=1)
+    return start, end
+
+
+def _statement_csv(today: date) -> io.StringIO:
+    """Выписка за последний год: по три операции в день."""
+    lines = ["date,amount,description"]
+    for day in range(365):
+        operation_date = (today - timedelta(days=day)).isoformat()
+        lines += [f"{operation_date},-350.00,Продукты", f"{operation_date},-350.00,Продукты",
+                  f"{operation_date},1200.00,Перевод"]
+    return io.StringIO("\n".join(lines))
+
+
+def _repayment_scenarios(c: DatasetContext) -> List[balance_forecast_service.ForecastScenario]:
+    """Сто сценариев: досрочное погашение кредита в разные дни и разовый расход."""
+    return [
+        balance_forecast_service.ForecastScenario(
+            f"Погашение через {days} дн.", early_repayments={c.loan_id: c.today + timedelta(days=days)},
+            extra_amounts=[(c.today + timedelta(days=days), Decimal("-5000.00"))]
+        )
+        for days in range(1, 101)
+    ]
+
+
+# Порядок важен: сначала чтение, затем изменяющие данные вызовы
+SERVICE_CALLS: List[ServiceCall] = [
+    # Транзакции и категории
+    ServiceCall("transaction_service.get_total_balance",
+                lambda s, c: transaction_service.get_total_balance(s)),
+    ServiceCall("transaction_service.get_transactions_by_date",
+                lambda s, c: transaction_service.get_transactions_by_date(s, c.today)),
+    ServiceCall("transaction_service.get_by_date_range",
+                lambda s, c: transaction_service.get_by_date_range(s, *_month_bounds(c.today))),
+    ServiceCall("transaction_service.get_transactions_page",
+                lambda s, c: transaction_service.get_transactions_page(
+                    s, c.today - timedelta(days=365 * 3), c.today)),
+    ServiceCall("transaction_service.get_month_stats",
+                lambda s, c: transaction_service.get_month_stats(s, c.today.year, c.today.month)),
+    ServiceCall("transaction_service.get_year_stats",
+                lambda s, c: transaction_service.get_year_stats(s, c.today.year)),
+    ServiceCall("transaction_service.get_category_statistics",
+                lambda s, c: transaction_service.get_category_statistics(s)),
+    ServiceCall("transaction_service.get_category_totals",
+                lambda s, c: transaction_service.get_category_totals(
+                    s, *_month_bounds(c.today), transaction_type=TransactionType.EXPENSE)),
+    ServiceCall("search_service.search_descriptions",
+                lambda s, c: search_service.search_descriptions(s, "плат")),
+    ServiceCall("category_service.get_all_categories",
+                lambda s, c: category_service.get_all_categories(s, TransactionType.EXPENSE)),
+    # Журнал баланса
+    ServiceCall("balance_ledger_service.get_ledger_balance",
+                lambda s, c: balance_ledger_service.get_ledger_balance(s)),
+    ServiceCall("balance_ledger_service.get_balances_between",
+                lambda s, c: balance_ledger_service.get_balances_between(
+                    s, c.today - timedelta(days=365), c.today)),
+    ServiceCall("balance_ledger_service.check_balance_ledger",
+                lambda s, c: balance_ledger_service.check_balance_ledger(s)),
+    # Прогноз баланса
+    ServiceCall("balance_forecast_service.calculate_actual_balance",
+                lambda s, c: balance_forecast_service.calculate_actual_balance(s, c.today)),
+    ServiceCall("balance_forecast_service.calculate_forecast_balance",
+                lambda s, c: balance_forecast_service.calculate_forecast_balance(s, c.today + timedelta(days=30))),
+    ServiceCall("balance_forecast_service.calculate_forecast_balances",
+                lambda s, c: balance_forecast_service.calculate_forecast_balances(
+                    s, [c.today + timedelta(days=days) for days in range(-7, 35)])),
+    ServiceCall("balance_forecast_service.get_forecast_for_period",
+                lambda s, c: balance_forecast_service.get_forecast_for_period(s, c.today, c.today + timedelta(days=30))),
+    ServiceCall("balance_forecast_service.get_forecast_series",
+                lambda s, c: balance_forecast_service.get_forecast_series(
+                    s, c.today - timedelta(days=30), c.today + timedelta(days=365 * 5))),
+    ServiceCall("balance_forecast_service.detect_cash_gaps",
+                lambda s, c: balance_forecast_service.detect_cash_gaps(s, c.today, c.today + timedelta(days=30))),
+    ServiceCall("balance_forecast_service.find_next_cash_gaps",
+                lambda s, c: balance_forecast_service.find_next_cash_gaps(s, horizon_days=5 * 365, limit=3)),
+    ServiceCall("balance_forecast_service.forecast_scenarios",
+                lambda s, c: balance_forecast_service.forecast_scenarios(s, _repayment_scenarios(c), c.today,
+                                                                         c.today + timedelta(days=365))),
+    ServiceCall("balance_forecast_service.get_cached_forecast_series",
+                lambda s, c: balance_forecast_service.get_cached_forecast_series(s, *_month_bounds(c.today))),
+    ServiceCall("balance_forecast_service.get_cached_forecast_balance",
+                lambda s, c: balance_forecast_service.get_cached_forecast_balance(
+                    s, c.today + timedelta(days=30))),
+    ServiceCall("balance_forecast_service.get_cached_forecast_balances",
+                lambda s, c: balance_forecast_service.get_cached_forecast_balances(
+                    s, [c.today + timedelta(days=days) for days in range(-7, 35)])),
+    ServiceCall("balance_forecast_service.get_cached_cash_gaps",
+                lambda s, c: balance_forecast_service.get_cached_cash_gaps(s, *_month_bounds(c.today))),
+    # Плановые транзакции
+    ServiceCall("planned_transaction_service.get_all_planned_transactions",
+                lambda s, c: planned_transaction_service.get_all_planned_transactions(s)),
+    ServiceCall("planned_transaction_service.get_occurrences_by_date",
+                lambda s, c: planned_transaction_service.get_occurrences_by_date(s, c.today)),
+    ServiceCall("planned_transaction_service.get_pending_occurrences",
+                lambda s, c: planned_transaction_service.get_pending_occurrences(s)),
+    ServiceCall("planned_transaction_service.get_occurrences_by_date_range",
+                lambda s, c: planned_transaction_service.get_occurrences_by_date_range(s, *_month_bounds(c.today))),
+    ServiceCall("plan_fact_service.get_plan_fact_analysis",
+                lambda s, c: plan_fact_service.get_plan_fact_analysis(s, c.today - timedelta(days=30), c.today)),
+    ServiceCall("plan_fact_service.get_occurrence_details",
+                lambda s, c: plan_fact_service.get_occurrence_details(s, c.occurrence_ids[0])),
+    # Отложенные платежи
+    ServiceCall("pending_payment_service.get_pending_payment_by_id",
+                lambda s, c: pending_payment_service.get_pending_payment_by_id(s, c.pending_payment_id)),
+    ServiceCall("pending_payment_service.get_all_pending_payments",
+                lambda s, c: pending_payment_service.get_all_pending_payments(s, status=PendingPaymentStatus.ACTIVE)),
+    ServiceCall("pending_payment_service.get_pending_payments_history",
+                lambda s, c: pending_payment_service.get_pending_payments_history(s, c.today - timedelta(days=90), c.today)),
+    ServiceCall("pending_payment_service.get_pending_payments_statistics",
+                lambda s, c: pending_payment_service.get_pending_payments_statistics(s)),
+    ServiceCall("pending_payment_service.get_pending_payments_by_date",
+                lambda s, c: pending_payment_service.get_pending_payments_by_date(s, c.today)),
+    # Займодатели и кредиты
+    ServiceCall("lender_service.get_all_lenders",
+                lambda s, c: lender_service.get_all_lenders(s)),
+    ServiceCall("lender_service.get_lender_by_id",
+                lambda s, c: lender_service.get_lender_by_id(s, c.lender_ids[0])),
+    ServiceCall("loan_service.get_all_loans",
+                lambda s, c: loan_service.get_all_loans(s, status=LoanStatus.ACTIVE)),
+    ServiceCall("loan_service.get_loan_by_id",
+                lambda s, c: loan_service.get_loan_by_id(s, c.loan_id)),
+    ServiceCall("loan_service.calculate_loan_balance",
+                lambda s, c: loan_service.calculate_loan_balance(s, c.loan_id)),
+    ServiceCall("loan_service.calculate_loan_statistics",
+                lambda s, c: loan_service.calculate_loan_statistics(s, c.loan_id)),
+    ServiceCall("loan_service.get_loans_by_current_holder",
+                lambda s, c: loan_service.get_loans_by_current_holder(s, c.lender_ids[0])),
+    ServiceCall("loan_service.get_debt_by_holder_statistics",
+                lambda s, c: loan_service.get_debt_by_holder_statistics(s, status=LoanStatus.ACTIVE)),
+    ServiceCall("loan_payment_service.get_payments_by_loan",
+                lambda s, c: loan_payment_service.get_payments_by_loan(s, c.loan_id)),
+    ServiceCall("loan_payment_service.get_overdue_statistics",
+                lambda s, c: loan_payment_service.get_overdue_statistics(s)),
+    ServiceCall("loan_payment_service.get_payments_by_date",
+                lambda s, c: loan_payment_service.get_payments_by_date(s, c.today)),
+    ServiceCall("loan_statistics_service.get_summary_statistics",
+                lambda s, c: loan_statistics_service.get_summary_statistics(s)),
+    ServiceCall("loan_statistics_service.get_monthly_burden_statistics",
+                lambda s, c: loan_statistics_service.get_monthly_burden_statistics(s)),
+    ServiceCall("loan_statistics_service.get_overdue_statistics",
+                lambda s, c: loan_statistics_service.get_overdue_statistics(s)),
+    ServiceCall("loan_statistics_service.get_period_statistics",
+                lambda s, c: loan_statistics_service.get_period_statistics(s, c.today - timedelta(days=90), c.today)),
+    ServiceCall("debt_transfer_service.get_remaining_debt",
+                lambda s, c: debt_transfer_service.get_remaining_debt(s, c.loan_id)),
+    ServiceCall("debt_transfer_service.get_transfer_history",
+                lambda s, c: debt_transfer_service.get_transfer_history(s, c.loan_id)),
+    # Изменяющие вызовы
+    ServiceCall("recurrence_service.ensure_occurrences_for_period",
+                lambda s, c: recurrence_service.ensure_occurrences_for_period(s, c.today, c.today + timedelta(days=60)),
+                mutates=True),
+    ServiceCall("transaction_service.create_transaction",
+                lambda s, c: transaction_service.create_transaction(s, TransactionCreate(
+                    amount=Decimal("100.00"), type=TransactionType.EXPENSE,
+                    category_id=c.expense_category_id, transaction_date=c.today)),
+                mutates=True),
+    ServiceCall("transaction_service.create_transactions_bulk",
+                lambda s, c: transaction_service.create_transactions_bulk(s, [
+                    TransactionCreate(amount=Decimal("10.00") + i, type=TransactionType.EXPENSE,
+                                      category_id=c.expense_category_id,
+                                      transaction_date=c.today - timedelta(days=i))
+                    for i in range(100)
+                ]),
+                mutates=True),
+    ServiceCall("statement_import_service.import_statement_csv",
+                lambda s, c: statement_import_service.import_statement_csv(
+                    s, _statement_csv(c.today), c.income_category_id, c.expense_category_id),
+                mutates=True),
+    ServiceCall("transaction_service.update_transaction",
+                lambda s, c: transaction_service.update_transaction(
+                    s, c.transaction_id, TransactionUpdate(amount=Decimal("250.00"))),
+                mutates=True),
+    ServiceCall("planned_transaction_service.execute_occurrence",
+                lambda s, c: planned_transaction_service.execute_occurrence(
+                    s, c.occurrence_ids[0], c.today, Decimal("1000.00")),
+                mutates=True),
+    ServiceCall("planned_transaction_service.skip_occurrence",
+                lambda s, c: planned_transaction_service.skip_occurrence(s, c.occurrence_ids[1]),
+                mutates=True),
+    ServiceCall("loan_payment_service.update_overdue_payments",
+                lambda s, c: loan_payment_service.update_overdue_payments(s),
+                mutates=True),
+    ServiceCall("loan_payment_service.execute_payment",
+                lambda s, c: loan_payment_service.execute_payment(s, c.payment_id, c.today),
+                mutates=True),
+    ServiceCall("transaction_service.delete_transaction",
+                lambda s, c: transaction_service.delete_transaction(s, c.transaction_id),
+                mutates=True),
+]
+
+
+def public_service_functions() -> List[str]:
+    """Имена ("модуль.функция") публичных функций сервисов, принимающих session первым аргументом."""
+    names = []
+    for module in SERVICE_MODULES:
+        short_name = module.__name__.rsplit(".", 1)[-1]
+        for name, func in inspect.getmembers(module, inspect.isfunction):
+            if name.startswith("_") or func.__module__ != module.__name__:
+                continue
+            parameters = list(inspect.signature(func).parameters)
+            if parameters and parameters[0] == "session":
+                names.append(f"{short_name}.{name}")
+    return sorted(names)
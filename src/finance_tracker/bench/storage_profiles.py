@@ -0,0 +1,338 @@
+"""
+Бенчмарк профилей хранения SQLite.
+
+Для каждого профиля из Config.STORAGE_PROFILES создаёт отдельную БД,
+наполняет её большим количеством транзакций и измеряет:
+- Задержку коммита: одиночные INSERT + COMMIT (среднее, p50, p95, max)
+- Пропускную способность чтения во время записи: поток-писатель непрерывно
+  коммитит транзакции, потоки-читатели выполняют агрегирующий запрос за период
+
+Запуск:
+    python -m finance_tracker.bench.storage_profiles --rows 200000 --duration 5
+    python -m finance_tracker.bench.storage_profiles --profiles safe fast --output bench.json
+"""
+
+import argparse
+import json
+import logging
+import os
+import random
+import statistics
+import tempfile
+import threading
+import time
+import uuid
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import Engine, func, select
+
+from finance_tracker.config import Config
+from finance_tracker.database import create_db_engine
+from finance_tracker.models import Base, CategoryDB, TransactionDB, TransactionType
+
+logger = logging.getLogger(__name__)
+
+# Размер пачки при первоначальном наполнении БД
+_FILL_CHUNK_SIZE = 10000
+
+
+def _fill_database(engine: Engine, rows: int, seed: int) -> str:
+    """
+    Наполняет БД категорией и указанным количеством транзакций.
+
+    Returns:
+        ID созданной категории (используется писателем в бенчмарке)
+    """
+    rnd = random.Random(seed)
+    category_id = str(uuid.uuid4())
+    start = date.today() - timedelta(days=3650)
+    now = datetime.now()
+
+    with engine.begin() as conn:
+        conn.execute(CategoryDB.__table__.insert(), [{
+            "id": category_id,
+            "name": "Бенчмарк",
+            "type": TransactionType.EXPENSE,
+            "is_system": False,
+            "created_at": now,
+            "updated_at": now,
+        }])
+
+    inserted = 0
+    while inserted < rows:
+        chunk = min(_FILL_CHUNK_SIZE, rows - inserted)
+        batch = [
+            {
+                "id": str(uuid.uuid4()),
+                "amount": Decimal(rnd.randint(100, 500000)) / 100,
+                "type": TransactionType.EXPENSE if rnd.random() < 0.8 else TransactionType.INCOME,
+                "category_id": category_id,
+                "description": f"Операция {inserted + i}",
+                "transaction_date": start + timedelta(days=rnd.randint(0, 3649)),
+                "created_at": now,
+                "updated_at": now,
+            }
+            for i in range(chunk)
+        ]
+        with engine.begin() as conn:
+            conn.execute(TransactionDB.__table__.insert(), batch)
+        inserted += chunk
+
+    return category_id
+
+
+def _single_insert(engine: Engine, category_id: str, rnd: random.Random) -> None:
+    """Выполняет одну транзакцию записи: INSERT одной строки + COMMIT."""
+    now = datetime.now()
+    with engine.begin() as conn:
+        conn.execute(TransactionDB.__table__.insert(), [{
+            "id": str(uuid.uuid4()),
+            "amount": Decimal(rnd.randint(100, 500000)) / 100,
+            "type": TransactionType.EXPENSE,
+            "category_id": category_id,
+            "description": "Коммит",
+            "transaction_date": date.today(),
+            "created_at": now,
+            "updated_at": now,
+        }])
+
+
+def _percentile(values: List[float], fraction: float) -> float:
+    """Возвращает перцентиль отсортированного списка (ближайший ранг)."""
+    index = min(len(values) - 1, max(0, int(round(fraction * (len(values) - 1)))))
+    return values[index]
+
+
+def measure_commit_latency(engine: Engine, category_id: str, commits: int, seed: int) -> Dict[str, float]:
+    """
+    Измеряет задержку одиночных коммитов.
+
+    Returns:
+        Словарь с метриками в миллисекундах: mean, p50, p95, max
+    """
+    rnd = random.Random(seed)
+    latencies: List[float] = []
+    for _ in range(commits):
+        started = time.perf_counter()
+        _single_insert(engine, category_id, rnd)
+        latencies.append((time.perf_counter() - started) * 1000)
+
+    latencies.sort()
+    return {
+        "commits": commits,
+        "mean_ms": round(statistics.fmean(latencies), 3),
+        "p50_ms": round(_percentile(latencies, 0.50), 3),
+        "p95_ms": round(_percentile(latencies, 0.95), 3),
+        "max_ms": round(latencies[-1], 3),
+    }
+
+
+def measure_read_while_write(
+    engine: Engine,
+    category_id: str,
+    duration: float,
+    readers: int,
+    seed: int
+) -> Dict[str, float]:
+    """
+    Измеряет пропускную способность чтения при параллельной записи.
+
+    Один поток непрерывно выполняет INSERT + COMMIT, потоки-читатели
+    выполняют агрегирующий запрос (сумма за случайный 30-дневный период).
+
+    Returns:
+        Словарь с количеством операций в секунду: reads_per_sec, writes_per_sec
+    """
+    stop = threading.Event()
+    counters = {"reads": 0, "writes": 0, "errors": 0}
+    lock = threading.Lock()
+    first_day = date.today() - timedelta(days=3650)
+
+    def writer() -> None:
+        rnd = random.Random(seed)
+        while not stop.is_set():
+            try:
+                _single_insert(engine, category_id, rnd)
+                with lock:
+                    counters["writes"] += 1
+            except Exception as e:
+                logger.debug(f"Ошибка записи в бенчмарке: {e}")
+                with lock:
+                    counters["errors"] += 1
+
+    def reader(reader_seed: int) -> None:
+        rnd = random.Random(reader_seed)
+        query_start = TransactionDB.transaction_date
+        with engine.connect() as conn:
+            while not stop.is_set():
+                period_start = first_day + timedelta(days=rnd.randint(0, 3620))
+                stmt = select(func.count(), func.sum(TransactionDB.amount)).where(
+                    query_start >= period_start,
+                    query_start <= period_start + timedelta(days=30)
+                )
+                try:
+                    conn.execute(stmt).one()
+                    conn.rollback()  # Завершаем read-транзакцию, чтобы видеть новые коммиты
+                    with lock:
+                        counters["reads"] += 1
+                except Exception as e:
+                    logger.debug(f"Ошибка чтения в бенчмарке: {e}")
+                    with lock:
+                        counters["errors"] += 1
+
+    threads = [threading.Thread(target=writer, daemon=True)]
+    threads += [threading.Thread(target=reader, args=(seed + i + 1,), daemon=True) for i in range(readers)]
+
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    time.sleep(duration)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    return {
+        "readers": readers,
+        "duration_s": round(elapsed, 3),
+        "reads_per_sec": round(counters["reads"] / elapsed, 1),
+        "writes_per_sec": round(counters["writes"] / elapsed, 1),
+        "errors": counters["errors"],
+    }
+
+
+def run_profile_benchmark(
+    profile_name: str,
+    work_dir: str,
+    rows: int,
+    commits: int,
+    duration: float,
+    readers: int = 2,
+    seed: int = 42
+) -> Dict[str, Any]:
+    """
+    Выполняет бенчмарк одного профиля хранения на отдельном файле БД.
+
+    Args:
+        profile_name: Имя профиля из Config.STORAGE_PROFILES
+        work_dir: Директория для временного файла БД
+        rows: Количество транзакций при наполнении БД
+        commits: Количество одиночных коммитов для замера задержки
+        duration: Длительность замера чтения во время записи (секунды)
+        readers: Количество потоков-читателей
+        seed: Зерно генератора случайных чисел
+
+    Returns:
+        Словарь с результатами бенчмарка профиля
+    """
+    profile = Config.STORAGE_PROFILES[profile_name]
+    db_path = os.path.join(work_dir, f"bench_{profile_name}.db")
+    engine = create_db_engine(f"sqlite:///{db_path}", profile)
+
+    try:
+        Base.metadata.create_all(engine)
+
+        started = time.perf_counter()
+        category_id = _fill_database(engine, rows, seed)
+        fill_seconds = time.perf_counter() - started
+
+        result = {
+            "profile": profile_name,
+            "pragmas": profile,
+            "rows": rows,
+            "fill_seconds": round(fill_seconds, 3),
+            "commit_latency": measure_commit_latency(engine, category_id, commits, seed),
+            "read_while_write": measure_read_while_write(engine, category_id, duration, readers, seed),
+            "db_size_mb": round(os.path.getsize(db_path) / (1024 * 1024), 2),
+        }
+        return result
+    finally:
+        engine.dispose()
+
+
+def run_benchmark(
+    profiles: Optional[List[str]] = None,
+    rows: int = 200000,
+    commits: int = 300,
+    duration: float = 5.0,
+    readers: int = 2,
+    seed: int = 42,
+    work_dir: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Выполняет бенчмарк для набора профилей хранения.
+
+    Returns:
+        Словарь {"parameters": ..., "results": [...]} для сериализации в JSON
+    """
+    profiles = profiles or list(Config.STORAGE_PROFILES)
+    results = []
+
+    with tempfile.TemporaryDirectory(dir=work_dir) as tmp_dir:
+        for profile_name in profiles:
+            logger.info(f"Бенчмарк профиля '{profile_name}' ({rows} строк)")
+            results.append(run_profile_benchmark(
+                profile_name, tmp_dir, rows, commits, duration, readers, seed
+            ))
+
+    return {
+        "parameters": {
+            "rows": rows,
+            "commits": commits,
+            "duration_s": duration,
+            "readers": readers,
+            "seed": seed,
+        },
+        "results": results,
+    }
+
+
+def _print_table(report: Dict[str, Any]) -> None:
+    """Выводит результаты бенчмарка в виде таблицы."""
+    header = f"{'Профиль':<10} {'commit p50':>11} {'commit p95':>11} {'чтений/с':>10} {'записей/с':>10}"
+    print(header)
+    print("-" * len(header))
+    for result in report["results"]:
+        latency = result["commit_latency"]
+        rww = result["read_while_write"]
+        print(
+            f"{result['profile']:<10} {latency['p50_ms']:>9.3f}мс {latency['p95_ms']:>9.3f}мс "
+            f"{rww['reads_per_sec']:>10.1f} {rww['writes_per_sec']:>10.1f}"
+        )
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Точка входа командной строки."""
+    parser = argparse.ArgumentParser(description="Бенчмарк профилей хранения SQLite")
+    parser.add_argument("--profiles", nargs="+", choices=list(Config.STORAGE_PROFILES),
+                        help="Профили для сравнения (по умолчанию все)")
+    parser.add_argument("--rows", type=int, default=200000, help="Количество транзакций в БД")
+    parser.add_argument("--commits", type=int, default=300, help="Количество одиночных коммитов")
+    parser.add_argument("--duration", type=float, default=5.0, help="Длительность замера чтения/записи, с")
+    parser.add_argument("--readers", type=int, default=2, help="Количество потоков-читателей")
+    parser.add_argument("--seed", type=int, default=42, help="Зерно генератора случайных чисел")
+    parser.add_argument("--work-dir", help="Директория для временных БД (по умолчанию системная)")
+    parser.add_argument("--output", help="Путь к JSON-файлу с результатами")
+    args = parser.parse_args(argv)
+
+    report = run_benchmark(
+        profiles=args.profiles,
+        rows=args.rows,
+        commits=args.commits,
+        duration=args.duration,
+        readers=args.readers,
+        seed=args.seed,
+        work_dir=args.work_dir,
+    )
+
+    _print_table(report)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, ensure_ascii=False, default=str)
+        print(f"Результаты сохранены в {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,197 @@
+"""
+Бенчмарк хранения UUID: String(36) против 16-байтового BLOB (UUIDType).
+
+Создаёт две БД с одинаковыми данными:
+- text: схема версии 1 (ID и внешние ключи String(36), отдельные
+  индексы ix_<таблица>_id поверх первичных ключей)
+- blob: текущая схема (UUIDType, без избыточных индексов)
+
+Измеряет размер файла, таблицы transactions и её индексов (через dbstat),
+время соединения transactions с categories с группировкой и время
+точечных выборок по первичному ключу.
+
+Запуск:
+    python -m finance_tracker.bench.uuid_storage --rows 1000000 --output uuid.json
+"""
+
+import argparse
+import json
+import os
+import random
+import tempfile
+import time
+import uuid
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import Engine, MetaData, String, create_engine
+
+from finance_tracker.models import Base, TransactionType
+from finance_tracker.models.types import UUIDType
+
+_FILL_CHUNK_SIZE = 20000
+
+_JOIN_SQL = (
+    "SELECT c.name, count(*), sum(t.amount) FROM transactions t "
+    "JOIN categories c ON c.id = t.category_id GROUP BY c.name"
+)
+
+
+def _text_metadata() -> MetaData:
+    """Копия метаданных моделей со String(36) вместо UUIDType (схема версии 1)."""
+    legacy = MetaData()
+    for table in Base.metadata.sorted_tables:
+        copy = table.to_metadata(legacy)
+        for column in copy.columns:
+            if isinstance(column.type, UUIDType):
+                column.type = String(36)
+    return legacy
+
+
+def _build_database(engine: Engine, metadata: MetaData, text_ids: bool, rows: int, categories: int, seed: int) -> List[str]:
+    """Создаёт схему и наполняет БД. Возвращает список ID транзакций (выборка для поиска)."""
+    metadata.create_all(engine)
+    if text_ids:
+        with engine.begin() as conn:
+            for table in metadata.sorted_tables:
+                conn.exec_driver_sql(f'CREATE INDEX "ix_{table.name}_id" ON "{table.name}" (id)')
+
+    rnd = random.Random(seed)
+    now = datetime.now()
+    start = date.today() - timedelta(days=3650)
+    category_table = metadata.tables["categories"]
+    transaction_table = metadata.tables["transactions"]
+
+    category_ids = [str(uuid.UUID(int=rnd.getrandbits(128), version=4)) for _ in range(categories)]
+    with engine.begin() as conn:
+        conn.execute(category_table.insert(), [
+            {"id": cid, "name": f"Категория {i}", "type": TransactionType.EXPENSE,
+             "is_system": False, "created_at": now, "updated_at": now}
+            for i, cid in enumerate(category_ids)
+        ])
+
+    sample: List[str] = []
+    inserted = 0
+    while inserted < rows:
+        chunk = min(_FILL_CHUNK_SIZE, rows - inserted)
+        batch = []
+        for _ in range(chunk):
+            tid = str(uuid.UUID(int=rnd.getrandbits(128), version=4))
+            batch.append({
+                "id": tid,
+                "amount": Decimal(rnd.randint(100, 500000)) / 100,
+                "type": TransactionType.EXPENSE,
+                "category_id": rnd.choice(category_ids),
+                "description": None,
+                "transaction_date": start + timedelta(days=rnd.randint(0, 3649)),
+                "created_at": now,
+                "updated_at": now,
+            })
+        sample.extend(row["id"] for row in batch[:: max(1, chunk // 50)])
+        with engine.begin() as conn:
+            conn.execute(transaction_table.insert(), batch)
+        inserted += chunk
+
+    with engine.begin() as conn:
+        conn.exec_driver_sql("ANALYZE")
+    return sample
+
+
+def _object_sizes(engine: Engine) -> Dict[str, int]:
+    """Размеры таблицы transactions и её индексов в байтах (dbstat)."""
+    with engine.connect() as conn:
+        index_names = [
+            row[0] for row in conn.exec_driver_sql(
+                "SELECT name FROM sqlite_master WHERE tbl_name = 'transactions' AND type = 'index'"
+            )
+        ]
+        sizes = {}
+        for name in ["transactions"] + index_names:
+            sizes[name] = conn.exec_driver_sql(
+                "SELECT coalesce(sum(pgsize), 0) FROM dbstat WHERE name = ?", (name,)
+            ).scalar()
+        return sizes
+
+
+def _time_best(func, repeats: int) -> float:
+    best = float("inf")
+    for _ in range(repeats):
+        started = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def _measure(engine: Engine, db_path: str, ids: List[Any], repeats: int) -> Dict[str, Any]:
+    sizes = _object_sizes(engine)
+    raw = engine.raw_connection()
+    try:
+        cursor = raw.cursor()
+        join_seconds = _time_best(lambda: cursor.execute(_JOIN_SQL).fetchall(), repeats)
+        lookup_seconds = _time_best(
+            lambda: [cursor.execute("SELECT amount FROM transactions WHERE id = ?", (i,)).fetchone() for i in ids],
+            repeats
+        )
+    finally:
+        raw.close()
+
+    index_bytes = sum(size for name, size in sizes.items() if name != "transactions")
+    return {
+        "file_mb": round(os.path.getsize(db_path) / (1024 * 1024), 2),
+        "transactions_table_mb": round(sizes["transactions"] / (1024 * 1024), 2),
+        "transactions_indexes_mb": round(index_bytes / (1024 * 1024), 2),
+        "indexes": {name: round(size / (1024 * 1024), 2) for name, size in sizes.items() if name != "transactions"},
+        "join_group_by_ms": round(join_seconds * 1000, 1),
+        "pk_lookups": len(ids),
+        "pk_lookup_total_ms": round(lookup_seconds * 1000, 1),
+    }
+
+
+def run_benchmark(rows: int = 1000000, categories: int = 50, repeats: int = 3, seed: int = 42,
+                  work_dir: Optional[str] = None) -> Dict[str, Any]:
+    """Строит обе БД и возвращает результаты замеров."""
+    results: Dict[str, Any] = {"parameters": {"rows": rows, "categories": categories, "repeats": repeats}}
+
+    with tempfile.TemporaryDirectory(dir=work_dir) as tmp_dir:
+        for variant, text_ids in (("text", True), ("blob", False)):
+            db_path = os.path.join(tmp_dir, f"uuid_{variant}.db")
+            engine = create_engine(f"sqlite:///{db_path}")
+            try:
+                metadata = _text_metadata() if text_ids else Base.metadata
+                sample = _build_database(engine, metadata, text_ids, rows, categories, seed)
+                ids = sample if text_ids else [uuid.UUID(i).bytes for i in sample]
+                results[variant] = _measure(engine, db_path, ids, repeats)
+            finally:
+                engine.dispose()
+
+    text_result, blob_result = results["text"], results["blob"]
+    results["ratio"] = {
+        key: round(blob_result[key] / text_result[key], 3)
+        for key in ("file_mb", "transactions_table_mb", "transactions_indexes_mb",
+                    "join_group_by_ms", "pk_lookup_total_ms")
+        if text_result[key]
+    }
+    return results
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Точка входа командной строки."""
+    parser = argparse.ArgumentParser(description="Бенчмарк хранения UUID: String(36) против BLOB")
+    parser.add_argument("--rows", type=int, default=1000000, help="Количество транзакций")
+    parser.add_argument("--categories", type=int, default=50, help="Количество категорий")
+    parser.add_argument("--repeats", type=int, default=3, help="Повторов замера (берётся лучший)")
+    parser.add_argument("--seed", type=int, default=42, help="Зерно генератора случайных чисел")
+    parser.add_argument("--work-dir", help="Директория для временных БД")
+    parser.add_argument("--output", help="Путь к JSON-файлу с результатами")
+    args = parser.parse_args(argv)
+
+    report = run_benchmark(args.rows, args.categories, args.repeats, args.seed, args.work_dir)
+    print(json.dumps(report, indent=2, ensure_ascii=False))
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,15 +1,16 @@
 import calendar
 import datetime
-from typing import Callable, List, Optional
+from decimal import Decimal
+from typing import Callable, Dict, List, Optional
 
 import flet as ft
 
 from finance_tracker.models.enums import TransactionType, PaymentStatus
 from finance_tracker.models.models import Transaction, PlannedOccurrence, PendingPaymentDB, LoanPaymentDB
 from finance_tracker.utils.logger import get_logger
-from finance_tracker.services.balance_forecast_service import detect_cash_gaps
+from finance_tracker.services.balance_forecast_service import get_cached_cash_gaps, get_cached_forecast_balances
 from finance_tracker.services.pending_payment_service import get_all_pending_payments
-from finance_tracker.database import get_db
+from finance_tracker.database import get_read_session
 
 logger = get_logger(__name__)
 
@@ -58,6 +59,7 @@ class CalendarWidget(ft.Container):
         self.pending_payments: List[PendingPaymentDB] = []
         self.loan_payments: List[LoanPaymentDB] = []
         self.cash_gaps: List[datetime.date] = []
+        self.forecast_balances: Dict[datetime.date, Decimal] = {}
 
         # Сохраняем начальную высоту страницы
         self._page_height = page_height
@@ -178,7 +180,7 @@ class CalendarWidget(ft.Container):
         self._update_calendar()
 
     def _update_cash_gaps(self):
-        """Обновляет список кассовых разрывов для отображаемого месяца."""
+        """Обновляет кассовые разрывы и прогнозируемые балансы будущих дней отображаемого месяца."""
         try:
             # Определяем диапазон дат для текущего месяца
             # Находим первый и последний день месяца
@@ -186,19 +188,27 @@ class CalendarWidget(ft.Container):
             start_date = datetime.date(self.current_date.year, self.current_date.month, 1)
             end_date = datetime.date(self.current_date.year, self.current_date.month, days_in_month)
             
-            # Используем сервис для обнаружения кассовых разрывов
-            with get_db() as session:
-                self.cash_gaps = detect_cash_gaps(session, start_date, end_date)
+            # Прогноз месяца берётся из общего кэша (пересчёт только после изменения данных)
+            with get_read_session() as session:
+                self.cash_gaps = get_cached_cash_gaps(session, start_date, end_date)
+                # Балансы всех будущих дней - из того же прогноза месяца
+                today = datetime.date.today()
+                future_days = [
+                    start_date + datetime.timedelta(days=offset) for offset in range(days_in_month)
+                    if start_date + datetime.timedelta(days=offset) > today
+                ]
+                self.forecast_balances = get_cached_forecast_balances(session, future_days)
                 
         except Exception as e:
             logger.error(f"Ошибка при обновлении кассовых разрывов: {e}")
             self.cash_gaps = []
+            self.forecast_balances = {}
 
     def _update_pending_payments(self):
         """Обновляет список отложенных платежей с плановой датой для отображаемого месяца."""
         try:
             # Загружаем все активные отложенные платежи с плановой датой
-            with get_db() as session:
+            with get_read_session() as session:
                 all_payments = get_all_pending_payments(session, has_planned_date=True)
                 
                 # Фильтруем только платежи текущего месяца
@@ -229,7 +239,7 @@ class CalendarWidget(ft.Container):
             end_date = datetime.date(self.current_date.year, self.current_date.month, days_in_month)
             
             # Загружаем все платежи по кредитам для текущего месяца
-            with get_db() as session:
+            with get_read_session() as session:
                 self.loan_payments = session.query(LoanPaymentDB).filter(
                     LoanPaymentDB.scheduled_date >= start_date,
                     LoanPaymentDB.scheduled_date <= end_date
@@ -502,6 +512,7 @@ class CalendarWidget(ft.Container):
         is_selected = self.selected_date == date_obj
         is_today = date_obj == datetime.date.today()
         is_cash_gap = date_obj in self.cash_gaps
+        forecast_balance = self.forecast_balances.get(date_obj)
         has_overdue_payment = self._has_overdue_payment(date_obj)
 
         # Собираем индикаторы для дня
@@ -541,6 +552,9 @@ class CalendarWidget(ft.Container):
             tooltip_text = "Просроченный платёж по кредиту!"
         elif is_cash_gap:
             tooltip_text = "Кассовый разрыв!"
+        if forecast_balance is not None:
+            forecast_text = f"Прогноз баланса: {forecast_balance:,.2f} ₽"
+            tooltip_text = f"{tooltip_text}\n{forecast_text}" if tooltip_text else forecast_text
 
         # Разбиваем индикаторы на строки, если их больше 3
         indicator_rows = []
@@ -577,7 +591,14 @@ class CalendarWidget(ft.Container):
                         spacing=1,
                         alignment=ft.MainAxisAlignment.CENTER,
                         horizontal_alignment=ft.CrossAxisAlignment.CENTER,
-                    )
+                    ),
+                    *([
+                        ft.Text(
+                            self._format_compact_amount(forecast_balance),
+                            size=max(self._font_size - 4, 8),
+                            color=ft.Colors.RED_700 if forecast_balance < 0 else "secondary",
+                        )
+                    ] if forecast_balance is not None else []),
                 ],
                 alignment=ft.MainAxisAlignment.CENTER,
                 spacing=2,
@@ -593,6 +614,28 @@ class CalendarWidget(ft.Container):
             tooltip=tooltip_text
         )
 
+    @staticmethod
+    def _format_compact_amount(amount: Decimal) -> str:
+        """
+        Краткая запись суммы для ячейки дня: 950, 12,3к, 1,5М.
+
+        Args:
+            amount: Сумма
+
+        Returns:
+            Строка с сокращением тысяч и миллионов
+        """
+        value = abs(amount).quantize(Decimal("1"))
+        sign = "-" if amount < 0 and value else ""
+        # Граница миллионов с учётом округления: 999 950 - это уже 1М, а не 1000к
+        if value >= 999_950:
+            text = f"{value / 1_000_000:.1f}М"
+        elif value >= 1_000:
+            text = f"{value / 1_000:.1f}к"
+        else:
+            text = str(value)
+        return sign + text.replace(".0", "").replace(".", ",")
+
     def _has_overdue_payment(self, date_obj: datetime.date) -> bool:
         """
         Проверяет наличие просроченных платежей по кредитам для конкретной даты.
@@ -5,10 +5,10 @@ import flet as ft
 
 from finance_tracker.models.models import TransactionDB, PlannedOccurrence, PendingPaymentDB, LoanPaymentDB
 from finance_tracker.models.enums import TransactionType, OccurrenceStatus, PendingPaymentPriority, PaymentStatus
-from finance_tracker.services.balance_forecast_service import calculate_forecast_balance
+from finance_tracker.services.balance_forecast_service import get_cached_forecast_balance
 from finance_tracker.services.pending_payment_service import get_pending_payments_by_date
 from finance_tracker.services.loan_payment_service import get_payments_by_date
-from finance_tracker.database import get_db
+from finance_tracker.database import get_read_session
 from finance_tracker.utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -137,7 +137,7 @@ class TransactionsPanel(ft.Container):
     def _load_pending_payments(self):
         """Загружает отложенные платежи для выбранной даты."""
         try:
-            with get_db() as session:
+            with get_read_session() as session:
                 self.pending_payments = get_pending_payments_by_date(session, self.date)
         except Exception as e:
             logger.error(f"Ошибка при загрузке отложенных платежей: {e}")
@@ -146,7 +146,7 @@ class TransactionsPanel(ft.Container):
     def _load_loan_payments(self):
         """Загружает платежи по кредитам для выбранной даты."""
         try:
-            with get_db() as session:
+            with get_read_session() as session:
                 self.loan_payments = get_payments_by_date(session, self.date)
         except Exception as e:
             logger.error(f"Ошибка при загрузке платежей по кредитам: {e}")
@@ -155,9 +155,9 @@ class TransactionsPanel(ft.Container):
     def _update_forecast(self):
         """Обновляет прогнозируемый баланс на выбранную дату."""
         try:
-            with get_db() as session:
-                # Рассчитываем прогноз на выбранную дату
-                self.forecast_balance = calculate_forecast_balance(session, self.date)
+            with get_read_session() as session:
+                # Прогноз на выбранную дату из общего кэша (повторные клики не пересчитывают прогноз)
+                self.forecast_balance = get_cached_forecast_balance(session, self.date)
         except Exception as e:
             logger.error(f"Ошибка при расчёте прогноза: {e}")
             self.forecast_balance = None
@@ -3,9 +3,9 @@
 
 Содержит настройки:
 - Основные параметры приложения (название, версия)
-- Настройки базы данных (путь)
+- Настройки базы данных (путь, профиль хранения SQLite)
 - Настройки интерфейса (тема, размеры окна)
-- Настройки логирования
+- Настройки логирования и профилировщика SQL
 - Персистентность настроек (загрузка/сохранение)
 - Управление пользовательской директорией данных
 """
@@ -33,6 +33,45 @@ class Config:
     # Константы приложения
     APP_NAME = "Finance Tracker"
     VERSION = "2.0.0"
+
+    # Профили хранения SQLite (PRAGMA, применяемые к каждому соединению).
+    # - safe: WAL + synchronous=FULL, каждый коммит гарантированно на диске
+    # - balanced: WAL + synchronous=NORMAL, коммит может потеряться только
+    #   при отключении питания, целостность БД сохраняется
+    # - fast: WAL + synchronous=OFF, максимальная скорость записи ценой
+    #   риска потери последних коммитов при сбое ОС
+    STORAGE_PROFILES = {
+        "safe": {
+            "journal_mode": "WAL",
+            "synchronous": "FULL",
+            "cache_size": -8000,  # ~8 МБ (отрицательное значение - в КиБ)
+            "mmap_size": 0,
+            "temp_store": "DEFAULT",
+            "busy_timeout": 10000,  # мс
+        },
+        "balanced": {
+            "journal_mode": "WAL",
+            "synchronous": "NORMAL",
+            "cache_size": -32000,  # ~32 МБ
+            "mmap_size": 64 * 1024 * 1024,
+            "temp_store": "MEMORY",
+            "busy_timeout": 5000,
+        },
+        "fast": {
+            "journal_mode": "WAL",
+            "synchronous": "OFF",
+            "cache_size": -128000,  # ~128 МБ
+            "mmap_size": 256 * 1024 * 1024,
+            "temp_store": "MEMORY",
+            "busy_timeout": 5000,
+        },
+    }
+    DEFAULT_STORAGE_PROFILE = "balanced"
+
+    # Допустимое число повторов одного SQL-запроса в единице работы
+    # (сессия или действие пользователя), выше которого профилировщик
+    # предупреждает о возможном N+1
+    DEFAULT_SQL_REPEAT_THRESHOLD = 10
     
     @staticmethod
     def get_user_data_dir() -> Path:
@@ -97,6 +136,9 @@ class Config:
         self.db_path: str = str(self.user_data_dir / "finance.db")
         self.config_file: str = str(self.user_data_dir / "config.json")
         self.log_file: str = str(self.user_data_dir / "logs" / "finance_tracker.log")
+
+        # Профиль хранения SQLite (ключ из STORAGE_PROFILES)
+        self.storage_profile: str = self.DEFAULT_STORAGE_PROFILE
         
         # Значения по умолчанию для UI
         self.theme_mode: str = "light"  # light, dark, system
@@ -107,6 +149,10 @@ class Config:
         
         # Настройки логирования
         self.log_level: str = "INFO"
+
+        # Профилировщик SQL (utils/sql_profiler.py), по умолчанию выключен
+        self.sql_profiler_enabled: bool = False
+        self.sql_profiler_repeat_threshold: int = self.DEFAULT_SQL_REPEAT_THRESHOLD
         
         # Настройки форматов
         self.date_format: str = "%d.%m.%Y"
@@ -143,6 +189,13 @@ class Config:
             
             # Настройки логирования
             self.log_level = data.get("log_level", "INFO")
+            self.sql_profiler_enabled = data.get("sql_profiler_enabled", False)
+            self.sql_profiler_repeat_threshold = data.get(
+                "sql_profiler_repeat_threshold", self.DEFAULT_SQL_REPEAT_THRESHOLD
+            )
+
+            # Настройки базы данных
+            self.storage_profile = data.get("storage_profile", self.DEFAULT_STORAGE_PROFILE)
             
             # Настройки форматов
             self.date_format = data.get("date_format", "%d.%m.%Y")
@@ -155,6 +208,26 @@ class Config:
         except Exception as e:
             logger.error(f"Ошибка при загрузке конфигурации: {e}")
 
+    def get_storage_profile(self) -> dict:
+        """
+        Возвращает PRAGMA-параметры текущего профиля хранения SQLite.
+
+        Если в конфигурации указан неизвестный профиль, используется
+        профиль по умолчанию (DEFAULT_STORAGE_PROFILE).
+
+        Returns:
+            dict: Копия параметров профиля (journal_mode, synchronous,
+            cache_size, mmap_size, temp_store, busy_timeout)
+        """
+        profile = self.STORAGE_PROFILES.get(self.storage_profile)
+        if profile is None:
+            logger.warning(
+                f"Неизвестный профиль хранения '{self.storage_profile}', "
+                f"используется '{self.DEFAULT_STORAGE_PROFILE}'"
+            )
+            profile = self.STORAGE_PROFILES[self.DEFAULT_STORAGE_PROFILE]
+        return dict(profile)
+
     def save(self) -> None:
         """
         Сохраняет текущие настройки в файл конфигурации.
@@ -169,6 +242,9 @@ class Config:
             "window_top": self.window_top,
             "window_left": self.window_left,
             "log_level": self.log_level,
+            "sql_profiler_enabled": self.sql_profiler_enabled,
+            "sql_profiler_repeat_threshold": self.sql_profiler_repeat_threshold,
+            "storage_profile": self.storage_profile,
             "date_format": self.date_format,
             "last_selected_index": self.last_selected_index
         }
@@ -2,113 +2,263 @@
 Модуль управления базой данных для Finance Tracker Flet.
 
 Содержит функции для:
-- Инициализации базы данных и создания таблиц
+- Создания engine с профилем хранения SQLite (PRAGMA на каждое соединение)
+- Инициализации базы данных, версионной миграции схемы и начальных данных
 - Управления сессиями БД через контекстный менеджер
+- Раздельных сессий чтения (пул WAL-читателей, scoped_session на поток)
+  и записи (сериализованы блокировкой)
 - Обработки ошибок с автоматическим откатом транзакций
 
 Путь к базе данных определяется в config.py через settings.db_path
 """
 
 from contextlib import contextmanager
-from typing import Generator
+from typing import Any, Dict, Generator, List, Optional, Tuple
 import logging
 import atexit
+import threading
 
-from sqlalchemy import create_engine, Engine, inspect
-from sqlalchemy.orm import sessionmaker, Session
+from sqlalchemy import create_engine, Connection, Engine, event, select
+from sqlalchemy.orm import scoped_session, sessionmaker, Session
 from sqlalchemy.exc import SQLAlchemyError
-import os
 
 from finance_tracker.config import settings
+from finance_tracker.migrations import Seed, run_migrations
 
 # Imports will be available after Task 2.1 and 3.2
 # from models import Base, CategoryDB, TransactionType
-from finance_tracker.services.category_service import init_loan_categories
+from finance_tracker.services.category_service import LOAN_CATEGORIES, insert_categories
+from finance_tracker.utils import sql_profiler
+from finance_tracker.utils.cache import register_data_revision_listeners
 
 # Настройка логирования
 logger = logging.getLogger(__name__)
 
 
+# Версия начальных данных (предопределённые и системные категории).
+# Увеличивается при изменении состава категорий
+SEED_VERSION = 1
+
+class _WriteLock:
+    """
+    Блокировка записи, повторно входимая в потоке-владельце.
+
+    В отличие от threading.RLock её может освободить любой поток: сессия
+    get_db_session может начать запись в одном потоке обработчиков Flet,
+    а зафиксировать или откатить её - в другом.
+    """
+
+    def __init__(self):
+        self._condition = threading.Condition(threading.Lock())
+        self._owner: Optional[int] = None
+        self._depth = 0
+
+    def acquire(self) -> None:
+        thread_id = threading.get_ident()
+        with self._condition:
+            while self._depth and self._owner != thread_id:
+                self._condition.wait()
+            self._owner = thread_id
+            self._depth += 1
+
+    def release(self) -> None:
+        with self._condition:
+            if not self._depth:
+                raise RuntimeError("Блокировка записи не захвачена")
+            self._depth -= 1
+            if not self._depth:
+                self._owner = None
+                self._condition.notify_all()
+
+    def __enter__(self) -> "_WriteLock":
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.release()
+
+
 # Глобальные переменные для engine и session factory
 _engine: Engine = None
 _SessionLocal: sessionmaker = None
 
+# Engine и сессии только для чтения (отдельный пул соединений-читателей WAL)
+_read_engine: Engine = None
+_ReadSession: scoped_session = None
+
+# Сериализация записи: в SQLite одновременно возможна только одна пишущая транзакция
+_write_lock = _WriteLock()
+
+# Глубина вложенности сессий чтения/записи в текущем потоке
+_local = threading.local()
+
+
+def apply_storage_profile(dbapi_connection: Any, profile: Dict[str, Any]) -> None:
+    """
+    Применяет PRAGMA-параметры профиля хранения к DBAPI-соединению SQLite.
+
+    Args:
+        dbapi_connection: Низкоуровневое соединение sqlite3
+        profile: Параметры профиля (см. Config.STORAGE_PROFILES)
+    """
+    cursor = dbapi_connection.cursor()
+    try:
+        # journal_mode первым: остальные параметры от него не зависят,
+        # а WAL сохраняется в файле БД и переживает переподключение
+        cursor.execute(f"PRAGMA journal_mode={profile['journal_mode']}")
+        cursor.execute(f"PRAGMA synchronous={profile['synchronous']}")
+        cursor.execute(f"PRAGMA cache_size={int(profile['cache_size'])}")
+        cursor.execute(f"PRAGMA mmap_size={int(profile['mmap_size'])}")
+        cursor.execute(f"PRAGMA temp_store={profile['temp_store']}")
+        cursor.execute(f"PRAGMA busy_timeout={int(profile['busy_timeout'])}")
+    finally:
+        cursor.close()
+
+
+def create_db_engine(
+    database_url: str,
+    profile: Optional[Dict[str, Any]] = None,
+    read_only: bool = False
+) -> Engine:
+    """
+    Создаёт engine SQLite с профилем хранения, применяемым к каждому соединению.
+
+    Args:
+        database_url: URL базы данных (sqlite:///...)
+        profile: Параметры профиля хранения. По умолчанию берётся
+            профиль из настроек (settings.storage_profile)
+        read_only: Запретить запись через соединения engine (PRAGMA query_only)
+
+    Returns:
+        Engine: Настроенный engine SQLAlchemy
+    """
+    if profile is None:
+        profile = settings.get_storage_profile()
+
+    engine = create_engine(
+        database_url,
+        connect_args={"check_same_thread": False},  # Для SQLite
+        echo=False
+    )
+
+    @event.listens_for(engine, "connect")
+    def _on_connect(dbapi_connection, connection_record):
+        apply_storage_profile(dbapi_connection, profile)
+        if read_only:
+            cursor = dbapi_connection.cursor()
+            cursor.execute("PRAGMA query_only=ON")
+            cursor.close()
+
+    logger.debug(f"Профиль хранения SQLite: {profile}")
+    return engine
+
+
+def _acquire_write_lock(session: Session) -> None:
+    """
+    Захватывает блокировку записи до конца транзакции сессии.
+
+    Вызывается при первом изменении данных (flush или DML-запрос), поэтому
+    сессии get_db_session, которые только читают, блокировку не берут.
+    """
+    if not session.info.get("write_lock_held"):
+        _write_lock.acquire()
+        session.info["write_lock_held"] = True
+
+
+def _on_before_flush(session: Session, flush_context: Any, instances: Any) -> None:
+    _acquire_write_lock(session)
+
+
+def _on_orm_execute(orm_execute_state: Any) -> None:
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        _acquire_write_lock(orm_execute_state.session)
+
+
+def _on_transaction_end(session: Session, transaction: Any) -> None:
+    """Освобождает блокировку записи при фиксации или откате внешней транзакции."""
+    if transaction.parent is None and session.info.pop("write_lock_held", False):
+        _write_lock.release()
+
+
+def _default_categories() -> List[Tuple[str, Any]]:
+    """Предопределённые категории первого запуска: (название, тип)."""
+    from finance_tracker.models import TransactionType
+
+    income_categories = [
+        "Зарплата",
+        "Фриланс",
+        "Инвестиции",
+        "Прочие доходы"
+    ]
+    expense_categories = [
+        "Продукты",
+        "Транспорт",
+        "Жильё",
+        "Связь",
+        "Развлечения",
+        "Здоровье",
+        "Прочие расходы"
+    ]
+    return (
+        [(name, TransactionType.INCOME) for name in income_categories]
+        + [(name, TransactionType.EXPENSE) for name in expense_categories]
+    )
+
 
 def init_default_categories(session: Session) -> None:
     """
     Создаёт предопределённые категории при первом запуске.
+
+    Если в справочнике уже есть категории, ничего не делает (удалённые
+    пользователем предопределённые категории не восстанавливаются).
     """
     # Import inside function to avoid circular imports or early import errors
-    from finance_tracker.models import CategoryDB, TransactionType
+    from finance_tracker.models import CategoryDB
 
     try:
         # Проверяем, есть ли уже категории в БД
-        existing_count = session.query(CategoryDB).count()
-        
-        if existing_count > 0:
-            logger.info(f"Категории уже существуют ({existing_count} шт.), пропускаем инициализацию")
+        if session.query(CategoryDB.id).limit(1).first() is not None:
+            logger.info("Категории уже существуют, пропускаем инициализацию")
             return
-        
+
         logger.info("Инициализация предопределённых категорий...")
-        
-        # Категории доходов
-        income_categories = [
-            "Зарплата",
-            "Фриланс",
-            "Инвестиции",
-            "Прочие доходы"
-        ]
-        
-        # Категории расходов
-        expense_categories = [
-            "Продукты",
-            "Транспорт",
-            "Жильё",
-            "Связь",
-            "Развлечения",
-            "Здоровье",
-            "Прочие расходы"
-        ]
-        
-        # Создаём категории доходов
-        for name in income_categories:
-            category = CategoryDB(
-                name=name,
-                type=TransactionType.INCOME,
-                is_system=True
-            )
-            session.add(category)
-            logger.debug(f"Добавлена категория дохода: {name}")
-        
-        # Создаём категории расходов
-        for name in expense_categories:
-            category = CategoryDB(
-                name=name,
-                type=TransactionType.EXPENSE,
-                is_system=True
-            )
-            session.add(category)
-            logger.debug(f"Добавлена категория расхода: {name}")
-        
-        # Сохраняем все категории
+        total_created = insert_categories(session, _default_categories())
         session.commit()
-        
-        total_created = len(income_categories) + len(expense_categories)
+
         logger.info(f"Успешно создано {total_created} предопределённых категорий")
-        
+
     except SQLAlchemyError as e:
         logger.error(f"Ошибка при инициализации категорий: {e}")
         session.rollback()
         raise
 
 
+def seed_initial_data(connection: Connection) -> None:
+    """
+    Добавляет начальные данные одним запросом INSERT ... ON CONFLICT DO NOTHING.
+
+    Системные категории кредитов добавляются всегда, предопределённые
+    категории - только в пустой справочник (как init_default_categories).
+    Выполняется run_migrations, только если версия начальных данных в БД
+    меньше SEED_VERSION.
+    """
+    from finance_tracker.models import CategoryDB
+
+    categories = list(LOAN_CATEGORIES)
+    if connection.execute(select(CategoryDB.id).limit(1)).first() is None:
+        categories = _default_categories() + categories
+
+    created_count = insert_categories(connection, categories)
+    logger.info(f"Добавлено начальных категорий: {created_count}")
+
+
 def init_db() -> Engine:
     """
-    Инициализирует подключение к базе данных и создаёт таблицы.
+    Инициализирует подключение к базе данных и приводит схему к текущей версии.
     
     Путь к базе данных берётся из settings.db_path (определён в config.py).
     """
-    global _engine, _SessionLocal
+    global _engine, _SessionLocal, _read_engine, _ReadSession
     
     # Import inside function
     from finance_tracker.models import Base
@@ -118,45 +268,18 @@ def init_db() -> Engine:
         db_path = settings.db_path
         database_url = f"sqlite:///{db_path}"
         
-        logger.info(f"Инициализация базы данных: {database_url}")
-        
-        # Создаём engine с настройками для SQLite
-        _engine = create_engine(
-            database_url,
-            connect_args={"check_same_thread": False},  # Для SQLite
-            echo=False
+        logger.info(
+            f"Инициализация базы данных: {database_url} "
+            f"(профиль хранения: {settings.storage_profile})"
         )
-
-        # Проверка схемы на устаревший Integer ID
-        try:
-            inspector = inspect(_engine)
-            if inspector.has_table("categories"):
-                columns = inspector.get_columns("categories")
-                id_column = next((c for c in columns if c["name"] == "id"), None)
-                if id_column:
-                    type_name = str(id_column["type"]).upper()
-                    if "INT" in type_name:
-                        logger.warning("Обнаружена устаревшая схема (Integer ID). Пересоздание базы данных...")
-                        _engine.dispose()
-                        if os.path.exists(db_path):
-                            try:
-                                os.remove(db_path)
-                                logger.info("Старая база данных удалена.")
-                            except PermissionError:
-                                logger.error("Не удалось удалить файл БД (занят другим процессом).")
-                        
-                        # Пересоздаем engine
-                        _engine = create_engine(
-                            database_url,
-                            connect_args={"check_same_thread": False},
-                            echo=False
-                        )
-        except Exception as e:
-            logger.warning(f"Ошибка при проверке схемы БД: {e}")
         
-        # Создаём все таблицы на основе моделей
-        Base.metadata.create_all(bind=_engine)
-        logger.info("Таблицы базы данных успешно созданы/проверены")
+        # Создаём engine с профилем хранения SQLite
+        _engine = create_db_engine(database_url)
+
+        # Приводим схему к текущей версии и добавляем начальные данные
+        # (на тёплом старте - один SELECT)
+        schema_version = run_migrations(_engine, seed=Seed(SEED_VERSION, seed_initial_data))
+        logger.info(f"Схема базы данных готова (версия {schema_version})")
         
         # Создаём фабрику сессий
         _SessionLocal = sessionmaker(
@@ -164,11 +287,28 @@ def init_db() -> Engine:
             autoflush=False,
             bind=_engine
         )
-        
-        # Инициализируем предопределённые категории
-        with get_db_session() as session:
-            init_default_categories(session)
-            init_loan_categories(session)
+        # Пишущая транзакция любой сессии сериализована той же блокировкой,
+        # что и get_write_session: от первого изменения до commit/rollback
+        event.listen(_SessionLocal, "before_flush", _on_before_flush)
+        event.listen(_SessionLocal, "do_orm_execute", _on_orm_execute)
+        event.listen(_SessionLocal, "after_transaction_end", _on_transaction_end)
+        # Фиксация изменений данных прогноза увеличивает номер изменения кэша
+        register_data_revision_listeners(_SessionLocal)
+
+        # Отдельный engine для чтения: в режиме WAL читатели не ждут
+        # завершения пишущей транзакции и видят последний зафиксированный снимок
+        _read_engine = create_db_engine(database_url, read_only=True)
+        _ReadSession = scoped_session(sessionmaker(
+            autocommit=False,
+            autoflush=False,
+            expire_on_commit=False,
+            bind=_read_engine
+        ))
+
+        # Профилировщик SQL (счётчик запросов и детектор N+1) по настройкам
+        sql_profiler.configure(settings.sql_profiler_enabled, settings.sql_profiler_repeat_threshold)
+        sql_profiler.instrument_engine(_engine)
+        sql_profiler.instrument_engine(_read_engine)
 
         # Регистрируем автоматическое закрытие при завершении процесса
         atexit.register(close_db)
@@ -188,51 +328,137 @@ def init_db() -> Engine:
 def get_db_session() -> Generator[Session, None, None]:
     """
     Контекстный менеджер для работы с сессией базы данных.
+
+    Запись через эту сессию сериализована с get_write_session: блокировка
+    записи захватывается при первом изменении данных и освобождается
+    при commit или rollback.
     """
     if _SessionLocal is None:
         error_msg = "База данных не инициализирована. Вызовите init_db() перед использованием."
         logger.error(error_msg)
         raise RuntimeError(error_msg)
     
-    # Создаём новую сессию
-    session: Session = _SessionLocal()
+    with sql_profiler.track("Сессия БД"):
+        # Создаём новую сессию
+        session: Session = _SessionLocal()
     
-    try:
-        logger.debug("Создана новая сессия БД")
-        yield session
+        try:
+            logger.debug("Создана новая сессия БД")
+            yield session
         
-    except SQLAlchemyError as e:
-        # Откатываем транзакцию при ошибке БД
-        logger.error(f"Ошибка SQLAlchemy, откат транзакции: {e}")
-        session.rollback()
-        raise
+        except SQLAlchemyError as e:
+            # Откатываем транзакцию при ошибке БД
+            logger.error(f"Ошибка SQLAlchemy, откат транзакции: {e}")
+            session.rollback()
+            raise
         
-    except Exception as e:
-        # Откатываем транзакцию при любой другой ошибке
-        logger.error(f"Неожиданная ошибка, откат транзакции: {e}")
-        session.rollback()
-        raise
+        except Exception as e:
+            # Откатываем транзакцию при любой другой ошибке
+            logger.error(f"Неожиданная ошибка, откат транзакции: {e}")
+            session.rollback()
+            raise
         
-    finally:
-        # Всегда закрываем сессию
-        session.close()
-        logger.debug("Сессия БД закрыта")
+        finally:
+            # Всегда закрываем сессию
+            session.close()
+            logger.debug("Сессия БД закрыта")
 
 
 # Алиас для обратной совместимости
 get_db = get_db_session
 
 
+@contextmanager
+def get_read_session() -> Generator[Session, None, None]:
+    """
+    Контекстный менеджер сессии только для чтения.
+
+    Сессия берётся из scoped_session (одна на поток): вложенные вызовы
+    в одном потоке получают ту же сессию, при выходе из внешнего блока
+    сессия закрывается и соединение возвращается в пул. Объекты не
+    истекают после закрытия (expire_on_commit=False) и доступны для
+    отображения. Попытка записи завершится ошибкой (PRAGMA query_only).
+    """
+    if _ReadSession is None:
+        error_msg = "База данных не инициализирована. Вызовите init_db() перед использованием."
+        logger.error(error_msg)
+        raise RuntimeError(error_msg)
+
+    depth = getattr(_local, "read_depth", 0)
+    if depth > 0:
+        # Вложенный вызов: сессию закроет внешний блок
+        yield _ReadSession()
+        return
+
+    _local.read_depth = 1
+    with sql_profiler.track("Сессия чтения"):
+        try:
+            yield _ReadSession()
+        except SQLAlchemyError as e:
+            logger.error(f"Ошибка SQLAlchemy в сессии чтения: {e}")
+            raise
+        finally:
+            _local.read_depth = 0
+            # Закрываем сессию и завершаем read-транзакцию, чтобы
+            # следующее чтение увидело свежий снимок данных
+            _ReadSession.remove()
+
+
+@contextmanager
+def get_write_session() -> Generator[Session, None, None]:
+    """
+    Контекстный менеджер сессии для записи.
+
+    Пишущие сессии сериализованы блокировкой: одновременно выполняется
+    только одна пишущая транзакция. Вложенные вызовы в одном потоке
+    получают ту же сессию. При выходе из внешнего блока изменения
+    фиксируются, при ошибке - откатываются.
+    """
+    if _SessionLocal is None:
+        error_msg = "База данных не инициализирована. Вызовите init_db() перед использованием."
+        logger.error(error_msg)
+        raise RuntimeError(error_msg)
+
+    with _write_lock:
+        session: Optional[Session] = getattr(_local, "write_session", None)
+        if session is not None:
+            # Вложенный вызов: коммит выполнит внешний блок
+            yield session
+            return
+
+        session = _SessionLocal()
+        _local.write_session = session
+        with sql_profiler.track("Сессия записи"):
+            try:
+                yield session
+                session.commit()
+            except Exception as e:
+                logger.error(f"Ошибка в сессии записи, откат транзакции: {e}")
+                session.rollback()
+                raise
+            finally:
+                _local.write_session = None
+                session.close()
+
+
 def close_db() -> None:
     """
     Закрывает соединение с базой данных и освобождает ресурсы.
     
     Должна вызываться при завершении работы приложения.
     """
-    global _engine, _SessionLocal
+    global _engine, _SessionLocal, _read_engine, _ReadSession
     
     if _engine is not None:
         logger.info("Закрытие соединения с базой данных...")
+        if _ReadSession is not None:
+            _ReadSession.remove()
+            _ReadSession = None
+        if _read_engine is not None:
+            sql_profiler.uninstrument_engine(_read_engine)
+            _read_engine.dispose()
+            _read_engine = None
+        sql_profiler.uninstrument_engine(_engine)
         _engine.dispose()
         _engine = None
         _SessionLocal = None
@@ -0,0 +1,520 @@
+"""
+Версионные миграции схемы базы данных Finance Tracker.
+
+Версия схемы хранится в служебной таблице schema_version
+(component TEXT PRIMARY KEY, version INTEGER). Компонент "schema" описывает
+версию структуры таблиц, компонент "seed" - версию начальных данных
+(предопределённых категорий).
+
+Поведение при запуске (run_migrations):
+- Тёплый старт: версии схемы и начальных данных совпадают с текущими -
+  выполняется один SELECT, без DDL, инспекции схемы и запросов к данным
+- Новая БД: таблицы создаются по моделям, версия фиксируется как текущая
+- БД без версии (UUID-схема до появления миграций): считается базовой
+  версией 1, недостающие таблицы создаются, затем применяются шаги миграции
+- Устаревшая схема с Integer ID: таблицы перестраиваются на месте с
+  заменой целочисленных ID на UUID (данные сохраняются)
+
+Все шаги миграции выполняются в одной транзакции: при ошибке любого шага
+БД остаётся в исходном состоянии.
+
+Начальные данные (Seed) добавляются в той же транзакции после миграции схемы,
+если их версия в БД меньше версии приложения.
+
+Добавление миграции: новый элемент списка MIGRATIONS с версией, на единицу
+большей предыдущей, и функцией upgrade(connection).
+"""
+
+import logging
+import uuid
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional
+
+from sqlalchemy import (
+    Column,
+    Connection,
+    Engine,
+    Integer,
+    MetaData,
+    String,
+    Table,
+    text,
+)
+from sqlalchemy.exc import OperationalError, SQLAlchemyError
+
+from finance_tracker.models.types import MINOR_UNITS, MoneyType, UUIDType, uuid_to_bytes
+
+# Настройка логирования
+logger = logging.getLogger(__name__)
+
+# Версия схемы, которой соответствует БД, созданная до появления миграций
+BASELINE_SCHEMA_VERSION = 1
+
+# Компонент версии структуры таблиц в schema_version
+SCHEMA_COMPONENT = "schema"
+
+# Компонент версии начальных данных в schema_version
+SEED_COMPONENT = "seed"
+
+# Префикс временных таблиц при перестройке таблиц
+_LEGACY_PREFIX = "_legacy_"
+
+# Служебная таблица версий (не входит в Base.metadata моделей)
+_meta = MetaData()
+schema_version_table = Table(
+    "schema_version",
+    _meta,
+    Column("component", String, primary_key=True),
+    Column("version", Integer, nullable=False),
+)
+
+
+@dataclass(frozen=True)
+class Migration:
+    """
+    Шаг миграции схемы.
+
+    Attributes:
+        version: Версия схемы после применения шага
+        description: Краткое описание изменений
+        upgrade: Функция, выполняющая изменения через переданное соединение
+    """
+    version: int
+    description: str
+    upgrade: Callable[[Connection], None]
+
+
+@dataclass(frozen=True)
+class Seed:
+    """
+    Начальные данные БД.
+
+    Attributes:
+        version: Версия набора данных (увеличивается при его изменении)
+        apply: Функция, добавляющая данные через переданное соединение
+    """
+    version: int
+    apply: Callable[[Connection], None]
+
+
+def get_target_version(migrations: Optional[List[Migration]] = None) -> int:
+    """Возвращает версию схемы, соответствующую текущим моделям."""
+    steps = MIGRATIONS if migrations is None else migrations
+    return max([BASELINE_SCHEMA_VERSION] + [step.version for step in steps])
+
+
+def get_component_version(connection: Connection, component: str) -> Optional[int]:
+    """
+    Возвращает версию компонента из schema_version.
+
+    Returns:
+        Версия или None, если таблицы schema_version нет или компонент не записан
+    """
+    try:
+        return connection.execute(
+            text("SELECT version FROM schema_version WHERE component = :component"),
+            {"component": component}
+        ).scalar()
+    except OperationalError:
+        # Таблицы schema_version ещё нет (новая или старая БД)
+        return None
+
+
+def get_component_versions(connection: Connection) -> Dict[str, int]:
+    """
+    Возвращает версии всех компонентов из schema_version одним запросом.
+
+    Returns:
+        Словарь {компонент: версия}; пустой, если таблицы schema_version нет
+    """
+    try:
+        return dict(connection.execute(text("SELECT component, version FROM schema_version")).all())
+    except OperationalError:
+        # Таблицы schema_version ещё нет (новая или старая БД)
+        return {}
+
+
+def set_component_version(connection: Connection, component: str, version: int) -> None:
+    """Записывает версию компонента в schema_version (создаёт таблицу при необходимости)."""
+    schema_version_table.create(connection, checkfirst=True)
+    connection.execute(
+        text(
+            "INSERT INTO schema_version (component, version) VALUES (:component, :version) "
+            "ON CONFLICT(component) DO UPDATE SET version = excluded.version"
+        ),
+        {"component": component, "version": version}
+    )
+
+
+def _user_tables(connection: Connection) -> List[str]:
+    """Возвращает имена пользовательских таблиц БД."""
+    return list(connection.execute(text(
+        "SELECT name FROM sqlite_master WHERE type = 'table' AND name NOT LIKE 'sqlite_%'"
+    )).scalars())
+
+
+def _has_integer_ids(connection: Connection) -> bool:
+    """Проверяет, использует ли таблица categories устаревшие Integer ID."""
+    for row in connection.execute(text("PRAGMA table_info(categories)")).mappings():
+        if row["name"] == "id":
+            return "INT" in (row["type"] or "").upper()
+    return False
+
+
+def _sql_uuid_to_blob(value: Any) -> Optional[bytes]:
+    """SQL-функция uuid_to_blob: строковый UUID -> 16 байт (BLOB не изменяется)."""
+    if value is None or isinstance(value, bytes):
+        return value
+    return uuid_to_bytes(str(value))
+
+
+def _register_sql_functions(connection: Connection) -> None:
+    """Регистрирует в SQLite функции преобразования значений, используемые миграциями."""
+    dbapi_connection = connection.connection.dbapi_connection
+    dbapi_connection.create_function("uuid_to_blob", 1, _sql_uuid_to_blob, deterministic=True)
+
+
+def _convert_expression(column: Column, expression: str, source_type: str) -> str:
+    """
+    Возвращает SQL-выражение, приводящее значение старой колонки к типу новой.
+
+    Args:
+        column: Колонка текущей модели
+        expression: SQL-выражение исходного значения
+        source_type: Объявленный тип колонки в старой таблице
+    """
+    source_type = (source_type or "").upper()
+    if isinstance(column.type, UUIDType) and "BLOB" not in source_type:
+        return f"uuid_to_blob({expression})"
+    if isinstance(column.type, MoneyType) and "INT" not in source_type:
+        return f"CAST(ROUND({expression} * {MINOR_UNITS}) AS INTEGER)"
+    return expression
+
+
+def tables_needing_conversion(connection: Connection) -> List[str]:
+    """Возвращает существующие таблицы моделей, колонки которых требуют приведения типа."""
+    from finance_tracker.models import Base
+
+    existing = set(_user_tables(connection))
+    result = []
+    for table in Base.metadata.sorted_tables:
+        if table.name not in existing:
+            continue
+        source_types = {
+            row["name"]: row["type"]
+            for row in connection.exec_driver_sql(f'PRAGMA table_info("{table.name}")').mappings()
+        }
+        if any(
+            column.name in source_types
+            and _convert_expression(column, column.name, source_types[column.name]) != column.name
+            for column in table.columns
+        ):
+            result.append(table.name)
+    return result
+
+
+def _column_default(column: Column, dialect: Any) -> Any:
+    """Вычисляет значение по умолчанию для колонки, отсутствующей в старой таблице."""
+    default = column.default
+    if default is None or not (getattr(default, "is_scalar", False) or getattr(default, "is_callable", False)):
+        return None
+    value = default.arg(None) if default.is_callable else default.arg
+    processor = column.type.bind_processor(dialect)
+    return processor(value) if processor else value
+
+
+def rebuild_tables(
+    connection: Connection,
+    table_names: Optional[List[str]] = None,
+    remap_integer_ids: bool = False
+) -> None:
+    """
+    Перестраивает существующие таблицы моделей по текущему описанию, сохраняя данные.
+
+    Таблицы переименовываются во временные, создаются заново по моделям
+    (с актуальными типами колонок и индексами), затем строки копируются
+    одним INSERT ... SELECT на таблицу с приведением типов колонок
+    (_convert_expression). Колонки, отсутствующие в старой таблице,
+    заполняются значениями по умолчанию моделей, лишние - отбрасываются.
+
+    Args:
+        connection: Соединение внутри транзакции миграции
+        table_names: Перестраиваемые таблицы (по умолчанию все существующие таблицы моделей)
+        remap_integer_ids: Заменить целочисленные ID (и ссылающиеся на них
+            внешние ключи) новыми UUID - для устаревшей схемы с Integer ID
+    """
+    from finance_tracker.models import Base
+
+    _register_sql_functions(connection)
+
+    existing = set(_user_tables(connection))
+    if table_names is not None:
+        existing &= set(table_names)
+    tables = [table for table in Base.metadata.sorted_tables if table.name in existing]
+    if not tables:
+        return
+
+    # Ссылки внешних ключей других таблиц не должны переключаться
+    # на переименованные временные таблицы
+    connection.exec_driver_sql("PRAGMA legacy_alter_table=ON")
+    try:
+        _rebuild(connection, tables, remap_integer_ids)
+    finally:
+        connection.exec_driver_sql("PRAGMA legacy_alter_table=OFF")
+
+
+def _rebuild(connection: Connection, tables: List[Table], remap_integer_ids: bool) -> None:
+    """Выполняет перестройку таблиц (см. rebuild_tables)."""
+    from finance_tracker.models import Base
+    from finance_tracker.models.models import (
+        create_balance_ledger_triggers,
+        create_search_index,
+        drop_balance_ledger_triggers,
+        drop_search_source_triggers,
+    )
+    from finance_tracker.services.balance_ledger_service import rebuild_balance_ledger
+    from finance_tracker.services.search_service import rebuild_search_index
+
+    # 1. Переименовываем старые таблицы и удаляем их индексы (имена индексов совпадут с новыми)
+    for table in tables:
+        index_names = connection.execute(
+            text("SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = :t AND sql IS NOT NULL"),
+            {"t": table.name}
+        ).scalars().all()
+        for index_name in index_names:
+            connection.exec_driver_sql(f'DROP INDEX "{index_name}"')
+        connection.exec_driver_sql(f'ALTER TABLE "{table.name}" RENAME TO "{_LEGACY_PREFIX}{table.name}"')
+
+    # 2. Создаём таблицы по текущим моделям. Триггеры журнала баланса и индекса
+    # поиска на время копирования снимаются: они пересчитываются после переноса данных
+    Base.metadata.create_all(connection)
+    drop_balance_ledger_triggers(connection)
+    drop_search_source_triggers(connection)
+
+    # 3. Таблицы соответствия старых целочисленных ID новым UUID
+    remapped = set()
+    if remap_integer_ids:
+        for table in tables:
+            map_name = f"{_LEGACY_PREFIX}map_{table.name}"
+            connection.exec_driver_sql(f'CREATE TEMP TABLE "{map_name}" (old_id PRIMARY KEY, new_id TEXT)')
+            old_ids = connection.exec_driver_sql(f'SELECT id FROM "{_LEGACY_PREFIX}{table.name}"').scalars().all()
+            if old_ids:
+                connection.exec_driver_sql(
+                    f'INSERT INTO "{map_name}" (old_id, new_id) VALUES (?, ?)',
+                    [(old_id, str(uuid.uuid4())) for old_id in old_ids]
+                )
+            remapped.add(table.name)
+
+    # 4. Копируем строки в порядке зависимостей
+    dialect = connection.dialect
+    for table in tables:
+        legacy_name = f"{_LEGACY_PREFIX}{table.name}"
+        legacy_types = {
+            row["name"]: row["type"]
+            for row in connection.exec_driver_sql(f'PRAGMA table_info("{legacy_name}")').mappings()
+        }
+
+        column_names: List[str] = []
+        expressions: List[str] = []
+        parameters: List[Any] = []
+        for column in table.columns:
+            column_names.append(f'"{column.name}"')
+            if column.name not in legacy_types:
+                expressions.append("?")
+                parameters.append(_column_default(column, dialect))
+                continue
+
+            expression = f'src."{column.name}"'
+            source_type = legacy_types[column.name]
+            if column.name == "id" and column.primary_key:
+                target = table.name
+            else:
+                targets = [fk.column.table.name for fk in column.foreign_keys]
+                target = targets[0] if targets else None
+            if target in remapped:
+                expression = (
+                    f'(SELECT new_id FROM "{_LEGACY_PREFIX}map_{target}" WHERE old_id = {expression})'
+                )
+                source_type = "TEXT"
+            expressions.append(_convert_expression(column, expression, source_type))
+
+        result = connection.exec_driver_sql(
+            f'INSERT INTO "{table.name}" ({", ".join(column_names)}) '
+            f'SELECT {", ".join(expressions)} FROM "{legacy_name}" AS src',
+            tuple(parameters)
+        )
+        connection.exec_driver_sql(f'DROP TABLE "{legacy_name}"')
+        logger.info(f"Таблица {table.name} перестроена, перенесено строк: {result.rowcount}")
+
+    for table_name in remapped:
+        connection.exec_driver_sql(f'DROP TABLE "{_LEGACY_PREFIX}map_{table_name}"')
+
+    create_balance_ledger_triggers(connection)
+    rebuild_balance_ledger(connection)
+    create_search_index(connection)
+    rebuild_search_index(connection)
+
+
+def _upgrade_uuid_blob(connection: Connection) -> None:
+    """Версия 2: UUID-ключи как 16-байтовые BLOB, без избыточных индексов по первичным ключам."""
+    rebuild_tables(connection)
+
+
+def _upgrade_money_minor_units(connection: Connection) -> None:
+    """Версия 3: денежные суммы как целые числа копеек."""
+    rebuild_tables(connection, tables_needing_conversion(connection))
+
+
+def _upgrade_balance_ledger(connection: Connection) -> None:
+    """Версия 4: журнал баланса (итог и дневные изменения), поддерживаемый триггерами."""
+    from finance_tracker.models import BalanceTotalDB, Base, DailyBalanceDB
+    from finance_tracker.models.models import create_balance_ledger_triggers
+    from finance_tracker.services.balance_ledger_service import rebuild_balance_ledger
+
+    Base.metadata.create_all(connection, tables=[BalanceTotalDB.__table__, DailyBalanceDB.__table__])
+    create_balance_ledger_triggers(connection)
+    rebuild_balance_ledger(connection)
+
+
+def _upgrade_daily_balance_index(connection: Connection) -> None:
+    """Версия 5: нарастающий итог по дням в журнале баланса (журнал пересоздаётся)."""
+    from finance_tracker.models import BalanceTotalDB, Base, DailyBalanceDB
+    from finance_tracker.models.models import create_balance_ledger_triggers, drop_balance_ledger_triggers
+    from finance_tracker.services.balance_ledger_service import rebuild_balance_ledger
+
+    ledger_tables = [BalanceTotalDB.__table__, DailyBalanceDB.__table__]
+    drop_balance_ledger_triggers(connection)
+    Base.metadata.drop_all(connection, tables=ledger_tables)
+    Base.metadata.create_all(connection, tables=ledger_tables)
+    create_balance_ledger_triggers(connection)
+    rebuild_balance_ledger(connection)
+
+
+def _upgrade_search_index(connection: Connection) -> None:
+    """Версия 6: полнотекстовый индекс FTS5 описаний, поддерживаемый триггерами."""
+    from finance_tracker.models.models import create_search_index
+    from finance_tracker.services.search_service import rebuild_search_index
+
+    create_search_index(connection)
+    rebuild_search_index(connection)
+
+
+def _upgrade_import_fingerprint(connection: Connection) -> None:
+    """Версия 7: отпечаток строки выписки у транзакций с уникальным индексом."""
+    from finance_tracker.models import TransactionDB
+
+    columns = {row["name"] for row in connection.exec_driver_sql('PRAGMA table_info("transactions")').mappings()}
+    if "import_fingerprint" not in columns:
+        connection.exec_driver_sql('ALTER TABLE "transactions" ADD COLUMN "import_fingerprint" VARCHAR')
+    for index in TransactionDB.__table__.indexes:
+        if index.name == "ix_transactions_import_fingerprint":
+            index.create(connection, checkfirst=True)
+
+
+def _upgrade_ledger_bulk_insert_flag(connection: Connection) -> None:
+    """Версия 8: триггер вставки журнала баланса отключается флагом массовой вставки."""
+    from finance_tracker.models.models import create_balance_ledger_triggers, drop_balance_ledger_triggers
+
+    drop_balance_ledger_triggers(connection)
+    create_balance_ledger_triggers(connection)
+
+
+# Упорядоченный список шагов миграции (версии строго возрастают с 2)
+MIGRATIONS: List[Migration] = [
+    Migration(2, "UUID-ключи в виде 16-байтовых BLOB", _upgrade_uuid_blob),
+    Migration(3, "Денежные суммы в копейках (INTEGER)", _upgrade_money_minor_units),
+    Migration(4, "Журнал баланса, поддерживаемый триггерами", _upgrade_balance_ledger),
+    Migration(5, "Нарастающий итог по дням в журнале баланса", _upgrade_daily_balance_index),
+    Migration(6, "Полнотекстовый индекс описаний (FTS5)", _upgrade_search_index),
+    Migration(7, "Отпечатки строк выписки для идемпотентного импорта", _upgrade_import_fingerprint),
+    Migration(8, "Флаг массовой вставки для триггера журнала баланса", _upgrade_ledger_bulk_insert_flag),
+]
+
+
+def run_migrations(
+    engine: Engine,
+    migrations: Optional[List[Migration]] = None,
+    seed: Optional[Seed] = None
+) -> int:
+    """
+    Приводит схему БД к текущей версии и добавляет начальные данные.
+
+    Args:
+        engine: Engine SQLAlchemy
+        migrations: Шаги миграции (по умолчанию MIGRATIONS)
+        seed: Начальные данные (None - не добавлять)
+
+    Returns:
+        Версия схемы после выполнения
+
+    Raises:
+        RuntimeError: Если версия БД новее версии приложения
+        SQLAlchemyError: При ошибке выполнения миграции (изменения откатываются)
+    """
+    from finance_tracker.models import Base
+
+    steps = sorted(MIGRATIONS if migrations is None else migrations, key=lambda s: s.version)
+    target_version = get_target_version(steps)
+
+    # Тёплый старт: один SELECT без DDL и инспекции
+    with engine.connect() as connection:
+        versions = get_component_versions(connection)
+    current_version = versions.get(SCHEMA_COMPONENT)
+    seed_needed = seed is not None and versions.get(SEED_COMPONENT, 0) < seed.version
+    if current_version == target_version and not seed_needed:
+        logger.info(f"Схема БД актуальна (версия {current_version})")
+        return current_version
+
+    if current_version is not None and current_version > target_version:
+        error_msg = (
+            f"Версия схемы БД ({current_version}) новее версии приложения ({target_version})"
+        )
+        logger.error(error_msg)
+        raise RuntimeError(error_msg)
+
+    try:
+        with engine.begin() as connection:
+            # pysqlite не открывает транзакцию перед DDL - открываем явно,
+            # чтобы все шаги выполнились атомарно
+            connection.exec_driver_sql("BEGIN IMMEDIATE")
+
+            # Повторное чтение под блокировкой (миграцию мог выполнить другой процесс)
+            versions = get_component_versions(connection)
+            current_version = versions.get(SCHEMA_COMPONENT)
+
+            if current_version is None:
+                if not _user_tables(connection):
+                    Base.metadata.create_all(connection)
+                    current_version = target_version
+                    logger.info(f"Создана новая схема БД (версия {target_version})")
+                elif _has_integer_ids(connection):
+                    logger.warning("Обнаружена устаревшая схема (Integer ID). Перестройка таблиц на месте...")
+                    rebuild_tables(connection, remap_integer_ids=True)
+                    current_version = target_version
+                    logger.info(f"Устаревшая схема перестроена (версия {target_version})")
+                else:
+                    # UUID-схема, созданная до появления миграций: базовая версия
+                    Base.metadata.create_all(connection)
+                    current_version = BASELINE_SCHEMA_VERSION
+                    logger.info(f"БД без версии схемы принята за версию {BASELINE_SCHEMA_VERSION}")
+
+            for step in steps:
+                if step.version <= current_version:
+                    continue
+                logger.info(f"Миграция схемы до версии {step.version}: {step.description}")
+                step.upgrade(connection)
+                current_version = step.version
+
+            set_component_version(connection, SCHEMA_COMPONENT, current_version)
+
+            if seed is not None and versions.get(SEED_COMPONENT, 0) < seed.version:
+                seed.apply(connection)
+                set_component_version(connection, SEED_COMPONENT, seed.version)
+                logger.info(f"Начальные данные добавлены (версия {seed.version})")
+
+        logger.info(f"Миграция схемы завершена (версия {current_version})")
+        return current_version
+
+    except SQLAlchemyError as e:
+        logger.error(f"Ошибка при миграции схемы БД, изменения откатены: {e}")
+        raise
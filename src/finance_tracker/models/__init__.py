@@ -7,6 +7,7 @@
 
 from .enums import (
     EndConditionType,
+    ForecastItemSource,
     IntervalUnit,
     LenderType,
     LoanStatus,
@@ -16,13 +17,16 @@ from .enums import (
     PendingPaymentPriority,
     PendingPaymentStatus,
     RecurrenceType,
+    SearchSourceType,
     TransactionType,
 )
 from .models import (
+    BalanceTotalDB,
     Base,
     Category,
     CategoryCreate,
     CategoryDB,
+    DailyBalanceDB,
     DebtTransfer,
     DebtTransferCreate,
     DebtTransferDB,
@@ -52,6 +56,7 @@ from .models import (
     RecurrenceRule,
     RecurrenceRuleCreate,
     RecurrenceRuleDB,
+    SEARCH_SOURCES,
     Transaction,
     TransactionCreate,
     TransactionDB,
@@ -71,6 +76,8 @@ __all__ = [
     "PaymentStatus",
     "PendingPaymentPriority",
     "PendingPaymentStatus",
+    "SearchSourceType",
+    "ForecastItemSource",
     # SQLAlchemy DB Models
     "Base",
     "CategoryDB",
@@ -83,6 +90,9 @@ __all__ = [
     "LoanDB",
     "LoanPaymentDB",
     "PendingPaymentDB",
+    "BalanceTotalDB",
+    "DailyBalanceDB",
+    "SEARCH_SOURCES",
     # Pydantic Models
     "TransactionCreate",
     "TransactionUpdate",
@@ -179,3 +179,31 @@ class PendingPaymentStatus(str, Enum):
     ACTIVE = "active"
     EXECUTED = "executed"
     CANCELLED = "cancelled"
+
+
+class SearchSourceType(str, Enum):
+    """
+    Источник описания в полнотекстовом индексе поиска.
+
+    Attributes:
+        TRANSACTION: Фактическая транзакция
+        PLANNED_TRANSACTION: Плановая транзакция
+        PENDING_PAYMENT: Отложенный платёж
+    """
+    TRANSACTION = "transaction"
+    PLANNED_TRANSACTION = "planned_transaction"
+    PENDING_PAYMENT = "pending_payment"
+
+
+class ForecastItemSource(str, Enum):
+    """
+    Источник плановой операции в прогнозе баланса.
+
+    Attributes:
+        PLANNED_TRANSACTION: Вхождение плановой транзакции
+        LOAN_PAYMENT: Неисполненный платёж по кредиту
+        PENDING_PAYMENT: Отложенный платёж с плановой датой
+    """
+    PLANNED_TRANSACTION = "planned_transaction"
+    LOAN_PAYMENT = "loan_payment"
+    PENDING_PAYMENT = "pending_payment"
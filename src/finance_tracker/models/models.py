@@ -14,15 +14,19 @@ from typing import Optional
 from decimal import Decimal
 import uuid
 
-from sqlalchemy import Column, Integer, String, Numeric, Date, DateTime, Enum as SQLEnum, Boolean, ForeignKey, Index
+from sqlalchemy import (
+    Column, Integer, String, Numeric, Date, DateTime, Enum as SQLEnum, Boolean, ForeignKey, Index, MetaData, Table,
+    UniqueConstraint, event
+)
 from sqlalchemy.orm import relationship, DeclarativeBase
 from pydantic import BaseModel, field_validator, Field, ConfigDict, computed_field
 
 from .enums import (
     TransactionType, RecurrenceType, OccurrenceStatus, IntervalUnit,
     EndConditionType, LenderType, LoanType, LoanStatus, PaymentStatus,
-    PendingPaymentPriority, PendingPaymentStatus
+    PendingPaymentPriority, PendingPaymentStatus, SearchSourceType
 )
+from .types import MoneyType, UUIDType
 
 # Декларативная база для SQLAlchemy моделей
 class Base(DeclarativeBase):
@@ -44,7 +48,7 @@ class CategoryDB(Base):
     """
     __tablename__ = "categories"
 
-    id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()), index=True)
+    id = Column(UUIDType, primary_key=True, default=lambda: str(uuid.uuid4()))
     name = Column(String, nullable=False, unique=True)
     type = Column(SQLEnum(TransactionType), nullable=False)
     is_system = Column(Boolean, default=False)
@@ -78,9 +82,9 @@ class PlannedTransactionDB(Base):
     """
     __tablename__ = "planned_transactions"
 
-    id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()), index=True)
-    amount = Column(Numeric(10, 2), nullable=False)
-    category_id = Column(String(36), ForeignKey("categories.id"), nullable=False)
+    id = Column(UUIDType, primary_key=True, default=lambda: str(uuid.uuid4()))
+    amount = Column(MoneyType, nullable=False)
+    category_id = Column(UUIDType, ForeignKey("categories.id"), nullable=False)
     description = Column(String)
     type = Column(SQLEnum(TransactionType), nullable=False, index=True)
     start_date = Column(Date, nullable=False, index=True)
@@ -118,8 +122,8 @@ class RecurrenceRuleDB(Base):
     """
     __tablename__ = "recurrence_rules"
 
-    id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()), index=True)
-    planned_transaction_id = Column(String(36), ForeignKey("planned_transactions.id"), nullable=False, unique=True)
+    id = Column(UUIDType, primary_key=True, default=lambda: str(uuid.uuid4()))
+    planned_transaction_id = Column(UUIDType, ForeignKey("planned_transactions.id"), nullable=False, unique=True)
     recurrence_type = Column(SQLEnum(RecurrenceType), nullable=False, default=RecurrenceType.NONE)
     interval = Column(Integer, nullable=True)
     interval_unit = Column(SQLEnum(IntervalUnit), nullable=True)
@@ -163,14 +167,14 @@ class PlannedOccurrenceDB(Base):
     """
     __tablename__ = "planned_occurrences"
 
-    id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()), index=True)
-    planned_transaction_id = Column(String(36), ForeignKey("planned_transactions.id"), nullable=False)
+    id = Column(UUIDType, primary_key=True, default=lambda: str(uuid.uuid4()))
+    planned_transaction_id = Column(UUIDType, ForeignKey("planned_transactions.id"), nullable=False)
     occurrence_date = Column(Date, nullable=False, index=True)
-    amount = Column(Numeric(10, 2), nullable=False)
+    amount = Column(MoneyType, nullable=False)
     status = Column(SQLEnum(OccurrenceStatus), default=OccurrenceStatus.PENDING, index=True)
-    actual_transaction_id = Column(String(36), ForeignKey("transactions.id"), nullable=True)
+    actual_transaction_id = Column(UUIDType, ForeignKey("transactions.id"), nullable=True)
     executed_date = Column(Date, nullable=True)
-    executed_amount = Column(Numeric(10, 2), nullable=True)
+    executed_amount = Column(MoneyType, nullable=True)
     skipped_date = Column(Date, nullable=True)
     skip_reason = Column(String, nullable=True)
     created_at = Column(DateTime, default=datetime.now)
@@ -273,6 +277,7 @@ class TransactionDB(Base):
         description: Описание транзакции (необязательное)
         transaction_date: Дата совершения транзакции
         planned_occurrence_id: Ссылка на плановое вхождение (если создана из плана) (UUID)
+        import_fingerprint: Отпечаток строки банковской выписки (только для импортированных транзакций)
         created_at: Дата создания записи
         updated_at: Дата последнего обновления
         
@@ -281,13 +286,14 @@ class TransactionDB(Base):
     """
     __tablename__ = "transactions"
 
-    id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()), index=True)
-    amount = Column(Numeric(10, 2), nullable=False)
+    id = Column(UUIDType, primary_key=True, default=lambda: str(uuid.uuid4()))
+    amount = Column(MoneyType, nullable=False)
     type = Column(SQLEnum(TransactionType), nullable=False)
-    category_id = Column(String(36), ForeignKey("categories.id"), nullable=False)
+    category_id = Column(UUIDType, ForeignKey("categories.id"), nullable=False)
     description = Column(String)
     transaction_date = Column(Date, nullable=False, index=True)
-    planned_occurrence_id = Column(String(36), ForeignKey("planned_occurrences.id", ondelete="SET NULL"), nullable=True)
+    planned_occurrence_id = Column(UUIDType, ForeignKey("planned_occurrences.id", ondelete="SET NULL"), nullable=True)
+    import_fingerprint = Column(String, nullable=True)
     created_at = Column(DateTime, default=datetime.now)
     updated_at = Column(DateTime, default=datetime.now, onupdate=datetime.now)
 
@@ -299,6 +305,8 @@ class TransactionDB(Base):
     __table_args__ = (
         Index('ix_transactions_date_type', 'transaction_date', 'type'),
         Index('ix_transactions_category_id_date', 'category_id', 'transaction_date'),
+        # Повторный импорт той же выписки не создаёт дубликатов
+        Index('ix_transactions_import_fingerprint', 'import_fingerprint', unique=True),
     )
     
     @property
@@ -343,7 +351,7 @@ class LenderDB(Base):
     """
     __tablename__ = "lenders"
 
-    id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()), index=True)
+    id = Column(UUIDType, primary_key=True, default=lambda: str(uuid.uuid4()))
     name = Column(String, nullable=False, unique=True)
     lender_type = Column(SQLEnum(LenderType), default=LenderType.OTHER)
     description = Column(String, nullable=True)
@@ -415,23 +423,23 @@ class LoanDB(Base):
     """
     __tablename__ = "loans"
 
-    id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()), index=True)
-    lender_id = Column(String(36), ForeignKey("lenders.id"), nullable=False)
+    id = Column(UUIDType, primary_key=True, default=lambda: str(uuid.uuid4()))
+    lender_id = Column(UUIDType, ForeignKey("lenders.id"), nullable=False)
     name = Column(String, nullable=False)
     loan_type = Column(SQLEnum(LoanType), default=LoanType.OTHER)
-    amount = Column(Numeric(10, 2), nullable=False)
+    amount = Column(MoneyType, nullable=False)
     interest_rate = Column(Numeric(5, 2), nullable=True)
     term_months = Column(Integer, nullable=True)
     issue_date = Column(Date, nullable=False)
     end_date = Column(Date, nullable=True)  # НОВОЕ: явная дата окончания кредита
-    disbursement_transaction_id = Column(String(36), ForeignKey("transactions.id"), nullable=True)  # Транзакция выдачи
+    disbursement_transaction_id = Column(UUIDType, ForeignKey("transactions.id"), nullable=True)  # Транзакция выдачи
     contract_number = Column(String, nullable=True)
     description = Column(String, nullable=True)
     status = Column(SQLEnum(LoanStatus), default=LoanStatus.ACTIVE)
     
     # НОВЫЕ поля для отслеживания передачи долга
-    original_lender_id = Column(String(36), ForeignKey("lenders.id"), nullable=True)
-    current_holder_id = Column(String(36), ForeignKey("lenders.id"), nullable=True)
+    original_lender_id = Column(UUIDType, ForeignKey("lenders.id"), nullable=True)
+    current_holder_id = Column(UUIDType, ForeignKey("lenders.id"), nullable=True)
     
     created_at = Column(DateTime, default=datetime.now)
     updated_at = Column(DateTime, default=datetime.now, onupdate=datetime.now)
@@ -534,18 +542,18 @@ class LoanPaymentDB(Base):
     """
     __tablename__ = "loan_payments"
 
-    id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()), index=True)
-    loan_id = Column(String(36), ForeignKey("loans.id"), nullable=False)
-    holder_id = Column(String(36), ForeignKey("lenders.id"), nullable=True)
+    id = Column(UUIDType, primary_key=True, default=lambda: str(uuid.uuid4()))
+    loan_id = Column(UUIDType, ForeignKey("loans.id"), nullable=False)
+    holder_id = Column(UUIDType, ForeignKey("lenders.id"), nullable=True)
     scheduled_date = Column(Date, nullable=False)
-    principal_amount = Column(Numeric(10, 2), nullable=False)
-    interest_amount = Column(Numeric(10, 2), nullable=False)
-    total_amount = Column(Numeric(10, 2), nullable=False)
+    principal_amount = Column(MoneyType, nullable=False)
+    interest_amount = Column(MoneyType, nullable=False)
+    total_amount = Column(MoneyType, nullable=False)
     status = Column(SQLEnum(PaymentStatus), default=PaymentStatus.PENDING)
-    planned_transaction_id = Column(String(36), ForeignKey("planned_transactions.id"), nullable=True)
-    actual_transaction_id = Column(String(36), ForeignKey("transactions.id"), nullable=True)
+    planned_transaction_id = Column(UUIDType, ForeignKey("planned_transactions.id"), nullable=True)
+    actual_transaction_id = Column(UUIDType, ForeignKey("transactions.id"), nullable=True)
     executed_date = Column(Date, nullable=True)
-    executed_amount = Column(Numeric(10, 2), nullable=True)
+    executed_amount = Column(MoneyType, nullable=True)
     overdue_days = Column(Integer, nullable=True)
     created_at = Column(DateTime, default=datetime.now)
     updated_at = Column(DateTime, default=datetime.now, onupdate=datetime.now)
@@ -592,18 +600,18 @@ class PendingPaymentDB(Base):
     """
     __tablename__ = "pending_payments"
 
-    id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()), index=True)
-    amount = Column(Numeric(10, 2), nullable=False)
-    category_id = Column(String(36), ForeignKey("categories.id"), nullable=False)
+    id = Column(UUIDType, primary_key=True, default=lambda: str(uuid.uuid4()))
+    amount = Column(MoneyType, nullable=False)
+    category_id = Column(UUIDType, ForeignKey("categories.id"), nullable=False)
     description = Column(String, nullable=False)
     priority = Column(SQLEnum(PendingPaymentPriority), default=PendingPaymentPriority.MEDIUM)
     planned_date = Column(Date, nullable=True)
     status = Column(SQLEnum(PendingPaymentStatus), default=PendingPaymentStatus.ACTIVE)
 
     # Факт исполнения
-    actual_transaction_id = Column(String(36), ForeignKey("transactions.id"), nullable=True)
+    actual_transaction_id = Column(UUIDType, ForeignKey("transactions.id"), nullable=True)
     executed_date = Column(Date, nullable=True, index=True)
-    executed_amount = Column(Numeric(10, 2), nullable=True)
+    executed_amount = Column(MoneyType, nullable=True)
 
     # Отмена
     cancelled_date = Column(Date, nullable=True, index=True)
@@ -646,14 +654,14 @@ class DebtTransferDB(Base):
     """
     __tablename__ = "debt_transfers"
 
-    id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()), index=True)
-    loan_id = Column(String(36), ForeignKey("loans.id"), nullable=False)
-    from_lender_id = Column(String(36), ForeignKey("lenders.id"), nullable=False)
-    to_lender_id = Column(String(36), ForeignKey("lenders.id"), nullable=False)
+    id = Column(UUIDType, primary_key=True, default=lambda: str(uuid.uuid4()))
+    loan_id = Column(UUIDType, ForeignKey("loans.id"), nullable=False)
+    from_lender_id = Column(UUIDType, ForeignKey("lenders.id"), nullable=False)
+    to_lender_id = Column(UUIDType, ForeignKey("lenders.id"), nullable=False)
     transfer_date = Column(Date, nullable=False)
-    transfer_amount = Column(Numeric(10, 2), nullable=False)
-    previous_amount = Column(Numeric(10, 2), nullable=False)
-    amount_difference = Column(Numeric(10, 2), nullable=False, default=Decimal('0'))
+    transfer_amount = Column(MoneyType, nullable=False)
+    previous_amount = Column(MoneyType, nullable=False)
+    amount_difference = Column(MoneyType, nullable=False, default=Decimal('0'))
     reason = Column(String, nullable=True)
     notes = Column(String, nullable=True)
     created_at = Column(DateTime, default=datetime.now)
@@ -672,6 +680,220 @@ class DebtTransferDB(Base):
     )
 
 
+class BalanceTotalDB(Base):
+    """
+    Итоговый баланс по всем транзакциям (одна строка с id = 1).
+
+    Поддерживается триггерами таблицы transactions (см. BALANCE_LEDGER_TRIGGERS)
+    в той же транзакции БД, что и изменение транзакции.
+
+    Attributes:
+        id: Всегда 1
+        balance: Сумма доходов минус сумма расходов
+        transaction_count: Количество транзакций
+        revision: Номер изменения журнала (увеличивается при каждом изменении)
+    """
+    __tablename__ = "balance_totals"
+
+    id = Column(Integer, primary_key=True)
+    balance = Column(MoneyType, nullable=False, default=Decimal('0'))
+    transaction_count = Column(Integer, nullable=False, default=0)
+    revision = Column(Integer, nullable=False, default=0)
+
+
+class DailyBalanceDB(Base):
+    """
+    Чистое изменение баланса за день (доходы минус расходы).
+
+    Строка существует только для дней, в которых есть транзакции.
+    Поддерживается триггерами таблицы transactions: при изменении транзакции
+    нарастающий итог пересчитывается только для дней начиная с её даты.
+
+    Attributes:
+        day: Дата
+        net: Доходы минус расходы за день
+        transaction_count: Количество транзакций за день
+        cumulative: Баланс на конец дня (сумма net по всем дням до day включительно)
+        revision: Номер изменения журнала, при котором строка изменялась последней
+    """
+    __tablename__ = "daily_balances"
+
+    day = Column(Date, primary_key=True)
+    net = Column(MoneyType, nullable=False, default=Decimal('0'))
+    transaction_count = Column(Integer, nullable=False, default=0)
+    cumulative = Column(MoneyType, nullable=False, default=Decimal('0'))
+    revision = Column(Integer, nullable=False, default=0)
+
+
+def _signed_amount_sql(row: str) -> str:
+    """SQL знаковой суммы строки триггера (NEW/OLD): доход со знаком плюс, расход - минус."""
+    return f"CASE WHEN {row}.type = '{TransactionType.INCOME.name}' THEN {row}.amount ELSE -{row}.amount END"
+
+
+def _ledger_apply_sql(row: str, sign: str) -> str:
+    """
+    Тело триггера: добавляет (sign='+') или вычитает (sign='-') строку транзакции в журнале баланса.
+
+    Новая строка дня получает нарастающий итог предыдущего дня, затем
+    нарастающий итог сдвигается на сумму транзакции для её дня и всех
+    последующих дней (суффикс), и им присваивается новый номер изменения.
+    """
+    amount = _signed_amount_sql(row)
+    day = f"{row}.transaction_date"
+    return (
+        f"INSERT INTO balance_totals (id, balance, transaction_count, revision) "
+        f"VALUES (1, {sign}({amount}), {sign}1, 1) "
+        f"ON CONFLICT(id) DO UPDATE SET balance = balance + excluded.balance, "
+        f"transaction_count = transaction_count + excluded.transaction_count, revision = revision + 1; "
+        f"INSERT INTO daily_balances (day, net, transaction_count, cumulative, revision) "
+        f"VALUES ({day}, {sign}({amount}), {sign}1, COALESCE((SELECT cumulative FROM daily_balances "
+        f"WHERE day < {day} ORDER BY day DESC LIMIT 1), 0), 0) "
+        f"ON CONFLICT(day) DO UPDATE SET net = net + excluded.net, "
+        f"transaction_count = transaction_count + excluded.transaction_count; "
+        f"UPDATE daily_balances SET cumulative = cumulative {sign} ({amount}), "
+        f"revision = (SELECT revision FROM balance_totals WHERE id = 1) WHERE day >= {day}; "
+        f"DELETE FROM daily_balances WHERE day = {day} AND transaction_count = 0;"
+    )
+
+
+# Флаг массовой вставки: пока в таблице есть строка, триггер вставки журнала
+# баланса не срабатывает (журнал по дням обновляет create_transactions_bulk).
+# Строка добавляется и удаляется в одной транзакции и другим соединениям не видна
+balance_ledger_bulk_insert_table = Table(
+    "balance_ledger_bulk_insert",
+    MetaData(),
+    Column("id", Integer, primary_key=True),
+)
+
+# Триггеры журнала баланса: итог и дневные изменения обновляются
+# при любой вставке, изменении и удалении транзакции (ORM и Core)
+BALANCE_LEDGER_TRIGGERS = {
+    "trg_transactions_ledger_insert": (
+        "AFTER INSERT ON transactions "
+        "WHEN NOT EXISTS (SELECT 1 FROM balance_ledger_bulk_insert) BEGIN "
+        + _ledger_apply_sql("NEW", "+") + " END"
+    ),
+    "trg_transactions_ledger_update": (
+        "AFTER UPDATE OF amount, type, transaction_date ON transactions BEGIN "
+        + _ledger_apply_sql("OLD", "-") + " " + _ledger_apply_sql("NEW", "+") + " END"
+    ),
+    "trg_transactions_ledger_delete": (
+        "AFTER DELETE ON transactions BEGIN " + _ledger_apply_sql("OLD", "-") + " END"
+    ),
+}
+
+
+def create_balance_ledger_triggers(connection) -> None:
+    """Создаёт триггеры журнала баланса и таблицу флага массовой вставки (если их ещё нет)."""
+    balance_ledger_bulk_insert_table.create(connection, checkfirst=True)
+    for name, body in BALANCE_LEDGER_TRIGGERS.items():
+        connection.exec_driver_sql(f"CREATE TRIGGER IF NOT EXISTS {name} {body}")
+
+
+def drop_balance_ledger_triggers(connection) -> None:
+    """Удаляет триггеры журнала баланса."""
+    for name in BALANCE_LEDGER_TRIGGERS:
+        connection.exec_driver_sql(f"DROP TRIGGER IF EXISTS {name}")
+
+
+@event.listens_for(TransactionDB.__table__, "after_create")
+def _on_transactions_created(target, connection, **kw) -> None:
+    # Таблица транзакций всегда создаётся вместе с триггерами журнала баланса
+    create_balance_ledger_triggers(connection)
+
+
+# =============================================================================
+# Полнотекстовый индекс описаний (FTS5)
+# =============================================================================
+
+# Таблицы, описания которых индексируются: имя таблицы -> тип источника
+SEARCH_SOURCES = {
+    "transactions": SearchSourceType.TRANSACTION,
+    "planned_transactions": SearchSourceType.PLANNED_TRANSACTION,
+    "pending_payments": SearchSourceType.PENDING_PAYMENT,
+}
+
+# Документы поиска: нормализованное описание каждой строки-источника.
+# Служебная таблица (не входит в Base.metadata и не перестраивается миграциями):
+# целочисленный id - стабильный rowid для внешнего содержимого FTS5
+search_documents_table = Table(
+    "search_documents",
+    MetaData(),
+    Column("id", Integer, primary_key=True),
+    Column("kind", String, nullable=False),
+    Column("source_id", UUIDType, nullable=False),
+    Column("body", String, nullable=False),
+    UniqueConstraint("kind", "source_id"),
+)
+
+# FTS5 над search_documents.body: unicode61 разбивает кириллицу на слова
+# и приводит к нижнему регистру, префиксные индексы ускоряют запросы "слово*"
+_SEARCH_INDEX_DDL = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS search_index USING fts5("
+    "body, content='search_documents', content_rowid='id', "
+    "tokenize='unicode61 remove_diacritics 2', prefix='2 3')",
+    "CREATE TRIGGER IF NOT EXISTS trg_search_documents_insert AFTER INSERT ON search_documents BEGIN "
+    "INSERT INTO search_index (rowid, body) VALUES (NEW.id, NEW.body); END",
+    "CREATE TRIGGER IF NOT EXISTS trg_search_documents_delete AFTER DELETE ON search_documents BEGIN "
+    "INSERT INTO search_index (search_index, rowid, body) VALUES ('delete', OLD.id, OLD.body); END",
+)
+
+
+def normalize_search_text_sql(expression: str) -> str:
+    """SQL нормализации текста для поиска: "ё" -> "е" (регистр приводит токенизатор FTS5)."""
+    return f"replace(replace({expression}, 'ё', 'е'), 'Ё', 'Е')"
+
+
+def _search_source_triggers(table_name: str) -> dict:
+    """Триггеры таблицы-источника, поддерживающие документы поиска."""
+    kind = SEARCH_SOURCES[table_name].value
+    add_new = (
+        f"INSERT INTO search_documents (kind, source_id, body) "
+        f"SELECT '{kind}', NEW.id, {normalize_search_text_sql('NEW.description')} "
+        f"WHERE NEW.description IS NOT NULL AND trim(NEW.description) != '';"
+    )
+    remove_old = f"DELETE FROM search_documents WHERE kind = '{kind}' AND source_id = OLD.id;"
+    return {
+        f"trg_search_{table_name}_insert": f"AFTER INSERT ON {table_name} BEGIN {add_new} END",
+        f"trg_search_{table_name}_update": (
+            f"AFTER UPDATE OF id, description ON {table_name} BEGIN {remove_old} {add_new} END"
+        ),
+        f"trg_search_{table_name}_delete": f"AFTER DELETE ON {table_name} BEGIN {remove_old} END",
+    }
+
+
+def create_search_index(connection, table_names=None) -> None:
+    """
+    Создаёт индекс поиска и триггеры таблиц-источников (если их ещё нет).
+
+    Args:
+        connection: Соединение БД
+        table_names: Таблицы-источники, для которых создаются триггеры (по умолчанию все)
+    """
+    search_documents_table.create(connection, checkfirst=True)
+    for ddl in _SEARCH_INDEX_DDL:
+        connection.exec_driver_sql(ddl)
+    for table_name in SEARCH_SOURCES if table_names is None else table_names:
+        for name, body in _search_source_triggers(table_name).items():
+            connection.exec_driver_sql(f"CREATE TRIGGER IF NOT EXISTS {name} {body}")
+
+
+def drop_search_source_triggers(connection) -> None:
+    """Удаляет триггеры таблиц-источников индекса поиска."""
+    for table_name in SEARCH_SOURCES:
+        for name in _search_source_triggers(table_name):
+            connection.exec_driver_sql(f"DROP TRIGGER IF EXISTS {name}")
+
+
+def _on_search_source_created(target, connection, **kw) -> None:
+    # Таблица-источник всегда создаётся вместе с индексом поиска и своими триггерами
+    create_search_index(connection, [target.name])
+
+
+for _source_table in (TransactionDB.__table__, PlannedTransactionDB.__table__, PendingPaymentDB.__table__):
+    event.listen(_source_table, "after_create", _on_search_source_created)
+
+
 # =============================================================================
 # Pydantic модели для валидации и API responses
 # =============================================================================
@@ -691,12 +913,14 @@ class TransactionCreate(BaseModel):
         category_id: ID категории из справочника (UUID)
         description: Необязательное описание транзакции
         transaction_date: Дата транзакции (по умолчанию текущая дата)
+        import_fingerprint: Отпечаток строки выписки (заполняется при импорте)
     """
     amount: Decimal = Field(gt=Decimal('0'), description="Сумма транзакции должна быть положительной")
     type: TransactionType
     category_id: str
     description: Optional[str] = None
     transaction_date: date_type = Field(default_factory=date_type.today)
+    import_fingerprint: Optional[str] = None
 
     @field_validator('category_id')
     @classmethod
@@ -0,0 +1,134 @@
+"""
+Пользовательские типы колонок SQLAlchemy.
+
+Содержит:
+- UUIDType: UUID в виде 16-байтового BLOB в БД и строки str в Python
+  (ID, не являющиеся UUID, хранятся как TEXT)
+- MoneyType: денежная сумма в виде целого числа копеек в БД и Decimal в Python
+- money_sum: SQL-агрегат SUM() денежных сумм с результатом Decimal
+"""
+
+import uuid
+from decimal import ROUND_HALF_UP, Decimal
+from typing import Any, Optional, Union
+
+from sqlalchemy import BigInteger, LargeBinary, func, type_coerce
+from sqlalchemy.types import TypeDecorator
+
+# Длина канонической строки UUID (xxxxxxxx-xxxx-xxxx-xxxx-xxxxxxxxxxxx)
+_UUID_STR_LENGTH = 36
+_UUID_BYTES_LENGTH = 16
+
+
+def uuid_to_bytes(value: Union[str, uuid.UUID]) -> Union[bytes, str]:
+    """
+    Преобразует UUID в 16 байт для хранения в БД.
+
+    Строки, не являющиеся UUID (например, идентификаторы в тестовых данных),
+    возвращаются без изменений и хранятся в SQLite как TEXT, поэтому при
+    чтении их нельзя принять за UUID.
+    """
+    if isinstance(value, uuid.UUID):
+        return value.bytes
+    if len(value) == _UUID_STR_LENGTH:
+        try:
+            return uuid.UUID(value).bytes
+        except ValueError:
+            pass
+    return value
+
+
+def bytes_to_uuid(value: Union[bytes, str]) -> str:
+    """Преобразует значение из БД обратно в строку (обратная операция uuid_to_bytes)."""
+    if isinstance(value, str):
+        return value
+    return str(uuid.UUID(bytes=bytes(value)))
+
+
+class _UUIDStorage(LargeBinary):
+    """BLOB, значения которого передаются драйверу без преобразования (bytes или str)."""
+
+    def bind_processor(self, dialect: Any) -> None:
+        return None
+
+    def result_processor(self, dialect: Any, coltype: Any) -> None:
+        return None
+
+
+class UUIDType(TypeDecorator):
+    """
+    UUID, хранимый как 16-байтовый BLOB.
+
+    В Python значения остаются строками str в каноническом виде, поэтому
+    модели, сервисы и Pydantic-схемы работают с ID как раньше. По сравнению
+    с String(36) строка, индекс и ключ соединения занимают 16 байт вместо 36.
+    ID, не являющиеся UUID, хранятся как TEXT без изменений.
+    """
+
+    impl = _UUIDStorage(_UUID_BYTES_LENGTH)
+    cache_ok = True
+
+    def process_bind_param(self, value: Optional[Union[str, uuid.UUID]], dialect: Any) -> Optional[Union[bytes, str]]:
+        if value is None:
+            return None
+        return uuid_to_bytes(value)
+
+    def process_result_value(self, value: Optional[Union[bytes, str]], dialect: Any) -> Optional[str]:
+        if value is None:
+            return None
+        return bytes_to_uuid(value)
+
+
+# Количество копеек в рубле и шаг округления денежных сумм
+MINOR_UNITS = 100
+_MONEY_QUANTUM = Decimal("0.01")
+
+
+def money_to_minor(value: Union[Decimal, int, float, str]) -> int:
+    """
+    Преобразует денежную сумму в целое число копеек.
+
+    Сумма округляется до копеек по правилу ROUND_HALF_UP. float преобразуется
+    через строковое представление, чтобы 0.1 не превращалось в 0.1000000000000000055.
+    """
+    if not isinstance(value, Decimal):
+        value = Decimal(str(value))
+    return int(value.quantize(_MONEY_QUANTUM, rounding=ROUND_HALF_UP) * MINOR_UNITS)
+
+
+def minor_to_money(value: int) -> Decimal:
+    """Преобразует целое число копеек в Decimal с двумя знаками после запятой."""
+    return Decimal(int(value)).scaleb(-2)
+
+
+class MoneyType(TypeDecorator):
+    """
+    Денежная сумма, хранимая как целое число копеек.
+
+    В Python значения остаются Decimal с двумя знаками после запятой.
+    Агрегаты SUM() в SQL вычисляются точно над целыми числами, а размер
+    суммы не ограничен 10 разрядами Numeric(10, 2).
+    """
+
+    impl = BigInteger
+    cache_ok = True
+
+    def process_bind_param(self, value: Optional[Union[Decimal, int, float, str]], dialect: Any) -> Optional[int]:
+        if value is None:
+            return None
+        return money_to_minor(value)
+
+    def process_result_value(self, value: Optional[int], dialect: Any) -> Optional[Decimal]:
+        if value is None:
+            return None
+        return minor_to_money(value)
+
+
+def money_sum(expression: Any) -> Any:
+    """
+    SQL-выражение SUM() над денежной колонкой (или выражением над ней).
+
+    Суммирование выполняется в БД над целыми копейками; результат
+    преобразуется в Decimal, для пустой выборки возвращается 0.
+    """
+    return type_coerce(func.coalesce(func.sum(expression), 0), MoneyType())
@@ -1,10 +1,15 @@
 __all__ = [
     "get_transactions_by_date",
     "get_by_date_range",
+    "get_transactions_page",
     "create_transaction",
+    "create_transactions_bulk",
+    "import_statement_csv",
     "update_transaction",
     "delete_transaction",
     "get_month_stats",
+    "get_year_stats",
+    "get_category_totals",
     "get_all_categories",
     "create_category",
     "delete_category",
@@ -43,12 +48,18 @@ __all__ = [
 from finance_tracker.services.transaction_service import (
     get_transactions_by_date,
     get_by_date_range,
+    get_transactions_page,
     create_transaction,
+    create_transactions_bulk,
     update_transaction,
     delete_transaction,
-    get_month_stats
+    get_month_stats,
+    get_year_stats,
+    get_category_totals
 )
 
+from finance_tracker.services.statement_import_service import import_statement_csv
+
 from finance_tracker.services.category_service import (
     get_all_categories,
     create_category,
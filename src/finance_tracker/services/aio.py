@@ -0,0 +1,420 @@
+"""
+Асинхронный фасад сервисов чтения.
+
+Выполняет функции сервисов чтения в ограниченном пуле потоков, чтобы
+медленные запросы не блокировали поток обработчиков событий Flet:
+- Каждый вызов получает собственную сессию чтения (database.get_read_session)
+- Пул ограничен MAX_WORKERS потоками
+- Запросы можно объединять в канал (channel): новый запрос в канале
+  вытесняет предыдущий - ещё не начатый вызов не выполняется, а результат
+  уже выполняющегося отбрасывается с исключением RequestSuperseded
+
+Возвращаемые ORM-объекты отсоединены от сессии. Связи, нужные UI (например,
+transaction.category), каждая обёртка перечисляет явно: они загружаются
+через selectinload до закрытия сессии - по одному запросу на связь.
+
+Пример:
+    >>> try:
+    ...     transactions = await aio.get_by_date_range(start, end, channel="calendar")
+    ... except aio.RequestSuperseded:
+    ...     return  # Пользователь уже переключил месяц
+"""
+
+import asyncio
+import dataclasses
+import functools
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+from decimal import Decimal
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, TypeVar
+
+from sqlalchemy import inspect as sa_inspect, select
+from sqlalchemy.exc import NoInspectionAvailable
+from sqlalchemy.orm import QueryableAttribute, Session, selectinload
+
+from finance_tracker.database import get_read_session
+from finance_tracker.models import (
+    PendingPaymentDB,
+    PlannedOccurrenceDB,
+    PlannedTransactionDB,
+    SearchSourceType,
+    TransactionDB,
+    TransactionType,
+)
+from finance_tracker.services import (
+    balance_forecast_service,
+    loan_statistics_service,
+    pending_payment_service,
+    planned_transaction_service,
+    search_service,
+    transaction_service,
+)
+
+# Настройка логирования
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Максимальное количество потоков пула (SQLite-читатели в режиме WAL)
+MAX_WORKERS = 4
+
+# Путь связей от класса результата: (PlannedOccurrenceDB.planned_transaction, PlannedTransactionDB.category)
+RelationPath = Tuple[QueryableAttribute, ...]
+
+# Связи результатов, которые использует UI
+TRANSACTION_RELATIONS: Tuple[RelationPath, ...] = ((TransactionDB.category,),)
+OCCURRENCE_RELATIONS: Tuple[RelationPath, ...] = (
+    (PlannedOccurrenceDB.planned_transaction, PlannedTransactionDB.category),
+)
+PENDING_PAYMENT_RELATIONS: Tuple[RelationPath, ...] = ((PendingPaymentDB.category,),)
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+# Номер последнего запроса в каждом канале
+_generations: Dict[str, int] = {}
+_generations_lock = threading.Lock()
+
+
+class RequestSuperseded(Exception):
+    """Запрос вытеснен более новым запросом в том же канале."""
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    """Возвращает пул потоков, создавая его при первом обращении."""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix="finance-aio")
+        return _executor
+
+
+def shutdown() -> None:
+    """Останавливает пул потоков (ожидает завершения выполняющихся вызовов)."""
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=True, cancel_futures=True)
+            _executor = None
+
+
+def _next_generation(channel: str) -> int:
+    with _generations_lock:
+        generation = _generations.get(channel, 0) + 1
+        _generations[channel] = generation
+        return generation
+
+
+def _is_superseded(channel: Optional[str], generation: int) -> bool:
+    if channel is None:
+        return False
+    with _generations_lock:
+        return _generations.get(channel) != generation
+
+
+def _orm_objects(value: Any) -> Iterable[Any]:
+    """Перебирает ORM-объекты результата (в том числе внутри списков, словарей и dataclass)."""
+    if value is None:
+        return
+    if isinstance(value, (list, tuple, set)):
+        for item in value:
+            yield from _orm_objects(item)
+        return
+    if isinstance(value, dict):
+        for item in value.values():
+            yield from _orm_objects(item)
+        return
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        for item in dataclasses.fields(value):
+            yield from _orm_objects(getattr(value, item.name))
+        return
+    try:
+        sa_inspect(type(value))
+    except NoInspectionAvailable:
+        return
+    yield value
+
+
+def _is_path_loaded(obj: Any, path: RelationPath) -> bool:
+    """Все связи пути уже загружены (например, joinedload в самом сервисе)."""
+    for attribute in path:
+        if obj is None:
+            return True
+        if attribute.key in sa_inspect(obj).unloaded:
+            return False
+        obj = getattr(obj, attribute.key)
+    return True
+
+
+def _load_relations(session: Session, value: Any, relations: Iterable[RelationPath]) -> None:
+    """
+    Загружает связи ORM-объектов результата, пока сессия открыта.
+
+    Для каждого пути объекты класса результата перечитываются одним запросом
+    по первичному ключу с selectinload по пути: связи уже находящихся в сессии
+    объектов заполняются без отдельного запроса на каждый объект.
+    """
+    objects = list(_orm_objects(value))
+    for path in relations:
+        entity = path[0].class_
+        pending = {
+            sa_inspect(obj).identity[0] for obj in objects
+            if isinstance(obj, entity) and sa_inspect(obj).persistent and not _is_path_loaded(obj, path)
+        }
+        if not pending:
+            continue
+        option = selectinload(path[0])
+        for attribute in path[1:]:
+            option = option.selectinload(attribute)
+        primary_key = sa_inspect(entity).primary_key[0]
+        session.execute(select(entity).where(primary_key.in_(pending)).options(option)).scalars().all()
+
+
+def _call_in_read_session(
+    func: Callable[..., T],
+    args: Tuple[Any, ...],
+    kwargs: Dict[str, Any],
+    channel: Optional[str],
+    generation: int,
+    relations: Tuple[RelationPath, ...]
+) -> T:
+    """Выполняет функцию сервиса с собственной сессией чтения (в потоке пула)."""
+    if _is_superseded(channel, generation):
+        raise RequestSuperseded(channel)
+    with get_read_session() as session:
+        result = func(session, *args, **kwargs)
+        _load_relations(session, result, relations)
+        return result
+
+
+async def run_read(
+    func: Callable[..., T],
+    *args: Any,
+    channel: Optional[str] = None,
+    relations: Iterable[RelationPath] = (),
+    **kwargs: Any
+) -> T:
+    """
+    Выполняет функцию сервиса чтения в пуле потоков.
+
+    Args:
+        func: Функция вида func(session, *args, **kwargs)
+        *args: Позиционные аргументы функции (без session)
+        channel: Канал запроса. Новый запрос в канале вытесняет предыдущий
+        relations: Пути связей ORM-объектов результата, загружаемые до закрытия сессии
+        **kwargs: Именованные аргументы функции
+
+    Returns:
+        Результат функции
+
+    Raises:
+        RequestSuperseded: Запрос вытеснен более новым в том же канале
+    """
+    generation = _next_generation(channel) if channel is not None else 0
+    loop = asyncio.get_running_loop()
+    call = functools.partial(_call_in_read_session, func, args, kwargs, channel, generation, tuple(relations))
+
+    result = await loop.run_in_executor(_get_executor(), call)
+
+    if _is_superseded(channel, generation):
+        logger.debug(f"Результат запроса {func.__name__} в канале '{channel}' отброшен (вытеснен)")
+        raise RequestSuperseded(channel)
+    return result
+
+
+# Транзакции
+
+async def get_total_balance(*, channel: Optional[str] = None) -> Decimal:
+    """Асинхронная версия transaction_service.get_total_balance."""
+    return await run_read(transaction_service.get_total_balance, channel=channel)
+
+
+async def get_transactions_by_date(target_date: date, *, channel: Optional[str] = None) -> List[Any]:
+    """Асинхронная версия transaction_service.get_transactions_by_date."""
+    return await run_read(
+        transaction_service.get_transactions_by_date, target_date,
+        channel=channel, relations=TRANSACTION_RELATIONS
+    )
+
+
+async def get_by_date_range(start_date: date, end_date: date, *, channel: Optional[str] = None) -> List[Any]:
+    """Асинхронная версия transaction_service.get_by_date_range."""
+    return await run_read(
+        transaction_service.get_by_date_range, start_date, end_date,
+        channel=channel, relations=TRANSACTION_RELATIONS
+    )
+
+
+async def get_transactions_page(
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    transaction_type: Optional[TransactionType] = None,
+    category_id: Optional[str] = None,
+    search_text: Optional[str] = None,
+    min_amount: Optional[Decimal] = None,
+    max_amount: Optional[Decimal] = None,
+    sort: str = "date_desc",
+    cursor: Optional[transaction_service.TransactionCursor] = None,
+    page_size: int = transaction_service.DEFAULT_PAGE_SIZE,
+    *,
+    channel: Optional[str] = None
+) -> transaction_service.TransactionPage:
+    """Асинхронная версия transaction_service.get_transactions_page."""
+    return await run_read(
+        transaction_service.get_transactions_page, start_date, end_date, transaction_type, category_id,
+        search_text, min_amount, max_amount, sort, cursor, page_size,
+        channel=channel, relations=TRANSACTION_RELATIONS
+    )
+
+
+async def get_month_stats(year: int, month: int, *, channel: Optional[str] = None) -> Dict[int, Tuple[Decimal, Decimal]]:
+    """Асинхронная версия transaction_service.get_month_stats."""
+    return await run_read(transaction_service.get_month_stats, year, month, channel=channel)
+
+
+async def get_year_stats(year: int, *, channel: Optional[str] = None) -> Dict[date, Tuple[Decimal, Decimal]]:
+    """Асинхронная версия transaction_service.get_year_stats."""
+    return await run_read(transaction_service.get_year_stats, year, channel=channel)
+
+
+async def get_category_statistics(*, channel: Optional[str] = None) -> Dict[str, Dict[str, Decimal]]:
+    """Асинхронная версия transaction_service.get_category_statistics."""
+    return await run_read(transaction_service.get_category_statistics, channel=channel)
+
+
+async def get_category_totals(
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    transaction_type: Optional[TransactionType] = None,
+    category_id: Optional[str] = None,
+    *,
+    channel: Optional[str] = None
+) -> List[transaction_service.CategoryTotal]:
+    """Асинхронная версия transaction_service.get_category_totals."""
+    return await run_read(
+        transaction_service.get_category_totals, start_date, end_date, transaction_type, category_id,
+        channel=channel
+    )
+
+
+# Полнотекстовый поиск
+
+async def search_descriptions(
+    search_text: str,
+    source_types: Optional[Iterable[SearchSourceType]] = None,
+    limit: int = search_service.DEFAULT_SEARCH_LIMIT,
+    *,
+    channel: Optional[str] = None
+) -> List[search_service.SearchHit]:
+    """Асинхронная версия search_service.search_descriptions."""
+    return await run_read(search_service.search_descriptions, search_text, source_types, limit, channel=channel)
+
+
+# Плановые операции и отложенные платежи
+
+async def get_occurrences_by_date(occurrence_date: date, *, channel: Optional[str] = None) -> List[Any]:
+    """Асинхронная версия planned_transaction_service.get_occurrences_by_date."""
+    return await run_read(
+        planned_transaction_service.get_occurrences_by_date, occurrence_date,
+        channel=channel, relations=OCCURRENCE_RELATIONS
+    )
+
+
+async def get_occurrences_by_date_range(start_date: date, end_date: date, *, channel: Optional[str] = None) -> List[Any]:
+    """Асинхронная версия planned_transaction_service.get_occurrences_by_date_range."""
+    return await run_read(
+        planned_transaction_service.get_occurrences_by_date_range, start_date, end_date,
+        channel=channel, relations=OCCURRENCE_RELATIONS
+    )
+
+
+async def get_pending_occurrences(limit: int = 5, *, channel: Optional[str] = None) -> List[Any]:
+    """Асинхронная версия planned_transaction_service.get_pending_occurrences."""
+    return await run_read(
+        planned_transaction_service.get_pending_occurrences, limit,
+        channel=channel, relations=OCCURRENCE_RELATIONS
+    )
+
+
+async def get_all_pending_payments(*, channel: Optional[str] = None, **filters: Any) -> List[Any]:
+    """Асинхронная версия pending_payment_service.get_all_pending_payments."""
+    return await run_read(
+        pending_payment_service.get_all_pending_payments,
+        channel=channel, relations=PENDING_PAYMENT_RELATIONS, **filters
+    )
+
+
+async def get_pending_payments_statistics(*, channel: Optional[str] = None) -> Dict[str, Any]:
+    """Асинхронная версия pending_payment_service.get_pending_payments_statistics."""
+    return await run_read(pending_payment_service.get_pending_payments_statistics, channel=channel)
+
+
+# Прогноз баланса
+
+async def calculate_forecast_balance(target_date: date, *, channel: Optional[str] = None) -> Decimal:
+    """Асинхронная версия balance_forecast_service.calculate_forecast_balance."""
+    return await run_read(balance_forecast_service.calculate_forecast_balance, target_date, channel=channel)
+
+
+async def calculate_forecast_balances(
+    dates: Iterable[date],
+    *,
+    channel: Optional[str] = None
+) -> Dict[date, Decimal]:
+    """Асинхронная версия balance_forecast_service.calculate_forecast_balances."""
+    return await run_read(balance_forecast_service.calculate_forecast_balances, list(dates), channel=channel)
+
+
+async def get_forecast_for_period(
+    start_date: date,
+    end_date: date,
+    *,
+    channel: Optional[str] = None
+) -> Dict[date, Tuple[Decimal, Decimal]]:
+    """Асинхронная версия balance_forecast_service.get_forecast_for_period."""
+    return await run_read(balance_forecast_service.get_forecast_for_period, start_date, end_date, channel=channel)
+
+
+async def get_forecast_series(
+    start_date: date,
+    end_date: date,
+    *,
+    channel: Optional[str] = None
+) -> balance_forecast_service.ForecastSeries:
+    """Асинхронная версия balance_forecast_service.get_forecast_series."""
+    return await run_read(balance_forecast_service.get_forecast_series, start_date, end_date, channel=channel)
+
+
+async def detect_cash_gaps(start_date: date, end_date: date, *, channel: Optional[str] = None) -> List[date]:
+    """Асинхронная версия balance_forecast_service.detect_cash_gaps."""
+    return await run_read(balance_forecast_service.detect_cash_gaps, start_date, end_date, channel=channel)
+
+
+async def find_next_cash_gaps(
+    horizon_days: int = balance_forecast_service.DEFAULT_CASH_GAP_HORIZON_DAYS,
+    limit: int = 1,
+    *,
+    channel: Optional[str] = None
+) -> List[balance_forecast_service.CashGap]:
+    """Асинхронная версия balance_forecast_service.find_next_cash_gaps."""
+    return await run_read(balance_forecast_service.find_next_cash_gaps, horizon_days, limit, channel=channel)
+
+
+async def forecast_scenarios(
+    scenarios: List[balance_forecast_service.ForecastScenario],
+    start_date: date,
+    end_date: date,
+    *,
+    channel: Optional[str] = None
+) -> balance_forecast_service.ScenarioForecast:
+    """Асинхронная версия balance_forecast_service.forecast_scenarios."""
+    return await run_read(balance_forecast_service.forecast_scenarios, scenarios, start_date, end_date, channel=channel)
+
+
+# Статистика кредитов
+
+async def get_summary_statistics(*, channel: Optional[str] = None) -> Dict[str, Any]:
+    """Асинхронная версия loan_statistics_service.get_summary_statistics."""
+    return await run_read(loan_statistics_service.get_summary_statistics, channel=channel)
@@ -6,32 +6,68 @@
 - Расчёта прогнозируемого баланса с учётом плановых транзакций и платежей по кредитам
 - Получения прогноза баланса на период
 - Определения кассовых разрывов (когда прогнозируемый баланс становится отрицательным)
+
+Прогноз на период строится одним проходом (get_forecast_series): изменения
+баланса от всех плановых операций складываются в массив копеек по дням
+горизонта, прогноз - нарастающая сумма этого массива от фактического
+баланса на сегодня. Для прошедших дней используется фактический баланс
+из журнала.
+
+Календарь и панель транзакций получают прогноз через общий кэш
+(get_cached_forecast_series и производные): прогноз на горизонт
+пересчитывается только после фиксации изменений данных прогноза
+(номер изменения data_revision) или смены дня.
+
+Ближайшие кассовые разрывы (find_next_cash_gaps) ищутся по прогнозу,
+который строится порциями (первая - FORECAST_CHUNK_DAYS дней, каждая
+следующая вдвое длиннее): поиск останавливается, как только найдено
+нужное количество разрывов, поэтому горизонт в несколько лет не требует
+прогноза на весь горизонт.
+
+Сценарии "что если" (forecast_scenarios) считаются как разреженные
+поправки к базовым изменениям баланса, построенным один раз для всех
+сценариев.
 """
 
 import logging
+from array import array
+from dataclasses import dataclass, field
 from datetime import date, timedelta
 from decimal import Decimal
-from typing import Dict, List, Tuple
+from calendar import monthrange
+from itertools import accumulate, islice
+from typing import Callable, Dict, FrozenSet, Iterable, List, Optional, Tuple
 
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import SQLAlchemyError
 
 from finance_tracker.models.models import (
-    TransactionDB,
     PlannedTransactionDB,
+    LoanDB,
     LoanPaymentDB,
     PendingPaymentDB,
 )
 from finance_tracker.models.enums import (
+    ForecastItemSource,
     TransactionType,
     PaymentStatus,
     PendingPaymentStatus
 )
+from finance_tracker.models.types import minor_to_money, money_to_minor
+from finance_tracker.services.balance_ledger_service import get_balance_at, get_balances_between
 from finance_tracker.services.recurrence_service import generate_occurrences_for_period
+from finance_tracker.utils.cache import cache, data_revision, has_uncommitted_data_changes
 
 # Настройка логирования
 logger = logging.getLogger(__name__)
 
+# Горизонт поиска ближайших кассовых разрывов по умолчанию (дней)
+DEFAULT_CASH_GAP_HORIZON_DAYS = 3 * 365
+
+# Размер первой порции прогноза при поиске кассовых разрывов (дней),
+# каждая следующая порция вдвое длиннее
+FORECAST_CHUNK_DAYS = 92
+
 
 def _get_pending_payments_for_period(
     session: Session,
@@ -101,9 +137,9 @@ def calculate_actual_balance(
     """
     Вычисляет фактический баланс на основе фактических транзакций до указанной даты.
     
-    Функция суммирует все доходы и вычитает все расходы из фактических транзакций,
-    которые произошли до указанной даты (включительно). Плановые транзакции
-    НЕ учитываются в фактическом балансе.
+    Функция возвращает сумму доходов минус сумму расходов фактических транзакций,
+    которые произошли до указанной даты (включительно), по нарастающему итогу
+    журнала баланса. Плановые транзакции НЕ учитываются в фактическом балансе.
     
     Args:
         session: Активная сессия БД для выполнения запросов
@@ -125,24 +161,10 @@ def calculate_actual_balance(
         ...     balance = calculate_actual_balance(session, date(2025, 1, 15))
     """
     try:
-        # Получаем все фактические транзакции до указанной даты
-        transactions = session.query(TransactionDB).filter(
-            TransactionDB.transaction_date <= up_to_date
-        ).all()
-        
-        # Вычисляем баланс
-        balance = Decimal('0.0')
+        # Нарастающий итог журнала баланса: двоичный поиск по дням без сканирования транзакций
+        balance = get_balance_at(session, up_to_date)
         
-        for transaction in transactions:
-            if transaction.type == TransactionType.INCOME:
-                balance += transaction.amount
-            elif transaction.type == TransactionType.EXPENSE:
-                balance -= transaction.amount
-        
-        logger.info(
-            f"Рассчитан фактический баланс на {up_to_date}: {balance:.2f} "
-            f"(транзакций: {len(transactions)})"
-        )
+        logger.info(f"Рассчитан фактический баланс на {up_to_date}: {balance:.2f}")
         
         return balance
         
@@ -152,6 +174,276 @@ def calculate_actual_balance(
         raise
 
 
+@dataclass(frozen=True)
+class ForecastSeries:
+    """
+    Прогноз баланса по дням периода.
+
+    Балансы хранятся в копейках в массивах array("q"), по одному элементу
+    на день начиная с start_date.
+
+    Attributes:
+        start_date: Первый день периода
+        actual: Фактический баланс на конец дня (для будущих дней - баланс на сегодня)
+        predicted: Прогнозируемый баланс на конец дня (для прошедших дней совпадает с фактическим)
+    """
+    start_date: date
+    actual: array
+    predicted: array
+
+    def __len__(self) -> int:
+        return len(self.predicted)
+
+    @property
+    def end_date(self) -> date:
+        """Последний день периода."""
+        return self.start_date + timedelta(days=len(self.predicted) - 1)
+
+    def predicted_at(self, day: date) -> Decimal:
+        """Прогнозируемый баланс на конец дня периода."""
+        return minor_to_money(self.predicted[(day - self.start_date).days])
+
+    def to_dict(self) -> Dict[date, Tuple[Decimal, Decimal]]:
+        """Прогноз в виде {дата: (фактический_баланс, прогнозируемый_баланс)}."""
+        return {
+            self.start_date + timedelta(days=offset): (minor_to_money(actual), minor_to_money(predicted))
+            for offset, (actual, predicted) in enumerate(zip(self.actual, self.predicted))
+        }
+
+
+@dataclass(frozen=True)
+class ForecastItem:
+    """
+    Плановая операция, учитываемая в прогнозе баланса.
+
+    Attributes:
+        item_date: Дата операции
+        amount: Изменение баланса (отрицательное для расходов)
+        source: Источник операции
+        source_id: ID плановой транзакции, платежа по кредиту или отложенного платежа
+        description: Описание операции (для платежа по кредиту - название кредита)
+    """
+    item_date: date
+    amount: Decimal
+    source: ForecastItemSource
+    source_id: str
+    description: Optional[str]
+
+
+@dataclass(frozen=True)
+class CashGap:
+    """
+    Кассовый разрыв - непрерывный период с отрицательным прогнозируемым балансом.
+
+    Attributes:
+        start_date: Первый день с отрицательным балансом
+        end_date: Последний день с отрицательным балансом (не позже конца горизонта)
+        depth: Наибольшая нехватка средств (модуль минимального баланса)
+        deepest_date: День минимального баланса
+        causes: Плановые расходы с начала разрыва до дня минимального баланса
+        continues_past_horizon: Баланс отрицателен и в последний день горизонта
+    """
+    start_date: date
+    end_date: date
+    depth: Decimal
+    deepest_date: date
+    causes: List[ForecastItem]
+    continues_past_horizon: bool = False
+
+
+@dataclass(frozen=True)
+class ForecastScenario:
+    """
+    Сценарий "что если": изменения плановых операций относительно базового прогноза.
+
+    Все даты сценария должны быть позже сегодняшнего дня.
+
+    Attributes:
+        name: Название сценария
+        skipped_planned_ids: Плановые транзакции, вхождения которых не исполняются
+        shifted_planned: Сдвиг вхождений плановых транзакций в днях {ID: дней}
+        pending_payment_dates: Даты исполнения отложенных платежей {ID: дата}
+        early_repayments: Досрочное погашение кредитов {ID кредита: дата}:
+            платежи после даты заменяются выплатой их основного долга в эту дату
+        extra_amounts: Дополнительные разовые операции [(дата, сумма со знаком)]
+    """
+    name: str
+    skipped_planned_ids: FrozenSet[str] = frozenset()
+    shifted_planned: Dict[str, int] = field(default_factory=dict)
+    pending_payment_dates: Dict[str, date] = field(default_factory=dict)
+    early_repayments: Dict[str, date] = field(default_factory=dict)
+    extra_amounts: List[Tuple[date, Decimal]] = field(default_factory=list)
+
+
+@dataclass(frozen=True)
+class ScenarioForecast:
+    """
+    Прогнозы баланса по сценариям на общий период.
+
+    Балансы хранятся в копейках: baseline - базовый прогноз, balances -
+    таблица [сценарий][день] в порядке переданных сценариев.
+
+    Attributes:
+        start_date: Первый день периода
+        scenario_names: Названия сценариев
+        baseline: Базовый прогноз по дням
+        balances: Прогноз по дням для каждого сценария
+        minimum_balances: Минимальный прогнозируемый баланс каждого сценария
+        minimum_dates: Первый день минимального баланса каждого сценария
+    """
+    start_date: date
+    scenario_names: List[str]
+    baseline: array
+    balances: List[array]
+    minimum_balances: List[Decimal]
+    minimum_dates: List[date]
+
+    def predicted_at(self, scenario_index: int, day: date) -> Decimal:
+        """Прогнозируемый баланс сценария на конец дня периода."""
+        return minor_to_money(self.balances[scenario_index][(day - self.start_date).days])
+
+
+def _active_planned_transactions(session: Session) -> List[PlannedTransactionDB]:
+    """Активные плановые транзакции, учитываемые в прогнозе."""
+    return session.query(PlannedTransactionDB).filter(PlannedTransactionDB.is_active).all()
+
+
+def _forecast_deltas(
+    session: Session,
+    first_day: date,
+    last_day: date,
+    planned_transactions: Optional[List[PlannedTransactionDB]] = None
+) -> array:
+    """
+    Изменения баланса по дням [first_day, last_day] от плановых операций (в копейках).
+
+    Учитываются вхождения активных плановых транзакций, неисполненные
+    платежи по кредитам и активные отложенные платежи с плановой датой.
+    Плановые транзакции можно передать заранее загруженными (при расчёте
+    прогноза порциями они загружаются один раз).
+    """
+    deltas = array("q", bytes(8 * ((last_day - first_day).days + 1)))
+
+    if planned_transactions is None:
+        planned_transactions = _active_planned_transactions(session)
+    for planned_tx in planned_transactions:
+        amount = money_to_minor(planned_tx.amount)
+        if planned_tx.type == TransactionType.EXPENSE:
+            amount = -amount
+        for occurrence_date in generate_occurrences_for_period(session, planned_tx, first_day, last_day):
+            deltas[(occurrence_date - first_day).days] += amount
+
+    # Платежи по кредитам - расходы
+    loan_payments = session.query(LoanPaymentDB.scheduled_date, LoanPaymentDB.total_amount).filter(
+        LoanPaymentDB.scheduled_date >= first_day,
+        LoanPaymentDB.scheduled_date <= last_day,
+        LoanPaymentDB.status.in_([PaymentStatus.PENDING, PaymentStatus.OVERDUE])
+    ).all()
+    for scheduled_date, total_amount in loan_payments:
+        deltas[(scheduled_date - first_day).days] -= money_to_minor(total_amount)
+
+    # Согласно правилу календаря: если отложенный платёж имеет planned_date,
+    # он учитывается в прогнозе как расход
+    pending_payments = _get_pending_payments_for_period(session, first_day, last_day)
+    for pending_payment in pending_payments:
+        deltas[(pending_payment.planned_date - first_day).days] -= money_to_minor(pending_payment.amount)
+
+    logger.debug(
+        f"Изменения баланса за {first_day} - {first_day + timedelta(days=len(deltas) - 1)}: "
+        f"плановых транзакций {len(planned_transactions)}, платежей по кредитам {len(loan_payments)}, "
+        f"отложенных платежей {len(pending_payments)}"
+    )
+    return deltas
+
+
+def _forecast_outflows(
+    session: Session,
+    first_day: date,
+    last_day: date,
+    planned_transactions: List[PlannedTransactionDB]
+) -> List[ForecastItem]:
+    """Плановые расходы за дни [first_day, last_day] по возрастанию даты."""
+    items: List[ForecastItem] = []
+    for planned_tx in planned_transactions:
+        if planned_tx.type != TransactionType.EXPENSE:
+            continue
+        for occurrence_date in generate_occurrences_for_period(session, planned_tx, first_day, last_day):
+            items.append(ForecastItem(
+                occurrence_date, -planned_tx.amount, ForecastItemSource.PLANNED_TRANSACTION,
+                planned_tx.id, planned_tx.description
+            ))
+
+    loan_payments = session.query(
+        LoanPaymentDB.id, LoanPaymentDB.scheduled_date, LoanPaymentDB.total_amount, LoanDB.name
+    ).join(LoanDB, LoanPaymentDB.loan_id == LoanDB.id).filter(
+        LoanPaymentDB.scheduled_date >= first_day,
+        LoanPaymentDB.scheduled_date <= last_day,
+        LoanPaymentDB.status.in_([PaymentStatus.PENDING, PaymentStatus.OVERDUE])
+    ).all()
+    for payment_id, scheduled_date, total_amount, loan_name in loan_payments:
+        items.append(ForecastItem(scheduled_date, -total_amount, ForecastItemSource.LOAN_PAYMENT, payment_id, loan_name))
+
+    for pending_payment in _get_pending_payments_for_period(session, first_day, last_day):
+        items.append(ForecastItem(
+            pending_payment.planned_date, -pending_payment.amount, ForecastItemSource.PENDING_PAYMENT,
+            pending_payment.id, pending_payment.description
+        ))
+
+    items.sort(key=lambda item: (item.item_date, item.amount))
+    return items
+
+
+def get_forecast_series(
+    session: Session,
+    start_date: date,
+    end_date: date
+) -> ForecastSeries:
+    """
+    Строит прогноз баланса на период одним проходом.
+
+    Для дней до сегодняшнего включительно фактический и прогнозируемый
+    балансы берутся из журнала баланса. Для будущих дней прогноз - баланс
+    на сегодня плюс нарастающая сумма изменений от плановых операций,
+    начиная с завтрашнего дня (в том числе до start_date).
+
+    Args:
+        session: Активная сессия БД для выполнения запросов
+        start_date: Начало периода для прогноза
+        end_date: Конец периода для прогноза (включительно)
+
+    Returns:
+        ForecastSeries: Фактический и прогнозируемый балансы по дням периода
+
+    Raises:
+        ValueError: Если start_date > end_date
+        SQLAlchemyError: При ошибках работы с БД
+    """
+    if start_date > end_date:
+        error_msg = f"Дата начала ({start_date}) не может быть позже даты окончания ({end_date})"
+        logger.error(error_msg)
+        raise ValueError(error_msg)
+
+    try:
+        today = date.today()
+        actual = get_balances_between(session, start_date, min(end_date, today))
+        predicted = array("q", actual)
+
+        if end_date > today:
+            tomorrow = today + timedelta(days=1)
+            anchor = money_to_minor(calculate_actual_balance(session, today))
+            deltas = _forecast_deltas(session, tomorrow, end_date)
+            skip = max((start_date - tomorrow).days, 0)
+            predicted.extend(islice(accumulate(deltas, initial=anchor), skip + 1, None))
+            actual.extend([anchor] * (len(predicted) - len(actual)))
+
+        return ForecastSeries(start_date, actual, predicted)
+
+    except SQLAlchemyError as e:
+        error_msg = f"Ошибка при расчёте прогноза для периода {start_date} - {end_date}: {e}"
+        logger.error(error_msg)
+        raise
+
+
 def calculate_forecast_balance(
     session: Session,
     target_date: date
@@ -187,75 +479,89 @@ def calculate_forecast_balance(
         ...     print(f"Прогнозируемый баланс через месяц: {forecast}")
     """
     try:
-        # Получаем фактический баланс на сегодня
+        # Если target_date в прошлом или сегодня, возвращаем фактический баланс на сегодня
         today = date.today()
-        actual_balance = calculate_actual_balance(session, today)
-
-        # Если target_date в прошлом или сегодня, возвращаем фактический баланс
         if target_date <= today:
-            return actual_balance
+            return calculate_actual_balance(session, today)
 
-        # Получаем все активные плановые транзакции
-        planned_transactions = session.query(PlannedTransactionDB).filter(
-            PlannedTransactionDB.is_active
-        ).all()
+        forecast_balance = get_forecast_series(session, target_date, target_date).predicted_at(target_date)
 
-        # Вычисляем прогнозируемый баланс
-        forecast_balance = actual_balance
+        logger.info(f"Рассчитан прогнозируемый баланс на {target_date}: {forecast_balance:.2f}")
 
-        for planned_tx in planned_transactions:
-            # <ai:step type="calculation">Генерируем вхождения для периода</ai:step>
-            occurrences = generate_occurrences_for_period(
-                session,
-                planned_tx,
-                today + timedelta(days=1),  # Начинаем с завтрашнего дня
-                target_date
-            )
+        return forecast_balance
 
-            # Добавляем/вычитаем суммы плановых транзакций
-            for occurrence_date in occurrences:
-                if planned_tx.type == TransactionType.INCOME:
-                    forecast_balance += planned_tx.amount
-                elif planned_tx.type == TransactionType.EXPENSE:
-                    forecast_balance -= planned_tx.amount
-
-        # <ai:step type="calculation">Учитываем платежи по кредитам</ai:step>
-        # Получаем все неисполненные платежи до target_date
-        loan_payments = session.query(LoanPaymentDB).filter(
-            LoanPaymentDB.scheduled_date > today,
-            LoanPaymentDB.scheduled_date <= target_date,
-            LoanPaymentDB.status.in_([PaymentStatus.PENDING, PaymentStatus.OVERDUE])
-        ).all()
+    except SQLAlchemyError as e:
+        error_msg = f"Ошибка при расчёте прогнозируемого баланса на {target_date}: {e}"
+        logger.error(error_msg)
+        raise
 
-        for payment in loan_payments:
-            # Платежи - это расходы, поэтому вычитаем их из прогноза
-            forecast_balance -= payment.total_amount
-
-        # <ai:step type="calculation">Учитываем отложенные платежи с плановой датой</ai:step>
-        # Получаем активные отложенные платежи с плановой датой до target_date
-        # Согласно правилу календаря: если платёж имеет planned_date, он учитывается в прогнозе
-        pending_payments = _get_pending_payments_for_period(
-            session,
-            today + timedelta(days=1),  # Начинаем с завтрашнего дня
-            target_date
-        )
 
-        for pending_payment in pending_payments:
-            # Отложенные платежи - это всегда расходы, поэтому вычитаем их из прогноза
-            forecast_balance -= pending_payment.amount
+def _balances_for_dates(
+    session: Session,
+    dates: List[date],
+    series_for: Callable[[date, date], ForecastSeries]
+) -> Dict[date, Decimal]:
+    """
+    Прогнозируемые балансы на отсортированные даты по одному прогнозу.
 
-        logger.info(
-            f"Рассчитан прогнозируемый баланс на {target_date}: {forecast_balance:.2f} "
-            f"(фактический: {actual_balance:.2f}, плановых транзакций: {len(planned_transactions)}, "
-            f"платежей по кредитам: {len(loan_payments)}, "
-            f"отложенных платежей: {len(pending_payments)})"
-        )
+    Будущие даты берутся из прогноза на [первая будущая, последняя], даты
+    до сегодняшнего включительно получают баланс на сегодня - опорный баланс
+    того же прогноза (как в calculate_forecast_balance).
+    """
+    today = date.today()
+    future = [day for day in dates if day > today]
+    balances: Dict[date, Decimal] = {}
+    if future:
+        series = series_for(future[0], future[-1])
+        # Прогноз из кэша может начинаться раньше сегодняшнего дня
+        today_offset = max((today - series.start_date).days, 0)
+        current = minor_to_money(series.actual[today_offset])
+        balances.update((day, series.predicted_at(day)) for day in future)
+    elif dates:
+        current = calculate_actual_balance(session, today)
+    for day in dates:
+        if day <= today:
+            balances[day] = current
+    return balances
 
-        return forecast_balance
+
+def calculate_forecast_balances(
+    session: Session,
+    dates: Iterable[date]
+) -> Dict[date, Decimal]:
+    """
+    Вычисляет прогнозируемые балансы сразу на несколько дат.
+
+    В отличие от calculate_forecast_balance для каждой даты, плановые
+    операции запрашиваются и повторения разворачиваются один раз (прогноз
+    get_forecast_series от первой до последней будущей даты), фактический
+    баланс на сегодня тоже вычисляется один раз. Для дат до сегодняшнего
+    дня включительно возвращается фактический баланс на сегодня.
+
+    Args:
+        session: Активная сессия БД для выполнения запросов
+        dates: Даты (порядок и повторы не важны)
+
+    Returns:
+        Словарь {дата: прогнозируемый_баланс} для всех переданных дат
+
+    Raises:
+        SQLAlchemyError: При ошибках работы с БД
+
+    Example:
+        >>> with get_db_session() as session:
+        ...     month = [date(2025, 3, day) for day in range(1, 32)]
+        ...     balances = calculate_forecast_balances(session, month)
+        ...     print(f"Баланс на конец месяца: {balances[date(2025, 3, 31)]}")
+    """
+    dates = sorted(set(dates))
+    try:
+        balances = _balances_for_dates(session, dates, lambda first, last: get_forecast_series(session, first, last))
+        logger.info(f"Рассчитан прогнозируемый баланс на {len(balances)} дат")
+        return balances
 
     except SQLAlchemyError as e:
-        error_msg = f"Ошибка при расчёте прогнозируемого баланса на {target_date}: {e}"
-        logger.error(error_msg)
+        logger.error(f"Ошибка при расчёте прогнозируемых балансов на {len(dates)} дат: {e}")
         raise
 
 
@@ -271,7 +577,8 @@ def get_forecast_for_period(
     в указанном периоде. Используется для отображения прогноза в календаре
     и для анализа финансового состояния на период.
 
-    Учитывает плановые транзакции и платежи по кредитам.
+    Учитывает плановые транзакции и платежи по кредитам. Словарь строится
+    по прогнозу get_forecast_series.
 
     Args:
         session: Активная сессия БД для выполнения запросов
@@ -299,114 +606,20 @@ def get_forecast_for_period(
         ...     for forecast_date, (actual, predicted) in forecast.items():
         ...         print(f"{forecast_date}: факт={actual}, прогноз={predicted}")
     """
-    # Валидация входных данных (Fail Fast)
-    if start_date > end_date:
-        error_msg = f"Дата начала ({start_date}) не может быть позже даты окончания ({end_date})"
-        logger.error(error_msg)
-        raise ValueError(error_msg)
+    forecast = get_forecast_series(session, start_date, end_date).to_dict()
 
-    try:
-        forecast: Dict[date, Tuple[Decimal, Decimal]] = {}
-        today = date.today()
+    logger.info(f"Рассчитан прогноз для периода {start_date} - {end_date} ({len(forecast)} дат)")
 
-        # Получаем фактический баланс на сегодня
-        actual_balance_today = calculate_actual_balance(session, today)
+    return forecast
 
-        # Получаем все активные плановые транзакции
-        planned_transactions = session.query(PlannedTransactionDB).filter(
-            PlannedTransactionDB.is_active
-        ).all()
 
-        # Создаём словарь плановых транзакций по датам
-        planned_by_date: Dict[date, List[PlannedTransactionDB]] = {}
-
-        for planned_tx in planned_transactions:
-            # Генерируем вхождения для всего периода
-            occurrences = generate_occurrences_for_period(
-                session,
-                planned_tx,
-                start_date,
-                end_date
-            )
-
-            for occurrence_date in occurrences:
-                if occurrence_date not in planned_by_date:
-                    planned_by_date[occurrence_date] = []
-                planned_by_date[occurrence_date].append(planned_tx)
-
-        # <ai:step type="calculation">Получаем платежи по кредитам для периода</ai:step>
-        # Получаем все неисполненные платежи по кредитам в периоде
-        loan_payments = session.query(LoanPaymentDB).filter(
-            LoanPaymentDB.scheduled_date >= start_date,
-            LoanPaymentDB.scheduled_date <= end_date,
-            LoanPaymentDB.status.in_([PaymentStatus.PENDING, PaymentStatus.OVERDUE])
-        ).all()
-
-        # Создаём словарь платежей по датам
-        payments_by_date: Dict[date, List[LoanPaymentDB]] = {}
-        for payment in loan_payments:
-            if payment.scheduled_date not in payments_by_date:
-                payments_by_date[payment.scheduled_date] = []
-            payments_by_date[payment.scheduled_date].append(payment)
-
-        # <ai:step type="calculation">Получаем отложенные платежи с плановой датой для периода</ai:step>
-        # Согласно правилу календаря: если платёж имеет planned_date, он учитывается в прогнозе
-        pending_payments = _get_pending_payments_for_period(session, start_date, end_date)
-
-        # Создаём словарь отложенных платежей по датам
-        pending_by_date: Dict[date, List[PendingPaymentDB]] = {}
-        for pending_payment in pending_payments:
-            if pending_payment.planned_date not in pending_by_date:
-                pending_by_date[pending_payment.planned_date] = []
-            pending_by_date[pending_payment.planned_date].append(pending_payment)
-
-        # Рассчитываем баланс для каждой даты в периоде
-        current_date = start_date
-        running_balance = actual_balance_today
-
-        while current_date <= end_date:
-            # Для дат в прошлом или сегодня используем фактический баланс
-            if current_date <= today:
-                actual_balance = calculate_actual_balance(session, current_date)
-                forecast[current_date] = (actual_balance, actual_balance)
-                running_balance = actual_balance
-            else:
-                # Для будущих дат рассчитываем прогноз
-                # Применяем плановые транзакции на текущую дату
-                if current_date in planned_by_date:
-                    for planned_tx in planned_by_date[current_date]:
-                        if planned_tx.type == TransactionType.INCOME:
-                            running_balance += planned_tx.amount
-                        elif planned_tx.type == TransactionType.EXPENSE:
-                            running_balance -= planned_tx.amount
-
-                # Применяем платежи по кредитам на текущую дату
-                if current_date in payments_by_date:
-                    for payment in payments_by_date[current_date]:
-                        running_balance -= payment.amount
-
-                # Применяем отложенные платежи на текущую дату
-                if current_date in pending_by_date:
-                    for pending_payment in pending_by_date[current_date]:
-                        # Отложенные платежи - это всегда расходы
-                        running_balance -= pending_payment.amount
-
-                # Фактический баланс для будущих дат = баланс на сегодня
-                forecast[current_date] = (actual_balance_today, running_balance)
-
-            current_date += timedelta(days=1)
-        
-        logger.info(
-            f"Рассчитан прогноз для периода {start_date} - {end_date} "
-            f"({len(forecast)} дат, плановых транзакций: {len(planned_transactions)})"
-        )
-        
-        return forecast
-        
-    except SQLAlchemyError as e:
-        error_msg = f"Ошибка при расчёте прогноза для периода {start_date} - {end_date}: {e}"
-        logger.error(error_msg)
-        raise
+def _negative_days(series: ForecastSeries) -> List[date]:
+    """Дни прогноза с отрицательным прогнозируемым балансом."""
+    return [
+        series.start_date + timedelta(days=offset)
+        for offset, predicted_balance in enumerate(series.predicted)
+        if predicted_balance < 0
+    ]
 
 
 def detect_cash_gaps(
@@ -451,35 +664,430 @@ def detect_cash_gaps(
         ...     else:
         ...         print("Кассовых разрывов не обнаружено")
     """
-    # Валидация входных данных (Fail Fast)
+    cash_gaps = _negative_days(get_forecast_series(session, start_date, end_date))
+
+    if cash_gaps:
+        logger.warning(
+            f"Обнаружено {len(cash_gaps)} кассовых разрывов в периоде {start_date} - {end_date}"
+        )
+    else:
+        logger.info(
+            f"Кассовых разрывов не обнаружено в периоде {start_date} - {end_date}"
+        )
+
+    return cash_gaps
+
+
+def find_next_cash_gaps(
+    session: Session,
+    horizon_days: int = DEFAULT_CASH_GAP_HORIZON_DAYS,
+    limit: int = 1
+) -> List[CashGap]:
+    """
+    Находит ближайшие кассовые разрывы начиная с сегодняшнего дня.
+
+    Прогноз строится порциями: первая - FORECAST_CHUNK_DAYS дней, каждая
+    следующая вдвое длиннее, поэтому количество запросов растёт как логарифм
+    горизонта. Поиск останавливается, как только найдено limit разрывов:
+    ближайший разрыв на горизонте в несколько лет находится без прогноза
+    на весь горизонт. Разрыв, начавшийся до конца горизонта, завершается
+    последним днём горизонта (continues_past_horizon=True).
+
+    Args:
+        session: Активная сессия БД для выполнения запросов
+        horizon_days: Горизонт поиска в днях от сегодняшнего дня
+        limit: Максимальное количество разрывов
+
+    Returns:
+        Список разрывов по возрастанию даты начала (пустой, если разрывов нет)
+
+    Raises:
+        ValueError: Если horizon_days < 0 или limit < 1
+        SQLAlchemyError: При ошибках работы с БД
+
+    Example:
+        >>> with get_db_session() as session:
+        ...     gaps = find_next_cash_gaps(session, horizon_days=2 * 365)
+        ...     if gaps:
+        ...         print(f"Кассовый разрыв с {gaps[0].start_date}, не хватает {gaps[0].depth}")
+    """
+    if horizon_days < 0:
+        raise ValueError(f"Горизонт поиска не может быть отрицательным: {horizon_days}")
+    if limit < 1:
+        raise ValueError(f"Количество разрывов должно быть положительным: {limit}")
+
+    try:
+        today = date.today()
+        horizon_end = today + timedelta(days=horizon_days)
+        planned_transactions = _active_planned_transactions(session)
+        gaps: List[CashGap] = []
+        # Открытый разрыв: [первый день, минимальный баланс, день минимума]
+        open_gap: Optional[list] = None
+
+        def close_gap(end_date: date, continues_past_horizon: bool = False) -> None:
+            start_date, min_balance, deepest_date = open_gap
+            causes = []
+            if deepest_date > today:
+                causes = _forecast_outflows(
+                    session, max(start_date, today + timedelta(days=1)), deepest_date, planned_transactions
+                )
+            gaps.append(CashGap(
+                start_date, end_date, minor_to_money(-min_balance), deepest_date, causes, continues_past_horizon
+            ))
+
+        balance = money_to_minor(calculate_actual_balance(session, today))
+        if balance < 0:
+            open_gap = [today, balance, today]
+
+        chunk_start = today + timedelta(days=1)
+        chunk_days = FORECAST_CHUNK_DAYS
+        while chunk_start <= horizon_end and len(gaps) < limit:
+            chunk_end = min(chunk_start + timedelta(days=chunk_days - 1), horizon_end)
+            chunk_days *= 2
+            deltas = _forecast_deltas(session, chunk_start, chunk_end, planned_transactions)
+            # Порция без отрицательных балансов вне разрыва пропускается без обхода по дням
+            balances = list(accumulate(deltas, initial=balance))
+            if open_gap is None and min(balances) >= 0:
+                balance = balances[-1]
+                chunk_start = chunk_end + timedelta(days=1)
+                continue
+
+            for offset, balance in enumerate(islice(balances, 1, None)):
+                day = chunk_start + timedelta(days=offset)
+                if balance < 0:
+                    if open_gap is None:
+                        open_gap = [day, balance, day]
+                    elif balance < open_gap[1]:
+                        open_gap[1:] = [balance, day]
+                elif open_gap is not None:
+                    close_gap(day - timedelta(days=1))
+                    open_gap = None
+                    if len(gaps) >= limit:
+                        break
+            chunk_start = chunk_end + timedelta(days=1)
+
+        if open_gap is not None and len(gaps) < limit:
+            close_gap(horizon_end, continues_past_horizon=True)
+
+        if gaps:
+            logger.warning(
+                f"Ближайший кассовый разрыв с {gaps[0].start_date} (найдено {len(gaps)} "
+                f"на горизонте до {horizon_end})"
+            )
+        else:
+            logger.info(f"Кассовых разрывов не обнаружено до {horizon_end}")
+        return gaps
+
+    except SQLAlchemyError as e:
+        logger.error(f"Ошибка при поиске кассовых разрывов на {horizon_days} дней: {e}")
+        raise
+
+
+def _signed_minor(planned_tx: PlannedTransactionDB) -> int:
+    """Изменение баланса от вхождения плановой транзакции (в копейках)."""
+    amount = money_to_minor(planned_tx.amount)
+    return -amount if planned_tx.type == TransactionType.EXPENSE else amount
+
+
+def forecast_scenarios(
+    session: Session,
+    scenarios: List[ForecastScenario],
+    start_date: date,
+    end_date: date
+) -> ScenarioForecast:
+    """
+    Строит прогноз баланса на период сразу для многих сценариев "что если".
+
+    Базовые изменения баланса по дням строятся один раз (как в
+    get_forecast_series). Каждый сценарий - разреженная поправка к ним:
+    изменения только в днях затронутых операций. Данные, на которые
+    ссылаются сценарии (вхождения плановых транзакций, отложенные платежи,
+    платежи по кредитам), загружаются одним запросом на вид данных для
+    всех сценариев, поэтому стоимость сотни сценариев близка к стоимости одного.
+
+    Прошедшие дни периода (до сегодняшнего включительно) во всех сценариях
+    совпадают с фактическим балансом.
+
+    Args:
+        session: Активная сессия БД для выполнения запросов
+        scenarios: Сценарии
+        start_date: Начало периода для прогноза
+        end_date: Конец периода для прогноза (включительно)
+
+    Returns:
+        ScenarioForecast: Базовый прогноз, прогнозы и минимальные балансы сценариев
+
+    Raises:
+        ValueError: Если start_date > end_date, дата сценария не позже сегодняшнего
+            дня или сценарий ссылается на несуществующие или неактивные данные
+        SQLAlchemyError: При ошибках работы с БД
+
+    Example:
+        >>> with get_db_session() as session:
+        ...     result = forecast_scenarios(session, [
+        ...         ForecastScenario("Без отпуска", skipped_planned_ids=frozenset({vacation_id})),
+        ...         ForecastScenario("Зарплата позже", shifted_planned={salary_id: 3}),
+        ...     ], date.today(), date.today() + timedelta(days=90))
+        ...     for name, minimum in zip(result.scenario_names, result.minimum_balances):
+        ...         print(f"{name}: минимальный баланс {minimum}")
+    """
     if start_date > end_date:
         error_msg = f"Дата начала ({start_date}) не может быть позже даты окончания ({end_date})"
         logger.error(error_msg)
         raise ValueError(error_msg)
-    
+
+    today = date.today()
+    tomorrow = today + timedelta(days=1)
+    for scenario in scenarios:
+        scenario_dates = (
+            list(scenario.pending_payment_dates.values()) + list(scenario.early_repayments.values())
+            + [item_date for item_date, _ in scenario.extra_amounts]
+        )
+        if any(scenario_date <= today for scenario_date in scenario_dates):
+            raise ValueError(f"Сценарий '{scenario.name}': даты изменений должны быть позже {today}")
+
     try:
-        # Получаем прогноз для периода
-        forecast = get_forecast_for_period(session, start_date, end_date)
-        
-        # Находим даты с отрицательным прогнозируемым балансом
-        cash_gaps: List[date] = []
-        
-        for forecast_date, (actual_balance, predicted_balance) in forecast.items():
-            if predicted_balance < Decimal('0'):
-                cash_gaps.append(forecast_date)
-        
-        if cash_gaps:
-            logger.warning(
-                f"Обнаружено {len(cash_gaps)} кассовых разрывов в периоде {start_date} - {end_date}"
+        past = get_balances_between(session, start_date, min(end_date, today))
+        if end_date <= today:
+            rows = [array("q", past) for _ in scenarios]
+            return _scenario_result(start_date, scenarios, past, rows)
+
+        planned_transactions = _active_planned_transactions(session)
+        anchor = money_to_minor(calculate_actual_balance(session, today))
+        deltas = _forecast_deltas(session, tomorrow, end_date, planned_transactions)
+        skip = max((start_date - tomorrow).days, 0)
+
+        # Данные, на которые ссылаются сценарии, - по одному запросу на вид
+        planned_by_id = {planned_tx.id: planned_tx for planned_tx in planned_transactions}
+        max_shift = max((abs(days) for s in scenarios for days in s.shifted_planned.values()), default=0)
+        occurrences: Dict[str, List[date]] = {}
+        for planned_id in {pid for s in scenarios for pid in (*s.skipped_planned_ids, *s.shifted_planned)}:
+            if planned_id not in planned_by_id:
+                raise ValueError(f"Плановая транзакция {planned_id} не найдена или неактивна")
+            occurrences[planned_id] = generate_occurrences_for_period(
+                session, planned_by_id[planned_id], tomorrow, end_date + timedelta(days=max_shift)
             )
-        else:
-            logger.info(
-                f"Кассовых разрывов не обнаружено в периоде {start_date} - {end_date}"
+
+        pending_ids = {pid for s in scenarios for pid in s.pending_payment_dates}
+        pending_by_id = {
+            payment.id: payment
+            for payment in session.query(PendingPaymentDB).filter(
+                PendingPaymentDB.id.in_(pending_ids),
+                PendingPaymentDB.status == PendingPaymentStatus.ACTIVE
             )
-        
-        return cash_gaps
-        
+        } if pending_ids else {}
+        missing = pending_ids - pending_by_id.keys()
+        if missing:
+            raise ValueError(f"Активные отложенные платежи не найдены: {', '.join(sorted(missing))}")
+
+        loan_ids = {lid for s in scenarios for lid in s.early_repayments}
+        loan_payments: Dict[str, List[Tuple[date, Decimal, Decimal]]] = {loan_id: [] for loan_id in loan_ids}
+        if loan_ids:
+            for loan_id, scheduled_date, principal, total in session.query(
+                LoanPaymentDB.loan_id, LoanPaymentDB.scheduled_date,
+                LoanPaymentDB.principal_amount, LoanPaymentDB.total_amount
+            ).filter(
+                LoanPaymentDB.loan_id.in_(loan_ids),
+                LoanPaymentDB.scheduled_date >= tomorrow,
+                LoanPaymentDB.status.in_([PaymentStatus.PENDING, PaymentStatus.OVERDUE])
+            ):
+                loan_payments[loan_id].append((scheduled_date, principal, total))
+
+        def add(overlay: Dict[int, int], day: date, amount: int) -> None:
+            if day <= end_date:
+                index = (day - tomorrow).days
+                overlay[index] = overlay.get(index, 0) + amount
+
+        rows = []
+        for scenario in scenarios:
+            overlay: Dict[int, int] = {}
+            for planned_id in scenario.skipped_planned_ids:
+                amount = _signed_minor(planned_by_id[planned_id])
+                for occurrence_date in occurrences[planned_id]:
+                    add(overlay, occurrence_date, -amount)
+            for planned_id, days in scenario.shifted_planned.items():
+                if planned_id in scenario.skipped_planned_ids:
+                    continue
+                amount = _signed_minor(planned_by_id[planned_id])
+                for occurrence_date in occurrences[planned_id]:
+                    add(overlay, occurrence_date, -amount)
+                    add(overlay, max(occurrence_date + timedelta(days=days), tomorrow), amount)
+            for payment_id, payment_date in scenario.pending_payment_dates.items():
+                payment = pending_by_id[payment_id]
+                amount = money_to_minor(payment.amount)
+                if payment.planned_date is not None and payment.planned_date >= tomorrow:
+                    add(overlay, payment.planned_date, amount)
+                add(overlay, payment_date, -amount)
+            for loan_id, repayment_date in scenario.early_repayments.items():
+                principal_left = 0
+                for scheduled_date, principal, total in loan_payments[loan_id]:
+                    if scheduled_date > repayment_date:
+                        add(overlay, scheduled_date, money_to_minor(total))
+                        principal_left += money_to_minor(principal)
+                add(overlay, repayment_date, -principal_left)
+            for item_date, amount in scenario.extra_amounts:
+                add(overlay, item_date, money_to_minor(amount))
+
+            scenario_deltas = array("q", deltas)
+            for index, amount in overlay.items():
+                scenario_deltas[index] += amount
+            row = array("q", past)
+            row.extend(islice(accumulate(scenario_deltas, initial=anchor), skip + 1, None))
+            rows.append(row)
+
+        baseline = array("q", past)
+        baseline.extend(islice(accumulate(deltas, initial=anchor), skip + 1, None))
+        logger.info(f"Рассчитан прогноз {len(scenarios)} сценариев для периода {start_date} - {end_date}")
+        return _scenario_result(start_date, scenarios, baseline, rows)
+
     except SQLAlchemyError as e:
-        error_msg = f"Ошибка при определении кассовых разрывов для периода {start_date} - {end_date}: {e}"
-        logger.error(error_msg)
+        logger.error(f"Ошибка при расчёте сценариев прогноза для периода {start_date} - {end_date}: {e}")
         raise
+
+
+def _scenario_result(
+    start_date: date,
+    scenarios: List[ForecastScenario],
+    baseline: array,
+    rows: List[array]
+) -> ScenarioForecast:
+    """Собирает результат сценариев с минимальными балансами."""
+    minimum_indexes = [min(range(len(row)), key=row.__getitem__) for row in rows]
+    return ScenarioForecast(
+        start_date=start_date,
+        scenario_names=[scenario.name for scenario in scenarios],
+        baseline=baseline,
+        balances=rows,
+        minimum_balances=[minor_to_money(row[index]) for row, index in zip(rows, minimum_indexes)],
+        minimum_dates=[start_date + timedelta(days=index) for index in minimum_indexes],
+    )
+
+
+def _cache_scope(session: Session) -> Tuple:
+    """Общая часть ключа кэша прогнозов: БД, номер изменения данных, текущий день."""
+    return session.get_bind(), data_revision.value, date.today()
+
+
+def get_cached_forecast_series(
+    session: Session,
+    start_date: date,
+    end_date: date
+) -> ForecastSeries:
+    """
+    Возвращает прогноз на период из общего кэша прогнозов.
+
+    Прогноз пересчитывается, только если после его построения были
+    зафиксированы изменения транзакций, плановых операций, платежей по
+    кредитам или отложенных платежей, либо сменился день. Кэш ограничен
+    (давно не использованные горизонты вытесняются). Если в сессии есть
+    незафиксированные изменения, прогноз строится без кэша.
+
+    Args:
+        session: Активная сессия БД для выполнения запросов
+        start_date: Начало периода для прогноза
+        end_date: Конец периода для прогноза (включительно)
+
+    Returns:
+        ForecastSeries: Прогноз по дням периода
+
+    Raises:
+        ValueError: Если start_date > end_date
+        SQLAlchemyError: При ошибках работы с БД
+    """
+    if has_uncommitted_data_changes(session):
+        return get_forecast_series(session, start_date, end_date)
+
+    # Номер изменения читается до построения: изменение, зафиксированное
+    # во время расчёта, приведёт к промаху при следующем обращении
+    key = _cache_scope(session) + (start_date, end_date)
+    series = cache.forecasts.get(key)
+    if series is None:
+        series = get_forecast_series(session, start_date, end_date)
+        cache.forecasts.set(key, series)
+    else:
+        logger.debug(f"Прогноз {start_date} - {end_date} взят из кэша")
+    return series
+
+
+def _find_cached_series(session: Session, first_day: date, last_day: date) -> Optional[ForecastSeries]:
+    """Прогноз из кэша (для текущих данных и дня), покрывающий дни [first_day, last_day]."""
+    scope = _cache_scope(session)
+    return cache.forecasts.find(
+        lambda key, cached: key[:3] == scope and cached.start_date <= first_day and last_day <= cached.end_date
+    )
+
+
+def get_cached_forecast_balance(session: Session, target_date: date) -> Decimal:
+    """
+    Прогнозируемый баланс на дату через общий кэш прогнозов.
+
+    Используется прогноз любого горизонта в кэше, содержащего дату; если
+    такого нет, строится и кэшируется прогноз на месяц даты (соседние даты
+    месяца берутся из него же).
+
+    Args:
+        session: Активная сессия БД для выполнения запросов
+        target_date: Дата, на которую рассчитывается прогноз
+
+    Returns:
+        Прогнозируемый баланс на дату (как calculate_forecast_balance)
+
+    Raises:
+        SQLAlchemyError: При ошибках работы с БД
+    """
+    today = date.today()
+    if target_date <= today or has_uncommitted_data_changes(session):
+        return calculate_forecast_balance(session, target_date)
+
+    series = _find_cached_series(session, target_date, target_date)
+    if series is None:
+        month_start = target_date.replace(day=1)
+        month_end = target_date.replace(day=monthrange(target_date.year, target_date.month)[1])
+        series = get_cached_forecast_series(session, month_start, month_end)
+    return series.predicted_at(target_date)
+
+
+def get_cached_forecast_balances(session: Session, dates: Iterable[date]) -> Dict[date, Decimal]:
+    """
+    Прогнозируемые балансы на несколько дат через общий кэш прогнозов.
+
+    Используется прогноз любого горизонта в кэше, покрывающего все будущие
+    даты (например, прогноз месяца, построенный для кассовых разрывов);
+    если такого нет, прогноз на эти даты строится и кэшируется.
+
+    Args:
+        session: Активная сессия БД для выполнения запросов
+        dates: Даты (порядок и повторы не важны)
+
+    Returns:
+        Словарь {дата: прогнозируемый_баланс} (как calculate_forecast_balances)
+
+    Raises:
+        SQLAlchemyError: При ошибках работы с БД
+    """
+    if has_uncommitted_data_changes(session):
+        return calculate_forecast_balances(session, dates)
+
+    def series_for(first: date, last: date) -> ForecastSeries:
+        return _find_cached_series(session, first, last) or get_cached_forecast_series(session, first, last)
+
+    return _balances_for_dates(session, sorted(set(dates)), series_for)
+
+
+def get_cached_cash_gaps(session: Session, start_date: date, end_date: date) -> List[date]:
+    """
+    Даты кассовых разрывов в периоде через общий кэш прогнозов (как detect_cash_gaps).
+
+    Args:
+        session: Активная сессия БД для выполнения запросов
+        start_date: Начало периода для анализа
+        end_date: Конец периода для анализа (включительно)
+
+    Returns:
+        Список дат, когда прогнозируемый баланс отрицательный
+
+    Raises:
+        ValueError: Если start_date > end_date
+        SQLAlchemyError: При ошибках работы с БД
+    """
+    return _negative_days(get_cached_forecast_series(session, start_date, end_date))
@@ -0,0 +1,437 @@
+"""
+Сервис журнала баланса.
+
+Журнал хранит итоговый баланс (balance_totals, одна строка) и чистое
+изменение баланса по дням (daily_balances). Таблицы поддерживаются
+триггерами таблицы transactions в той же транзакции БД, что и изменение
+транзакции, поэтому текущий баланс читается одним запросом по первичному
+ключу независимо от объёма истории.
+
+Для каждого дня журнал хранит также нарастающий итог (баланс на конец дня).
+Ряд нарастающих итогов дублируется в памяти (DailyBalanceIndex): баланс на
+любую дату - двоичный поиск по порядковым номерам дней и одно чтение массива.
+Копия в памяти обновляется по номеру изменения журнала и перечитывает только
+изменившийся суффикс дней.
+
+Функции:
+- get_ledger_balance: итоговый баланс из журнала
+- get_balance_at: баланс на конец указанной даты
+- get_balances_between: балансы на конец каждого дня периода (в копейках)
+- rebuild_balance_ledger: пересчёт журнала по таблице транзакций
+- apply_daily_changes: внесение в журнал изменений пачки транзакций одним проходом
+- check_balance_ledger: проверка согласованности журнала (с восстановлением)
+"""
+
+import logging
+from array import array
+from bisect import bisect_right
+from dataclasses import dataclass, field
+from datetime import date
+from decimal import Decimal
+from threading import Lock
+from typing import Dict, List, Optional, Tuple, Union
+from weakref import WeakKeyDictionary
+
+from sqlalchemy import (
+    BigInteger, Connection, Engine, bindparam, case, delete, func, insert, literal, select, type_coerce, update
+)
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from finance_tracker.models import BalanceTotalDB, DailyBalanceDB, TransactionDB, TransactionType
+from finance_tracker.models.types import minor_to_money, money_sum
+
+# Настройка логирования
+logger = logging.getLogger(__name__)
+
+# Первичный ключ единственной строки итогового баланса
+TOTAL_ROW_ID = 1
+
+
+@dataclass
+class LedgerCheckResult:
+    """
+    Результат проверки журнала баланса.
+
+    Attributes:
+        ledger_balance: Итоговый баланс по журналу
+        actual_balance: Баланс, рассчитанный по транзакциям
+        mismatched_days: Дни, для которых изменение или нарастающий итог в журнале не совпадает с транзакциями
+        repaired: Журнал был пересчитан
+    """
+    ledger_balance: Decimal
+    actual_balance: Decimal
+    mismatched_days: List[date] = field(default_factory=list)
+    repaired: bool = False
+
+    @property
+    def is_consistent(self) -> bool:
+        """Журнал согласован с транзакциями."""
+        return self.ledger_balance == self.actual_balance and not self.mismatched_days
+
+
+def _signed_amount():
+    return case(
+        (TransactionDB.type == TransactionType.INCOME, TransactionDB.amount),
+        else_=-TransactionDB.amount
+    )
+
+
+def get_ledger_balance(session: Session) -> Decimal:
+    """
+    Возвращает итоговый баланс из журнала (0 для БД без транзакций).
+
+    Args:
+        session: Активная сессия БД
+
+    Returns:
+        Decimal: Сумма доходов минус сумма расходов
+    """
+    balance = session.query(BalanceTotalDB.balance).filter(BalanceTotalDB.id == TOTAL_ROW_ID).scalar()
+    return balance if balance is not None else Decimal("0")
+
+
+def _ledger_revision(executor: Union[Session, Connection]) -> int:
+    """Номер изменения журнала (0 для БД без строки итога)."""
+    totals = BalanceTotalDB.__table__
+    revision = executor.execute(select(totals.c.revision).where(totals.c.id == TOTAL_ROW_ID)).scalar()
+    return revision or 0
+
+
+def _daily_totals():
+    """SELECT по транзакциям: день, изменение за день, количество, нарастающий итог."""
+    net = func.sum(_signed_amount())
+    return select(
+        TransactionDB.transaction_date.label("day"),
+        net.label("net"),
+        func.count().label("transaction_count"),
+        func.sum(net).over(order_by=TransactionDB.transaction_date).label("cumulative"),
+    ).group_by(TransactionDB.transaction_date)
+
+
+def rebuild_balance_ledger(executor: Union[Session, Connection]) -> None:
+    """
+    Пересчитывает журнал баланса по таблице транзакций.
+
+    Выполняет два INSERT ... SELECT с группировкой в SQL (нарастающий итог -
+    оконной функцией). Номер изменения журнала увеличивается, поэтому копии
+    в памяти (DailyBalanceIndex) перечитываются полностью.
+    Транзакцию не фиксирует.
+
+    Args:
+        executor: Сессия или соединение БД
+    """
+    revision = _ledger_revision(executor) + 1
+    daily = _daily_totals().subquery()
+    executor.execute(delete(DailyBalanceDB.__table__))
+    executor.execute(delete(BalanceTotalDB.__table__))
+    executor.execute(
+        insert(DailyBalanceDB.__table__).from_select(
+            ["day", "net", "transaction_count", "cumulative", "revision"],
+            select(daily.c.day, daily.c.net, daily.c.transaction_count, daily.c.cumulative, literal(revision))
+        )
+    )
+    executor.execute(
+        insert(BalanceTotalDB.__table__).from_select(
+            ["id", "balance", "transaction_count", "revision"],
+            select(
+                literal(TOTAL_ROW_ID),
+                func.coalesce(func.sum(DailyBalanceDB.__table__.c.net), 0),
+                func.coalesce(func.sum(DailyBalanceDB.__table__.c.transaction_count), 0),
+                literal(revision),
+            )
+        )
+    )
+    logger.info("Журнал баланса пересчитан по транзакциям")
+
+
+def apply_daily_changes(executor: Union[Session, Connection], changes: Dict[date, Tuple[Decimal, int]]) -> None:
+    """
+    Вносит в журнал баланса изменения по дням, минуя построчные триггеры.
+
+    Используется при массовых изменениях транзакций, выполняемых с отключёнными
+    триггерами журнала: вместо пересчёта суффикса нарастающих итогов на каждую
+    строку выполняются один upsert дневных изменений, один пересчёт суффикса
+    начиная с самого раннего затронутого дня и одно обновление итога.
+    Номер изменения журнала увеличивается один раз. Транзакцию не фиксирует.
+
+    Args:
+        executor: Сессия или соединение БД
+        changes: День -> (изменение баланса за день, изменение количества транзакций)
+    """
+    changes = {day: change for day, change in changes.items() if change != (Decimal("0"), 0)}
+    if not changes:
+        return
+
+    daily = DailyBalanceDB.__table__
+    totals = BalanceTotalDB.__table__
+    first_day = min(changes)
+    revision = _ledger_revision(executor) + 1
+
+    upsert = sqlite_insert(daily).values(
+        day=bindparam("day"), net=bindparam("net"), transaction_count=bindparam("count"),
+        cumulative=literal(0), revision=literal(revision)
+    )
+    executor.execute(
+        upsert.on_conflict_do_update(
+            index_elements=[daily.c.day],
+            set_={
+                "net": daily.c.net + upsert.excluded.net,
+                "transaction_count": daily.c.transaction_count + upsert.excluded.transaction_count,
+            }
+        ),
+        [{"day": day, "net": net, "count": count} for day, (net, count) in sorted(changes.items())]
+    )
+    executor.execute(delete(daily).where(daily.c.day >= first_day, daily.c.transaction_count == 0))
+
+    # Нарастающий итог: итог дня до first_day плюс оконная сумма net по суффиксу
+    base = executor.execute(
+        select(type_coerce(daily.c.cumulative, BigInteger)).where(daily.c.day < first_day)
+        .order_by(daily.c.day.desc()).limit(1)
+    ).scalar() or 0
+    running = select(
+        daily.c.day,
+        func.sum(type_coerce(daily.c.net, BigInteger)).over(order_by=daily.c.day).label("total"),
+    ).where(daily.c.day >= first_day).subquery()
+    executor.execute(
+        update(daily).where(daily.c.day == running.c.day).values(
+            cumulative=type_coerce(literal(base) + running.c.total, BigInteger), revision=revision
+        )
+    )
+
+    balance_change = sum((net for net, _ in changes.values()), Decimal("0"))
+    count_change = sum(count for _, count in changes.values())
+    executor.execute(
+        sqlite_insert(totals).values(
+            id=TOTAL_ROW_ID, balance=balance_change, transaction_count=count_change, revision=revision
+        ).on_conflict_do_update(
+            index_elements=[totals.c.id],
+            set_={
+                "balance": totals.c.balance + balance_change,
+                "transaction_count": totals.c.transaction_count + count_change,
+                "revision": revision,
+            }
+        )
+    )
+    logger.debug(f"В журнал баланса внесены изменения за {len(changes)} дн. начиная с {first_day}")
+
+
+class DailyBalanceIndex:
+    """
+    Копия нарастающих итогов журнала баланса в памяти.
+
+    Хранит упорядоченные порядковые номера дней (date.toordinal) и балансы
+    на конец этих дней в копейках. Баланс на дату - двоичный поиск
+    последнего дня не позже даты.
+
+    Актуальность проверяется по номеру изменения журнала. Триггеры присваивают
+    новый номер всем дням начиная с изменённого, поэтому при обновлении
+    сохраняется префикс до последнего дня, не менявшегося с прошлого чтения,
+    а перечитываются только следующие за ним дни.
+    """
+
+    def __init__(self):
+        self.revision: Optional[int] = None
+        self._ordinals = array("q")
+        self._balances = array("q")
+        self._lock = Lock()
+
+    def __len__(self) -> int:
+        return len(self._ordinals)
+
+    def balance_at(self, session: Session, day: date) -> Decimal:
+        """Обновляет копию при необходимости и возвращает баланс на конец дня."""
+        with self._lock:
+            self._refresh(session)
+            position = bisect_right(self._ordinals, day.toordinal())
+            return minor_to_money(self._balances[position - 1] if position else 0)
+
+    def balances_between(self, session: Session, start_date: date, end_date: date) -> array:
+        """Обновляет копию при необходимости и возвращает балансы на конец каждого дня периода."""
+        with self._lock:
+            self._refresh(session)
+            return _balances_by_day(self._ordinals, self._balances, start_date, end_date)
+
+    def _refresh(self, session: Session) -> None:
+        revision = _ledger_revision(session)
+        if revision == self.revision:
+            return
+
+        table = DailyBalanceDB.__table__
+        query = select(table.c.day, type_coerce(table.c.cumulative, BigInteger)).order_by(table.c.day)
+        unchanged_day = None
+        if self.revision is not None:
+            unchanged_day = session.execute(
+                select(table.c.day).where(table.c.revision <= self.revision)
+                .order_by(table.c.day.desc()).limit(1)
+            ).scalar()
+
+        if unchanged_day is None:
+            keep = 0
+        else:
+            keep = bisect_right(self._ordinals, unchanged_day.toordinal())
+            query = query.where(table.c.day > unchanged_day)
+        del self._ordinals[keep:]
+        del self._balances[keep:]
+        reloaded = 0
+        for day, cumulative in session.execute(query):
+            self._ordinals.append(day.toordinal())
+            self._balances.append(cumulative)
+            reloaded += 1
+
+        logger.debug(
+            f"Индекс дневных балансов обновлён до изменения {revision}: "
+            f"сохранено дней {keep}, перечитано {reloaded}"
+        )
+        self.revision = revision
+
+
+def _balances_by_day(ordinals, balances, start_date: date, end_date: date) -> array:
+    """
+    Балансы на конец каждого дня [start_date, end_date] по упорядоченным дням журнала.
+
+    Один двоичный поиск для первого дня, далее слияние с днями журнала.
+    """
+    result = array("q")
+    position = bisect_right(ordinals, start_date.toordinal())
+    current = balances[position - 1] if position else 0
+    for ordinal in range(start_date.toordinal(), end_date.toordinal() + 1):
+        while position < len(ordinals) and ordinals[position] <= ordinal:
+            current = balances[position]
+            position += 1
+        result.append(current)
+    return result
+
+
+# Копии нарастающих итогов по engine (каждая БД - своя копия)
+_daily_indexes: "WeakKeyDictionary[Engine, DailyBalanceIndex]" = WeakKeyDictionary()
+_daily_indexes_lock = Lock()
+
+
+def _daily_index(engine: Engine) -> DailyBalanceIndex:
+    with _daily_indexes_lock:
+        index = _daily_indexes.get(engine)
+        if index is None:
+            index = _daily_indexes[engine] = DailyBalanceIndex()
+        return index
+
+
+def _has_uncommitted_writes(session: Session) -> bool:
+    # pysqlite открывает транзакцию только перед изменяющими запросами
+    return session.connection().connection.dbapi_connection.in_transaction
+
+
+def get_balance_at(session: Session, day: date) -> Decimal:
+    """
+    Возвращает баланс на конец указанной даты (все транзакции до неё включительно).
+
+    Баланс берётся из копии нарастающих итогов в памяти. Если в сессии есть
+    незафиксированные изменения, копия не обновляется (изменения могут быть
+    откачены): баланс читается из журнала одним запросом по первичному ключу.
+
+    Args:
+        session: Активная сессия БД
+        day: Дата
+
+    Returns:
+        Decimal: Доходы минус расходы до даты включительно
+    """
+    if _has_uncommitted_writes(session):
+        balance = session.query(DailyBalanceDB.cumulative).filter(
+            DailyBalanceDB.day <= day
+        ).order_by(DailyBalanceDB.day.desc()).limit(1).scalar()
+        return balance if balance is not None else minor_to_money(0)
+    return _daily_index(session.get_bind()).balance_at(session, day)
+
+
+def get_balances_between(session: Session, start_date: date, end_date: date) -> array:
+    """
+    Возвращает балансы на конец каждого дня периода одним проходом.
+
+    Как и get_balance_at, при незафиксированных изменениях в сессии читает
+    журнал напрямую (двумя запросами), не обновляя копию в памяти.
+
+    Args:
+        session: Активная сессия БД
+        start_date: Первый день периода
+        end_date: Последний день периода (включительно)
+
+    Returns:
+        array("q"): Балансы в копейках, по одному на день периода (пустой при start_date > end_date)
+    """
+    if start_date > end_date:
+        return array("q")
+    if not _has_uncommitted_writes(session):
+        return _daily_index(session.get_bind()).balances_between(session, start_date, end_date)
+
+    table = DailyBalanceDB.__table__
+    cumulative = type_coerce(table.c.cumulative, BigInteger)
+    before = session.execute(
+        select(cumulative).where(table.c.day < start_date).order_by(table.c.day.desc()).limit(1)
+    ).scalar()
+    ordinals = [start_date.toordinal() - 1] if before is not None else []
+    balances = [before] if before is not None else []
+    for day, balance in session.execute(
+        select(table.c.day, cumulative).where(table.c.day.between(start_date, end_date)).order_by(table.c.day)
+    ):
+        ordinals.append(day.toordinal())
+        balances.append(balance)
+    return _balances_by_day(ordinals, balances, start_date, end_date)
+
+
+def check_balance_ledger(session: Session, repair: bool = False) -> LedgerCheckResult:
+    """
+    Сверяет журнал баланса с таблицей транзакций.
+
+    Args:
+        session: Активная сессия БД
+        repair: Пересчитать журнал и зафиксировать изменения при расхождении
+
+    Returns:
+        LedgerCheckResult: Итог по журналу и по транзакциям, дни с расхождением
+
+    Raises:
+        SQLAlchemyError: При ошибках работы с базой данных
+    """
+    try:
+        ledger_balance = get_ledger_balance(session)
+        actual_balance = session.query(money_sum(_signed_amount())).scalar()
+
+        actual_days = _daily_totals().subquery()
+        ledger_days = DailyBalanceDB.__table__
+        # Полное внешнее соединение через объединение двух LEFT JOIN
+        missing_in_ledger = select(actual_days.c.day).outerjoin(
+            ledger_days, ledger_days.c.day == actual_days.c.day
+        ).where(
+            (ledger_days.c.day.is_(None))
+            | (ledger_days.c.net != actual_days.c.net)
+            | (ledger_days.c.transaction_count != actual_days.c.transaction_count)
+            | (ledger_days.c.cumulative != actual_days.c.cumulative)
+        )
+        stale_in_ledger = select(ledger_days.c.day).outerjoin(
+            actual_days, actual_days.c.day == ledger_days.c.day
+        ).where(actual_days.c.day.is_(None))
+        mismatched_days = sorted(
+            set(session.execute(missing_in_ledger).scalars()) | set(session.execute(stale_in_ledger).scalars())
+        )
+
+        result = LedgerCheckResult(ledger_balance, actual_balance, mismatched_days)
+        if result.is_consistent:
+            logger.debug(f"Журнал баланса согласован: {ledger_balance}")
+            return result
+
+        logger.warning(
+            f"Журнал баланса расходится с транзакциями: журнал {ledger_balance}, "
+            f"транзакции {actual_balance}, дней с расхождением {len(mismatched_days)}"
+        )
+        if repair:
+            rebuild_balance_ledger(session)
+            session.commit()
+            result.repaired = True
+        return result
+
+    except SQLAlchemyError as e:
+        logger.error(f"Ошибка при проверке журнала баланса: {e}")
+        session.rollback()
+        raise
@@ -5,10 +5,15 @@
 - Получение списка категорий с фильтрацией
 - Создание пользовательских категорий
 - Удаление пользовательских категорий (системные защищены)
+- Массовое добавление предопределённых категорий одним запросом
 """
 
 import logging
-from typing import List, Optional
+import uuid
+from datetime import datetime
+from typing import List, Optional, Sequence, Tuple, Union
+from sqlalchemy import Connection
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import SQLAlchemyError, IntegrityError
 
@@ -19,6 +24,13 @@ from finance_tracker.utils.validation import validate_uuid_format
 # Настройка логирования
 logger = logging.getLogger(__name__)
 
+# Системные категории для кредитов и займов: (название, тип)
+LOAN_CATEGORIES: List[Tuple[str, TransactionType]] = [
+    ("Выплата кредита (основной долг)", TransactionType.EXPENSE),
+    ("Выплата процентов по кредиту", TransactionType.EXPENSE),
+    ("Получение кредита", TransactionType.INCOME),
+]
+
 
 def get_all_categories(
     session: Session,
@@ -282,6 +294,49 @@ def delete_category(
         raise
 
 
+def insert_categories(
+    executor: Union[Session, Connection],
+    categories: Sequence[Tuple[str, TransactionType]],
+    is_system: bool = True
+) -> int:
+    """
+    Добавляет категории одним запросом INSERT ... ON CONFLICT(name) DO NOTHING.
+
+    Категории, название которых уже есть в справочнике, пропускаются,
+    поэтому функция идемпотентна и не требует предварительной проверки.
+    Транзакцию не фиксирует.
+
+    Args:
+        executor: Сессия или соединение БД
+        categories: Пары (название, тип транзакции)
+        is_system: Флаг системной категории для всех добавляемых
+
+    Returns:
+        Количество добавленных категорий
+    """
+    if not categories:
+        return 0
+
+    now = datetime.now()
+    rows = [
+        {
+            "id": str(uuid.uuid4()),
+            "name": name,
+            "type": transaction_type,
+            "is_system": is_system,
+            "created_at": now,
+            "updated_at": now,
+        }
+        for name, transaction_type in categories
+    ]
+    statement = sqlite_insert(CategoryDB.__table__).values(rows).on_conflict_do_nothing(index_elements=["name"])
+    created_count = max(executor.execute(statement).rowcount, 0)
+
+    if created_count > 0:
+        cache.categories.invalidate()
+    return created_count
+
+
 def init_loan_categories(session: Session) -> None:
     """
     Создаёт системные категории для кредитов и займов.
@@ -302,41 +357,11 @@ def init_loan_categories(session: Session) -> None:
         SQLAlchemyError: При ошибках работы с БД
     """
     try:
-        # Список категорий для создания
-        loan_categories = [
-            {
-                "name": "Выплата кредита (основной долг)",
-                "type": TransactionType.EXPENSE,
-                "is_system": True
-            },
-            {
-                "name": "Выплата процентов по кредиту",
-                "type": TransactionType.EXPENSE,
-                "is_system": True
-            },
-            {
-                "name": "Получение кредита",
-                "type": TransactionType.INCOME,
-                "is_system": True
-            }
-        ]
-
-        # Создаём категории, если их ещё нет
-        created_count = 0
-        for cat_data in loan_categories:
-            # Проверяем, существует ли уже такая категория
-            existing = session.query(CategoryDB).filter_by(name=cat_data["name"]).first()
-
-            if existing is None:
-                # Создаём новую категорию
-                category = CategoryDB(**cat_data)
-                session.add(category)
-                created_count += 1
-                logger.debug(f"Создана категория: {cat_data['name']}")
-
-        # Коммитим все созданные категории
+        # Добавляем недостающие категории одним запросом
+        created_count = insert_categories(session, LOAN_CATEGORIES)
+        session.commit()
+
         if created_count > 0:
-            session.commit()
             logger.info(f"Инициализировано {created_count} системных категорий для кредитов")
         else:
             logger.info("Системные категории для кредитов уже существуют")
@@ -12,6 +12,7 @@ import logging
 from typing import Dict, Any
 from datetime import date, timedelta
 from decimal import Decimal
+from sqlalchemy import func
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import SQLAlchemyError
 
@@ -19,6 +20,7 @@ from finance_tracker.models import (
     LoanDB, LoanPaymentDB, TransactionDB,
     LoanStatus, PaymentStatus, TransactionType
 )
+from finance_tracker.models.types import money_sum
 from finance_tracker.services.loan_service import get_debt_by_holder_statistics
 
 # Настройка логирования
@@ -71,52 +73,44 @@ def get_summary_statistics(session: Session) -> Dict[str, Any]:
         # <ai:block name="active_loans_stats">
         #     <ai:purpose>Получение статистики по активным кредитам</ai:purpose>
 
-        # Получаем активные кредиты
-        active_loans = session.query(LoanDB).filter(
+        # Количество и сумма активных кредитов (агрегаты в SQL)
+        total_active_loans, total_active_amount = session.query(
+            func.count(LoanDB.id),
+            money_sum(LoanDB.amount)
+        ).filter(
             LoanDB.status == LoanStatus.ACTIVE
-        ).all()
+        ).one()
 
-        # <ai:step type="calculation">
-        total_active_loans = len(active_loans)
-        total_active_amount = sum(loan.amount for loan in active_loans)
-        # </ai:step>
-
-        # Получаем закрытые кредиты
-        closed_loans = session.query(LoanDB).filter(
+        # Количество закрытых кредитов
+        total_closed_loans = session.query(func.count(LoanDB.id)).filter(
             LoanDB.status == LoanStatus.PAID_OFF
-        ).all()
-
-        # <ai:step type="calculation">
-        total_closed_loans = len(closed_loans)
-        # </ai:step>
+        ).scalar()
         # </ai:block>
 
         # <ai:block name="monthly_payments_calculation">
         #     <ai:purpose>Расчет ежемесячных платежей</ai:purpose>
 
-        # Для каждого активного кредита получаем платежи
-        monthly_payments_sum = Decimal('0')
-        total_interest_expected = Decimal('0')
-        total_overpayment = Decimal('0')
-
-        for loan in active_loans:
-            # Получаем все платежи по этому кредиту
-            payments = session.query(LoanPaymentDB).filter_by(
-                loan_id=loan.id,
-                status=PaymentStatus.PENDING
-            ).all()
-
-            # <ai:step type="calculation">
-            # Суммируем платежи (приблизительно ежемесячные платежи)
-            for payment in payments:
-                monthly_payments_sum += payment.total_amount
-                total_interest_expected += payment.interest_amount
-            # </ai:step>
-
-        # Рассчитываем переплату
-        total_overpayment = sum(loan.amount * (loan.interest_rate / Decimal('100')) / Decimal('12')
-                               for loan in active_loans
-                               if loan.interest_rate > 0)
+        # Суммируем ожидающие платежи всех активных кредитов одним запросом
+        monthly_payments_sum, total_interest_expected = session.query(
+            money_sum(LoanPaymentDB.total_amount),
+            money_sum(LoanPaymentDB.interest_amount)
+        ).join(
+            LoanDB, LoanPaymentDB.loan_id == LoanDB.id
+        ).filter(
+            LoanDB.status == LoanStatus.ACTIVE,
+            LoanPaymentDB.status == PaymentStatus.PENDING
+        ).one()
+
+        # Рассчитываем переплату (загружаем только сумму и ставку)
+        rated_loans = session.query(LoanDB.amount, LoanDB.interest_rate).filter(
+            LoanDB.status == LoanStatus.ACTIVE,
+            LoanDB.interest_rate > 0
+        ).all()
+        total_overpayment = sum(
+            (amount * (interest_rate / Decimal('100')) / Decimal('12')
+             for amount, interest_rate in rated_loans),
+            Decimal('0')
+        )
 
         # </ai:block>
 
@@ -3,17 +3,19 @@
 
 Содержит функции для:
 - Проверки рабочих дней
+- Компиляции правил повторения (с кэшированием)
 - Вычисления следующей даты вхождения
-- Генерации дат вхождений для периода
+- Генерации дат вхождений для периода (с арифметическим переходом к началу периода)
 - Ленивой генерации вхождений
 """
 
 import json
 import logging
 from datetime import date, timedelta
-from typing import List, Optional
+from typing import List, Optional, Tuple
 from calendar import monthrange
 
+from sqlalchemy import inspect as sa_inspect
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import SQLAlchemyError
 
@@ -28,6 +30,7 @@ from finance_tracker.models.enums import (
     EndConditionType,
     OccurrenceStatus
 )
+from finance_tracker.utils.cache import cache
 
 # Настройка логирования
 logger = logging.getLogger(__name__)
@@ -53,6 +56,216 @@ def is_workday(target_date: date) -> bool:
     return target_date.weekday() < 5
 
 
+# Виды шага скомпилированного правила
+_STEP_DAYS = 0
+_STEP_WEEKDAYS = 1
+_STEP_MONTHS = 2
+_STEP_YEARS = 3
+
+
+class CompiledRecurrenceRule:
+    """
+    Неизменяемое представление правила повторения для генерации вхождений.
+
+    Значения перечислений сведены к виду шага (дни, дни недели, месяцы, годы),
+    дни недели хранятся битовой маской, условия окончания - готовыми
+    датой и количеством. Шаг генерации не обращается к атрибутам ORM и
+    не разбирает JSON дней недели.
+
+    Attributes:
+        step_kind: Вид шага (_STEP_DAYS, _STEP_WEEKDAYS, _STEP_MONTHS, _STEP_YEARS)
+        step: Шаг в днях для _STEP_DAYS, иначе интервал правила
+        weekday_mask: Битовая маска дней недели (бит 0 - понедельник)
+        first_weekday: Первый день недели из маски
+        only_workdays: Признак "только рабочие дни"
+        start_date: Дата начала плановой транзакции (исходные день и месяц)
+        until_date: Дата окончания (для UNTIL_DATE)
+        max_count: Количество повторений (для AFTER_COUNT)
+    """
+
+    __slots__ = (
+        "step_kind", "step", "weekday_mask", "first_weekday", "only_workdays",
+        "start_date", "until_date", "max_count",
+    )
+
+    def __init__(
+        self,
+        step_kind: int,
+        step: int,
+        weekday_mask: int,
+        only_workdays: bool,
+        start_date: Optional[date],
+        until_date: Optional[date],
+        max_count: Optional[int]
+    ):
+        values = {
+            "step_kind": step_kind,
+            "step": step,
+            "weekday_mask": weekday_mask,
+            "first_weekday": (weekday_mask & -weekday_mask).bit_length() - 1,
+            "only_workdays": only_workdays,
+            "start_date": start_date,
+            "until_date": until_date,
+            "max_count": max_count,
+        }
+        for name, value in values.items():
+            object.__setattr__(self, name, value)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} неизменяем")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"{type(self).__name__} неизменяем")
+
+
+def _weekday_mask(weekdays_json: str) -> int:
+    """Битовая маска дней недели из JSON массива (0=пн, 6=вс)."""
+    try:
+        weekdays = json.loads(weekdays_json)
+    except (TypeError, ValueError):
+        weekdays = None
+    if not isinstance(weekdays, list) or any(
+            not isinstance(wd, int) or isinstance(wd, bool) or not 0 <= wd <= 6 for wd in weekdays):
+        error_msg = f"Некорректные дни недели в правиле повторения: {weekdays_json}"
+        logger.error(error_msg)
+        raise ValueError(error_msg)
+    mask = 0
+    for wd in weekdays:
+        mask |= 1 << wd
+    return mask
+
+
+def _compile_rule(
+    recurrence_rule: RecurrenceRuleDB,
+    planned_tx: Optional[PlannedTransactionDB]
+) -> CompiledRecurrenceRule:
+    """Компиляция правила повторения без кэширования."""
+    recurrence_type = recurrence_rule.recurrence_type
+    interval = recurrence_rule.interval
+    if recurrence_type not in (RecurrenceType.DAILY, RecurrenceType.WEEKLY, RecurrenceType.MONTHLY,
+                               RecurrenceType.YEARLY, RecurrenceType.CUSTOM):
+        error_msg = f"Неизвестный тип повторения: {recurrence_type}"
+        logger.error(error_msg)
+        raise ValueError(error_msg)
+    if interval is None:
+        error_msg = f"Не задан интервал правила повторения ID {recurrence_rule.id}"
+        logger.error(error_msg)
+        raise ValueError(error_msg)
+
+    weekday_mask = 0
+    if recurrence_type == RecurrenceType.DAILY:
+        step_kind, step = _STEP_DAYS, interval
+    elif recurrence_type == RecurrenceType.WEEKLY:
+        step_kind, step = _STEP_DAYS, 7 * interval
+    elif recurrence_type == RecurrenceType.MONTHLY:
+        step_kind, step = _STEP_MONTHS, interval
+    elif recurrence_type == RecurrenceType.YEARLY:
+        step_kind, step = _STEP_YEARS, interval
+    elif recurrence_rule.interval_unit == IntervalUnit.DAYS:
+        step_kind, step = _STEP_DAYS, interval
+    elif recurrence_rule.interval_unit == IntervalUnit.WEEKS:
+        weekday_mask = _weekday_mask(recurrence_rule.weekdays) if recurrence_rule.weekdays else 0
+        # Пустой список дней недели - просто каждые N недель
+        step_kind, step = (_STEP_WEEKDAYS, interval) if weekday_mask else (_STEP_DAYS, 7 * interval)
+    elif recurrence_rule.interval_unit == IntervalUnit.MONTHS:
+        step_kind, step = _STEP_MONTHS, interval
+    elif recurrence_rule.interval_unit == IntervalUnit.YEARS:
+        step_kind, step = _STEP_YEARS, interval
+    else:
+        error_msg = f"Неизвестная единица интервала: {recurrence_rule.interval_unit}"
+        logger.error(error_msg)
+        raise ValueError(error_msg)
+
+    start_date = planned_tx.start_date if planned_tx is not None else None
+    if start_date is None and step_kind in (_STEP_MONTHS, _STEP_YEARS):
+        error_msg = f"Правило повторения ID {recurrence_rule.id} не связано с плановой транзакцией"
+        logger.error(error_msg)
+        raise ValueError(error_msg)
+
+    end_condition_type = recurrence_rule.end_condition_type
+    return CompiledRecurrenceRule(
+        step_kind=step_kind,
+        step=step,
+        weekday_mask=weekday_mask,
+        only_workdays=bool(recurrence_rule.only_workdays),
+        start_date=start_date,
+        until_date=recurrence_rule.end_date if end_condition_type == EndConditionType.UNTIL_DATE else None,
+        max_count=recurrence_rule.occurrences_count if end_condition_type == EndConditionType.AFTER_COUNT else None
+    )
+
+
+def compile_recurrence_rule(
+    recurrence_rule: RecurrenceRuleDB,
+    planned_tx: Optional[PlannedTransactionDB] = None
+) -> CompiledRecurrenceRule:
+    """
+    Возвращает скомпилированное правило повторения.
+
+    Результат кэшируется по (id правила, updated_at, start_date плановой
+    транзакции). Правила без id или updated_at и правила с незаписанными
+    изменениями компилируются заново при каждом вызове.
+
+    Args:
+        recurrence_rule: Правило повторения
+        planned_tx: Плановая транзакция правила (по умолчанию recurrence_rule.planned_transaction)
+
+    Returns:
+        Скомпилированное правило
+
+    Raises:
+        ValueError: Если тип повторения, единица интервала или дни недели некорректны
+    """
+    if planned_tx is None:
+        planned_tx = recurrence_rule.planned_transaction
+    key = None
+    if recurrence_rule.id is not None and recurrence_rule.updated_at is not None \
+            and not sa_inspect(recurrence_rule).modified:
+        key = (recurrence_rule.id, recurrence_rule.updated_at,
+               planned_tx.start_date if planned_tx is not None else None)
+        compiled = cache.recurrence_rules.get(key)
+        if compiled is not None:
+            return compiled
+
+    compiled = _compile_rule(recurrence_rule, planned_tx)
+    if key is not None:
+        cache.recurrence_rules.set(key, compiled)
+    return compiled
+
+
+def _next_occurrence(current_date: date, rule: CompiledRecurrenceRule) -> date:
+    """Следующая дата вхождения по скомпилированному правилу."""
+    step_kind = rule.step_kind
+    if step_kind == _STEP_DAYS:
+        next_date = current_date + timedelta(days=rule.step)
+    elif step_kind == _STEP_WEEKDAYS:
+        current_weekday = current_date.weekday()
+        # Следующий день недели из маски в текущей неделе, иначе первый через N недель
+        later = rule.weekday_mask >> (current_weekday + 1)
+        if later:
+            days_ahead = (later & -later).bit_length()
+        else:
+            days_ahead = 7 * rule.step - current_weekday + rule.first_weekday
+        next_date = current_date + timedelta(days=days_ahead)
+    elif step_kind == _STEP_MONTHS:
+        month_index = current_date.month - 1 + rule.step
+        year = current_date.year + month_index // 12
+        month = month_index % 12 + 1
+        # Граничный случай: исходный день больше количества дней в месяце
+        next_date = date(year, month, min(rule.start_date.day, monthrange(year, month)[1]))
+    else:
+        year = current_date.year + rule.step
+        month = rule.start_date.month
+        # Граничный случай: 29 февраля в невисокосном году
+        next_date = date(year, month, min(rule.start_date.day, monthrange(year, month)[1]))
+
+    # Если включена опция "только рабочие дни", пропускаем выходные
+    if rule.only_workdays:
+        while not is_workday(next_date):
+            next_date += timedelta(days=1)
+
+    return next_date
+
+
 def calculate_next_occurrence_date(
     current_date: date,
     recurrence_rule: RecurrenceRuleDB
@@ -61,6 +274,7 @@ def calculate_next_occurrence_date(
     Вычисляет следующую дату вхождения на основе правила повторения.
     
     Функция учитывает тип повторения, интервал, дни недели и опцию "только рабочие дни".
+    Правило компилируется (compile_recurrence_rule) и берётся из кэша при повторных вызовах.
     
     Args:
         current_date: Текущая дата вхождения
@@ -77,154 +291,71 @@ def calculate_next_occurrence_date(
         >>> calculate_next_occurrence_date(date(2025, 1, 1), rule)
         date(2025, 1, 2)
     """
-    if recurrence_rule.recurrence_type == RecurrenceType.DAILY:
-        # Ежедневное повторение
-        next_date = current_date + timedelta(days=recurrence_rule.interval)
-        
-        # Если включена опция "только рабочие дни", пропускаем выходные
-        if recurrence_rule.only_workdays:
-            while not is_workday(next_date):
-                next_date += timedelta(days=1)
-        
-        return next_date
-    
-    elif recurrence_rule.recurrence_type == RecurrenceType.WEEKLY:
-        # Еженедельное повторение
-        next_date = current_date + timedelta(weeks=recurrence_rule.interval)
-        
-        # Если включена опция "только рабочие дни", пропускаем выходные
-        if recurrence_rule.only_workdays:
-            while not is_workday(next_date):
-                next_date += timedelta(days=1)
-        
-        return next_date
-    
-    elif recurrence_rule.recurrence_type == RecurrenceType.MONTHLY:
-        # Ежемесячное повторение
-        # Получаем исходный день из плановой транзакции
-        planned_tx = recurrence_rule.planned_transaction
-        original_day = planned_tx.start_date.day
-        
-        # Вычисляем следующий месяц
-        year = current_date.year
-        month = current_date.month + recurrence_rule.interval
-        
-        # Корректируем год, если месяц выходит за пределы
-        while month > 12:
-            month -= 12
-            year += 1
-        
-        # Обрабатываем граничный случай: если день больше количества дней в месяце
-        max_day_in_month = monthrange(year, month)[1]
-        day = min(original_day, max_day_in_month)
-        
-        next_date = date(year, month, day)
-        
-        # Если включена опция "только рабочие дни", пропускаем выходные
-        if recurrence_rule.only_workdays:
-            while not is_workday(next_date):
-                next_date += timedelta(days=1)
-        
-        return next_date
-    
-    elif recurrence_rule.recurrence_type == RecurrenceType.YEARLY:
-        # Ежегодное повторение
-        # Получаем исходный день из плановой транзакции
-        planned_tx = recurrence_rule.planned_transaction
-        original_day = planned_tx.start_date.day
-        original_month = planned_tx.start_date.month
-        
-        year = current_date.year + recurrence_rule.interval
-        month = original_month
-        
-        # Обрабатываем граничный случай: 29 февраля в невисокосном году
-        max_day_in_month = monthrange(year, month)[1]
-        day = min(original_day, max_day_in_month)
-        
-        next_date = date(year, month, day)
-        
-        # Если включена опция "только рабочие дни", пропускаем выходные
-        if recurrence_rule.only_workdays:
-            while not is_workday(next_date):
-                next_date += timedelta(days=1)
-        
-        return next_date
-    
-    elif recurrence_rule.recurrence_type == RecurrenceType.CUSTOM:
-        # Кастомное правило повторения
-        if recurrence_rule.interval_unit == IntervalUnit.DAYS:
-            next_date = current_date + timedelta(days=recurrence_rule.interval)
-        elif recurrence_rule.interval_unit == IntervalUnit.WEEKS:
-            # Если указаны конкретные дни недели
-            if recurrence_rule.weekdays:
-                weekdays = json.loads(recurrence_rule.weekdays)
-                current_weekday = current_date.weekday()
-                
-                # Ищем следующий день недели из списка
-                next_weekday = None
-                for wd in weekdays:
-                    if wd > current_weekday:
-                        next_weekday = wd
-                        break
-                
-                if next_weekday is not None:
-                    # Следующий день в текущей неделе
-                    days_ahead = next_weekday - current_weekday
-                    next_date = current_date + timedelta(days=days_ahead)
-                else:
-                    # Переходим к следующей неделе (или через N недель)
-                    days_ahead = (7 * recurrence_rule.interval) - current_weekday + weekdays[0]
-                    next_date = current_date + timedelta(days=days_ahead)
-            else:
-                # Просто добавляем N недель
-                next_date = current_date + timedelta(weeks=recurrence_rule.interval)
-        elif recurrence_rule.interval_unit == IntervalUnit.MONTHS:
-            # Аналогично ежемесячному повторению
-            planned_tx = recurrence_rule.planned_transaction
-            original_day = planned_tx.start_date.day
-            
-            year = current_date.year
-            month = current_date.month + recurrence_rule.interval
-            
-            while month > 12:
-                month -= 12
-                year += 1
-            
-            max_day_in_month = monthrange(year, month)[1]
-            day = min(original_day, max_day_in_month)
-            
-            next_date = date(year, month, day)
-        elif recurrence_rule.interval_unit == IntervalUnit.YEARS:
-            # Аналогично ежегодному повторению
-            planned_tx = recurrence_rule.planned_transaction
-            original_day = planned_tx.start_date.day
-            original_month = planned_tx.start_date.month
-            
-            year = current_date.year + recurrence_rule.interval
-            month = original_month
-            
-            max_day_in_month = monthrange(year, month)[1]
-            day = min(original_day, max_day_in_month)
-            
-            next_date = date(year, month, day)
-        else:
-            error_msg = f"Неизвестная единица интервала: {recurrence_rule.interval_unit}"
-            logger.error(error_msg)
-            raise ValueError(error_msg)
-        
-        # Если включена опция "только рабочие дни", пропускаем выходные
-        if recurrence_rule.only_workdays:
-            while not is_workday(next_date):
-                next_date += timedelta(days=1)
-        
-        return next_date
-    
-    else:
-        error_msg = f"Неизвестный тип повторения: {recurrence_rule.recurrence_type}"
-        logger.error(error_msg)
-        raise ValueError(error_msg)
+    return _next_occurrence(current_date, compile_recurrence_rule(recurrence_rule))
+
+
+def _occurrence_in_month(start: date, months_ahead: int) -> date:
+    """
+    Вхождение ежемесячного правила через months_ahead месяцев от start.
+
+    День месяца - день start, ограниченный длиной месяца (как в _next_occurrence).
+    """
+    month_index = start.month - 1 + months_ahead
+    year = start.year + month_index // 12
+    month = month_index % 12 + 1
+    return date(year, month, min(start.day, monthrange(year, month)[1]))
 
 
+def _skip_to_window(rule: CompiledRecurrenceRule, window_start: date) -> Tuple[date, int]:
+    """
+    Вхождение, с которого начинается перебор для периода от window_start.
+
+    Для правил без "только рабочие дни" номер вхождения вычисляется
+    арифметически: возвращается вхождение не позже window_start (или первое
+    вхождение недели/блока, если раньше него в блоке нет вхождений) и
+    количество предшествующих вхождений (для условия AFTER_COUNT). Дальше
+    период перебирается обычным шагом, поэтому стоимость генерации зависит
+    от длины периода, а не от возраста правила.
+
+    Для "только рабочие дни" сдвиг на рабочий день влияет на все следующие
+    даты, поэтому перебор начинается со start_date.
+
+    Returns:
+        (дата вхождения, количество вхождений до неё)
+    """
+    start = rule.start_date
+    step = rule.step
+    if window_start <= start or rule.only_workdays or step < 1:
+        return start, 0
+
+    step_kind = rule.step_kind
+    if step_kind == _STEP_DAYS:
+        index = (window_start - start).days // step
+        return start + timedelta(days=index * step), index
+
+    if step_kind == _STEP_MONTHS:
+        months_between = (window_start.year - start.year) * 12 + window_start.month - start.month
+        index = months_between // step
+        return _occurrence_in_month(start, index * step), index
+
+    if step_kind == _STEP_YEARS:
+        index = (window_start.year - start.year) // step
+        return _occurrence_in_month(start, 12 * index * step), index
+
+    # Дни недели: первая неделя - start_date и следующие дни маски, затем
+    # каждые step недель все дни маски (блок начинается с понедельника)
+    block_days = 7 * step
+    first_monday = start - timedelta(days=start.weekday())
+    block = (window_start - first_monday).days // block_days
+    if block < 1:
+        return start, 0
+    mask = rule.weekday_mask
+    first_block_count = 1 + bin(mask >> (start.weekday() + 1)).count("1")
+    return (
+        first_monday + timedelta(days=block * block_days + rule.first_weekday),
+        first_block_count + (block - 1) * bin(mask).count("1")
+    )
+
 
 def generate_occurrences_for_period(
     session: Session,
@@ -243,6 +374,10 @@ def generate_occurrences_for_period(
     Для бессрочных транзакций генерируются вхождения только от start_date и позже.
     Для транзакций с end_date генерируются вхождения только в диапазоне [start_date, end_date].
     
+    Перебор начинается не со start_date плановой транзакции, а с вхождения
+    у начала периода (_skip_to_window), поэтому давно действующее правило
+    не перебирает всю свою историю.
+    
     Args:
         session: Активная сессия БД для доступа к правилам повторения
         planned_tx: Шаблон плановой транзакции с правилом повторения
@@ -291,30 +426,28 @@ def generate_occurrences_for_period(
                 return [planned_tx.start_date]
             return []
         
+        # Правило компилируется один раз на вызов (и берётся из кэша при повторных)
+        rule = compile_recurrence_rule(recurrence_rule, planned_tx)
+        until_date = rule.until_date
+        max_count = rule.max_count
+        
         # Для транзакций с end_date: проверяем, что период пересекается с [start_date, end_date] транзакции
-        if recurrence_rule.end_condition_type == EndConditionType.UNTIL_DATE and recurrence_rule.end_date:
-            # Если запрашиваемый период полностью после end_date транзакции, возвращаем пустой список
-            if start_date > recurrence_rule.end_date:
-                logger.debug(f"Период ({start_date} - {end_date}) после end_date плановой транзакции ({recurrence_rule.end_date}), вхождения не генерируются")
-                return []
+        if until_date and start_date > until_date:
+            # Запрашиваемый период полностью после end_date транзакции
+            logger.debug(f"Период ({start_date} - {end_date}) после end_date плановой транзакции ({until_date}), вхождения не генерируются")
+            return []
         
         occurrences: List[date] = []
-        current_date = planned_tx.start_date
         
-        # Если дата начала плана позже конца периода, возвращаем пустой список
-        if current_date > end_date:
-            return []
-        
-        # Счётчик для условия AFTER_COUNT
-        count = 0
-        max_count = recurrence_rule.occurrences_count if recurrence_rule.end_condition_type == EndConditionType.AFTER_COUNT else None
+        # Переход сразу к вхождению у начала периода; count - количество
+        # пропущенных вхождений (для условия AFTER_COUNT)
+        current_date, count = _skip_to_window(rule, start_date)
         
         # Генерируем вхождения
         while current_date <= end_date:
             # Проверяем условие окончания по дате
-            if recurrence_rule.end_condition_type == EndConditionType.UNTIL_DATE:
-                if recurrence_rule.end_date and current_date > recurrence_rule.end_date:
-                    break
+            if until_date and current_date > until_date:
+                break
             
             # Проверяем условие окончания по количеству
             if max_count is not None and count >= max_count:
@@ -323,15 +456,13 @@ def generate_occurrences_for_period(
             # Добавляем текущую дату, если она в периоде
             if current_date >= start_date:
                 occurrences.append(current_date)
-                count += 1
-            elif current_date < start_date:
-                # Увеличиваем счётчик, даже если дата не в периоде
-                count += 1
+            # Счётчик увеличивается, даже если дата не в периоде
+            count += 1
             
             # Вычисляем следующую дату
-            next_date = calculate_next_occurrence_date(current_date, recurrence_rule)
+            next_date = _next_occurrence(current_date, rule)
             
-            if next_date is None or next_date <= current_date:
+            if next_date <= current_date:
                 # Защита от бесконечного цикла
                 logger.warning(f"Невозможно вычислить следующую дату для плановой транзакции ID {planned_tx.id}")
                 break
@@ -0,0 +1,167 @@
+"""
+Сервис полнотекстового поиска по описаниям.
+
+Описания транзакций, плановых транзакций и отложенных платежей хранятся
+в search_documents (поддерживается триггерами таблиц-источников) и
+индексируются FTS5-таблицей search_index. Поиск выполняется по всем датам,
+слова запроса сопоставляются с началом слов описания (префиксный поиск),
+регистр и "ё"/"е" не различаются. Результаты упорядочены по релевантности (BM25).
+
+Функции:
+- build_match_query: запрос FTS5 по введённому тексту
+- matching_source_ids: подзапрос ID источников, описание которых совпадает с текстом
+- search_descriptions: ранжированный поиск по всем источникам
+- rebuild_search_index: пересчёт индекса по таблицам-источникам
+"""
+
+import logging
+import re
+from dataclasses import dataclass
+from typing import Iterable, List, Optional, Union
+
+from sqlalchemy import Connection, Select, column, delete, func, select, table, text
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from finance_tracker.models import SEARCH_SOURCES, SearchSourceType
+from finance_tracker.models.models import normalize_search_text_sql, search_documents_table
+
+# Настройка логирования
+logger = logging.getLogger(__name__)
+
+# Количество результатов поиска по умолчанию
+DEFAULT_SEARCH_LIMIT = 50
+
+# Слова запроса: последовательности букв и цифр (включая кириллицу)
+_WORD_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+# FTS5-таблица индекса (виртуальная, описывается только для построения запросов)
+search_index = table("search_index", column("rowid"), column("body"))
+
+
+@dataclass(frozen=True)
+class SearchHit:
+    """
+    Результат поиска.
+
+    Attributes:
+        source_type: Тип источника (транзакция, плановая транзакция, отложенный платёж)
+        source_id: ID строки-источника
+        snippet: Фрагмент описания с выделенными совпадениями («...»)
+        rank: Релевантность BM25 (меньше - релевантнее)
+    """
+    source_type: SearchSourceType
+    source_id: str
+    snippet: str
+    rank: float
+
+
+def build_match_query(search_text: str) -> Optional[str]:
+    """
+    Строит запрос FTS5: каждое слово текста ищется как префикс, слова объединяются по И.
+
+    Слова заключаются в кавычки, поэтому операторы FTS5 в тексте
+    пользователя (AND, NEAR, *, :) не интерпретируются.
+
+    Returns:
+        Запрос MATCH или None, если в тексте нет слов
+    """
+    normalized = search_text.replace("ё", "е").replace("Ё", "Е")
+    words = _WORD_PATTERN.findall(normalized)
+    if not words:
+        return None
+    return " ".join(f'"{word}"*' for word in words)
+
+
+def matching_source_ids(source_type: SearchSourceType, match_query: str) -> Select:
+    """
+    Подзапрос ID строк-источников, описание которых совпадает с запросом FTS5.
+
+    Args:
+        source_type: Тип источника
+        match_query: Запрос из build_match_query
+
+    Returns:
+        SELECT source_id для использования в IN (...)
+    """
+    documents = search_documents_table
+    return select(documents.c.source_id).join(
+        search_index, search_index.c.rowid == documents.c.id
+    ).where(
+        text("search_index MATCH :match_query").bindparams(match_query=match_query),
+        documents.c.kind == source_type.value
+    )
+
+
+def search_descriptions(
+    session: Session,
+    search_text: str,
+    source_types: Optional[Iterable[SearchSourceType]] = None,
+    limit: int = DEFAULT_SEARCH_LIMIT
+) -> List[SearchHit]:
+    """
+    Ищет описания по всем датам с ранжированием по релевантности.
+
+    Args:
+        session: Активная сессия БД
+        search_text: Введённый пользователем текст
+        source_types: Типы источников (по умолчанию все)
+        limit: Максимальное количество результатов
+
+    Returns:
+        Список результатов по убыванию релевантности (пустой, если в тексте нет слов)
+
+    Raises:
+        SQLAlchemyError: При ошибках работы с базой данных
+    """
+    match_query = build_match_query(search_text)
+    if match_query is None:
+        return []
+
+    try:
+        documents = search_documents_table
+        rank = text("search_index.rank")
+        query = select(
+            documents.c.kind,
+            documents.c.source_id,
+            text("snippet(search_index, 0, '«', '»', '…', 12)"),
+            rank,
+        ).select_from(
+            search_index.join(documents, search_index.c.rowid == documents.c.id)
+        ).where(
+            text("search_index MATCH :match_query").bindparams(match_query=match_query)
+        ).order_by(rank).limit(limit)
+        if source_types is not None:
+            query = query.where(documents.c.kind.in_([source_type.value for source_type in source_types]))
+
+        hits = [
+            SearchHit(SearchSourceType(kind), source_id, snippet, rank_value)
+            for kind, source_id, snippet, rank_value in session.execute(query)
+        ]
+        logger.debug(f"Поиск '{search_text}': найдено {len(hits)}")
+        return hits
+
+    except SQLAlchemyError as e:
+        logger.error(f"Ошибка полнотекстового поиска '{search_text}': {e}")
+        raise
+
+
+def rebuild_search_index(executor: Union[Session, Connection]) -> None:
+    """
+    Пересчитывает документы и индекс поиска по таблицам-источникам.
+
+    Выполняет по одному INSERT ... SELECT на таблицу-источник.
+    Транзакцию не фиксирует.
+
+    Args:
+        executor: Сессия или соединение БД
+    """
+    executor.execute(delete(search_documents_table))
+    for table_name, source_type in SEARCH_SOURCES.items():
+        executor.execute(text(
+            f"INSERT INTO search_documents (kind, source_id, body) "
+            f"SELECT :kind, id, {normalize_search_text_sql('description')} FROM {table_name} "
+            f"WHERE description IS NOT NULL AND trim(description) != ''"
+        ), {"kind": source_type.value})
+    count = executor.execute(select(func.count()).select_from(search_documents_table)).scalar()
+    logger.info(f"Индекс поиска пересчитан: {count} описаний")
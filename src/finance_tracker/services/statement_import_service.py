@@ -0,0 +1,263 @@
+"""
+Сервис импорта банковских выписок в формате CSV.
+
+Файл читается построчно (csv.DictReader над открытым файлом), строки
+накапливаются пачками и сохраняются через create_transactions_bulk:
+каждая пачка фиксируется отдельно. В памяти держится только текущая
+пачка и счётчик повторов для каждой различной строки выписки.
+
+Каждой строке назначается отпечаток содержимого: дата, сумма со знаком,
+нормализованное описание и порядковый номер одинаковой строки внутри дня
+(две одинаковые покупки за день - разные транзакции). Отпечаток хранится
+в transactions.import_fingerprint с уникальным индексом, поэтому повторный
+импорт той же выписки (в том числе прерванного импорта) не создаёт дубликатов.
+
+Функции:
+- import_statement_csv: потоковый импорт выписки
+"""
+
+import csv
+import hashlib
+import logging
+import os
+from contextlib import nullcontext
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from decimal import Decimal, InvalidOperation
+from typing import Dict, List, Optional, TextIO, Tuple, Union
+
+from sqlalchemy import select
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from finance_tracker.models import TransactionDB, TransactionType
+from finance_tracker.models.types import money_to_minor
+from finance_tracker.services.transaction_service import create_transactions_bulk
+from finance_tracker.utils.validation import validate_uuid_format
+
+# Настройка логирования
+logger = logging.getLogger(__name__)
+
+# Количество строк выписки в одной фиксируемой пачке
+DEFAULT_IMPORT_CHUNK_SIZE = 2000
+
+# Максимальное количество ошибок, сохраняемых в результате (остальные только считаются)
+MAX_REPORTED_ERRORS = 100
+
+
+@dataclass(frozen=True)
+class StatementColumns:
+    """
+    Соответствие колонок выписки полям транзакции.
+
+    Attributes:
+        date: Колонка даты операции
+        amount: Колонка суммы со знаком (положительная - доход, отрицательная - расход)
+        description: Колонка описания (None - описаний нет)
+        date_format: Формат даты для datetime.strptime
+        delimiter: Разделитель полей
+        decimal_separator: Разделитель дробной части суммы
+        encoding: Кодировка файла
+    """
+    date: str = "date"
+    amount: str = "amount"
+    description: Optional[str] = "description"
+    date_format: str = "%Y-%m-%d"
+    delimiter: str = ","
+    decimal_separator: str = "."
+    encoding: str = "utf-8-sig"
+
+
+@dataclass
+class StatementImportResult:
+    """
+    Результат импорта выписки.
+
+    Attributes:
+        imported_count: Количество созданных транзакций
+        duplicate_count: Количество строк, уже импортированных ранее
+        error_count: Количество строк с ошибками
+        errors: Описания первых MAX_REPORTED_ERRORS ошибок ("строка N: ...")
+    """
+    imported_count: int = 0
+    duplicate_count: int = 0
+    error_count: int = 0
+    errors: List[str] = field(default_factory=list)
+
+    def add_error(self, line_number: int, message: str) -> None:
+        """Учитывает ошибку строки выписки."""
+        self.error_count += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append(f"строка {line_number}: {message}")
+
+
+def _normalize_description(description: Optional[str]) -> str:
+    """Описание для отпечатка: без различий регистра, "ё"/"е" и пробелов."""
+    if not description:
+        return ""
+    return " ".join(description.casefold().replace("ё", "е").split())
+
+
+def _parse_amount(value: str, decimal_separator: str) -> Decimal:
+    """Сумма со знаком: пробелы (в том числе неразрывные) между разрядами удаляются."""
+    cleaned = "".join(value.split()).replace(decimal_separator, ".")
+    try:
+        amount = Decimal(cleaned)
+    except InvalidOperation:
+        raise ValueError(f"некорректная сумма '{value}'")
+    if not amount.is_finite() or amount == 0:
+        raise ValueError(f"некорректная сумма '{value}'")
+    return amount
+
+
+def _parse_row(row: Dict[str, Optional[str]], columns: StatementColumns) -> Tuple[date, Decimal, Optional[str]]:
+    """Разбирает строку выписки: дата, сумма со знаком, описание."""
+    raw_date = (row.get(columns.date) or "").strip()
+    raw_amount = (row.get(columns.amount) or "").strip()
+    if not raw_date or not raw_amount:
+        raise ValueError("не заполнены дата или сумма")
+    try:
+        operation_date = datetime.strptime(raw_date, columns.date_format).date()
+    except ValueError:
+        raise ValueError(f"некорректная дата '{raw_date}'")
+    amount = _parse_amount(raw_amount, columns.decimal_separator)
+    description = (row.get(columns.description) or "").strip() if columns.description else ""
+    return operation_date, amount, description or None
+
+
+class _FingerprintCounter:
+    """
+    Отпечатки строк с порядковым номером одинаковых строк внутри дня.
+
+    Счётчики ведутся для всего импорта, поэтому порядковые номера не зависят
+    от порядка строк: выписка, не упорядоченная по дате, получает те же
+    отпечатки при повторном импорте. Память - одно число на каждую различную
+    строку выписки.
+    """
+
+    def __init__(self):
+        self._counts: Dict[str, int] = {}
+
+    def fingerprint(self, operation_date: date, amount: Decimal, description: Optional[str]) -> str:
+        key = f"{operation_date.isoformat()}|{money_to_minor(amount)}|{_normalize_description(description)}"
+        ordinal = self._counts.get(key, 0) + 1
+        self._counts[key] = ordinal
+        return hashlib.sha256(f"{key}|{ordinal}".encode("utf-8")).hexdigest()[:32]
+
+
+def _save_chunk(
+    session: Session,
+    chunk: List[Tuple[int, dict]],
+    result: StatementImportResult
+) -> None:
+    """Сохраняет пачку строк, пропуская уже импортированные (поиск по уникальному индексу)."""
+    fingerprints = [item["import_fingerprint"] for _, item in chunk]
+    existing = set(session.execute(
+        select(TransactionDB.import_fingerprint).where(TransactionDB.import_fingerprint.in_(fingerprints))
+    ).scalars())
+    new_rows = []
+    for line_number, item in chunk:
+        # Уже сохранённые и повторяющиеся внутри пачки отпечатки не отправляются в БД
+        if item["import_fingerprint"] not in existing:
+            existing.add(item["import_fingerprint"])
+            new_rows.append((line_number, item))
+    result.duplicate_count += len(chunk) - len(new_rows)
+    if not new_rows:
+        return
+
+    bulk_result = create_transactions_bulk(session, [item for _, item in new_rows])
+    result.imported_count += len(bulk_result.created_ids)
+    for position, message in bulk_result.errors.items():
+        result.add_error(new_rows[position][0], message)
+
+
+def import_statement_csv(
+    session: Session,
+    source: Union[str, os.PathLike, TextIO],
+    income_category_id: str,
+    expense_category_id: str,
+    columns: Optional[StatementColumns] = None,
+    chunk_size: int = DEFAULT_IMPORT_CHUNK_SIZE
+) -> StatementImportResult:
+    """
+    Импортирует транзакции из CSV-выписки банка, читая файл потоково.
+
+    Строки сохраняются пачками по chunk_size, каждая пачка фиксируется
+    отдельно. Строки, импортированные ранее (совпал отпечаток), пропускаются,
+    поэтому прерванный импорт можно просто повторить.
+
+    Args:
+        session: Активная сессия БД
+        source: Путь к файлу или открытый текстовый поток
+        income_category_id: Категория для поступлений (UUID)
+        expense_category_id: Категория для списаний (UUID)
+        columns: Соответствие колонок (по умолчанию StatementColumns())
+        chunk_size: Количество строк в пачке
+
+    Returns:
+        StatementImportResult: Количество созданных транзакций, дубликатов и ошибок
+
+    Raises:
+        ValueError: Если в заголовке нет нужных колонок, некорректны параметры
+            или не удалось сохранить пачку (зафиксированные ранее пачки сохраняются)
+        SQLAlchemyError: При ошибках чтения из БД
+
+    Example:
+        >>> columns = StatementColumns(date="Дата операции", amount="Сумма",
+        ...                            description="Описание", date_format="%d.%m.%Y",
+        ...                            delimiter=";", decimal_separator=",", encoding="cp1251")
+        >>> with get_db_session() as session:
+        ...     result = import_statement_csv(session, "statement.csv", income_id, expense_id, columns)
+        ...     print(f"Импортировано: {result.imported_count}, дубликатов: {result.duplicate_count}")
+    """
+    columns = columns or StatementColumns()
+    validate_uuid_format(income_category_id, "income_category_id")
+    validate_uuid_format(expense_category_id, "expense_category_id")
+    if chunk_size < 1:
+        raise ValueError("Размер пачки должен быть положительным")
+
+    opened = (
+        open(source, encoding=columns.encoding, newline="")
+        if isinstance(source, (str, os.PathLike)) else nullcontext(source)
+    )
+    result = StatementImportResult()
+    try:
+        with opened as stream:
+            reader = csv.DictReader(stream, delimiter=columns.delimiter)
+            required = [columns.date, columns.amount] + ([columns.description] if columns.description else [])
+            missing = [name for name in required if name not in (reader.fieldnames or [])]
+            if missing:
+                raise ValueError(f"В выписке нет колонок: {', '.join(missing)}")
+
+            counter = _FingerprintCounter()
+            chunk: List[Tuple[int, dict]] = []
+            for row in reader:
+                try:
+                    operation_date, amount, description = _parse_row(row, columns)
+                except ValueError as e:
+                    result.add_error(reader.line_num, str(e))
+                    continue
+                chunk.append((reader.line_num, {
+                    "amount": abs(amount),
+                    "type": TransactionType.INCOME if amount > 0 else TransactionType.EXPENSE,
+                    "category_id": income_category_id if amount > 0 else expense_category_id,
+                    "description": description,
+                    "transaction_date": operation_date,
+                    "import_fingerprint": counter.fingerprint(operation_date, amount, description),
+                }))
+                if len(chunk) >= chunk_size:
+                    _save_chunk(session, chunk, result)
+                    chunk = []
+            if chunk:
+                _save_chunk(session, chunk, result)
+
+        logger.info(
+            f"Импорт выписки завершён: создано {result.imported_count}, "
+            f"дубликатов {result.duplicate_count}, ошибок {result.error_count}"
+        )
+        return result
+
+    except SQLAlchemyError as e:
+        logger.error(f"Ошибка БД при импорте выписки (создано до ошибки: {result.imported_count}): {e}")
+        session.rollback()
+        raise
@@ -4,24 +4,42 @@
 Содержит бизнес-логику и CRUD операции для работы с транзакциями:
 - get_transactions_by_date: получение транзакций по дате
 - get_by_date_range: получение транзакций за период
+- get_transactions_page: страница транзакций по фильтрам (keyset-пагинация)
 - add_transaction: создание новой транзакции с валидацией
+- create_transactions_bulk: массовое создание транзакций одной транзакцией БД
 - update_transaction: обновление существующей транзакции
 - delete_transaction: удаление транзакции с проверкой существования
 - get_month_stats: получение статистики по месяцу для календаря
+- get_year_stats: получение статистики по всем дням года (тепловая карта)
+- get_category_totals: количество и сумма транзакций по категориям с фильтрами
 
 Все функции принимают сессию БД как параметр (Dependency Injection).
 """
 
+from dataclasses import dataclass, field
 from datetime import date
 from decimal import Decimal
-from typing import List, Optional, Dict, Tuple
+from typing import Any, List, Optional, Dict, Sequence, Tuple, Union
 import logging
+import uuid
 
-from sqlalchemy.orm import Session
+from sqlalchemy import case, delete, func, insert, literal, select, tuple_
+from sqlalchemy.orm import Query, Session, joinedload
 from sqlalchemy.exc import SQLAlchemyError
-from pydantic import ValidationError
+from pydantic import TypeAdapter, ValidationError
 
-from finance_tracker.models import TransactionDB, TransactionCreate, TransactionType, TransactionUpdate
+from finance_tracker.models import (
+    CategoryDB,
+    SearchSourceType,
+    TransactionCreate,
+    TransactionDB,
+    TransactionType,
+    TransactionUpdate,
+)
+from finance_tracker.models.types import minor_to_money, money_sum, money_to_minor
+from finance_tracker.models.models import balance_ledger_bulk_insert_table
+from finance_tracker.services.balance_ledger_service import apply_daily_changes, get_ledger_balance
+from finance_tracker.services.search_service import build_match_query, matching_source_ids
 from finance_tracker.utils.validation import validate_uuid_format
 
 
@@ -29,9 +47,23 @@ from finance_tracker.utils.validation import validate_uuid_format
 logger = logging.getLogger(__name__)
 
 
+def balance_sum_expression():
+    """
+    SQL-выражение баланса: SUM(доходы) - SUM(расходы) по транзакциям запроса.
+
+    Суммирование выполняется в SQL над целыми копейками, результат
+    приводится к Decimal типом MoneyType (0 для пустой выборки).
+    """
+    signed_amount = case(
+        (TransactionDB.type == TransactionType.INCOME, TransactionDB.amount),
+        else_=-TransactionDB.amount
+    )
+    return money_sum(signed_amount)
+
+
 def get_total_balance(session: Session) -> Decimal:
     """
-    Рассчитывает текущий общий баланс (Доходы - Расходы).
+    Возвращает текущий общий баланс (Доходы - Расходы) из журнала баланса.
     
     Args:
         session: Активная сессия БД
@@ -45,13 +77,8 @@ def get_total_balance(session: Session) -> Decimal:
     try:
         logger.debug("Расчёт текущего баланса")
         
-        # Получаем все транзакции
-        transactions = session.query(TransactionDB).all()
-        
-        total_income = sum((t.amount for t in transactions if t.type == TransactionType.INCOME), Decimal('0.0'))
-        total_expense = sum((t.amount for t in transactions if t.type == TransactionType.EXPENSE), Decimal('0.0'))
-        
-        balance = total_income - total_expense
+        # Итог поддерживается триггерами журнала баланса: чтение одной строки
+        balance = get_ledger_balance(session)
         logger.info(f"Текущий баланс: {balance}")
         return balance
         
@@ -120,6 +147,190 @@ def get_by_date_range(session: Session, start_date: date, end_date: date) -> Lis
         raise
 
 
+# Сортировки страниц транзакций: ключ -> (колонка, по убыванию)
+TRANSACTION_SORTS = {
+    "date_desc": ("transaction_date", True),
+    "date_asc": ("transaction_date", False),
+    "amount_desc": ("amount", True),
+    "amount_asc": ("amount", False),
+}
+
+# Размер страницы транзакций по умолчанию
+DEFAULT_PAGE_SIZE = 50
+
+
+@dataclass(frozen=True)
+class TransactionCursor:
+    """
+    Позиция страницы транзакций (keyset): значение ключа сортировки и ID последней строки.
+
+    Attributes:
+        value: transaction_date или amount последней транзакции (по ключу сортировки)
+        id: ID последней транзакции (разрешает равные значения ключа)
+    """
+    value: Union[date, Decimal]
+    id: str
+
+
+@dataclass
+class TransactionPage:
+    """
+    Страница транзакций.
+
+    Attributes:
+        items: Транзакции страницы (с загруженной категорией)
+        next_cursor: Позиция следующей страницы (None - страница последняя)
+        total_count: Количество транзакций по фильтрам (только для первой страницы)
+        total_income: Сумма доходов по фильтрам (только для первой страницы)
+        total_expense: Сумма расходов по фильтрам (только для первой страницы)
+    """
+    items: List[TransactionDB]
+    next_cursor: Optional[TransactionCursor] = None
+    total_count: Optional[int] = None
+    total_income: Optional[Decimal] = None
+    total_expense: Optional[Decimal] = None
+
+
+def _filter_transactions(
+    query: Query,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    transaction_type: Optional[TransactionType] = None,
+    category_id: Optional[str] = None,
+    search_text: Optional[str] = None,
+    min_amount: Optional[Decimal] = None,
+    max_amount: Optional[Decimal] = None
+) -> Query:
+    """
+    Добавляет к запросу фильтры транзакций (все необязательны, объединяются по И).
+
+    Поиск по описанию выполняется по полнотекстовому индексу (search_service):
+    слова текста ищутся как начала слов описания без учёта регистра.
+    Текст без слов не фильтрует транзакции.
+
+    Raises:
+        ValueError: Если category_id имеет неверный формат
+    """
+    if start_date is not None:
+        query = query.filter(TransactionDB.transaction_date >= start_date)
+    if end_date is not None:
+        query = query.filter(TransactionDB.transaction_date <= end_date)
+    if transaction_type is not None:
+        query = query.filter(TransactionDB.type == transaction_type)
+    if category_id is not None:
+        validate_uuid_format(category_id, "category_id")
+        query = query.filter(TransactionDB.category_id == category_id)
+    if min_amount is not None:
+        query = query.filter(TransactionDB.amount >= min_amount)
+    if max_amount is not None:
+        query = query.filter(TransactionDB.amount <= max_amount)
+    match_query = build_match_query(search_text) if search_text else None
+    if match_query is not None:
+        query = query.filter(TransactionDB.id.in_(
+            matching_source_ids(SearchSourceType.TRANSACTION, match_query)
+        ))
+    return query
+
+
+def get_transactions_page(
+    session: Session,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    transaction_type: Optional[TransactionType] = None,
+    category_id: Optional[str] = None,
+    search_text: Optional[str] = None,
+    min_amount: Optional[Decimal] = None,
+    max_amount: Optional[Decimal] = None,
+    sort: str = "date_desc",
+    cursor: Optional[TransactionCursor] = None,
+    page_size: int = DEFAULT_PAGE_SIZE
+) -> TransactionPage:
+    """
+    Получает страницу транзакций по фильтрам с keyset-пагинацией.
+    
+    Строки упорядочены по ключу сортировки и ID, следующая страница
+    начинается строго после cursor, поэтому стоимость запроса не зависит
+    от номера страницы и длины периода. Для первой страницы (cursor=None)
+    одним агрегатным запросом считаются количество транзакций и суммы
+    доходов и расходов по фильтрам.
+    
+    Args:
+        session: Активная сессия БД
+        start_date: Начало периода (включительно)
+        end_date: Конец периода (включительно)
+        transaction_type: Тип транзакций
+        category_id: ID категории
+        search_text: Слова описания (полнотекстовый поиск по началу слов)
+        min_amount: Минимальная сумма (включительно)
+        max_amount: Максимальная сумма (включительно)
+        sort: Ключ сортировки из TRANSACTION_SORTS
+        cursor: Позиция из next_cursor предыдущей страницы (None - первая страница)
+        page_size: Количество транзакций на странице
+        
+    Returns:
+        TransactionPage: Транзакции страницы и позиция следующей страницы
+        
+    Raises:
+        ValueError: При неизвестной сортировке, page_size < 1 или неверном category_id
+        SQLAlchemyError: При ошибках работы с базой данных
+    """
+    if sort not in TRANSACTION_SORTS:
+        error_msg = f"Неизвестная сортировка: {sort}. Допустимые значения: {', '.join(TRANSACTION_SORTS)}"
+        logger.error(error_msg)
+        raise ValueError(error_msg)
+    if page_size < 1:
+        error_msg = f"Размер страницы должен быть положительным, получено: {page_size}"
+        logger.error(error_msg)
+        raise ValueError(error_msg)
+    
+    try:
+        filters = dict(
+            start_date=start_date, end_date=end_date, transaction_type=transaction_type,
+            category_id=category_id, search_text=search_text,
+            min_amount=min_amount, max_amount=max_amount
+        )
+        column_name, descending = TRANSACTION_SORTS[sort]
+        sort_column = getattr(TransactionDB, column_name)
+        
+        query = _filter_transactions(
+            session.query(TransactionDB).options(joinedload(TransactionDB.category)), **filters
+        )
+        if cursor is not None:
+            position = tuple_(sort_column, TransactionDB.id)
+            after = tuple_(
+                literal(cursor.value, sort_column.type), literal(cursor.id, TransactionDB.id.type)
+            )
+            query = query.filter(position < after if descending else position > after)
+        if descending:
+            query = query.order_by(sort_column.desc(), TransactionDB.id.desc())
+        else:
+            query = query.order_by(sort_column, TransactionDB.id)
+        
+        # Лишняя строка показывает, есть ли следующая страница
+        items = query.limit(page_size + 1).all()
+        page = TransactionPage(items=items[:page_size])
+        if len(items) > page_size:
+            last = page.items[-1]
+            page.next_cursor = TransactionCursor(getattr(last, column_name), last.id)
+        
+        if cursor is None:
+            income = money_sum(case((TransactionDB.type == TransactionType.INCOME, TransactionDB.amount), else_=0))
+            expense = money_sum(case((TransactionDB.type == TransactionType.EXPENSE, TransactionDB.amount), else_=0))
+            page.total_count, page.total_income, page.total_expense = _filter_transactions(
+                session.query(func.count(TransactionDB.id), income, expense), **filters
+            ).one()
+        
+        logger.debug(
+            f"Страница транзакций ({sort}): {len(page.items)} строк, "
+            f"{'есть' if page.next_cursor else 'нет'} следующей"
+        )
+        return page
+        
+    except SQLAlchemyError as e:
+        logger.error(f"Ошибка при получении страницы транзакций: {e}")
+        raise
+
+
 def create_transaction(session: Session, transaction: TransactionCreate) -> TransactionDB:
     """
     Создаёт новую транзакцию с валидацией данных.
@@ -174,6 +385,131 @@ def create_transaction(session: Session, transaction: TransactionCreate) -> Tran
         raise
 
 
+# Размер пачки строк при массовой вставке транзакций
+BULK_CHUNK_SIZE = 1000
+
+_transaction_list_adapter = TypeAdapter(List[TransactionCreate])
+
+
+@dataclass
+class BulkCreateResult:
+    """
+    Результат массового создания транзакций.
+
+    Attributes:
+        created_ids: ID созданных транзакций в порядке входных данных
+        errors: Ошибки по номерам входных элементов (такие элементы не создаются)
+    """
+    created_ids: List[str] = field(default_factory=list)
+    errors: Dict[int, str] = field(default_factory=dict)
+
+
+def _validate_bulk_items(
+    items: Sequence[Union[TransactionCreate, Dict[str, Any]]]
+) -> Tuple[Dict[int, TransactionCreate], Dict[int, str]]:
+    """
+    Валидирует элементы одним проходом TypeAdapter по списку.
+
+    Если в списке есть ошибки, элементы с ошибками исключаются и оставшиеся
+    проверяются ещё одним проходом (он завершается без ошибок).
+
+    Returns:
+        (номер элемента -> модель, номер элемента -> описание ошибок)
+    """
+    errors: Dict[int, List[str]] = {}
+    positions = list(range(len(items)))
+    validated: List[TransactionCreate] = []
+    while positions:
+        try:
+            validated = _transaction_list_adapter.validate_python([items[i] for i in positions])
+            break
+        except ValidationError as e:
+            failed = set()
+            for error in e.errors():
+                position = positions[error["loc"][0]]
+                failed.add(position)
+                field_path = ".".join(str(part) for part in error["loc"][1:])
+                errors.setdefault(position, []).append(
+                    f"{field_path}: {error['msg']}" if field_path else error["msg"]
+                )
+            positions = [position for position in positions if position not in failed]
+    return dict(zip(positions, validated)), {position: "; ".join(messages) for position, messages in errors.items()}
+
+
+def create_transactions_bulk(
+    session: Session,
+    items: Sequence[Union[TransactionCreate, Dict[str, Any]]]
+) -> BulkCreateResult:
+    """
+    Создаёт транзакции пачкой в одной транзакции БД.
+
+    Все элементы валидируются одним проходом Pydantic, категории проверяются
+    одним запросом. Элементы с ошибками пропускаются и перечисляются в
+    результате, остальные вставляются executemany пачками по BULK_CHUNK_SIZE.
+    Построчный триггер журнала баланса на время вставки отключается флагом,
+    журнал обновляется один раз по изменениям за каждый день (apply_daily_changes).
+
+    Args:
+        session: Активная сессия БД
+        items: Данные транзакций (TransactionCreate или словари с теми же полями)
+
+    Returns:
+        BulkCreateResult: ID созданных транзакций и ошибки по номерам элементов
+
+    Raises:
+        ValueError: При ошибках записи в базу данных (ничего не создаётся)
+    """
+    try:
+        logger.debug(f"Массовое создание транзакций: {len(items)} элементов")
+        validated, errors = _validate_bulk_items(items)
+
+        category_ids = {str(uuid.UUID(item.category_id)) for item in validated.values()}
+        existing_categories = set(
+            session.execute(select(CategoryDB.id).where(CategoryDB.id.in_(category_ids))).scalars()
+        ) if category_ids else set()
+
+        result = BulkCreateResult()
+        rows = []
+        changes: Dict[date, Tuple[Decimal, int]] = {}
+        for position in sorted(validated):
+            item = validated[position]
+            if str(uuid.UUID(item.category_id)) not in existing_categories:
+                errors[position] = f"category_id: категория {item.category_id} не найдена"
+                continue
+            row = {"id": str(uuid.uuid4()), **item.model_dump()}
+            rows.append(row)
+            result.created_ids.append(row["id"])
+            # Сумма в журнале - как она будет сохранена (с округлением до копеек)
+            amount = minor_to_money(money_to_minor(item.amount))
+            signed_amount = amount if item.type == TransactionType.INCOME else -amount
+            net, count = changes.get(item.transaction_date, (Decimal("0"), 0))
+            changes[item.transaction_date] = (net + signed_amount, count + 1)
+        result.errors = dict(sorted(errors.items()))
+
+        if rows:
+            apply_daily_changes(session, changes)
+            # Флаг отключает построчный триггер вставки журнала; при ошибке
+            # он откатывается вместе с транзакцией
+            session.execute(insert(balance_ledger_bulk_insert_table).values(id=1))
+            for start in range(0, len(rows), BULK_CHUNK_SIZE):
+                session.execute(insert(TransactionDB), rows[start:start + BULK_CHUNK_SIZE])
+            session.execute(delete(balance_ledger_bulk_insert_table))
+            session.commit()
+
+        logger.info(f"Массово создано транзакций: {len(rows)}, ошибок: {len(result.errors)}")
+        return result
+
+    except SQLAlchemyError as e:
+        logger.error(f"Ошибка при массовом сохранении транзакций в БД: {e}")
+        session.rollback()
+        raise ValueError(f"Ошибка при сохранении транзакций: {e}")
+
+    except Exception as e:
+        logger.error(f"Неожиданная ошибка при массовом создании транзакций: {e}")
+        session.rollback()
+        raise
+
+
 def update_transaction(
     session: Session, 
     transaction_id: str, 
@@ -290,6 +626,26 @@ def delete_transaction(session: Session, transaction_id: str) -> bool:
         raise
 
 
+def _daily_income_expense(session: Session, start_date: date, end_date: date) -> List[Tuple[date, Decimal, Decimal]]:
+    """
+    Суммы доходов и расходов по дням периода одним запросом с GROUP BY.
+
+    Args:
+        session: Активная сессия БД
+        start_date: Начало периода (включительно)
+        end_date: Конец периода (не включительно)
+
+    Returns:
+        Строки (день, доходы, расходы) только для дней с транзакциями, по возрастанию даты
+    """
+    income = money_sum(case((TransactionDB.type == TransactionType.INCOME, TransactionDB.amount), else_=0))
+    expense = money_sum(case((TransactionDB.type == TransactionType.EXPENSE, TransactionDB.amount), else_=0))
+    return session.query(TransactionDB.transaction_date, income, expense).filter(
+        TransactionDB.transaction_date >= start_date,
+        TransactionDB.transaction_date < end_date
+    ).group_by(TransactionDB.transaction_date).order_by(TransactionDB.transaction_date).all()
+
+
 def get_month_stats(session: Session, year: int, month: int) -> Dict[int, Tuple[Decimal, Decimal]]:
     """
     Получает статистику транзакций по дням месяца для отображения в календаре.
@@ -329,29 +685,11 @@ def get_month_stats(session: Session, year: int, month: int) -> Dict[int, Tuple[
         else:
             end_date = date(year, month + 1, 1)
         
-        # Получаем все транзакции месяца
-        transactions = session.query(TransactionDB).filter(
-            TransactionDB.transaction_date >= start_date,
-            TransactionDB.transaction_date < end_date
-        ).all()
-        
-        # Группируем по дням
-        stats: Dict[int, Tuple[Decimal, Decimal]] = {}
-        
-        for transaction in transactions:
-            day = transaction.transaction_date.day
-            
-            # Инициализируем день, если его ещё нет
-            if day not in stats:
-                stats[day] = (Decimal('0.0'), Decimal('0.0'))
-            
-            # Добавляем сумму к доходам или расходам
-            income, expense = stats[day]
-            
-            if transaction.type == TransactionType.INCOME:
-                stats[day] = (income + transaction.amount, expense)
-            else:  # TransactionType.EXPENSE
-                stats[day] = (income, expense + transaction.amount)
+        # Доходы и расходы по дням группируются в SQL
+        stats: Dict[int, Tuple[Decimal, Decimal]] = {
+            day.day: (income, expense)
+            for day, income, expense in _daily_income_expense(session, start_date, end_date)
+        }
         
         logger.info(f"Статистика для {year}-{month:02d}: {len(stats)} дней с транзакциями")
         return stats
@@ -364,6 +702,125 @@ def get_month_stats(session: Session, year: int, month: int) -> Dict[int, Tuple[
         raise
 
 
+def get_year_stats(session: Session, year: int) -> Dict[date, Tuple[Decimal, Decimal]]:
+    """
+    Получает статистику транзакций по всем дням года (для годовой тепловой карты).
+    
+    Все дни года загружаются одним запросом; дни без транзакций
+    присутствуют в результате с нулевыми суммами.
+    
+    Args:
+        session: Активная сессия БД
+        year: Год (например, 2024)
+        
+    Returns:
+        Словарь {дата: (доходы, расходы)} для каждого дня года (365 или 366 записей)
+        в порядке возрастания даты
+        
+    Raises:
+        SQLAlchemyError: При ошибках работы с базой данных
+    """
+    try:
+        logger.debug(f"Получение статистики за {year} год")
+        
+        start_date = date(year, 1, 1)
+        end_date = date(year + 1, 1, 1)
+        
+        rows = {
+            day: (income, expense)
+            for day, income, expense in _daily_income_expense(session, start_date, end_date)
+        }
+        zero = (Decimal('0.00'), Decimal('0.00'))
+        stats: Dict[date, Tuple[Decimal, Decimal]] = {
+            date.fromordinal(ordinal): rows.get(date.fromordinal(ordinal), zero)
+            for ordinal in range(start_date.toordinal(), end_date.toordinal())
+        }
+        
+        logger.info(f"Статистика за {year} год: {len(rows)} дней с транзакциями")
+        return stats
+        
+    except SQLAlchemyError as e:
+        logger.error(f"Ошибка при получении статистики года: {e}")
+        raise
+
+
+@dataclass(frozen=True)
+class CategoryTotal:
+    """
+    Итог транзакций по категории.
+
+    Attributes:
+        category_id: ID категории
+        name: Название категории
+        type: Тип категории (INCOME/EXPENSE)
+        count: Количество транзакций
+        total: Сумма транзакций
+    """
+    category_id: str
+    name: str
+    type: TransactionType
+    count: int
+    total: Decimal
+
+
+def get_category_totals(
+    session: Session,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    transaction_type: Optional[TransactionType] = None,
+    category_id: Optional[str] = None,
+    search_text: Optional[str] = None,
+    min_amount: Optional[Decimal] = None,
+    max_amount: Optional[Decimal] = None
+) -> List[CategoryTotal]:
+    """
+    Получает количество и сумму транзакций по категориям одним запросом с GROUP BY.
+    
+    Все фильтры необязательны и объединяются по И.
+    
+    Args:
+        session: Активная сессия БД
+        start_date: Начало периода (включительно)
+        end_date: Конец периода (включительно)
+        transaction_type: Тип транзакций
+        category_id: ID категории
+        search_text: Слова описания (полнотекстовый поиск по началу слов)
+        min_amount: Минимальная сумма (включительно)
+        max_amount: Максимальная сумма (включительно)
+        
+    Returns:
+        Список итогов по категориям с транзакциями, по убыванию суммы
+        
+    Raises:
+        ValueError: Если category_id имеет неверный формат
+        SQLAlchemyError: При ошибках работы с базой данных
+    """
+    try:
+        logger.debug(
+            f"Получение итогов по категориям: период {start_date} - {end_date}, "
+            f"тип {transaction_type}, категория {category_id}"
+        )
+        
+        total = money_sum(TransactionDB.amount)
+        query = session.query(
+            CategoryDB.id, CategoryDB.name, CategoryDB.type, func.count(TransactionDB.id), total
+        ).join(TransactionDB, TransactionDB.category_id == CategoryDB.id)
+        query = _filter_transactions(
+            query, start_date, end_date, transaction_type, category_id,
+            search_text, min_amount, max_amount
+        )
+        
+        rows = query.group_by(CategoryDB.id).order_by(total.desc(), CategoryDB.name).all()
+        totals = [CategoryTotal(*row) for row in rows]
+        
+        logger.info(f"Итоги по категориям: {len(totals)} категорий с транзакциями")
+        return totals
+        
+    except SQLAlchemyError as e:
+        logger.error(f"Ошибка при получении итогов по категориям: {e}")
+        raise
+
+
 def get_category_statistics(session: Session) -> Dict[str, Dict[str, Decimal]]:
     """
     Получает статистику по категориям (суммы доходов и расходов).
@@ -387,27 +844,15 @@ def get_category_statistics(session: Session) -> Dict[str, Dict[str, Decimal]]:
     try:
         logger.debug("Получение статистики по категориям")
         
-        # Получаем все транзакции с категориями
-        from finance_tracker.models import CategoryDB
-        
-        transactions = session.query(TransactionDB).join(CategoryDB).all()
-        
-        # Группируем по категориям
-        stats: Dict[str, Dict[str, Decimal]] = {}
-        
-        for transaction in transactions:
-            category_id = transaction.category_id
-            
-            # Инициализируем категорию, если её ещё нет
-            if category_id not in stats:
-                stats[category_id] = {
-                    "total": Decimal('0.0'),
-                    "name": transaction.category.name,
-                    "type": transaction.category.type.value
-                }
-            
-            # Добавляем сумму транзакции
-            stats[category_id]["total"] += transaction.amount
+        # Суммы по категориям группируются в SQL
+        stats: Dict[str, Dict[str, Decimal]] = {
+            item.category_id: {
+                "total": item.total,
+                "name": item.name,
+                "type": item.type.value
+            }
+            for item in get_category_totals(session)
+        }
         
         logger.info(f"Статистика по категориям: {len(stats)} категорий с транзакциями")
         return stats
@@ -417,4 +862,4 @@ def get_category_statistics(session: Session) -> Dict[str, Dict[str, Decimal]]:
         raise
     except Exception as e:
         logger.error(f"Неожиданная ошибка при получении статистики по категориям: {e}")
-        raise
\ No newline at end of file
+        raise
@@ -0,0 +1,6 @@
+"""
+Инструменты разработчика Finance Tracker.
+
+Модули пакета запускаются из командной строки и не используются приложением:
+- query_audit: аудит планов выполнения SQL-запросов сервисов (EXPLAIN QUERY PLAN)
+"""
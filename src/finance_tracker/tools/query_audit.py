@@ -0,0 +1,359 @@
+"""
+Аудит планов выполнения SQL-запросов сервисов.
+
+Создаёт синтетическую БД, вызывает публичные функции сервисов и для
+каждого выполненного ими запроса получает план EXPLAIN QUERY PLAN.
+В планах отмечаются:
+- Полные просмотры таблиц (SCAN без индекса)
+- Временные B-деревья для ORDER BY / GROUP BY / DISTINCT
+- Автоматические индексы, которые SQLite строит на время запроса
+
+Для проблемных запросов предлагается индекс по колонкам условий WHERE
+и сортировки/группировки (с добавлением выбираемых колонок, чтобы индекс
+был покрывающим). Разбор SQL эвристический - предложения требуют проверки.
+
+Отчёт в формате JSON не содержит времени выполнения и случайных значений,
+поэтому отчёты разных версий можно сравнивать через diff.
+
+Запуск:
+    python -m finance_tracker.tools.query_audit --output audit.json
+    python -m finance_tracker.tools.query_audit --scale large --strict
+"""
+
+import argparse
+import json
+import logging
+import os
+import re
+import sqlite3
+import sys
+import tempfile
+from dataclasses import dataclass, field, replace
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import Engine, event
+from sqlalchemy.orm import sessionmaker
+
+from finance_tracker.bench.generator import SCALES, DatasetContext, DatasetSpec, describe, generate_dataset
+from finance_tracker.bench.service_calls import SERVICE_CALLS, ServiceCall, public_service_functions
+from finance_tracker.database import create_db_engine
+from finance_tracker.migrations import run_migrations
+from finance_tracker.models import Base
+from finance_tracker.utils.cache import cache
+from finance_tracker.utils.sql_profiler import normalize_sql
+
+logger = logging.getLogger(__name__)
+
+# Операторы, для которых строится план
+_EXPLAINABLE = ("SELECT", "WITH", "INSERT", "UPDATE", "DELETE")
+
+_ACCESS_RE = re.compile(r"^(?P<op>SCAN|SEARCH) (?:TABLE )?(?P<table>\w+)(?: AS (?P<alias>\w+))?(?P<rest>.*)$")
+_INDEX_RE = re.compile(r"USING (?:COVERING )?INDEX (?P<index>\w+)")
+_CLAUSE_END_RE = re.compile(r" (?:GROUP BY|ORDER BY|LIMIT|HAVING) ")
+
+# Максимальное число колонок предлагаемого покрывающего индекса
+_MAX_INDEX_COLUMNS = 6
+
+
+@dataclass
+class _CapturedStatement:
+    sql: str
+    parameters: Any
+    count: int = 1
+
+
+@dataclass
+class _StatementCapture:
+    """Собирает уникальные SQL-запросы engine (с количеством повторов)."""
+    statements: Dict[str, _CapturedStatement] = field(default_factory=dict)
+
+    def __call__(self, conn, cursor, statement, parameters, context, executemany) -> None:
+        if not statement.lstrip().upper().startswith(_EXPLAINABLE):
+            return
+        if executemany:
+            parameters = parameters[0] if parameters else ()
+        key = normalize_sql(statement)
+        captured = self.statements.get(key)
+        if captured is None:
+            self.statements[key] = _CapturedStatement(statement, parameters)
+        else:
+            captured.count += 1
+
+
+def _declared_indexes() -> Dict[str, Dict[str, List[str]]]:
+    """Индексы моделей: {таблица: {имя индекса: [колонки]}}."""
+    indexes: Dict[str, Dict[str, List[str]]] = {}
+    for table in Base.metadata.tables.values():
+        table_indexes = indexes.setdefault(table.name, {})
+        for index in table.indexes:
+            table_indexes[index.name] = [column.name for column in index.columns]
+    return indexes
+
+
+def explain(connection: sqlite3.Connection, statement: str, parameters: Any) -> List[str]:
+    """Возвращает строки плана EXPLAIN QUERY PLAN (поле detail) для запроса."""
+    rows = connection.execute(f"EXPLAIN QUERY PLAN {statement}", parameters or ()).fetchall()
+    return [row[3] for row in rows]
+
+
+def _table_columns(fragment: str, alias: str) -> List[str]:
+    """Колонки таблицы (по псевдониму), упомянутые во фрагменте SQL, в порядке появления."""
+    pattern = re.compile(rf'(?<![\w."]){re.escape(alias)}"?\."?(\w+)"?')
+    columns: List[str] = []
+    for column in pattern.findall(fragment):
+        if column not in columns:
+            columns.append(column)
+    return columns
+
+
+def _split_clauses(sql: str) -> Tuple[str, str, str]:
+    """Эвристически делит SQL на список выборки, условие WHERE и хвост (GROUP BY/ORDER BY)."""
+    upper = sql.upper()
+    from_at = upper.find(" FROM ")
+    select_part = sql[:from_at] if upper.startswith(("SELECT", "WITH")) and from_at != -1 else ""
+    where_at = upper.find(" WHERE ")
+    if where_at == -1:
+        where_part = ""
+        tail_match = _CLAUSE_END_RE.search(upper)
+    else:
+        tail_match = _CLAUSE_END_RE.search(upper, where_at)
+        where_part = sql[where_at:tail_match.start() if tail_match else len(sql)]
+    tail_part = sql[tail_match.start():] if tail_match else ""
+    return select_part, where_part, tail_part
+
+
+def suggest_index(
+    sql: str,
+    table: str,
+    alias: str,
+    indexes: Dict[str, Dict[str, List[str]]]
+) -> Optional[Dict[str, Any]]:
+    """
+    Предлагает покрывающий индекс для таблицы запроса.
+
+    Ключ индекса - колонки условия WHERE, затем колонки GROUP BY/ORDER BY;
+    в конец добавляются выбираемые колонки таблицы, если их немного.
+    Если ключ уже является префиксом объявленного индекса, DDL не предлагается,
+    а в existing_index указывается индекс, который планировщик не выбрал.
+    Возвращает None, если ключ пуст (запрос читает таблицу целиком).
+    """
+    select_part, where_part, tail_part = _split_clauses(sql)
+    key = _table_columns(where_part, alias)
+    key += [column for column in _table_columns(tail_part, alias) if column not in key]
+    if not key:
+        return None
+    for name, columns in sorted(indexes.get(table, {}).items(), key=lambda item: (len(item[1]), item[0])):
+        if columns[:len(key)] == key:
+            return {"table": table, "columns": key, "covering": False, "ddl": None, "existing_index": name}
+    covering = key + [column for column in _table_columns(select_part, alias) if column not in key]
+    columns = covering if len(covering) <= _MAX_INDEX_COLUMNS else key
+    name = f"ix_{table}_{'_'.join(columns)}"
+    column_list = ", ".join(columns)
+    return {
+        "table": table,
+        "columns": columns,
+        "covering": columns is covering,
+        "ddl": f"CREATE INDEX {name} ON {table} ({column_list})",
+        "existing_index": None,
+    }
+
+
+def analyze_plan(
+    sql: str,
+    plan: List[str],
+    indexes: Dict[str, Dict[str, List[str]]]
+) -> Dict[str, Any]:
+    """
+    Разбирает план запроса.
+
+    Returns:
+        Словарь: использованные индексы, полные просмотры таблиц,
+        временные B-деревья, автоматические индексы и предложения индексов
+    """
+    used_indexes: List[str] = []
+    full_scans: List[str] = []
+    automatic_indexes: List[str] = []
+    temp_btrees: List[str] = []
+    problem_tables: List[Tuple[str, str]] = []
+
+    for detail in plan:
+        if detail.startswith("USE TEMP B-TREE"):
+            temp_btrees.append(detail[len("USE TEMP B-TREE FOR "):])
+            continue
+        match = _ACCESS_RE.match(detail)
+        if not match or match.group("table") not in indexes:
+            continue
+        table = match.group("table")
+        alias = match.group("alias") or table
+        rest = match.group("rest")
+        index_match = _INDEX_RE.search(rest)
+        if "AUTOMATIC" in rest:
+            automatic_indexes.append(table)
+            problem_tables.append((table, alias))
+        elif index_match:
+            used_indexes.append(index_match.group("index"))
+        elif match.group("op") == "SCAN":
+            full_scans.append(table)
+            problem_tables.append((table, alias))
+
+    if temp_btrees and "MULTI-INDEX OR" not in plan:
+        # Сортировку без временного B-дерева может обеспечить индекс по первой таблице запроса
+        first_access = next((d for d in plan if _ACCESS_RE.match(d)), None)
+        match = _ACCESS_RE.match(first_access) if first_access else None
+        if match and match.group("table") in indexes:
+            problem_tables.append((match.group("table"), match.group("alias") or match.group("table")))
+
+    suggestions = []
+    for table, alias in problem_tables:
+        suggestion = suggest_index(sql, table, alias, indexes)
+        if suggestion and suggestion not in suggestions:
+            suggestions.append(suggestion)
+
+    return {
+        "indexes": sorted(set(used_indexes)),
+        "full_scans": sorted(set(full_scans)),
+        "automatic_indexes": sorted(set(automatic_indexes)),
+        "temp_btrees": temp_btrees,
+        "suggestions": suggestions,
+    }
+
+
+def run_audit(
+    spec: Optional[DatasetSpec] = None,
+    calls: Optional[List[ServiceCall]] = None,
+    work_dir: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Выполняет аудит планов запросов на синтетической БД.
+
+    Args:
+        spec: Параметры синтетической БД (по умолчанию SCALES["medium"])
+        calls: Вызовы сервисов (по умолчанию SERVICE_CALLS)
+        work_dir: Директория для временной БД
+
+    Returns:
+        Отчёт аудита (см. main)
+    """
+    spec = spec or SCALES["medium"]
+    calls = SERVICE_CALLS if calls is None else calls
+    indexes = _declared_indexes()
+    report: Dict[str, Any] = {
+        "sqlite_version": sqlite3.sqlite_version,
+        "parameters": describe(spec),
+        "calls": {},
+    }
+
+    with tempfile.TemporaryDirectory(dir=work_dir) as tmp_dir:
+        engine = create_db_engine(f"sqlite:///{os.path.join(tmp_dir, 'audit.db')}")
+        try:
+            run_migrations(engine)
+            context = generate_dataset(engine, spec)
+            SessionLocal = sessionmaker(bind=engine)
+            raw = engine.raw_connection()
+            try:
+                for call in calls:
+                    report["calls"][call.name] = _audit_call(call, context, engine, SessionLocal, raw, indexes)
+            finally:
+                raw.close()
+        finally:
+            engine.dispose()
+
+    index_usage: Dict[str, List[str]] = {}
+    summary = {"statements": 0, "full_scans": 0, "automatic_indexes": 0, "temp_btrees": 0, "suggestions": 0, "errors": 0}
+    for name, result in report["calls"].items():
+        summary["errors"] += result["error"] is not None
+        for statement in result["statements"]:
+            summary["statements"] += 1
+            summary["full_scans"] += len(statement["full_scans"])
+            summary["automatic_indexes"] += len(statement["automatic_indexes"])
+            summary["temp_btrees"] += len(statement["temp_btrees"])
+            summary["suggestions"] += sum(1 for item in statement["suggestions"] if item["ddl"])
+            for index_name in statement["indexes"]:
+                users = index_usage.setdefault(index_name, [])
+                if name not in users:
+                    users.append(name)
+
+    declared = {name for table_indexes in indexes.values() for name in table_indexes}
+    audited = {call.name for call in calls}
+    report["index_usage"] = {name: index_usage[name] for name in sorted(index_usage)}
+    report["unused_indexes"] = sorted(declared - set(index_usage))
+    report["not_audited"] = [name for name in public_service_functions() if name not in audited]
+    report["summary"] = summary
+    return report
+
+
+def _audit_call(
+    call: ServiceCall,
+    context: DatasetContext,
+    engine: Engine,
+    SessionLocal: sessionmaker,
+    raw: Any,
+    indexes: Dict[str, Dict[str, List[str]]]
+) -> Dict[str, Any]:
+    """Выполняет вызов сервиса, перехватывая его запросы, и строит их планы."""
+    capture = _StatementCapture()
+    error = None
+    cache.clear_all()
+    event.listen(engine, "before_cursor_execute", capture)
+    try:
+        with SessionLocal() as session:
+            call.run(session, context)
+            session.commit()
+    except Exception as e:
+        error = f"{type(e).__name__}: {e}"
+        logger.warning(f"Вызов {call.name} завершился ошибкой: {error}")
+    finally:
+        event.remove(engine, "before_cursor_execute", capture)
+
+    statements = []
+    for sql, captured in capture.statements.items():
+        try:
+            plan = explain(raw, captured.sql, captured.parameters)
+        except sqlite3.Error as e:
+            logger.warning(f"Не удалось получить план запроса {call.name}: {e}")
+            continue
+        if not plan:
+            continue
+        statements.append({"sql": sql, "executions": captured.count, "plan": plan, **analyze_plan(sql, plan, indexes)})
+    return {"error": error, "statements": statements}
+
+
+def _has_issues(report: Dict[str, Any]) -> bool:
+    summary = report["summary"]
+    return bool(summary["full_scans"] or summary["automatic_indexes"] or summary["temp_btrees"] or summary["errors"])
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Точка входа командной строки.
+
+    Структура отчёта:
+        calls: {вызов: {error, statements: [{sql, executions, plan, indexes,
+                full_scans, automatic_indexes, temp_btrees, suggestions}]}}
+        index_usage: {индекс: [вызовы]}
+        unused_indexes: индексы моделей, не использованные ни одним запросом
+        not_audited: публичные функции сервисов без вызова в аудите
+        summary: количество запросов и найденных проблем
+    """
+    parser = argparse.ArgumentParser(description="Аудит планов SQL-запросов сервисов")
+    parser.add_argument("--scale", choices=sorted(SCALES), default="medium", help="Масштаб синтетической БД")
+    parser.add_argument("--seed", type=int, default=42, help="Зерно генератора случайных чисел")
+    parser.add_argument("--work-dir", help="Директория для временной БД")
+    parser.add_argument("--output", help="Путь к JSON-файлу с отчётом")
+    parser.add_argument("--strict", action="store_true",
+                        help="Код возврата 1 при полных просмотрах, временных B-деревьях или ошибках")
+    args = parser.parse_args(argv)
+
+    spec = replace(SCALES[args.scale], seed=args.seed)
+    report = run_audit(spec, work_dir=args.work_dir)
+    text = json.dumps(report, indent=2, ensure_ascii=False, default=str)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+    return 1 if args.strict and _has_issues(report) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,14 +1,36 @@
 """
 Модуль кэширования данных приложения.
 Обеспечивает хранение часто используемых данных в памяти для ускорения доступа.
+
+Номер изменения данных (data_revision) увеличивается при фиксации сессии,
+изменившей таблицы, от которых зависит прогноз баланса (FORECAST_DATA_TABLES).
+Отслеживание подключается к фабрикам сессий приложения (register_data_revision_listeners).
+Кэши, построенные по этим данным, используют номер как часть ключа.
 """
 
 import logging
-from typing import Dict, List, Optional, Any, TypeVar, Generic
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional, Any, TypeVar, Generic, Union
 from threading import Lock
 
+from sqlalchemy import event
+from sqlalchemy.orm import ORMExecuteState, Session, sessionmaker
+
 logger = logging.getLogger(__name__)
 
+# Таблицы, изменение которых меняет прогноз баланса
+FORECAST_DATA_TABLES = frozenset({
+    "transactions",
+    "planned_transactions",
+    "recurrence_rules",
+    "planned_occurrences",
+    "loan_payments",
+    "pending_payments",
+})
+
+# Ключ Session.info: сессия изменила таблицы FORECAST_DATA_TABLES после последней фиксации
+_DATA_CHANGED_KEY = "forecast_data_changed"
+
 T = TypeVar('T')
 
 class CacheStore(Generic[T]):
@@ -53,6 +75,111 @@ class CacheStore(Generic[T]):
             self._list_cache = None
             logger.debug(f"Кэш '{self.name}' сброшен")
 
+class LRUCacheStore(Generic[T]):
+    """Хранилище кэша с ограниченным числом элементов (вытесняются давно не использованные)."""
+
+    def __init__(self, name: str, max_size: int):
+        self.name = name
+        self.max_size = max_size
+        self._cache: "OrderedDict[Any, T]" = OrderedDict()
+        self._lock = Lock()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._cache)
+
+    def get(self, key: Any) -> Optional[T]:
+        """Получение элемента по ключу (элемент становится последним использованным)."""
+        with self._lock:
+            value = self._cache.get(key)
+            if value is not None:
+                self._cache.move_to_end(key)
+            return value
+
+    def find(self, predicate: Callable[[Any, T], bool]) -> Optional[T]:
+        """Поиск элемента, начиная с последнего использованного."""
+        with self._lock:
+            for key in reversed(self._cache):
+                value = self._cache[key]
+                if predicate(key, value):
+                    self._cache.move_to_end(key)
+                    return value
+            return None
+
+    def set(self, key: Any, value: T):
+        """Сохранение элемента с вытеснением давно не использованных."""
+        with self._lock:
+            self._cache[key] = value
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.max_size:
+                self._cache.popitem(last=False)
+
+    def invalidate(self):
+        """Полная очистка кэша."""
+        with self._lock:
+            self._cache.clear()
+            logger.debug(f"Кэш '{self.name}' сброшен")
+
+
+class DataRevision:
+    """Номер изменения данных прогноза (увеличивается при фиксации изменений)."""
+
+    def __init__(self):
+        self._value = 0
+        self._lock = Lock()
+
+    @property
+    def value(self) -> int:
+        return self._value
+
+    def bump(self) -> int:
+        """Увеличивает номер изменения (для записи в обход сессий ORM)."""
+        with self._lock:
+            self._value += 1
+            return self._value
+
+
+def has_uncommitted_data_changes(session: Session) -> bool:
+    """Сессия содержит незафиксированные изменения (ожидающие или уже записанные в БД)."""
+    return bool(session.new or session.dirty or session.deleted or session.info.get(_DATA_CHANGED_KEY))
+
+
+def _track_flush(session: Session, flush_context: Any) -> None:
+    changed = list(session.new) + list(session.dirty) + list(session.deleted)
+    if any(getattr(getattr(obj, "__table__", None), "name", None) in FORECAST_DATA_TABLES for obj in changed):
+        session.info[_DATA_CHANGED_KEY] = True
+
+
+def _track_orm_execute(orm_execute_state: ORMExecuteState) -> None:
+    # Массовые INSERT/UPDATE/DELETE через session.execute() минуют flush
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        table = getattr(orm_execute_state.statement, "table", None)
+        if getattr(table, "name", None) in FORECAST_DATA_TABLES:
+            orm_execute_state.session.info[_DATA_CHANGED_KEY] = True
+
+
+def _bump_on_commit(session: Session) -> None:
+    if session.info.pop(_DATA_CHANGED_KEY, False):
+        revision = data_revision.bump()
+        logger.debug(f"Данные прогноза изменены, номер изменения {revision}")
+
+
+def _reset_on_rollback(session: Session) -> None:
+    session.info.pop(_DATA_CHANGED_KEY, None)
+
+
+def register_data_revision_listeners(target: Union[sessionmaker, Session]) -> None:
+    """
+    Подключает отслеживание изменений данных прогноза к фабрике сессий (или сессии).
+
+    Фиксация сессии, изменившей таблицы FORECAST_DATA_TABLES, увеличивает data_revision.
+    """
+    event.listen(target, "after_flush", _track_flush)
+    event.listen(target, "do_orm_execute", _track_orm_execute)
+    event.listen(target, "after_commit", _bump_on_commit)
+    event.listen(target, "after_rollback", _reset_on_rollback)
+
+
 class AppCache:
     """Глобальный менеджер кэша приложения."""
     
@@ -72,11 +199,20 @@ class AppCache:
         # Инициализация хранилищ
         self.categories = CacheStore("categories")
         self.lenders = CacheStore("lenders")
+        # Прогнозы баланса по горизонтам (ключ включает номер изменения данных)
+        self.forecasts = LRUCacheStore("forecasts", max_size=16)
+        # Скомпилированные правила повторения (ключ включает updated_at правила)
+        self.recurrence_rules = LRUCacheStore("recurrence_rules", max_size=1024)
         
     def clear_all(self):
         """Очистка всех кэшей."""
         self.categories.invalidate()
         self.lenders.invalidate()
+        self.forecasts.invalidate()
+        self.recurrence_rules.invalidate()
+
+# Глобальный номер изменения данных прогноза
+data_revision = DataRevision()
 
 # Глобальный экземпляр
 cache = AppCache()
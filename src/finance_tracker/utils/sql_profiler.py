@@ -0,0 +1,211 @@
+"""
+Профилировщик SQL-запросов: счётчик запросов и детектор N+1.
+
+Считает количество SQL-запросов и время их выполнения в единицах работы:
+- Сессия БД (get_db_session, get_read_session, get_write_session)
+- Действие пользователя (track("Название действия") в обработчиках UI)
+
+Если один и тот же нормализованный запрос (без значений параметров)
+выполняется в единице работы больше repeat_threshold раз, пишется
+предупреждение - типичный признак запроса на каждую строку (N+1).
+
+Включается настройками Config.sql_profiler_enabled и
+Config.sql_profiler_repeat_threshold. В выключенном состоянии обработчики
+событий engine не регистрируются, а track() не создаёт единиц работы.
+
+Пример:
+    >>> with sql_profiler.track("Открытие вкладки кредитов"):
+    ...     with get_db_session() as session:
+    ...         stats = get_summary_statistics(session)
+"""
+
+import logging
+import re
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Dict, Generator, List, Optional
+
+from sqlalchemy import Engine, event
+
+logger = logging.getLogger(__name__)
+
+# Порог повторов одного запроса по умолчанию
+DEFAULT_REPEAT_THRESHOLD = 10
+
+# Количество самых частых запросов в итоговом сообщении единицы работы
+_TOP_STATEMENTS = 3
+
+_PARAM_LIST_RE = re.compile(r"\(\?(?:, \?)+\)")
+
+_enabled = False
+_repeat_threshold = DEFAULT_REPEAT_THRESHOLD
+_instrumented_engines: List[Engine] = []
+_local = threading.local()
+
+
+def normalize_sql(statement: str) -> str:
+    """Приводит SQL к каноническому виду: один пробел между токенами, списки IN (?, ?) свёрнуты."""
+    return _PARAM_LIST_RE.sub("(?, ...)", " ".join(statement.split()))
+
+
+@dataclass
+class UnitOfWork:
+    """
+    Статистика запросов единицы работы.
+
+    Attributes:
+        name: Название (действие пользователя или тип сессии)
+        statement_count: Количество выполненных запросов
+        total_seconds: Суммарное время выполнения запросов
+        statements: Количество выполнений каждого нормализованного запроса
+        reported: Запросы, о повторах которых уже предупредила вложенная единица работы
+    """
+    name: str
+    statement_count: int = 0
+    total_seconds: float = 0.0
+    statements: Counter = field(default_factory=Counter)
+    reported: set = field(default_factory=set)
+
+    def repeated_statements(self, threshold: int) -> Dict[str, int]:
+        """Запросы, выполненные больше threshold раз."""
+        return {sql: count for sql, count in self.statements.items() if count > threshold}
+
+
+def is_enabled() -> bool:
+    """Возвращает True, если профилировщик включён."""
+    return _enabled
+
+
+def configure(enabled: bool, repeat_threshold: int = DEFAULT_REPEAT_THRESHOLD) -> None:
+    """
+    Включает или выключает профилировщик.
+
+    При выключении обработчики событий снимаются со всех engine.
+
+    Args:
+        enabled: Включить профилировщик
+        repeat_threshold: Допустимое число повторов одного запроса в единице работы
+    """
+    global _enabled, _repeat_threshold
+    _repeat_threshold = max(1, int(repeat_threshold))
+    if _enabled and not enabled:
+        for engine in list(_instrumented_engines):
+            uninstrument_engine(engine)
+    _enabled = enabled
+    logger.info(
+        f"Профилировщик SQL {'включён' if enabled else 'выключен'} "
+        f"(порог повторов: {_repeat_threshold})"
+    )
+
+
+def instrument_engine(engine: Engine) -> None:
+    """Регистрирует обработчики событий на engine (только если профилировщик включён)."""
+    if not _enabled or engine in _instrumented_engines:
+        return
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    _instrumented_engines.append(engine)
+
+
+def uninstrument_engine(engine: Engine) -> None:
+    """Снимает обработчики событий с engine."""
+    if engine not in _instrumented_engines:
+        return
+    event.remove(engine, "before_cursor_execute", _before_cursor_execute)
+    event.remove(engine, "after_cursor_execute", _after_cursor_execute)
+    _instrumented_engines.remove(engine)
+
+
+def _active_units() -> List[UnitOfWork]:
+    units = getattr(_local, "units", None)
+    if units is None:
+        units = _local.units = []
+    return units
+
+
+@contextmanager
+def track(name: str) -> Generator[Optional[UnitOfWork], None, None]:
+    """
+    Единица работы профилировщика.
+
+    Запросы, выполненные внутри блока (в текущем потоке), учитываются
+    во всех вложенных друг в друга единицах работы. При выходе из блока
+    в журнал пишется итог: количество запросов и время. О запросе,
+    по которому уже предупредила вложенная единица работы, внешние
+    единицы повторно не предупреждают.
+
+    Args:
+        name: Название единицы работы (например, действие пользователя)
+
+    Yields:
+        Статистика единицы работы или None, если профилировщик выключен
+    """
+    if not _enabled:
+        yield None
+        return
+
+    unit = UnitOfWork(name)
+    units = _active_units()
+    units.append(unit)
+    try:
+        yield unit
+    finally:
+        units.remove(unit)
+        reported = _report(unit)
+        for enclosing in units:
+            enclosing.reported.update(reported)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    conn.info.setdefault("sql_profiler_started", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    started = conn.info.get("sql_profiler_started")
+    if not started:
+        return
+    elapsed = time.perf_counter() - started.pop()
+
+    units = getattr(_local, "units", None)
+    if not units:
+        return
+    sql = normalize_sql(statement)
+    for unit in units:
+        unit.statement_count += 1
+        unit.total_seconds += elapsed
+        unit.statements[sql] += 1
+
+
+def _report(unit: UnitOfWork) -> List[str]:
+    """Пишет итог единицы работы в журнал. Возвращает запросы с превышением порога повторов."""
+    if unit.statement_count == 0:
+        return []
+    top = ", ".join(
+        f"{count}x {sql[:80]}" for sql, count in unit.statements.most_common(_TOP_STATEMENTS)
+    )
+    logger.debug(
+        f"SQL '{unit.name}': запросов {unit.statement_count}, "
+        f"{unit.total_seconds * 1000:.1f} мс; частые: {top}"
+    )
+    repeated = unit.repeated_statements(_repeat_threshold)
+    for sql, count in repeated.items():
+        if sql in unit.reported:
+            continue
+        logger.warning(
+            f"Возможный N+1 в '{unit.name}': запрос выполнен {count} раз "
+            f"(порог {_repeat_threshold}): {sql[:300]}"
+        )
+    return list(repeated)
+
+
+def summary(unit: UnitOfWork) -> Dict[str, Any]:
+    """Итог единицы работы в виде словаря (для тестов и отладочного вывода)."""
+    return {
+        "name": unit.name,
+        "statements": unit.statement_count,
+        "total_ms": round(unit.total_seconds * 1000, 3),
+        "repeated": unit.repeated_statements(_repeat_threshold),
+    }
@@ -1,3 +1,4 @@
+import asyncio
 import logging
 from datetime import date, timedelta
 from decimal import Decimal
@@ -13,6 +14,7 @@ from finance_tracker.services import (
     pending_payment_service,
     loan_payment_service,
 )
+from finance_tracker.services import aio
 # Assuming logger is setup via utils.logger
 from finance_tracker.utils.logger import get_logger
 logger = get_logger(__name__)
@@ -49,22 +51,11 @@ class HomePresenter:
     def load_calendar_data(self, calendar_date: date) -> None:
         """Загрузить данные для календаря."""
         try:
-            # Determine the range for the calendar, assuming current month.
-            first_day_of_month = date(calendar_date.year, calendar_date.month, 1)
-            # Find the last day of the month
-            next_month = calendar_date.replace(day=28) + timedelta(days=4)
-            last_day_of_month = next_month - timedelta(days=next_month.day)
+            first_day_of_month, last_day_of_month = self._month_bounds(calendar_date)
             
             transactions = transaction_service.get_by_date_range(self.session, first_day_of_month, last_day_of_month)
             occurrences = planned_transaction_service.get_occurrences_by_date_range(self.session, first_day_of_month, last_day_of_month)
-            
-            # Проверяем, что callback доступен и компоненты готовы
-            if hasattr(self.callbacks, 'update_calendar_data'):
-                try:
-                    self.callbacks.update_calendar_data(transactions, occurrences)
-                except Exception as callback_error:
-                    # Логируем ошибку, но не прерываем загрузку других данных
-                    logger.warning(f"Не удалось обновить календарь (компоненты могут быть не готовы): {callback_error}")
+            self._show_calendar_data(transactions, occurrences)
         except Exception as e:
             self._handle_error("Ошибка загрузки данных календаря", e)
     
@@ -77,30 +68,7 @@ class HomePresenter:
             self.selected_date = selected_date
             transactions = transaction_service.get_transactions_by_date(self.session, selected_date)
             occurrences = planned_transaction_service.get_occurrences_by_date(self.session, selected_date)
-            
-            logger.debug(
-                f"[ДИАГНОСТИКА] Загружено {len(transactions)} транзакций и "
-                f"{len(occurrences)} вхождений для даты {selected_date}"
-            )
-            
-            # Проверяем, что callback доступен и компоненты готовы
-            if hasattr(self.callbacks, 'update_transactions'):
-                try:
-                    logger.debug("[ДИАГНОСТИКА] Вызов callbacks.update_transactions")
-                    self.callbacks.update_transactions(selected_date, transactions, occurrences)
-                except Exception as callback_error:
-                    # Логируем ошибку, но не прерываем загрузку других данных
-                    logger.warning(f"Не удалось обновить транзакции (компоненты могут быть не готовы): {callback_error}")
-            
-            # Обновляем выделение в календаре
-            if hasattr(self.callbacks, 'update_calendar_selection'):
-                try:
-                    logger.debug("[ДИАГНОСТИКА] Вызов callbacks.update_calendar_selection")
-                    self.callbacks.update_calendar_selection(selected_date)
-                    logger.debug("[ДИАГНОСТИКА] callbacks.update_calendar_selection завершён")
-                except Exception as callback_error:
-                    logger.warning(f"Не удалось обновить выделение в календаре: {callback_error}")
-            
+            self._show_date_data(selected_date, transactions, occurrences)
             logger.debug("[ДИАГНОСТИКА] HomePresenter.on_date_selected завершён")
         except Exception as e:
             self._handle_error("Ошибка загрузки данных для выбранной даты", e)
@@ -109,15 +77,7 @@ class HomePresenter:
         """Загрузить плановые операции."""
         try:
             occurrences = planned_transaction_service.get_pending_occurrences(self.session)
-            formatted_occurrences = self._format_occurrences_for_ui(occurrences) # This needs implementation
-            
-            # Проверяем, что callback доступен и компоненты готовы
-            if hasattr(self.callbacks, 'update_planned_occurrences'):
-                try:
-                    self.callbacks.update_planned_occurrences(formatted_occurrences)
-                except Exception as callback_error:
-                    # Логируем ошибку, но не прерываем загрузку других данных
-                    logger.warning(f"Не удалось обновить плановые операции (компоненты могут быть не готовы): {callback_error}")
+            self._show_planned_occurrences(occurrences)
         except Exception as e:
             self._handle_error("Ошибка загрузки плановых операций", e)
     
@@ -126,22 +86,144 @@ class HomePresenter:
         try:
             payments = pending_payment_service.get_all_pending_payments(self.session)
             statistics = pending_payment_service.get_pending_payments_statistics(self.session)
-            
-            # Проверяем, что statistics - это словарь
-            if not isinstance(statistics, dict):
-                logger.warning(f"statistics имеет неожиданный тип: {type(statistics)}")
-                statistics = {"total_active": 0, "total_amount": 0.0}
-            
-            # Проверяем, что callback доступен и компоненты готовы
-            if hasattr(self.callbacks, 'update_pending_payments'):
-                try:
-                    self.callbacks.update_pending_payments(payments, statistics)
-                except Exception as callback_error:
-                    # Логируем ошибку, но не прерываем загрузку других данных
-                    logger.warning(f"Не удалось обновить отложенные платежи (компоненты могут быть не готовы): {callback_error}")
+            self._show_pending_payments(payments, statistics)
         except Exception as e:
             self._handle_error("Ошибка загрузки отложенных платежей", e)
     
+    # Asynchronous Data Loading Methods (сервисы чтения выполняются в пуле потоков)
+    async def load_initial_data_async(self) -> None:
+        """Асинхронно загрузить все данные при инициализации, не блокируя UI."""
+        await asyncio.gather(
+            self.load_calendar_data_async(date.today()),
+            self.on_date_selected_async(self.selected_date),
+            self.load_planned_occurrences_async(),
+            self.load_pending_payments_async(),
+        )
+
+    async def load_calendar_data_async(self, calendar_date: date) -> None:
+        """
+        Асинхронно загрузить данные для календаря.
+
+        Новый вызов вытесняет предыдущий незавершённый (например, при быстром
+        переключении месяцев): устаревший результат не передаётся во View.
+        """
+        try:
+            first_day_of_month, last_day_of_month = self._month_bounds(calendar_date)
+            transactions, occurrences = await asyncio.gather(
+                aio.get_by_date_range(first_day_of_month, last_day_of_month, channel="home.calendar.transactions"),
+                aio.get_occurrences_by_date_range(first_day_of_month, last_day_of_month, channel="home.calendar.occurrences"),
+            )
+            self._show_calendar_data(transactions, occurrences)
+        except aio.RequestSuperseded:
+            logger.debug(f"Загрузка календаря на {calendar_date} вытеснена более новым запросом")
+        except Exception as e:
+            self._handle_error("Ошибка загрузки данных календаря", e)
+
+    async def on_date_selected_async(self, selected_date: date) -> None:
+        """
+        Асинхронно обработать выбор даты.
+
+        Новый вызов вытесняет предыдущий незавершённый: во View попадают
+        данные только последней выбранной даты.
+        """
+        try:
+            self.selected_date = selected_date
+            transactions, occurrences = await asyncio.gather(
+                aio.get_transactions_by_date(selected_date, channel="home.date.transactions"),
+                aio.get_occurrences_by_date(selected_date, channel="home.date.occurrences"),
+            )
+            self._show_date_data(selected_date, transactions, occurrences)
+        except aio.RequestSuperseded:
+            logger.debug(f"Загрузка данных на {selected_date} вытеснена более новым запросом")
+        except Exception as e:
+            self._handle_error("Ошибка загрузки данных для выбранной даты", e)
+
+    async def load_planned_occurrences_async(self) -> None:
+        """Асинхронно загрузить плановые операции."""
+        try:
+            occurrences = await aio.get_pending_occurrences(channel="home.planned.occurrences")
+            self._show_planned_occurrences(occurrences)
+        except aio.RequestSuperseded:
+            logger.debug("Загрузка плановых операций вытеснена более новым запросом")
+        except Exception as e:
+            self._handle_error("Ошибка загрузки плановых операций", e)
+
+    async def load_pending_payments_async(self) -> None:
+        """Асинхронно загрузить отложенные платежи и их статистику."""
+        try:
+            payments, statistics = await asyncio.gather(
+                aio.get_all_pending_payments(channel="home.pending.payments"),
+                aio.get_pending_payments_statistics(channel="home.pending.statistics"),
+            )
+            self._show_pending_payments(payments, statistics)
+        except aio.RequestSuperseded:
+            logger.debug("Загрузка отложенных платежей вытеснена более новым запросом")
+        except Exception as e:
+            self._handle_error("Ошибка загрузки отложенных платежей", e)
+
+    # View Updates (общие для синхронной и асинхронной загрузки)
+    def _show_calendar_data(self, transactions: List[Any], occurrences: List[Any]) -> None:
+        """Передать во View данные календаря."""
+        # Проверяем, что callback доступен и компоненты готовы
+        if hasattr(self.callbacks, 'update_calendar_data'):
+            try:
+                self.callbacks.update_calendar_data(transactions, occurrences)
+            except Exception as callback_error:
+                # Логируем ошибку, но не прерываем загрузку других данных
+                logger.warning(f"Не удалось обновить календарь (компоненты могут быть не готовы): {callback_error}")
+
+    def _show_date_data(self, selected_date: date, transactions: List[Any], occurrences: List[Any]) -> None:
+        """Передать во View операции выбранной даты и обновить выделение в календаре."""
+        logger.debug(
+            f"[ДИАГНОСТИКА] Загружено {len(transactions)} транзакций и "
+            f"{len(occurrences)} вхождений для даты {selected_date}"
+        )
+        
+        # Проверяем, что callback доступен и компоненты готовы
+        if hasattr(self.callbacks, 'update_transactions'):
+            try:
+                logger.debug("[ДИАГНОСТИКА] Вызов callbacks.update_transactions")
+                self.callbacks.update_transactions(selected_date, transactions, occurrences)
+            except Exception as callback_error:
+                # Логируем ошибку, но не прерываем загрузку других данных
+                logger.warning(f"Не удалось обновить транзакции (компоненты могут быть не готовы): {callback_error}")
+        
+        # Обновляем выделение в календаре
+        if hasattr(self.callbacks, 'update_calendar_selection'):
+            try:
+                logger.debug("[ДИАГНОСТИКА] Вызов callbacks.update_calendar_selection")
+                self.callbacks.update_calendar_selection(selected_date)
+                logger.debug("[ДИАГНОСТИКА] callbacks.update_calendar_selection завершён")
+            except Exception as callback_error:
+                logger.warning(f"Не удалось обновить выделение в календаре: {callback_error}")
+
+    def _show_planned_occurrences(self, occurrences: List[Any]) -> None:
+        """Передать во View плановые операции в формате для UI."""
+        formatted_occurrences = self._format_occurrences_for_ui(occurrences)
+        
+        # Проверяем, что callback доступен и компоненты готовы
+        if hasattr(self.callbacks, 'update_planned_occurrences'):
+            try:
+                self.callbacks.update_planned_occurrences(formatted_occurrences)
+            except Exception as callback_error:
+                # Логируем ошибку, но не прерываем загрузку других данных
+                logger.warning(f"Не удалось обновить плановые операции (компоненты могут быть не готовы): {callback_error}")
+
+    def _show_pending_payments(self, payments: List[Any], statistics: Any) -> None:
+        """Передать во View отложенные платежи и их статистику."""
+        # Проверяем, что statistics - это словарь
+        if not isinstance(statistics, dict):
+            logger.warning(f"statistics имеет неожиданный тип: {type(statistics)}")
+            statistics = {"total_active": 0, "total_amount": 0.0}
+        
+        # Проверяем, что callback доступен и компоненты готовы
+        if hasattr(self.callbacks, 'update_pending_payments'):
+            try:
+                self.callbacks.update_pending_payments(payments, statistics)
+            except Exception as callback_error:
+                # Логируем ошибку, но не прерываем загрузку других данных
+                logger.warning(f"Не удалось обновить отложенные платежи (компоненты могут быть не готовы): {callback_error}")
+
     # Transaction Operations
     def create_transaction(self, transaction_data: TransactionCreate) -> None: # Assuming TransactionCreate Pydantic model
         """Создать новую транзакцию."""
@@ -408,6 +490,14 @@ class HomePresenter:
             return None
     
     # Private Methods
+    @staticmethod
+    def _month_bounds(calendar_date: date) -> Tuple[date, date]:
+        """Вернуть первый и последний день месяца указанной даты."""
+        first_day_of_month = date(calendar_date.year, calendar_date.month, 1)
+        next_month = calendar_date.replace(day=28) + timedelta(days=4)
+        last_day_of_month = next_month - timedelta(days=next_month.day)
+        return first_day_of_month, last_day_of_month
+
     def _refresh_data(self) -> None:
         """Обновить все данные после изменений."""
         self.load_calendar_data(self.selected_date)
@@ -336,7 +336,16 @@ class HomeView(ft.Column, IHomeViewCallbacks):
 
     def on_date_selected(self, date_obj: datetime.date):
         """Обработка выбора даты в календаре - делегирует в Presenter."""
-        self.presenter.on_date_selected(date_obj)
+        self._run_async(self.presenter.on_date_selected_async, date_obj)
+
+    def _run_async(self, handler, *args):
+        """
+        Запустить асинхронный метод Presenter в цикле событий страницы.
+
+        Чтение из БД выполняется в пуле потоков, обработчик события UI
+        возвращается сразу.
+        """
+        self.page.run_task(handler, *args)
 
     def open_add_transaction_modal(self):
         """Открытие модального окна добавления транзакции."""
@@ -544,7 +553,7 @@ class HomeView(ft.Column, IHomeViewCallbacks):
                 f"дата: {occurrence.occurrence_date}"
             )
             # Делегируем в Presenter для обновления выбранной даты
-            self.presenter.on_date_selected(occurrence.occurrence_date)
+            self._run_async(self.presenter.on_date_selected_async, occurrence.occurrence_date)
             logger.info(
                 f"[ДИАГНОСТИКА] Календарь переключён на дату вхождения: {occurrence.occurrence_date}"
             )
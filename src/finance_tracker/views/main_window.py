@@ -1,8 +1,9 @@
 import flet as ft
 from finance_tracker.utils.logger import get_logger
 from finance_tracker.config import settings
-from finance_tracker.database import get_db_session
+from finance_tracker.database import get_db_session, get_read_session
 from finance_tracker.services.transaction_service import get_total_balance
+from finance_tracker.utils import sql_profiler
 
 from finance_tracker.views.home_view import HomeView
 from finance_tracker.views.categories_view import CategoriesView
@@ -84,7 +85,7 @@ class MainWindow(ft.Row):
     def update_balance(self):
         """Обновляет отображение текущего баланса"""
         try:
-            with get_db_session() as session:
+            with get_read_session() as session:
                 balance = get_total_balance(session)
                 if hasattr(self, 'balance_text') and self.balance_text:
                     self.balance_text.value = f"Баланс: {balance:,.2f} ₽".replace(",", " ")
@@ -200,7 +201,7 @@ class MainWindow(ft.Row):
         try:
             # Теперь HomeView добавлен на страницу и можно загружать данные
             if self.home_view and hasattr(self.home_view, 'presenter'):
-                self.home_view.presenter.load_initial_data()
+                self.page.run_task(self.home_view.presenter.load_initial_data_async)
             
             # Обновляем баланс в AppBar
             self.update_balance()
@@ -228,11 +229,12 @@ class MainWindow(ft.Row):
         # Проверяем, что rail уже добавлен на страницу перед вызовом update()
         if hasattr(self.rail, 'page') and self.rail.page:
             self.rail.update()
-        self.content_area.content = self.get_view(index)
-        self.content_area.update()
-        self.save_state()
-        # При навигации также обновляем баланс
-        self.update_balance()
+        with sql_profiler.track(f"Переход в раздел {index}"):
+            self.content_area.content = self.get_view(index)
+            self.content_area.update()
+            self.save_state()
+            # При навигации также обновляем баланс
+            self.update_balance()
         logger.info(f"Переход в раздел с индексом: {index}")
 
     def get_view(self, index: int) -> ft.Control:
@@ -247,7 +249,7 @@ class MainWindow(ft.Row):
             # Обновляем данные при возврате на главный экран
             if self.home_view and hasattr(self.home_view, 'presenter'):
                 try:
-                    self.home_view.presenter.load_initial_data()
+                    self.page.run_task(self.home_view.presenter.load_initial_data_async)
                     logger.info("Данные HomeView обновлены при возврате на главный экран")
                 except Exception as e:
                     logger.error(f"Ошибка обновления данных HomeView: {e}")
@@ -1,7 +1,7 @@
 """
 История операций - основной экран для просмотра всех транзакций.
 
-Отображает все фактические транзакции с:
+Отображает фактические транзакции постранично (бесконечная прокрутка) с:
 - Фильтрацией по дате, категории, типу
 - Поиском по описанию
 - Группировкой и сортировкой
@@ -17,14 +17,24 @@ from collections import defaultdict
 import flet as ft
 from sqlalchemy.orm import Session
 
-from finance_tracker.database import get_db
+from finance_tracker.database import get_read_session
 from finance_tracker.models import TransactionDB, TransactionType
-from finance_tracker.services.transaction_service import get_by_date_range
+from finance_tracker.services.transaction_service import (
+    TransactionCursor,
+    get_category_totals,
+    get_transactions_page,
+)
 from finance_tracker.services.category_service import get_all_categories
 from finance_tracker.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+# Количество транзакций, загружаемых за один запрос
+PAGE_SIZE = 100
+
+# Расстояние до конца списка (в пикселях), на котором догружается следующая страница
+SCROLL_LOAD_THRESHOLD = 200
+
 
 class TransactionHistoryView(ft.Container):
     """
@@ -53,9 +63,13 @@ class TransactionHistoryView(ft.Container):
         self.group_by: str = "date"  # date, category, month
         self.sort_by: str = "date_desc"  # date_asc, date_desc, amount_asc, amount_desc
 
-        # Данные
+        # Данные: загруженные страницы транзакций по текущим фильтрам
         self.transactions: List[TransactionDB] = []
-        self.filtered_transactions: List[TransactionDB] = []
+        self.next_cursor: Optional[TransactionCursor] = None
+        self.total_count = 0
+        self.total_income = Decimal('0.0')
+        self.total_expense = Decimal('0.0')
+        self._loading_page = False
 
         # UI Components - фильтры
         self.date_range_text = ft.Text(
@@ -130,7 +144,9 @@ class TransactionHistoryView(ft.Container):
             controls=[],
             scroll=ft.ScrollMode.AUTO,
             spacing=10,
-            expand=True
+            expand=True,
+            on_scroll=self._on_list_scroll,
+            on_scroll_interval=100
         )
 
         # График по категориям
@@ -243,7 +259,7 @@ class TransactionHistoryView(ft.Container):
     def _load_categories(self):
         """Загружает список категорий для фильтра."""
         try:
-            with get_db() as session:
+            with get_read_session() as session:
                 categories = get_all_categories(session)
                 self.category_dropdown.options = [
                     ft.dropdown.Option("all", "Все категории")
@@ -256,13 +272,29 @@ class TransactionHistoryView(ft.Container):
         except Exception as e:
             logger.error(f"Ошибка загрузки категорий: {e}")
 
+    def _page_filters(self) -> dict:
+        """Текущие фильтры в виде аргументов сервиса."""
+        return dict(
+            start_date=self.start_date,
+            end_date=self.end_date,
+            transaction_type=self.selected_type,
+            category_id=self.selected_category_id,
+            search_text=self.search_query or None
+        )
+
     def _load_data(self):
-        """Загружает транзакции за выбранный период."""
+        """Загружает первую страницу транзакций по текущим фильтрам."""
         try:
-            with get_db() as session:
-                self.transactions = get_by_date_range(session, self.start_date, self.end_date)
-                self._apply_filters()
-                self._update_ui()
+            with get_read_session() as session:
+                page = get_transactions_page(
+                    session, sort=self.sort_by, page_size=PAGE_SIZE, **self._page_filters()
+                )
+            self.transactions = page.items
+            self.next_cursor = page.next_cursor
+            self.total_count = page.total_count
+            self.total_income = page.total_income
+            self.total_expense = page.total_expense
+            self._update_ui()
         except Exception as e:
             logger.error(f"Ошибка загрузки данных: {e}")
             if self.page:
@@ -271,49 +303,26 @@ class TransactionHistoryView(ft.Container):
                     bgcolor=ft.Colors.ERROR
                 ))
 
-    def _apply_filters(self):
-        """Применяет фильтры к транзакциям."""
-        self.filtered_transactions = self.transactions.copy()
-
-        # Фильтр по категории
-        if self.selected_category_id:
-            self.filtered_transactions = [
-                t for t in self.filtered_transactions
-                if t.category_id == self.selected_category_id
-            ]
-
-        # Фильтр по типу
-        if self.selected_type:
-            self.filtered_transactions = [
-                t for t in self.filtered_transactions
-                if t.type == self.selected_type
-            ]
-
-        # Поиск по описанию
-        if self.search_query:
-            query_lower = self.search_query.lower()
-            self.filtered_transactions = [
-                t for t in self.filtered_transactions
-                if t.description and query_lower in t.description.lower()
-            ]
-
-        # Сортировка
-        self._apply_sorting()
-
-    def _apply_sorting(self):
-        """Применяет сортировку к отфильтрованным транзакциям."""
-        reverse = self.sort_by.endswith("_desc")
-
-        if self.sort_by.startswith("date"):
-            self.filtered_transactions.sort(
-                key=lambda t: t.transaction_date,
-                reverse=reverse
-            )
-        elif self.sort_by.startswith("amount"):
-            self.filtered_transactions.sort(
-                key=lambda t: t.amount,
-                reverse=reverse
-            )
+    def _load_next_page(self):
+        """Догружает следующую страницу транзакций (если она есть)."""
+        if self.next_cursor is None or self._loading_page:
+            return
+        self._loading_page = True
+        try:
+            with get_read_session() as session:
+                page = get_transactions_page(
+                    session, sort=self.sort_by, cursor=self.next_cursor, page_size=PAGE_SIZE,
+                    **self._page_filters()
+                )
+            self.transactions.extend(page.items)
+            self.next_cursor = page.next_cursor
+            self._update_transactions_list()
+            if self.page:
+                self.update()
+        except Exception as e:
+            logger.error(f"Ошибка загрузки страницы транзакций: {e}")
+        finally:
+            self._loading_page = False
 
     def _update_ui(self):
         """Обновляет UI на основе отфильтрованных данных."""
@@ -333,17 +342,11 @@ class TransactionHistoryView(ft.Container):
         self.update()
 
     def _update_statistics(self):
-        """Обновляет карточки статистики."""
-        total_income = sum(
-            (t.amount for t in self.filtered_transactions if t.type == TransactionType.INCOME),
-            Decimal('0.0')
-        )
-        total_expense = sum(
-            (t.amount for t in self.filtered_transactions if t.type == TransactionType.EXPENSE),
-            Decimal('0.0')
-        )
+        """Обновляет карточки статистики (итоги по всем транзакциям фильтра, не только загруженным)."""
+        total_income = self.total_income
+        total_expense = self.total_expense
         balance = total_income - total_expense
-        count = len(self.filtered_transactions)
+        count = self.total_count
 
         self._update_stat_card(self.stat_income, f"{total_income:,.2f} ₽".replace(",", " "))
         self._update_stat_card(self.stat_expense, f"{total_expense:,.2f} ₽".replace(",", " "))
@@ -369,7 +372,7 @@ class TransactionHistoryView(ft.Container):
         """Обновляет список транзакций с группировкой."""
         self.transactions_container.controls.clear()
 
-        if not self.filtered_transactions:
+        if not self.transactions:
             self.transactions_container.controls.append(
                 ft.Container(
                     content=ft.Text(
@@ -391,11 +394,25 @@ class TransactionHistoryView(ft.Container):
         elif self.group_by == "month":
             self._render_by_month()
 
+        if self.next_cursor is not None:
+            self.transactions_container.controls.append(
+                ft.Container(
+                    content=ft.Text(
+                        f"Показано {len(self.transactions)} из {self.total_count}. "
+                        "Прокрутите вниз, чтобы загрузить ещё",
+                        size=12,
+                        color="outline"
+                    ),
+                    alignment=ft.alignment.center,
+                    padding=10
+                )
+            )
+
     def _render_by_date(self):
         """Отображение транзакций с группировкой по дате."""
         # Группируем по датам
         by_date: Dict[datetime.date, List[TransactionDB]] = defaultdict(list)
-        for transaction in self.filtered_transactions:
+        for transaction in self.transactions:
             by_date[transaction.transaction_date].append(transaction)
 
         # Сортируем даты
@@ -439,7 +456,7 @@ class TransactionHistoryView(ft.Container):
         """Отображение транзакций с группировкой по категории."""
         # Группируем по категориям
         by_category: Dict[str, List[TransactionDB]] = defaultdict(list)
-        for transaction in self.filtered_transactions:
+        for transaction in self.transactions:
             category_name = transaction.category.name if transaction.category else "Без категории"
             by_category[category_name].append(transaction)
 
@@ -477,7 +494,7 @@ class TransactionHistoryView(ft.Container):
         """Отображение транзакций с группировкой по месяцам."""
         # Группируем по месяцам
         by_month: Dict[tuple, List[TransactionDB]] = defaultdict(list)
-        for transaction in self.filtered_transactions:
+        for transaction in self.transactions:
             month_key = (transaction.transaction_date.year, transaction.transaction_date.month)
             by_month[month_key].append(transaction)
 
@@ -614,13 +631,19 @@ class TransactionHistoryView(ft.Container):
 
         self.page.open(dialog)
 
+    def _category_amounts(self) -> Dict[str, Decimal]:
+        """Возвращает суммы транзакций по фильтрам по названиям категорий (один GROUP BY в SQL)."""
+        with get_read_session() as session:
+            totals = get_category_totals(session, **self._page_filters())
+        return {item.name: item.total for item in totals}
+
     def _update_chart(self):
         """Обновляет график распределения по категориям."""
-        # Группируем по категориям
-        by_category: Dict[str, Decimal] = defaultdict(lambda: Decimal('0.0'))
-        for transaction in self.filtered_transactions:
-            category_name = transaction.category.name if transaction.category else "Без категории"
-            by_category[category_name] += transaction.amount
+        try:
+            by_category = self._category_amounts()
+        except Exception as e:
+            logger.error(f"Ошибка построения графика по категориям: {e}")
+            by_category = {}
 
         if not by_category:
             self.chart_container.content = ft.Text("Нет данных для графика")
@@ -716,14 +739,12 @@ class TransactionHistoryView(ft.Container):
         else:
             self.selected_type = None
 
-        self._apply_filters()
-        self._update_ui()
+        self._load_data()
 
     def _on_search_change(self, e):
         """Обработчик изменения поискового запроса."""
         self.search_query = self.search_field.value or ""
-        self._apply_filters()
-        self._update_ui()
+        self._load_data()
 
     def _on_group_change(self, e):
         """Обработчик изменения группировки."""
@@ -733,8 +754,12 @@ class TransactionHistoryView(ft.Container):
     def _on_sort_change(self, e):
         """Обработчик изменения сортировки."""
         self.sort_by = self.sort_dropdown.value
-        self._apply_filters()
-        self._update_ui()
+        self._load_data()
+
+    def _on_list_scroll(self, e: ft.OnScrollEvent):
+        """Догружает следующую страницу при прокрутке к концу списка."""
+        if e.max_scroll_extent is not None and e.pixels >= e.max_scroll_extent - SCROLL_LOAD_THRESHOLD:
+            self._load_next_page()
 
     def _refresh_data(self, e):
         """Обновление данных."""
@@ -3,17 +3,16 @@
 """
 import pytest
 from unittest.mock import Mock, MagicMock
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
 from datetime import date, datetime
 from decimal import Decimal
 import uuid
 import flet as ft
 
-from finance_tracker.models import Base
 from finance_tracker.models.models import CategoryDB, TransactionDB, TransactionCreate
 from finance_tracker.models.enums import TransactionType
 
+from db_test_helpers import memory_db_session
+
 
 @pytest.fixture
 def db_session():
@@ -21,16 +20,27 @@ def db_session():
     Централизованная фикстура для создания временной БД и сессии.
     Автоматически закрывает соединение после теста.
     """
-    engine = create_engine("sqlite:///:memory:")
-    Base.metadata.create_all(engine)
-    Session = sessionmaker(bind=engine)
-    session = Session()
-    
-    yield session
-    
-    # Закрываем сессию и соединение
-    session.close()
-    engine.dispose()
+    with memory_db_session() as session:
+        yield session
+
+
+@pytest.fixture
+def initialized_db(tmp_path):
+    """
+    Инициализирует БД приложения (init_db) на временном файле.
+    Нужна для кода, работающего через get_read_session/get_write_session.
+    """
+    from finance_tracker import database
+    from finance_tracker.config import settings
+
+    original_db_path = settings.db_path
+    settings.db_path = str(tmp_path / "finance.db")
+    try:
+        database.init_db()
+        yield
+    finally:
+        database.close_db()
+        settings.db_path = original_db_path
 
 
 @pytest.fixture
@@ -161,6 +171,17 @@ def sample_categories(db_session):
     }
 
 
+@pytest.fixture
+def categories(sample_categories):
+    """
+    Идентификаторы категорий доходов и расходов.
+
+    Returns:
+        tuple: (income_id, expense_id)
+    """
+    return sample_categories["income"][0].id, sample_categories["expense"][0].id
+
+
 @pytest.fixture
 def sample_transactions(db_session, sample_categories):
     """
@@ -0,0 +1,51 @@
+"""
+Вспомогательные функции для тестов, работающих с базой данных.
+
+Содержит:
+- Временную БД в памяти с сессией (для фикстуры db_session и property-тестов,
+  где каждый пример hypothesis работает с новой БД)
+- Создание пары категорий доходов и расходов
+"""
+from contextlib import contextmanager
+from typing import Iterator, Tuple
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session, sessionmaker
+
+from finance_tracker.models import Base
+from finance_tracker.models.models import CategoryDB
+from finance_tracker.models.enums import TransactionType
+from finance_tracker.utils.cache import register_data_revision_listeners
+
+
+@contextmanager
+def memory_db_session() -> Iterator[Session]:
+    """
+    Создаёт БД в памяти и сессию к ней; по выходе закрывает сессию и engine.
+
+    Фабрика сессий настроена как в init_db: фиксация изменений сбрасывает кэш прогноза.
+    """
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(engine)
+    session_factory = sessionmaker(bind=engine)
+    register_data_revision_listeners(session_factory)
+    session = session_factory()
+    try:
+        yield session
+    finally:
+        session.close()
+        engine.dispose()
+
+
+def add_test_categories(session: Session) -> Tuple[str, str]:
+    """
+    Добавляет категории доходов и расходов.
+
+    Returns:
+        Кортеж (income_id, expense_id)
+    """
+    income = CategoryDB(name="Зарплата", type=TransactionType.INCOME)
+    expense = CategoryDB(name="Расходы", type=TransactionType.EXPENSE)
+    session.add_all([income, expense])
+    session.commit()
+    return income.id, expense.id
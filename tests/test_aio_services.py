@@ -0,0 +1,157 @@
+"""
+Тесты асинхронного фасада сервисов чтения (finance_tracker.services.aio).
+"""
+
+import asyncio
+import threading
+from datetime import date
+from decimal import Decimal
+from unittest.mock import Mock
+
+import pytest
+from sqlalchemy import event
+
+from finance_tracker.database import get_write_session
+from finance_tracker.models import (
+    CategoryDB,
+    PlannedOccurrenceDB,
+    PlannedTransactionDB,
+    TransactionDB,
+    TransactionType,
+)
+from finance_tracker.services import aio
+from finance_tracker.views.home_presenter import HomePresenter
+from finance_tracker.views.interfaces import IHomeViewCallbacks
+
+
+@pytest.fixture
+def transaction_in_db(initialized_db):
+    """Создаёт категорию и транзакцию на сегодня."""
+    with get_write_session() as session:
+        category = CategoryDB(name="Тестовая", type=TransactionType.EXPENSE, is_system=False)
+        session.add(category)
+        session.flush()
+        session.add(TransactionDB(
+            amount=Decimal("100.00"),
+            type=TransactionType.EXPENSE,
+            category_id=category.id,
+            description="Кофе",
+            transaction_date=date.today(),
+        ))
+
+
+def test_read_service_runs_in_pool_with_relations_loaded(transaction_in_db):
+    """Сервис выполняется вне вызывающего потока, связи доступны после закрытия сессии."""
+    caller_thread = threading.get_ident()
+    worker_threads = []
+
+    def service(session, target_date):
+        worker_threads.append(threading.get_ident())
+        return session.query(TransactionDB).filter_by(transaction_date=target_date).all()
+
+    transactions = asyncio.run(aio.run_read(service, date.today(), relations=aio.TRANSACTION_RELATIONS))
+
+    assert worker_threads and worker_threads[0] != caller_thread
+    assert len(transactions) == 1
+    assert transactions[0].category.name == "Тестовая"
+
+
+def test_occurrence_relations_loaded_once_per_relation(initialized_db):
+    """Связи вхождений загружаются одним запросом на связь, а не на каждый объект."""
+    from finance_tracker import database
+
+    with get_write_session() as session:
+        for index in range(3):
+            category = CategoryDB(name=f"Категория {index}", type=TransactionType.EXPENSE, is_system=False)
+            planned = PlannedTransactionDB(amount=Decimal("10.00"), category=category, type=TransactionType.EXPENSE,
+                                           start_date=date.today(), is_active=True)
+            session.add(PlannedOccurrenceDB(planned_transaction=planned, occurrence_date=date.today(),
+                                            amount=Decimal("10.00")))
+
+    statements = []
+    capture = lambda conn, cursor, statement, *args: statements.append(statement)  # noqa: E731
+    event.listen(database._read_engine, "before_cursor_execute", capture)
+    try:
+        occurrences = asyncio.run(aio.get_occurrences_by_date_range(date.today(), date.today()))
+    finally:
+        event.remove(database._read_engine, "before_cursor_execute", capture)
+
+    assert sorted(o.planned_transaction.category.name for o in occurrences) == [
+        "Категория 0", "Категория 1", "Категория 2"
+    ]
+    assert sum("FROM categories" in statement for statement in statements) == 1
+    assert sum("FROM planned_transactions" in statement for statement in statements) == 1
+
+
+def test_newer_request_supersedes_older(initialized_db):
+    """Результат устаревшего запроса в канале отбрасывается."""
+    first_started = threading.Event()
+    release_first = threading.Event()
+
+    def slow(session):
+        first_started.set()
+        release_first.wait(timeout=5)
+        return "old"
+
+    def fast(session):
+        return "new"
+
+    async def scenario():
+        first = asyncio.ensure_future(aio.run_read(slow, channel="test"))
+        await asyncio.get_running_loop().run_in_executor(None, first_started.wait, 5)
+        second = await aio.run_read(fast, channel="test")
+        release_first.set()
+        with pytest.raises(aio.RequestSuperseded):
+            await first
+        return second
+
+    assert asyncio.run(scenario()) == "new"
+
+
+def test_requests_in_different_channels_independent(initialized_db):
+    """Запросы в разных каналах не вытесняют друг друга."""
+    async def scenario():
+        return await asyncio.gather(
+            aio.run_read(lambda session: 1, channel="a"),
+            aio.run_read(lambda session: 2, channel="b"),
+        )
+
+    assert asyncio.run(scenario()) == [1, 2]
+
+
+def test_get_total_balance_async(transaction_in_db):
+    """Асинхронная версия сервиса возвращает тот же результат, что и синхронная."""
+    assert asyncio.run(aio.get_total_balance()) == Decimal("-100.00")
+
+
+def test_presenter_on_date_selected_async(transaction_in_db):
+    """HomePresenter загружает данные выбранной даты через асинхронный фасад."""
+    callbacks = Mock(spec=IHomeViewCallbacks)
+    presenter = HomePresenter(Mock(), callbacks)
+
+    asyncio.run(presenter.on_date_selected_async(date.today()))
+
+    callbacks.update_transactions.assert_called_once()
+    selected_date, transactions, occurrences = callbacks.update_transactions.call_args[0]
+    assert selected_date == date.today()
+    assert [t.description for t in transactions] == ["Кофе"]
+    assert occurrences == []
+    callbacks.update_calendar_selection.assert_called_once_with(date.today())
+    callbacks.show_error.assert_not_called()
+
+
+def test_presenter_load_initial_data_async(transaction_in_db):
+    """Начальная загрузка HomePresenter не обращается к сессии UI-потока."""
+    session = Mock()
+    callbacks = Mock(spec=IHomeViewCallbacks)
+    presenter = HomePresenter(session, callbacks)
+
+    asyncio.run(presenter.load_initial_data_async())
+
+    assert session.method_calls == []
+    callbacks.update_calendar_data.assert_called_once()
+    callbacks.update_transactions.assert_called_once()
+    callbacks.update_planned_occurrences.assert_called_once_with([])
+    payments, statistics = callbacks.update_pending_payments.call_args[0]
+    assert payments == [] and isinstance(statistics, dict)
+    callbacks.show_error.assert_not_called()
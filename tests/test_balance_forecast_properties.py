@@ -4,6 +4,8 @@ Property-based тесты для прогноза баланса (Flet верс
 Тестирует:
 - Property 21: Расчёт прогнозируемого баланса
 - Property 22: Учёт компонентов в прогнозе
+- Прогноз на период одним проходом (get_forecast_series)
+- Прогноз на несколько дат одним проходом (calculate_forecast_balances)
 """
 
 from datetime import date, timedelta
@@ -33,7 +35,12 @@ from finance_tracker.models.enums import (
     PendingPaymentPriority
 )
 from finance_tracker.services.balance_forecast_service import (
-    calculate_forecast_balance
+    calculate_actual_balance,
+    calculate_forecast_balance,
+    calculate_forecast_balances,
+    detect_cash_gaps,
+    get_forecast_for_period,
+    get_forecast_series,
 )
 
 # Создаём тестовый движок БД в памяти
@@ -80,6 +87,23 @@ dates = st.dates(min_value=date(2024, 1, 1), max_value=date(2025, 12, 31))
 amounts = st.decimals(min_value=Decimal('1.00'), max_value=Decimal('10000.00'), places=2)
 transaction_types = st.sampled_from(TransactionType)
 
+def _planned_total(planned, pending, today, day):
+    """Сумма плановых операций в (today, day] без сервиса повторений (эталон для проверки)."""
+    steps = {RecurrenceType.DAILY: 1, RecurrenceType.WEEKLY: 7}
+    total = Decimal('0')
+    for day_offset, amount, tx_type, recurrence_type in planned:
+        first = today + timedelta(days=day_offset)
+        occurrence_dates = [first]
+        if recurrence_type in steps:
+            occurrence_dates = [first + timedelta(days=i) for i in range(0, (day - first).days + 1, steps[recurrence_type])]
+        count = sum(1 for occurrence in occurrence_dates if today < occurrence <= day)
+        total += count * (amount if tx_type == TransactionType.INCOME else -amount)
+    for day_offset, amount in pending:
+        if today < today + timedelta(days=day_offset) <= day:
+            total -= amount
+    return total
+
+
 class TestBalanceForecastProperties:
     """Property-based тесты для прогноза баланса."""
 
@@ -300,3 +324,159 @@ class TestBalanceForecastProperties:
             # Assert
             assert calculated_forecast == expected_forecast
 
+    def test_period_forecast_subtracts_loan_payments(self):
+        """Прогноз на период вычитает платежи по кредитам так же, как прогноз на дату."""
+        from finance_tracker.models.enums import LenderType, LoanType, LoanStatus
+
+        with get_test_session() as session:
+            today = date.today()
+            inc_cat = CategoryDB(name="Initial", type=TransactionType.INCOME, is_system=True)
+            session.add(inc_cat)
+            session.flush()
+            session.add(TransactionDB(
+                amount=Decimal('5000.00'),
+                type=TransactionType.INCOME,
+                category_id=inc_cat.id,
+                transaction_date=today,
+                description="Initial Balance"
+            ))
+            lender = LenderDB(name="Bank", lender_type=LenderType.BANK)
+            session.add(lender)
+            session.flush()
+            loan = LoanDB(
+                lender_id=lender.id,
+                name="My Loan",
+                amount=Decimal('10000.00'),
+                issue_date=today,
+                loan_type=LoanType.CONSUMER,
+                status=LoanStatus.ACTIVE
+            )
+            session.add(loan)
+            session.flush()
+            session.add(LoanPaymentDB(
+                loan_id=loan.id,
+                scheduled_date=today + timedelta(days=3),
+                total_amount=Decimal('1200.00'),
+                principal_amount=Decimal('1000.00'),
+                interest_amount=Decimal('200.00'),
+                status=PaymentStatus.PENDING
+            ))
+            session.commit()
+
+            end_date = today + timedelta(days=5)
+            forecast = get_forecast_for_period(session, today, end_date)
+
+            assert forecast[today + timedelta(days=2)][1] == Decimal('5000.00')
+            assert forecast[end_date][1] == Decimal('3800.00')
+            assert forecast[end_date][1] == calculate_forecast_balance(session, end_date)
+
+    @given(
+        past_amounts=st.lists(st.tuples(st.integers(min_value=-20, max_value=0), amounts, transaction_types),
+                              max_size=6),
+        planned=st.lists(
+            st.tuples(
+                st.integers(min_value=-10, max_value=40),
+                amounts,
+                transaction_types,
+                st.sampled_from([RecurrenceType.NONE, RecurrenceType.DAILY, RecurrenceType.WEEKLY]),
+            ),
+            max_size=5
+        ),
+        pending=st.lists(st.tuples(st.integers(min_value=1, max_value=40), amounts), max_size=3),
+        start_offset=st.integers(min_value=-15, max_value=20),
+        length=st.integers(min_value=1, max_value=30),
+    )
+    @settings(max_examples=40, deadline=None)
+    def test_forecast_series_matches_per_date_forecast(self, past_amounts, planned, pending, start_offset, length):
+        """Прогноз на период совпадает с прогнозом на каждую дату, в том числе для периода в будущем."""
+        with get_test_session() as session:
+            today = date.today()
+            categories = {
+                tx_type: CategoryDB(name=f"Series {tx_type.value}", type=tx_type, is_system=True)
+                for tx_type in TransactionType
+            }
+            session.add_all(categories.values())
+            session.flush()
+            for day_offset, amount, tx_type in past_amounts:
+                session.add(TransactionDB(amount=amount, type=tx_type, category_id=categories[tx_type].id,
+                                          transaction_date=today + timedelta(days=day_offset)))
+            for day_offset, amount, tx_type, recurrence_type in planned:
+                planned_tx = PlannedTransactionDB(
+                    amount=amount, category_id=categories[tx_type].id, type=tx_type,
+                    start_date=today + timedelta(days=day_offset), is_active=True
+                )
+                session.add(planned_tx)
+                session.add(RecurrenceRuleDB(planned_transaction=planned_tx, recurrence_type=recurrence_type,
+                                             interval=1, end_condition_type=EndConditionType.NEVER))
+            for day_offset, amount in pending:
+                session.add(PendingPaymentDB(
+                    amount=amount, category_id=categories[TransactionType.EXPENSE].id, description="Pending",
+                    planned_date=today + timedelta(days=day_offset), status=PendingPaymentStatus.ACTIVE
+                ))
+            session.commit()
+
+            start_date = today + timedelta(days=start_offset)
+            end_date = start_date + timedelta(days=length - 1)
+            series = get_forecast_series(session, start_date, end_date)
+
+            assert len(series) == length and series.end_date == end_date
+            forecast = series.to_dict()
+            assert forecast == get_forecast_for_period(session, start_date, end_date)
+            for day, (actual, predicted) in forecast.items():
+                if day <= today:
+                    assert actual == predicted == calculate_actual_balance(session, day)
+                else:
+                    assert actual == calculate_actual_balance(session, today)
+                    assert predicted == calculate_forecast_balance(session, day)
+                    assert predicted == actual + _planned_total(planned, pending, today, day)
+            assert detect_cash_gaps(session, start_date, end_date) == [
+                day for day, (_, predicted) in forecast.items() if predicted < 0
+            ]
+
+    @given(
+        planned=st.lists(
+            st.tuples(
+                st.integers(min_value=-10, max_value=40),
+                amounts,
+                transaction_types,
+                st.sampled_from([RecurrenceType.NONE, RecurrenceType.DAILY, RecurrenceType.WEEKLY]),
+            ),
+            max_size=5
+        ),
+        pending=st.lists(st.tuples(st.integers(min_value=1, max_value=40), amounts), max_size=3),
+        date_offsets=st.lists(st.integers(min_value=-20, max_value=60), max_size=42),
+    )
+    @settings(max_examples=30, deadline=None)
+    def test_multi_date_forecast_matches_per_date_forecast(self, planned, pending, date_offsets):
+        """Прогноз на несколько дат одним проходом совпадает с прогнозом на каждую дату."""
+        with get_test_session() as session:
+            today = date.today()
+            categories = {
+                tx_type: CategoryDB(name=f"Multi {tx_type.value}", type=tx_type, is_system=True)
+                for tx_type in TransactionType
+            }
+            session.add_all(categories.values())
+            session.flush()
+            session.add(TransactionDB(amount=Decimal("500.00"), type=TransactionType.INCOME,
+                                      category_id=categories[TransactionType.INCOME].id, transaction_date=today))
+            for day_offset, amount, tx_type, recurrence_type in planned:
+                planned_tx = PlannedTransactionDB(
+                    amount=amount, category_id=categories[tx_type].id, type=tx_type,
+                    start_date=today + timedelta(days=day_offset), is_active=True
+                )
+                session.add(planned_tx)
+                session.add(RecurrenceRuleDB(planned_transaction=planned_tx, recurrence_type=recurrence_type,
+                                             interval=1, end_condition_type=EndConditionType.NEVER))
+            for day_offset, amount in pending:
+                session.add(PendingPaymentDB(
+                    amount=amount, category_id=categories[TransactionType.EXPENSE].id, description="Pending",
+                    planned_date=today + timedelta(days=day_offset), status=PendingPaymentStatus.ACTIVE
+                ))
+            session.commit()
+
+            dates = [today + timedelta(days=offset) for offset in date_offsets]
+            balances = calculate_forecast_balances(session, dates)
+
+            assert set(balances) == set(dates)
+            for day in dates:
+                assert balances[day] == calculate_forecast_balance(session, day)
@@ -0,0 +1,311 @@
+"""
+Тесты журнала баланса (balance_totals, daily_balances), поддерживаемого триггерами.
+Проверяют согласованность журнала с транзакциями при любых способах изменения данных.
+"""
+
+from datetime import date, timedelta
+from decimal import Decimal
+
+import pytest
+from hypothesis import given, settings, strategies as st
+from sqlalchemy import event, update
+from sqlalchemy.exc import OperationalError
+
+from finance_tracker.models import (
+    DailyBalanceDB,
+    TransactionCreate,
+    TransactionDB,
+    TransactionType,
+    TransactionUpdate,
+)
+from finance_tracker.models.models import balance_ledger_bulk_insert_table
+from finance_tracker.services import transaction_service
+from finance_tracker.services.balance_ledger_service import (
+    DailyBalanceIndex,
+    check_balance_ledger,
+    get_balance_at,
+    get_balances_between,
+)
+from finance_tracker.services.transaction_service import (
+    balance_sum_expression,
+    create_transaction,
+    create_transactions_bulk,
+    delete_transaction,
+    get_total_balance,
+    update_transaction,
+)
+from db_test_helpers import add_test_categories, memory_db_session
+
+BASE_DATE = date(2024, 1, 1)
+
+
+def _category_id(categories, tx_type):
+    income_id, expense_id = categories
+    return income_id if tx_type == TransactionType.INCOME else expense_id
+
+
+def _daily(session):
+    return {row.day: row.net for row in session.query(DailyBalanceDB).all()}
+
+
+operation_strategy = st.tuples(
+    st.sampled_from(["create", "update", "delete"]),
+    st.decimals(min_value=Decimal("0.01"), max_value=Decimal("100000"), places=2),
+    st.sampled_from(list(TransactionType)),
+    st.integers(min_value=0, max_value=5),
+)
+
+
+@given(operations=st.lists(operation_strategy, min_size=1, max_size=20))
+@settings(max_examples=40, deadline=None)
+def test_ledger_matches_transactions_after_service_calls(operations):
+    """После любой последовательности create/update/delete итог журнала равен сумме транзакций."""
+    with memory_db_session() as session:
+        categories = add_test_categories(session)
+        ids = []
+        for action, amount, tx_type, day in operations:
+            if action == "create" or not ids:
+                tx = create_transaction(session, TransactionCreate(
+                    amount=amount, type=tx_type, category_id=_category_id(categories, tx_type),
+                    transaction_date=BASE_DATE + timedelta(days=day)))
+                ids.append(tx.id)
+            elif action == "update":
+                update_transaction(session, ids[day % len(ids)], TransactionUpdate(
+                    amount=amount, type=tx_type, category_id=_category_id(categories, tx_type),
+                    transaction_date=BASE_DATE + timedelta(days=day)))
+            else:
+                delete_transaction(session, ids.pop(day % len(ids)))
+
+        assert get_total_balance(session) == session.query(balance_sum_expression()).scalar()
+        assert check_balance_ledger(session).is_consistent
+        for offset in range(-1, 7):
+            day = BASE_DATE + timedelta(days=offset)
+            assert get_balance_at(session, day) == session.query(balance_sum_expression()).filter(
+                TransactionDB.transaction_date <= day).scalar()
+
+
+def test_ledger_tracks_core_inserts_and_bulk_deletes(db_session, categories):
+    """Журнал обновляется и при вставке/удалении через Core, минуя ORM."""
+    db_session.execute(TransactionDB.__table__.insert(), [
+        {"id": f"00000000-0000-4000-8000-00000000000{i}", "amount": Decimal("10.00") * (i + 1),
+         "type": TransactionType.EXPENSE if i % 2 else TransactionType.INCOME,
+         "category_id": _category_id(categories, TransactionType.EXPENSE if i % 2 else TransactionType.INCOME),
+         "transaction_date": BASE_DATE + timedelta(days=i % 2)}
+        for i in range(4)
+    ])
+    db_session.commit()
+
+    # 10 - 20 + 30 - 40
+    assert get_total_balance(db_session) == Decimal("-20.00")
+    assert _daily(db_session) == {BASE_DATE: Decimal("40.00"), BASE_DATE + timedelta(days=1): Decimal("-60.00")}
+
+    db_session.execute(update(TransactionDB).where(TransactionDB.amount == Decimal("40.00")).values(
+        transaction_date=BASE_DATE))
+    db_session.query(TransactionDB).filter(TransactionDB.type == TransactionType.INCOME).delete()
+    db_session.commit()
+
+    assert get_total_balance(db_session) == Decimal("-60.00")
+    # Дни без транзакций из журнала удаляются
+    assert _daily(db_session) == {BASE_DATE: Decimal("-40.00"), BASE_DATE + timedelta(days=1): Decimal("-20.00")}
+
+
+def test_empty_database_balance_is_zero(db_session):
+    assert get_total_balance(db_session) == Decimal("0")
+
+
+def test_check_detects_and_repairs_inconsistent_ledger(db_session, categories):
+    """Проверка находит расхождение журнала с транзакциями и пересчитывает его."""
+    create_transaction(db_session, TransactionCreate(
+        amount=Decimal("500.00"), type=TransactionType.INCOME,
+        category_id=_category_id(categories, TransactionType.INCOME), transaction_date=BASE_DATE))
+    db_session.execute(update(DailyBalanceDB).values(net=Decimal("1.00")))
+    db_session.execute(DailyBalanceDB.__table__.insert().values(
+        day=BASE_DATE + timedelta(days=3), net=Decimal("7.00"), transaction_count=1))
+    db_session.commit()
+
+    result = check_balance_ledger(db_session)
+    assert not result.is_consistent
+    assert result.mismatched_days == [BASE_DATE, BASE_DATE + timedelta(days=3)]
+    assert result.repaired is False
+
+    result = check_balance_ledger(db_session, repair=True)
+    assert result.repaired is True
+    assert check_balance_ledger(db_session).is_consistent
+    assert _daily(db_session) == {BASE_DATE: Decimal("500.00")}
+
+
+def _add(session, categories, amount, tx_type, day):
+    return create_transaction(session, TransactionCreate(
+        amount=Decimal(amount), type=tx_type, category_id=_category_id(categories, tx_type),
+        transaction_date=BASE_DATE + timedelta(days=day)))
+
+
+def test_daily_cumulative_is_prefix_sum(db_session, categories):
+    """Нарастающий итог дня равен сумме изменений всех дней до него включительно."""
+    _add(db_session, categories, "100.00", TransactionType.INCOME, 0)
+    _add(db_session, categories, "30.00", TransactionType.EXPENSE, 5)
+    # Транзакция в прошлом сдвигает итоги всех последующих дней
+    _add(db_session, categories, "7.50", TransactionType.EXPENSE, 2)
+
+    rows = db_session.query(DailyBalanceDB.day, DailyBalanceDB.cumulative).order_by(DailyBalanceDB.day).all()
+    assert rows == [
+        (BASE_DATE, Decimal("100.00")),
+        (BASE_DATE + timedelta(days=2), Decimal("92.50")),
+        (BASE_DATE + timedelta(days=5), Decimal("62.50")),
+    ]
+    assert get_balance_at(db_session, BASE_DATE - timedelta(days=1)) == Decimal("0")
+    assert get_balance_at(db_session, BASE_DATE + timedelta(days=3)) == Decimal("92.50")
+    assert get_balance_at(db_session, BASE_DATE + timedelta(days=100)) == Decimal("62.50")
+
+
+def test_index_rereads_only_changed_suffix(db_session, categories):
+    """Копия в памяти после изменения перечитывает только дни начиная с изменённого."""
+    for day in range(10):
+        _add(db_session, categories, "10.00", TransactionType.INCOME, day)
+    index = DailyBalanceIndex()
+    assert index.balance_at(db_session, BASE_DATE + timedelta(days=9)) == Decimal("100.00")
+
+    statements = []
+    engine = db_session.get_bind()
+
+    def _capture(conn, cursor, statement, parameters, context, executemany):
+        statements.append((statement, parameters))
+
+    tx = _add(db_session, categories, "5.00", TransactionType.EXPENSE, 7)
+    event.listen(engine, "before_cursor_execute", _capture)
+    try:
+        assert index.balance_at(db_session, BASE_DATE + timedelta(days=9)) == Decimal("95.00")
+    finally:
+        event.remove(engine, "before_cursor_execute", _capture)
+    # Номер изменения, последний неизменённый день, дни после него
+    assert len(statements) == 3
+    assert statements[-1][1][-1] == (BASE_DATE + timedelta(days=6)).isoformat()
+    assert len(index) == 10
+
+    # Удаление единственной транзакции последнего дня убирает день из копии
+    delete_transaction(db_session, tx.id)
+    db_session.query(TransactionDB).filter(TransactionDB.transaction_date == BASE_DATE + timedelta(days=9)).delete()
+    db_session.commit()
+    assert index.balance_at(db_session, BASE_DATE + timedelta(days=30)) == Decimal("90.00")
+    assert len(index) == 9
+
+
+def test_balance_at_sees_uncommitted_changes(db_session, categories):
+    """Незафиксированные изменения сессии учитываются и не попадают в копию в памяти."""
+    _add(db_session, categories, "50.00", TransactionType.INCOME, 0)
+    assert get_balance_at(db_session, BASE_DATE) == Decimal("50.00")
+
+    db_session.add(TransactionDB(amount=Decimal("20.00"), type=TransactionType.EXPENSE,
+                              category_id=_category_id(categories, TransactionType.EXPENSE), transaction_date=BASE_DATE))
+    db_session.flush()
+    assert get_balance_at(db_session, BASE_DATE) == Decimal("30.00")
+
+    db_session.rollback()
+    assert get_balance_at(db_session, BASE_DATE) == Decimal("50.00")
+
+
+@given(
+    existing=st.lists(operation_strategy, max_size=8),
+    batch=st.lists(operation_strategy, min_size=1, max_size=30),
+)
+@settings(max_examples=40, deadline=None)
+def test_bulk_create_keeps_ledger_consistent(existing, batch):
+    """Массовое создание обновляет журнал так же, как построчные триггеры."""
+    with memory_db_session() as session:
+        categories = add_test_categories(session)
+        for _, amount, tx_type, day in existing:
+            _add(session, categories, amount, tx_type, day * 2)
+        index = DailyBalanceIndex()
+        index.balance_at(session, BASE_DATE)
+
+        result = create_transactions_bulk(session, [
+            {"amount": amount, "type": tx_type, "category_id": _category_id(categories, tx_type),
+             "transaction_date": BASE_DATE + timedelta(days=day)}
+            for _, amount, tx_type, day in batch
+        ])
+
+        assert len(result.created_ids) == len(batch) and not result.errors
+        assert check_balance_ledger(session).is_consistent
+        for offset in range(-1, 12):
+            day = BASE_DATE + timedelta(days=offset)
+            assert index.balance_at(session, day) == session.query(balance_sum_expression()).filter(
+                TransactionDB.transaction_date <= day).scalar()
+
+        # Триггеры восстановлены: последующие построчные изменения учитываются
+        delete_transaction(session, result.created_ids[0])
+        assert check_balance_ledger(session).is_consistent
+
+
+def test_bulk_create_ledger_uses_rounded_amounts(db_session, categories):
+    """Журнал учитывает суммы с округлением до копеек, как они сохраняются."""
+
+    create_transactions_bulk(db_session, [
+        {"amount": Decimal("10.005"), "type": TransactionType.INCOME,
+         "category_id": _category_id(categories, TransactionType.INCOME), "transaction_date": BASE_DATE},
+        {"amount": Decimal("3.333"), "type": TransactionType.EXPENSE,
+         "category_id": _category_id(categories, TransactionType.EXPENSE), "transaction_date": BASE_DATE},
+    ])
+
+    assert check_balance_ledger(db_session).is_consistent
+    assert get_total_balance(db_session) == db_session.query(balance_sum_expression()).scalar()
+
+
+def test_bulk_create_keeps_triggers_in_place(db_session, categories):
+    """Массовая вставка не меняет схему: триггеры не снимаются и не создаются заново."""
+    statements = []
+    engine = db_session.get_bind()
+    capture = lambda conn, cursor, statement, *args: statements.append(statement)  # noqa: E731
+
+    event.listen(engine, "before_cursor_execute", capture)
+    create_transactions_bulk(db_session, [
+        {"amount": Decimal("40.00"), "type": TransactionType.EXPENSE,
+         "category_id": _category_id(categories, TransactionType.EXPENSE), "transaction_date": BASE_DATE}
+    ])
+    event.remove(engine, "before_cursor_execute", capture)
+
+    assert not [statement for statement in statements if "TRIGGER" in statement.upper()]
+    assert check_balance_ledger(db_session).is_consistent
+
+
+def test_bulk_create_failure_rolls_back_ledger_and_flag(db_session, categories, monkeypatch):
+    """Ошибка массовой вставки откатывает журнал и флаг, отключающий триггер вставки."""
+    _add(db_session, categories, "100.00", TransactionType.INCOME, 0)
+
+    def _failing_delete(*args, **kwargs):
+        raise OperationalError("DELETE", {}, Exception("disk I/O error"))
+
+    monkeypatch.setattr(transaction_service, "delete", _failing_delete)
+    with pytest.raises(ValueError):
+        create_transactions_bulk(db_session, [
+            {"amount": Decimal("40.00"), "type": TransactionType.EXPENSE,
+             "category_id": _category_id(categories, TransactionType.EXPENSE), "transaction_date": BASE_DATE}
+        ])
+    monkeypatch.undo()
+
+    assert db_session.query(TransactionDB).count() == 1
+    assert db_session.query(balance_ledger_bulk_insert_table).count() == 0
+    assert get_total_balance(db_session) == Decimal("100.00")
+    _add(db_session, categories, "30.00", TransactionType.EXPENSE, 1)
+    assert get_total_balance(db_session) == Decimal("70.00")
+    assert check_balance_ledger(db_session).is_consistent
+
+
+def test_balances_between_fill_days_without_transactions(db_session, categories):
+    """Балансы по дням периода совпадают с get_balance_at и при незафиксированных изменениях."""
+    _add(db_session, categories, "100.00", TransactionType.INCOME, 0)
+    _add(db_session, categories, "30.00", TransactionType.EXPENSE, 3)
+    start, end = BASE_DATE - timedelta(days=2), BASE_DATE + timedelta(days=6)
+
+    def _expected():
+        return [int(get_balance_at(db_session, start + timedelta(days=i)) * 100) for i in range((end - start).days + 1)]
+
+    assert list(get_balances_between(db_session, start, end)) == _expected() == [0, 0, 10000, 10000, 10000, 7000,
+                                                                             7000, 7000, 7000]
+    assert list(get_balances_between(db_session, end, start)) == []
+
+    db_session.add(TransactionDB(amount=Decimal("5.00"), type=TransactionType.EXPENSE,
+                              category_id=_category_id(categories, TransactionType.EXPENSE),
+                              transaction_date=BASE_DATE + timedelta(days=1)))
+    db_session.flush()
+    assert list(get_balances_between(db_session, BASE_DATE + timedelta(days=2), end)) == [9500, 6500, 6500, 6500, 6500]
+    db_session.rollback()
@@ -0,0 +1,80 @@
+"""
+Тесты генератора синтетических данных и бенчмарка сервисов (finance_tracker.bench).
+"""
+
+from dataclasses import replace
+
+from sqlalchemy import func, select
+
+from finance_tracker.bench.generator import SCALES, generate_dataset
+from finance_tracker.bench.runner import run_benchmark
+from finance_tracker.bench.service_calls import SERVICE_CALLS
+from finance_tracker.database import create_db_engine
+from finance_tracker.migrations import run_migrations
+from finance_tracker.models import (
+    DebtTransferDB,
+    LoanPaymentDB,
+    PaymentStatus,
+    PlannedOccurrenceDB,
+    RecurrenceRuleDB,
+    TransactionDB,
+)
+
+TINY = replace(SCALES["small"], years=1, transactions_per_day=2, planned_transactions=10, loans=10)
+
+
+def test_generate_dataset_counts(tmp_path):
+    """Генератор создаёт данные всех сущностей и возвращает их количество."""
+    engine = create_db_engine(f"sqlite:///{tmp_path / 'bench.db'}")
+    try:
+        run_migrations(engine)
+        context = generate_dataset(engine, SCALES["small"])
+
+        with engine.connect() as conn:
+            def count(model):
+                return conn.execute(select(func.count()).select_from(model)).scalar()
+
+            assert count(TransactionDB) == context.row_counts["transactions"] > 0
+            assert count(PlannedOccurrenceDB) == context.row_counts["planned_occurrences"] > 0
+            assert count(LoanPaymentDB) == context.row_counts["loan_payments"] > 0
+            assert count(DebtTransferDB) == context.row_counts["debt_transfers"]
+            # Смешанные правила повторения: несколько типов
+            types = conn.execute(select(RecurrenceRuleDB.recurrence_type).distinct()).scalars().all()
+            assert len(types) >= 3
+            status = conn.execute(
+                select(LoanPaymentDB.status).where(LoanPaymentDB.id == context.payment_id)
+            ).scalar()
+            assert status == PaymentStatus.PENDING
+    finally:
+        engine.dispose()
+
+
+def test_generate_dataset_is_deterministic(tmp_path):
+    """Одинаковые параметры дают одинаковые идентификаторы и количество строк."""
+    contexts = []
+    for name in ("a.db", "b.db"):
+        engine = create_db_engine(f"sqlite:///{tmp_path / name}")
+        try:
+            run_migrations(engine)
+            contexts.append(generate_dataset(engine, TINY))
+        finally:
+            engine.dispose()
+
+    assert contexts[0] == contexts[1]
+
+
+def test_run_benchmark_rolls_back_mutating_calls(tmp_path):
+    """Изменяющий вызов измеряется на каждом повторе без ошибок: изменения откатываются."""
+    calls = [call for call in SERVICE_CALLS if call.name in (
+        "transaction_service.get_total_balance",
+        "loan_payment_service.execute_payment",
+    )]
+    report = run_benchmark(["tiny"], repeats=3, calls=calls, work_dir=str(tmp_path), specs={"tiny": TINY})
+
+    results = report["scales"]["tiny"]["calls"]
+    assert set(results) == {call.name for call in calls}
+    for result in results.values():
+        assert result["error"] is None
+        assert result["statements"] >= 1
+        assert result["min_ms"] <= result["median_ms"] <= result["max_ms"]
+    assert results["loan_payment_service.execute_payment"]["mutates"] is True
@@ -23,7 +23,8 @@ from finance_tracker.models import (
 )
 from finance_tracker.services.transaction_service import (
     get_month_stats,
-    get_transactions_by_date
+    get_transactions_by_date,
+    get_year_stats
 )
 
 # Создаём тестовый движок БД в памяти
@@ -165,6 +166,45 @@ class TestCalendarProperties:
                 assert inc == expected_stats[day]["income"]
                 assert exp == expected_stats[day]["expense"]
 
+    @given(data=transactions_list_strategy())
+    @settings(max_examples=30, deadline=None)
+    def test_year_stats_match_month_stats(self, data):
+        """
+        Статистика за год содержит все дни года и совпадает
+        с помесячной статистикой для дней с транзакциями.
+        """
+        base_date, tx_list = data
+        year = base_date.year
+        
+        with get_test_session() as session:
+            cat_inc = CategoryDB(name="Inc", type=TransactionType.INCOME)
+            cat_exp = CategoryDB(name="Exp", type=TransactionType.EXPENSE)
+            session.add_all([cat_inc, cat_exp])
+            session.commit()
+            
+            for item in tx_list:
+                cat_id = cat_inc.id if item["type"] == TransactionType.INCOME else cat_exp.id
+                session.add(TransactionDB(
+                    amount=item["amount"],
+                    type=item["type"],
+                    category_id=cat_id,
+                    transaction_date=item["date"],
+                    description="Test"
+                ))
+            session.commit()
+            
+            year_stats = get_year_stats(session, year)
+            
+            assert len(year_stats) == (date(year + 1, 1, 1) - date(year, 1, 1)).days
+            assert list(year_stats) == sorted(year_stats)
+            expected = {
+                date(year, month, day): totals
+                for month in range(1, 13)
+                for day, totals in get_month_stats(session, year, month).items()
+            }
+            for day, totals in year_stats.items():
+                assert totals == expected.get(day, (Decimal('0'), Decimal('0')))
+
     @given(data=transactions_list_strategy())
     @settings(max_examples=50, deadline=None)
     def test_property_5_day_transactions(self, data):
@@ -1,9 +1,11 @@
 """
 Тесты синхронизации выделения даты в календаре при клике на плановую транзакцию.
 """
+import asyncio
 import unittest
 from unittest.mock import Mock, MagicMock, patch
 import datetime
+import pytest
 from hypothesis import given, strategies as st, settings
 
 from finance_tracker.views.home_view import HomeView
@@ -309,18 +311,22 @@ class TestCalendarSelectionSync(unittest.TestCase):
         # Вызываем on_occurrence_clicked
         home_view.on_occurrence_clicked(mock_occurrence)
         
-        # Проверяем, что presenter.on_date_selected был вызван
-        MockPresenter.return_value.on_date_selected.assert_called_once_with(
-            mock_occurrence.occurrence_date
+        # Проверяем, что presenter.on_date_selected_async запущен в цикле событий страницы
+        self.mock_page.run_task.assert_called_once_with(
+            MockPresenter.return_value.on_date_selected_async,
+            mock_occurrence.occurrence_date,
         )
 
 
+@pytest.mark.usefixtures("initialized_db")
 class TestCalendarSelectionSyncIntegration(unittest.TestCase):
     """Интеграционные тесты синхронизации выделения календаря."""
 
     def setUp(self):
         """Настройка перед каждым тестом."""
         self.mock_page = MagicMock()
+        # Асинхронные загрузки Presenter выполняются сразу, как в цикле событий Flet
+        self.mock_page.run_task = Mock(side_effect=lambda handler, *args: asyncio.run(handler(*args)))
         self.mock_page.open = Mock()
         self.mock_page.close = Mock()
         self.mock_page.update = Mock()
@@ -0,0 +1,176 @@
+"""
+Тесты поиска ближайших кассовых разрывов (find_next_cash_gaps).
+Проверяют границы и глубину разрывов, причины разрыва, порционный расчёт
+прогноза и остановку поиска после нужного количества разрывов.
+"""
+
+from datetime import date, timedelta
+from decimal import Decimal
+from unittest.mock import patch
+
+import pytest
+from hypothesis import given, settings, strategies as st
+
+from finance_tracker.models import (
+    ForecastItemSource,
+    LenderDB,
+    LoanDB,
+    LoanPaymentDB,
+    PaymentStatus,
+    PendingPaymentDB,
+    PendingPaymentStatus,
+    PlannedTransactionDB,
+    RecurrenceRuleDB,
+    RecurrenceType,
+    TransactionDB,
+    TransactionType,
+)
+from finance_tracker.services import balance_forecast_service
+from finance_tracker.services.balance_forecast_service import find_next_cash_gaps, get_forecast_series
+from db_test_helpers import add_test_categories, memory_db_session
+
+
+def _balance(session, category_id, amount):
+    amount = Decimal(amount)
+    tx_type = TransactionType.INCOME if amount >= 0 else TransactionType.EXPENSE
+    session.add(TransactionDB(amount=abs(amount), type=tx_type, category_id=category_id,
+                              transaction_date=date.today()))
+    session.commit()
+
+
+def _planned(session, category_id, tx_type, amount, day_offset, recurrence=None, description=None):
+    planned = PlannedTransactionDB(
+        amount=Decimal(amount), category_id=category_id, type=tx_type, description=description,
+        start_date=date.today() + timedelta(days=day_offset), is_active=True
+    )
+    session.add(planned)
+    if recurrence is not None:
+        session.add(RecurrenceRuleDB(planned_transaction=planned, recurrence_type=recurrence, interval=1))
+    session.commit()
+    return planned
+
+
+def test_no_gaps_and_argument_validation(db_session, categories):
+    income_id, expense_id = categories
+    _balance(db_session, income_id, "1000.00")
+    _planned(db_session, expense_id, TransactionType.EXPENSE, "999.00", 5)
+
+    assert find_next_cash_gaps(db_session, horizon_days=365) == []
+    with pytest.raises(ValueError):
+        find_next_cash_gaps(db_session, horizon_days=-1)
+    with pytest.raises(ValueError):
+        find_next_cash_gaps(db_session, limit=0)
+
+
+def test_gap_bounds_depth_and_causes(db_session, categories):
+    today = date.today()
+    income_id, expense_id = categories
+    _balance(db_session, income_id, "1000.00")
+    rent = _planned(db_session, expense_id, TransactionType.EXPENSE, "800.00", 3, description="Аренда")
+    lender = LenderDB(name="Банк")
+    db_session.add(lender)
+    db_session.flush()
+    loan = LoanDB(name="Ипотека", lender_id=lender.id, amount=Decimal("100000.00"), issue_date=today)
+    db_session.add(loan)
+    db_session.flush()
+    loan_payment = LoanPaymentDB(
+        loan_id=loan.id, scheduled_date=today + timedelta(days=4), principal_amount=Decimal("250.00"),
+        interest_amount=Decimal("50.00"), total_amount=Decimal("300.00"), status=PaymentStatus.PENDING
+    )
+    pending = PendingPaymentDB(
+        amount=Decimal("100.00"), category_id=expense_id, description="Ремонт",
+        status=PendingPaymentStatus.ACTIVE, planned_date=today + timedelta(days=6)
+    )
+    db_session.add_all([loan_payment, pending])
+    db_session.commit()
+    _planned(db_session, income_id, TransactionType.INCOME, "500.00", 8)
+
+    [gap] = find_next_cash_gaps(db_session, horizon_days=30, limit=5)
+
+    # Баланс: 1000 -> 200 (день 3) -> -100 (день 4) -> -200 (день 6) -> 300 (день 8)
+    assert (gap.start_date, gap.end_date) == (today + timedelta(days=4), today + timedelta(days=7))
+    assert (gap.depth, gap.deepest_date) == (Decimal("200.00"), today + timedelta(days=6))
+    assert not gap.continues_past_horizon
+    assert [(item.source, item.source_id, item.amount, item.description) for item in gap.causes] == [
+        (ForecastItemSource.LOAN_PAYMENT, loan_payment.id, Decimal("-300.00"), "Ипотека"),
+        (ForecastItemSource.PENDING_PAYMENT, pending.id, Decimal("-100.00"), "Ремонт"),
+    ]
+    assert rent.id not in {item.source_id for item in gap.causes}
+
+
+def test_gap_open_today_and_past_horizon(db_session, categories):
+    today = date.today()
+    income_id, expense_id = categories
+    _balance(db_session, expense_id, "-10.00")
+
+    [gap] = find_next_cash_gaps(db_session, horizon_days=10)
+
+    assert (gap.start_date, gap.end_date, gap.deepest_date) == (today, today + timedelta(days=10), today)
+    assert gap.depth == Decimal("10.00")
+    assert gap.causes == []
+    assert gap.continues_past_horizon
+
+
+def test_search_stops_after_limit_gaps(db_session, categories):
+    income_id, expense_id = categories
+    # Каждую неделю: расход, через три дня такой же доход
+    _planned(db_session, expense_id, TransactionType.EXPENSE, "100.00", 1, RecurrenceType.WEEKLY)
+    _planned(db_session, income_id, TransactionType.INCOME, "100.00", 4, RecurrenceType.WEEKLY)
+
+    with patch.object(balance_forecast_service, "_forecast_deltas",
+                      wraps=balance_forecast_service._forecast_deltas) as deltas:
+        gaps = find_next_cash_gaps(db_session, horizon_days=10 * 365, limit=3)
+
+    assert [(gap.start_date - date.today()).days for gap in gaps] == [1, 8, 15]
+    assert all((gap.end_date - gap.start_date).days == 2 for gap in gaps)
+    assert deltas.call_count == 1
+
+
+@settings(max_examples=30, deadline=None)
+@given(
+    initial=st.integers(min_value=-300, max_value=1000),
+    planned=st.lists(
+        st.tuples(
+            st.integers(min_value=1, max_value=60),
+            st.integers(min_value=1, max_value=500),
+            st.sampled_from([TransactionType.INCOME, TransactionType.EXPENSE]),
+            st.sampled_from([None, RecurrenceType.WEEKLY, RecurrenceType.MONTHLY]),
+        ),
+        max_size=6
+    ),
+    horizon_days=st.integers(min_value=0, max_value=120),
+    limit=st.integers(min_value=1, max_value=4),
+    chunk_days=st.integers(min_value=1, max_value=40),
+)
+def test_gaps_match_negative_stretches_of_full_forecast(initial, planned, horizon_days, limit, chunk_days):
+    """Свойство: разрывы совпадают с отрицательными участками прогноза на весь горизонт."""
+    with memory_db_session() as session:
+        today = date.today()
+        income_id, expense_id = add_test_categories(session)
+        if initial:
+            _balance(session, income_id if initial > 0 else expense_id, Decimal(initial))
+        for day_offset, amount, tx_type, recurrence in planned:
+            category_id = income_id if tx_type == TransactionType.INCOME else expense_id
+            _planned(session, category_id, tx_type, Decimal(amount), day_offset, recurrence)
+
+        series = get_forecast_series(session, today, today + timedelta(days=horizon_days))
+        stretches = []
+        for offset, balance in enumerate(series.predicted):
+            if balance >= 0:
+                continue
+            if stretches and stretches[-1][1] == offset - 1:
+                stretches[-1][1] = offset
+                stretches[-1][2] = min(stretches[-1][2], balance)
+            else:
+                stretches.append([offset, offset, balance])
+
+        with patch.object(balance_forecast_service, "FORECAST_CHUNK_DAYS", chunk_days):
+            gaps = find_next_cash_gaps(session, horizon_days=horizon_days, limit=limit)
+
+        assert [
+            ((gap.start_date - today).days, (gap.end_date - today).days, gap.depth) for gap in gaps
+        ] == [(start, end, Decimal(-minimum).scaleb(-2)) for start, end, minimum in stretches[:limit]]
+        for gap in gaps:
+            assert series.predicted_at(gap.deepest_date) == -gap.depth
+            assert all(gap.start_date <= item.item_date <= gap.deepest_date for item in gap.causes)
+            assert all(item.amount < 0 for item in gap.causes)
@@ -0,0 +1,119 @@
+"""
+Тесты скомпилированных правил повторения (compile_recurrence_rule).
+Проверяют шаг по маске дней недели, неизменяемость и кэширование
+по (id правила, updated_at).
+"""
+
+import json
+from datetime import date, timedelta
+from decimal import Decimal
+from unittest.mock import patch
+
+import pytest
+
+from finance_tracker.models import (
+    EndConditionType,
+    IntervalUnit,
+    PlannedTransactionDB,
+    RecurrenceRuleDB,
+    RecurrenceType,
+    TransactionType,
+)
+from finance_tracker.services import recurrence_service
+from finance_tracker.services.recurrence_service import (
+    calculate_next_occurrence_date,
+    compile_recurrence_rule,
+    generate_occurrences_for_period,
+)
+from finance_tracker.utils.cache import cache
+
+
+@pytest.fixture(autouse=True)
+def clean_rule_cache():
+    cache.recurrence_rules.invalidate()
+    yield
+    cache.recurrence_rules.invalidate()
+
+
+def _weekly_rule(weekdays, start_date=date(2025, 1, 1), interval=2):
+    planned = PlannedTransactionDB(amount=Decimal("100.00"), type=TransactionType.EXPENSE,
+                                   start_date=start_date, is_active=True)
+    return RecurrenceRuleDB(
+        planned_transaction=planned, recurrence_type=RecurrenceType.CUSTOM, interval=interval,
+        interval_unit=IntervalUnit.WEEKS, weekdays=json.dumps(weekdays)
+    )
+
+
+def _chain(rule, current_date, steps):
+    dates = []
+    for _ in range(steps):
+        current_date = calculate_next_occurrence_date(current_date, rule)
+        dates.append(current_date)
+    return dates
+
+
+def test_weekday_mask_steps_through_selected_days():
+    # Понедельник и четверг каждые две недели, начало - среда 1 января
+    expected = [date(2025, 1, 2), date(2025, 1, 13), date(2025, 1, 16), date(2025, 1, 27)]
+
+    assert _chain(_weekly_rule([0, 3]), date(2025, 1, 1), 4) == expected
+    # Порядок дней в JSON не важен
+    assert _chain(_weekly_rule([3, 0]), date(2025, 1, 1), 4) == expected
+    # Пустой список - каждые N недель от текущей даты
+    assert _chain(_weekly_rule([]), date(2025, 1, 1), 2) == [date(2025, 1, 15), date(2025, 1, 29)]
+
+
+def test_compiled_rule_is_immutable_and_validated():
+    compiled = compile_recurrence_rule(_weekly_rule([0, 3]))
+
+    assert (compiled.weekday_mask, compiled.first_weekday) == (0b1001, 0)
+    assert not hasattr(compiled, "__dict__")
+    with pytest.raises(AttributeError):
+        compiled.step = 1
+    with pytest.raises(ValueError):
+        compile_recurrence_rule(_weekly_rule([7]))
+    with pytest.raises(ValueError):
+        compile_recurrence_rule(RecurrenceRuleDB(recurrence_type=RecurrenceType.NONE, interval=1))
+
+
+def test_end_conditions_precomputed():
+    rule = _weekly_rule([1])
+    rule.end_condition_type = EndConditionType.AFTER_COUNT
+    rule.occurrences_count = 3
+    rule.end_date = date(2025, 6, 1)
+
+    compiled = compile_recurrence_rule(rule)
+
+    assert (compiled.max_count, compiled.until_date) == (3, None)
+
+
+def test_compiled_rule_cached_until_rule_changes(db_session, sample_categories):
+    # Начало в пятницу: первое вхождение (дата начала) тоже попадает на пятницу
+    start = date.today() + timedelta(days=(4 - date.today().weekday()) % 7)
+    end = start + timedelta(days=60)
+    rule = _weekly_rule([0, 3], start_date=start)
+    rule.planned_transaction.category_id = sample_categories["expense"][0].id
+    db_session.add(rule)
+    db_session.commit()
+    planned = rule.planned_transaction
+
+    with patch.object(recurrence_service, "_weekday_mask", wraps=recurrence_service._weekday_mask) as parse:
+        first = generate_occurrences_for_period(db_session, planned, start, end)
+        assert generate_occurrences_for_period(db_session, planned, start, end) == first
+        assert parse.call_count == 1
+        compiled = compile_recurrence_rule(rule)
+        assert compile_recurrence_rule(rule) is compiled
+
+        # Незаписанное изменение - правило компилируется заново, кэш не используется
+        rule.weekdays = json.dumps([4])
+        assert compile_recurrence_rule(rule).weekday_mask == 0b10000
+        assert len(cache.recurrence_rules) == 1
+
+        # После фиксации меняется updated_at - новая запись кэша
+        db_session.commit()
+        changed = compile_recurrence_rule(rule)
+        assert changed is not compiled and changed.weekday_mask == 0b10000
+        assert compile_recurrence_rule(rule) is changed
+        assert len(cache.recurrence_rules) == 2
+
+    assert all(day.weekday() == 4 for day in generate_occurrences_for_period(db_session, planned, start, end))
@@ -1,7 +1,8 @@
 
-from sqlalchemy import inspect
-from finance_tracker.database import init_default_categories
-from finance_tracker.services.category_service import init_loan_categories
+from sqlalchemy import event, inspect
+from finance_tracker.database import init_default_categories, seed_initial_data
+from finance_tracker.services.category_service import LOAN_CATEGORIES, init_loan_categories, insert_categories
+from finance_tracker.models.enums import TransactionType
 from finance_tracker.models.models import CategoryDB
 import uuid
 
@@ -28,12 +29,50 @@ def test_init_loan_categories_uuids(db_session):
         uuid.UUID(cat.id)
 
 def test_schema_has_uuid_columns(db_session):
-    """Test that the schema created by tests has VARCHAR(36) for IDs."""
+    """Test that the schema stores IDs as 16-byte BLOBs."""
     engine = db_session.get_bind()
     inspector = inspect(engine)
     
     columns = inspector.get_columns("categories")
     id_col = next(c for c in columns if c["name"] == "id")
     
-    # In SQLite, VARCHAR(36) might be reported as VARCHAR(36) or just VARCHAR
-    assert "VARCHAR" in str(id_col["type"]).upper() or "TEXT" in str(id_col["type"]).upper()
+    assert "BLOB" in str(id_col["type"]).upper()
+
+
+def test_insert_categories_skips_existing_names(db_session):
+    """Повторное добавление категорий не создаёт дубликатов."""
+    assert insert_categories(db_session, LOAN_CATEGORIES) == len(LOAN_CATEGORIES)
+    assert insert_categories(db_session, LOAN_CATEGORIES + [("Новая", TransactionType.EXPENSE)]) == 1
+    db_session.commit()
+
+    assert db_session.query(CategoryDB).count() == len(LOAN_CATEGORIES) + 1
+
+
+def test_seed_initial_data_fills_empty_catalog_in_one_statement(db_session):
+    """В пустой справочник добавляются предопределённые и системные категории одним INSERT."""
+    engine = db_session.get_bind()
+    statements = []
+    event.listen(engine, "before_cursor_execute",
+                 lambda conn, cursor, statement, *args: statements.append(statement))
+
+    with engine.begin() as connection:
+        seed_initial_data(connection)
+
+    inserts = [s for s in statements if s.lstrip().upper().startswith("INSERT")]
+    assert len(inserts) == 1
+    names = {c.name for c in db_session.query(CategoryDB).all()}
+    assert "Зарплата" in names
+    assert {name for name, _ in LOAN_CATEGORIES} <= names
+
+
+def test_seed_initial_data_keeps_user_catalog(db_session):
+    """Если категории уже есть, добавляются только системные категории кредитов."""
+    db_session.add(CategoryDB(name="Моя категория", type=TransactionType.EXPENSE))
+    db_session.commit()
+
+    with db_session.get_bind().begin() as connection:
+        seed_initial_data(connection)
+
+    names = {c.name for c in db_session.query(CategoryDB).all()}
+    assert "Зарплата" not in names
+    assert names == {"Моя категория"} | {name for name, _ in LOAN_CATEGORIES}
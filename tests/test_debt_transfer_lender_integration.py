@@ -185,23 +185,19 @@ class TestDebtTransferStatisticsIntegration(unittest.TestCase):
         mock_query = Mock()
         mock_session.query.return_value = mock_query
         
-        # Мокируем активные кредиты
-        mock_loan1 = Mock()
-        mock_loan1.amount = Decimal('150000.00')
-        mock_loan1.interest_rate = Decimal('12.0')
-        
-        mock_loan2 = Mock()
-        mock_loan2.amount = Decimal('150000.00')
-        mock_loan2.interest_rate = Decimal('15.0')
-        
-        mock_loan3 = Mock()
-        mock_loan3.amount = Decimal('200000.00')
-        mock_loan3.interest_rate = Decimal('18.0')
-        
-        mock_query.filter.return_value.all.return_value = [mock_loan1, mock_loan2, mock_loan3]
-        
-        # Мокируем платежи
-        mock_query.filter_by.return_value.all.return_value = []
+        # Мокируем агрегаты по активным и закрытым кредитам
+        mock_query.filter.return_value.one.return_value = (3, Decimal('500000.00'))
+        mock_query.filter.return_value.scalar.return_value = 0
+        
+        # Мокируем сумму и ставку активных кредитов (для расчёта переплаты)
+        mock_query.filter.return_value.all.return_value = [
+            (Decimal('150000.00'), Decimal('12.0')),
+            (Decimal('150000.00'), Decimal('15.0')),
+            (Decimal('200000.00'), Decimal('18.0')),
+        ]
+        
+        # Мокируем суммы ожидающих платежей
+        mock_query.join.return_value.filter.return_value.one.return_value = (Decimal('0'), Decimal('0'))
         
         # Вызываем get_summary_statistics
         stats = get_summary_statistics(mock_session)
@@ -0,0 +1,191 @@
+"""
+Тесты общего кэша прогнозов баланса.
+Проверяют номер изменения данных (data_revision), повторное использование
+прогнозов до фиксации изменений и ограничение размера кэша.
+"""
+
+from datetime import date, timedelta
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import event, insert
+
+from finance_tracker.models import (
+    PlannedTransactionDB,
+    RecurrenceRuleDB,
+    RecurrenceType,
+    TransactionDB,
+    TransactionType,
+)
+from finance_tracker.services.balance_forecast_service import (
+    calculate_forecast_balance,
+    calculate_forecast_balances,
+    detect_cash_gaps,
+    get_cached_cash_gaps,
+    get_cached_forecast_balance,
+    get_cached_forecast_balances,
+    get_cached_forecast_series,
+)
+from finance_tracker.utils.cache import LRUCacheStore, cache, data_revision
+
+
+@pytest.fixture(autouse=True)
+def clean_forecast_cache():
+    cache.forecasts.invalidate()
+    yield
+    cache.forecasts.invalidate()
+
+
+@pytest.fixture
+def statements(db_session):
+    captured = []
+
+    def _capture(conn, cursor, statement, parameters, context, executemany):
+        captured.append(statement)
+
+    engine = db_session.get_bind()
+    event.listen(engine, "before_cursor_execute", _capture)
+    yield captured
+    event.remove(engine, "before_cursor_execute", _capture)
+
+
+def _add_monthly_rent(session, expense_id, amount="30000.00"):
+    planned = PlannedTransactionDB(
+        amount=Decimal(amount), category_id=expense_id, type=TransactionType.EXPENSE,
+        start_date=date.today() + timedelta(days=1), is_active=True
+    )
+    session.add(planned)
+    session.add(RecurrenceRuleDB(planned_transaction=planned, recurrence_type=RecurrenceType.MONTHLY, interval=1))
+    session.commit()
+    return planned
+
+
+def test_revision_bumped_only_by_committed_forecast_data(db_session, categories):
+    revision = data_revision.value
+    income_id, expense_id = categories
+    assert data_revision.value == revision
+
+    db_session.add(TransactionDB(amount=Decimal("10.00"), type=TransactionType.INCOME, category_id=income_id,
+                              transaction_date=date.today()))
+    db_session.flush()
+    assert data_revision.value == revision
+    db_session.rollback()
+    assert data_revision.value == revision
+
+    db_session.execute(insert(TransactionDB), [{
+        "id": "00000000-0000-4000-8000-000000000001", "amount": Decimal("10.00"),
+        "type": TransactionType.INCOME, "category_id": income_id, "transaction_date": date.today(),
+    }])
+    db_session.commit()
+    assert data_revision.value == revision + 1
+
+    db_session.query(TransactionDB).delete()
+    db_session.commit()
+    assert data_revision.value == revision + 2
+
+    _add_monthly_rent(db_session, expense_id)
+    assert data_revision.value == revision + 3
+
+
+def test_cached_series_reused_until_data_changes(db_session, categories, statements):
+    income_id, expense_id = categories
+    db_session.add(TransactionDB(amount=Decimal("100000.00"), type=TransactionType.INCOME, category_id=income_id,
+                              transaction_date=date.today()))
+    db_session.commit()
+    _add_monthly_rent(db_session, expense_id)
+    start, end = date.today(), date.today() + timedelta(days=90)
+
+    first = get_cached_forecast_series(db_session, start, end)
+    statements.clear()
+    assert get_cached_forecast_series(db_session, start, end) is first
+    assert get_cached_cash_gaps(db_session, start, end) == detect_cash_gaps(db_session, start, end) == []
+    # Повторные даты в горизонте кэша без запросов к БД
+    statements.clear()
+    for offset in range(1, 60, 7):
+        day = start + timedelta(days=offset)
+        assert get_cached_forecast_balance(db_session, day) == first.predicted_at(day)
+    assert statements == []
+
+    # Фиксация изменения плановых операций - прогноз пересчитывается
+    _add_monthly_rent(db_session, expense_id, "25000.00")
+    second = get_cached_forecast_series(db_session, start, end)
+    assert second is not first
+    assert get_cached_cash_gaps(db_session, start, end) == detect_cash_gaps(db_session, start, end) != []
+
+
+def test_forecast_balance_cached_by_month(db_session, categories, statements):
+    _, expense_id = categories
+    _add_monthly_rent(db_session, expense_id)
+    target = date.today() + timedelta(days=40)
+    neighbour = target.replace(day=1) if target.day > 1 else target.replace(day=2)
+
+    assert get_cached_forecast_balance(db_session, target) == calculate_forecast_balance(db_session, target)
+    # Другие даты того же месяца берутся из уже построенного прогноза
+    statements.clear()
+    balance = get_cached_forecast_balance(db_session, neighbour)
+    assert statements == []
+    assert balance == calculate_forecast_balance(db_session, neighbour)
+
+
+def test_uncommitted_changes_bypass_cache(db_session, categories):
+    income_id, _ = categories
+    start, end = date.today(), date.today() + timedelta(days=10)
+    cached = get_cached_forecast_series(db_session, start, end)
+
+    db_session.add(TransactionDB(amount=Decimal("99.00"), type=TransactionType.EXPENSE, category_id=income_id,
+                              transaction_date=date.today()))
+    db_session.flush()
+    uncommitted = get_cached_forecast_series(db_session, start, end)
+    assert uncommitted.predicted[0] == cached.predicted[0] - 9900
+    db_session.rollback()
+    assert get_cached_forecast_series(db_session, start, end) is cached
+
+
+def test_lru_store_evicts_least_recently_used():
+    store = LRUCacheStore("test", max_size=2)
+    store.set("a", 1)
+    store.set("b", 2)
+    assert store.get("a") == 1
+    store.set("c", 3)
+
+    assert store.get("b") is None
+    assert store.find(lambda key, value: value > 0) == 3
+    assert len(store) == 2
+    store.invalidate()
+    assert len(store) == 0
+
+
+def test_calendar_balances_reuse_cached_month(db_session, categories, statements):
+    _, expense_id = categories
+    _add_monthly_rent(db_session, expense_id)
+    month_start = (date.today().replace(day=1) + timedelta(days=32)).replace(day=1)
+    month_end = (month_start + timedelta(days=32)).replace(day=1) - timedelta(days=1)
+    days = [month_start + timedelta(days=offset) for offset in range((month_end - month_start).days + 1)]
+
+    gaps = get_cached_cash_gaps(db_session, month_start, month_end)
+    statements.clear()
+    balances = get_cached_forecast_balances(db_session, days + [date.today()])
+
+    # Балансы будущих дней взяты из прогноза месяца, построенного для кассовых разрывов
+    assert statements == []
+    assert balances == calculate_forecast_balances(db_session, days + [date.today()])
+    assert gaps == [day for day in days if balances[day] < 0]
+
+
+def test_cached_balances_from_series_starting_in_past(db_session, categories, statements):
+    income_id, expense_id = categories
+    for days_ago, amount in [(10, "100.00"), (2, "500.00")]:
+        db_session.add(TransactionDB(amount=Decimal(amount), type=TransactionType.INCOME, category_id=income_id,
+                                  transaction_date=date.today() - timedelta(days=days_ago)))
+    db_session.commit()
+    _add_monthly_rent(db_session, expense_id, "50.00")
+    days = [date.today() + timedelta(days=offset) for offset in (-1, 0, 5)]
+
+    get_cached_forecast_series(db_session, date.today() - timedelta(days=15), date.today() + timedelta(days=30))
+    statements.clear()
+    balances = get_cached_forecast_balances(db_session, days)
+
+    # Прошедшие даты получают фактический баланс на сегодня, а не на первый день прогноза
+    assert statements == []
+    assert balances == calculate_forecast_balances(db_session, days)
+    assert balances[days[0]] == balances[days[1]] == Decimal("600.00")
@@ -0,0 +1,183 @@
+"""
+Тесты пакетного прогноза по сценариям "что если" (forecast_scenarios).
+Каждый вид изменения сверяется с прогнозом get_forecast_series после
+такого же изменения данных в БД.
+"""
+
+from datetime import date, timedelta
+from decimal import Decimal
+
+import pytest
+from hypothesis import given, settings, strategies as st
+from sqlalchemy import event
+
+from finance_tracker.models import (
+    CategoryDB,
+    LenderDB,
+    LoanDB,
+    LoanPaymentDB,
+    PaymentStatus,
+    PendingPaymentDB,
+    PendingPaymentStatus,
+    PlannedTransactionDB,
+    RecurrenceRuleDB,
+    RecurrenceType,
+    TransactionDB,
+    TransactionType,
+)
+from finance_tracker.services.balance_forecast_service import (
+    ForecastScenario,
+    forecast_scenarios,
+    get_forecast_series,
+)
+from db_test_helpers import memory_db_session
+
+
+def _day(offset):
+    return date.today() + timedelta(days=offset)
+
+
+def _fill(session):
+    """Баланс, зарплата, еженедельные расходы, отложенный платёж и кредит из трёх платежей."""
+    income = CategoryDB(name="Зарплата", type=TransactionType.INCOME)
+    expense = CategoryDB(name="Расходы", type=TransactionType.EXPENSE)
+    lender = LenderDB(name="Банк")
+    session.add_all([income, expense, lender])
+    session.flush()
+    session.add(TransactionDB(amount=Decimal("1000.00"), type=TransactionType.INCOME, category_id=income.id,
+                              transaction_date=date.today()))
+    salary = PlannedTransactionDB(amount=Decimal("3000.00"), category_id=income.id, type=TransactionType.INCOME,
+                                  start_date=_day(10), is_active=True)
+    food = PlannedTransactionDB(amount=Decimal("400.00"), category_id=expense.id, type=TransactionType.EXPENSE,
+                                start_date=_day(2), is_active=True)
+    session.add_all([salary, food])
+    session.add(RecurrenceRuleDB(planned_transaction=food, recurrence_type=RecurrenceType.WEEKLY, interval=1))
+    pending = PendingPaymentDB(amount=Decimal("700.00"), category_id=expense.id, description="Ремонт",
+                               status=PendingPaymentStatus.ACTIVE, planned_date=_day(20))
+    unplanned = PendingPaymentDB(amount=Decimal("150.00"), category_id=expense.id, description="Подарок",
+                                 status=PendingPaymentStatus.ACTIVE)
+    loan = LoanDB(name="Кредит", lender_id=lender.id, amount=Decimal("3000.00"), issue_date=date.today())
+    session.add_all([pending, unplanned, loan])
+    session.flush()
+    payments = [
+        LoanPaymentDB(loan_id=loan.id, scheduled_date=_day(15 + 30 * i), principal_amount=Decimal("1000.00"),
+                      interest_amount=Decimal("90.00"), total_amount=Decimal("1090.00"),
+                      status=PaymentStatus.PENDING)
+        for i in range(3)
+    ]
+    session.add_all(payments)
+    session.commit()
+    return salary, food, pending, unplanned, loan, payments
+
+
+def _forecast_after(session, change, start, end):
+    """Прогноз после изменения данных в БД (изменение откатывается)."""
+    change()
+    session.flush()
+    try:
+        return get_forecast_series(session, start, end).predicted
+    finally:
+        session.rollback()
+
+
+@settings(max_examples=25, deadline=None)
+@given(
+    start_offset=st.integers(min_value=-5, max_value=20),
+    length=st.integers(min_value=1, max_value=100),
+    shift=st.integers(min_value=-12, max_value=12),
+    move_to=st.integers(min_value=1, max_value=60),
+    repay_on=st.integers(min_value=1, max_value=90),
+    extra=st.tuples(st.integers(min_value=1, max_value=60), st.integers(min_value=-5000, max_value=5000)),
+)
+def test_each_change_matches_forecast_of_changed_data(start_offset, length, shift, move_to, repay_on, extra):
+    """Свойство: прогноз сценария совпадает с прогнозом после такого же изменения данных."""
+    with memory_db_session() as session:
+        salary, food, pending, unplanned, loan, payments = _fill(session)
+        start, end = _day(start_offset), _day(start_offset + length - 1)
+        scenarios = [
+            ForecastScenario("Без расходов на еду", skipped_planned_ids=frozenset({food.id})),
+            ForecastScenario("Зарплата со сдвигом", shifted_planned={salary.id: shift}),
+            ForecastScenario("Ремонт в другой день", pending_payment_dates={pending.id: _day(move_to)}),
+            ForecastScenario("Подарок", pending_payment_dates={unplanned.id: _day(move_to)}),
+            ForecastScenario("Досрочное погашение", early_repayments={loan.id: _day(repay_on)}),
+            ForecastScenario("Разовая операция", extra_amounts=[(_day(extra[0]), Decimal(extra[1]))]),
+        ]
+
+        result = forecast_scenarios(session, scenarios, start, end)
+
+        def repay():
+            left = Decimal("0")
+            for payment in payments:
+                if payment.scheduled_date > _day(repay_on):
+                    left += payment.principal_amount
+                    session.delete(payment)
+            if left:
+                session.add(LoanPaymentDB(loan_id=loan.id, scheduled_date=_day(repay_on), principal_amount=left,
+                                          interest_amount=Decimal("0"), total_amount=left,
+                                          status=PaymentStatus.PENDING))
+
+        def add_extra():
+            amount = Decimal(extra[1])
+            if amount:
+                session.add(PlannedTransactionDB(
+                    amount=abs(amount), category_id=salary.category_id if amount > 0 else food.category_id,
+                    type=TransactionType.INCOME if amount > 0 else TransactionType.EXPENSE,
+                    start_date=_day(extra[0]), is_active=True
+                ))
+
+        changes = [
+            lambda: setattr(food, "is_active", False),
+            lambda: setattr(salary, "start_date", max(salary.start_date + timedelta(days=shift), _day(1))),
+            lambda: setattr(pending, "planned_date", _day(move_to)),
+            lambda: setattr(unplanned, "planned_date", _day(move_to)),
+            repay,
+            add_extra,
+        ]
+        assert list(result.baseline) == list(get_forecast_series(session, start, end).predicted)
+        for index, change in enumerate(changes):
+            expected = _forecast_after(session, change, start, end)
+            assert list(result.balances[index]) == list(expected), scenarios[index].name
+            assert result.minimum_balances[index] == result.predicted_at(index, result.minimum_dates[index])
+            assert result.minimum_balances[index] * 100 == min(expected)
+
+
+def test_many_scenarios_share_baseline_queries(db_session):
+    salary, food, pending, unplanned, loan, payments = _fill(db_session)
+    statements = []
+    engine = db_session.get_bind()
+    capture = lambda conn, cursor, statement, *args: statements.append(statement)  # noqa: E731
+
+    event.listen(engine, "before_cursor_execute", capture)
+    forecast_scenarios(db_session, [ForecastScenario("Сдвиг", shifted_planned={salary.id: 1})], _day(0), _day(90))
+    single = len(statements)
+    statements.clear()
+    result = forecast_scenarios(db_session, [
+        ForecastScenario(f"Сдвиг на {days}", shifted_planned={salary.id: days},
+                         pending_payment_dates={pending.id: _day(days)}, early_repayments={loan.id: _day(days)})
+        for days in range(1, 101)
+    ], _day(0), _day(90))
+    event.remove(engine, "before_cursor_execute", capture)
+
+    assert len(result.balances) == len(result.minimum_balances) == 100
+    assert all(len(row) == 91 for row in result.balances)
+    assert len(statements) <= single + 2
+
+
+def test_invalid_scenarios_rejected(db_session):
+    salary, food, pending, unplanned, loan, payments = _fill(db_session)
+
+    with pytest.raises(ValueError):
+        forecast_scenarios(db_session, [ForecastScenario("Прошлое", extra_amounts=[(date.today(), Decimal("1"))])],
+                           _day(0), _day(10))
+    with pytest.raises(ValueError):
+        forecast_scenarios(db_session, [ForecastScenario("Нет такой", skipped_planned_ids=frozenset({loan.id}))],
+                           _day(0), _day(10))
+    with pytest.raises(ValueError):
+        forecast_scenarios(db_session, [ForecastScenario("Нет платежа", pending_payment_dates={salary.id: _day(3)})],
+                           _day(0), _day(10))
+    with pytest.raises(ValueError):
+        forecast_scenarios(db_session, [], _day(5), _day(4))
+
+    past = forecast_scenarios(db_session, [ForecastScenario("Без еды", skipped_planned_ids=frozenset({food.id}))],
+                              _day(-10), _day(0))
+    assert list(past.balances[0]) == list(past.baseline)
@@ -60,8 +60,10 @@ class TestHomeView(unittest.TestCase):
 
         self.view.on_date_selected(new_date)
 
-        # Проверяем, что вызван метод Presenter
-        self.mock_presenter.return_value.on_date_selected.assert_called_once_with(new_date)
+        # Проверяем, что асинхронный метод Presenter запущен в цикле событий страницы
+        self.page.run_task.assert_called_once_with(
+            self.mock_presenter.return_value.on_date_selected_async, new_date
+        )
 
     def test_did_mount_behavior_simulation(self):
         """Тест симуляции поведения did_mount - загрузка данных после инициализации."""
@@ -1078,7 +1080,7 @@ class TestHomeViewPlannedWidgetIntegration(unittest.TestCase):
 
     def test_on_occurrence_clicked_calls_presenter_on_date_selected(self):
         """
-        Тест что клик на вхождение вызывает presenter.on_date_selected.
+        Тест что клик на вхождение запускает presenter.on_date_selected_async.
         
         Requirements: 2.1, 2.2
         """
@@ -1090,9 +1092,10 @@ class TestHomeViewPlannedWidgetIntegration(unittest.TestCase):
         # Act - вызываем on_occurrence_clicked
         self.view.on_occurrence_clicked(mock_occurrence)
         
-        # Assert - проверяем вызов presenter.on_date_selected с правильной датой
-        self.mock_presenter.return_value.on_date_selected.assert_called_once_with(
-            mock_occurrence.occurrence_date
+        # Assert - проверяем запуск presenter.on_date_selected_async с правильной датой
+        self.page.run_task.assert_called_once_with(
+            self.mock_presenter.return_value.on_date_selected_async,
+            mock_occurrence.occurrence_date,
         )
 
     def test_on_occurrence_clicked_updates_calendar(self):
@@ -1109,13 +1112,14 @@ class TestHomeViewPlannedWidgetIntegration(unittest.TestCase):
         # Act - вызываем on_occurrence_clicked
         self.view.on_occurrence_clicked(mock_occurrence)
         
-        # Assert - проверяем, что presenter.on_date_selected был вызван
+        # Assert - проверяем, что presenter.on_date_selected_async был запущен
         # Это приведет к обновлению календаря и панели транзакций
-        self.mock_presenter.return_value.on_date_selected.assert_called_once()
+        self.page.run_task.assert_called_once()
         
         # Проверяем, что дата передана корректно
-        call_args = self.mock_presenter.return_value.on_date_selected.call_args
-        passed_date = call_args[0][0]
+        call_args = self.page.run_task.call_args
+        self.assertEqual(call_args[0][0], self.mock_presenter.return_value.on_date_selected_async)
+        passed_date = call_args[0][1]
         self.assertEqual(passed_date, mock_occurrence.occurrence_date)
 
     def test_on_occurrence_clicked_handles_errors_gracefully(self):
@@ -1129,8 +1133,8 @@ class TestHomeViewPlannedWidgetIntegration(unittest.TestCase):
         mock_occurrence.id = "test-occurrence-id"
         mock_occurrence.occurrence_date = datetime.date(2024, 12, 25)
         
-        # Настраиваем presenter для выброса исключения
-        self.mock_presenter.return_value.on_date_selected.side_effect = Exception("Test error")
+        # Настраиваем запуск задачи для выброса исключения
+        self.page.run_task.side_effect = Exception("Test error")
         
         # Act & Assert - вызов не должен распространять исключение
         with patch('finance_tracker.views.home_view.logger') as mock_logger:
@@ -1161,7 +1165,7 @@ class TestHomeViewPlannedWidgetIntegration(unittest.TestCase):
         
         for test_date in test_dates:
             # Сбрасываем mock для чистого тестирования
-            self.mock_presenter.return_value.on_date_selected.reset_mock()
+            self.page.run_task.reset_mock()
             
             # Создаем mock вхождение с тестовой датой
             mock_occurrence = Mock()
@@ -1172,4 +1176,6 @@ class TestHomeViewPlannedWidgetIntegration(unittest.TestCase):
             self.view.on_occurrence_clicked(mock_occurrence)
             
             # Assert - проверяем вызов с правильной датой
-            self.mock_presenter.return_value.on_date_selected.assert_called_once_with(test_date)
+            self.page.run_task.assert_called_once_with(
+                self.mock_presenter.return_value.on_date_selected_async, test_date
+            )
@@ -37,7 +37,9 @@ def test_property_3_view_delegation_consistency(date_obj):
         view.on_date_selected(date_obj)
 
         # Проверка: View делегировал действие в Presenter с корректными параметрами
-        mock_presenter_instance.on_date_selected.assert_called_once_with(date_obj)
+        mock_page.run_task.assert_called_once_with(
+            mock_presenter_instance.on_date_selected_async, date_obj
+        )
 
 
 @settings(max_examples=100)
@@ -140,7 +142,9 @@ def test_property_8_date_selection_callback_consistency(selected_date):
         view.on_date_selected(selected_date)
 
         # Проверка: Presenter вызван с корректной датой
-        mock_presenter_instance.on_date_selected.assert_called_once_with(selected_date)
+        mock_page.run_task.assert_called_once_with(
+            mock_presenter_instance.on_date_selected_async, selected_date
+        )
 
 
 @settings(max_examples=100)
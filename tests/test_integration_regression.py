@@ -127,8 +127,8 @@ class TestIntegrationRegression(ViewTestBase):
         )
         
         # Настраиваем возвращаемые значения для предотвращения ошибок типов
-        self.mock_home_presenter.return_value.load_initial_data = Mock()
-        self.mock_home_presenter.return_value.on_date_selected = Mock()
+        self.mock_home_presenter.return_value.load_initial_data_async = Mock()
+        self.mock_home_presenter.return_value.on_date_selected_async = Mock()
         
     def create_mock_application_state(self) -> Dict[str, Any]:
         """
@@ -163,7 +163,7 @@ class TestApplicationStartupSequence(TestIntegrationRegression):
         - Все компоненты создаются в правильном порядке
         - Нет Offstage Control ошибок
         - Настройки загружаются корректно
-        - load_initial_data вызывается автоматически при монтировании
+        - load_initial_data_async запускается автоматически при монтировании
         
         Validates: Requirements 9.1
         """
@@ -196,8 +196,8 @@ class TestApplicationStartupSequence(TestIntegrationRegression):
         self.mock_home_presenter.assert_called_once()
         
         # В Flet did_mount() вызывается автоматически при установке controls,
-        # поэтому load_initial_data уже должен быть вызван
-        self.mock_home_presenter.return_value.load_initial_data.assert_called()
+        # поэтому load_initial_data_async уже должен быть запущен
+        self.page.run_task.assert_any_call(self.mock_home_presenter.return_value.load_initial_data_async)
         
         app_state["ui_ready"] = True
         self.assertTrue(app_state["ui_ready"])
@@ -212,7 +212,7 @@ class TestApplicationStartupSequence(TestIntegrationRegression):
         - Инициализация происходит в правильном порядке
         - Presenter создается с правильными параметрами
         - HomeView переиспользуется при навигации
-        - load_initial_data вызывается автоматически при монтировании
+        - load_initial_data_async запускается автоматически при монтировании
         
         Validates: Requirements 9.2
         """
@@ -236,8 +236,8 @@ class TestApplicationStartupSequence(TestIntegrationRegression):
         self.assertEqual(call_args[0][1], main_window.home_view)  # callbacks (HomeView)
         
         # В Flet did_mount() вызывается автоматически при установке controls,
-        # поэтому load_initial_data уже должен быть вызван
-        self.mock_home_presenter.return_value.load_initial_data.assert_called()
+        # поэтому load_initial_data_async уже должен быть запущен
+        self.page.run_task.assert_any_call(self.mock_home_presenter.return_value.load_initial_data_async)
         
         # Проверяем, что HomeView переиспользуется при навигации
         home_view_instance = main_window.home_view
@@ -450,11 +450,11 @@ class TestErrorHandlingIntegration(TestIntegrationRegression):
         
         # Проверяем, что did_mount можно вызвать без ошибок
         # Примечание: did_mount уже был вызван автоматически при создании MainWindow,
-        # поэтому load_initial_data уже вызван. Повторный вызов did_mount безопасен.
+        # поэтому load_initial_data_async уже запущен. Повторный вызов did_mount безопасен.
         try:
             main_window.did_mount()
-            # Проверяем, что load_initial_data был вызван (автоматически при монтировании + повторно)
-            self.mock_home_presenter.return_value.load_initial_data.assert_called()
+            # Проверяем, что load_initial_data_async был запущен (автоматически при монтировании + повторно)
+            self.page.run_task.assert_any_call(self.mock_home_presenter.return_value.load_initial_data_async)
         except Exception as e:
             self.fail(f"did_mount вызвал необработанную ошибку: {e}")
         
@@ -515,7 +515,7 @@ class TestErrorHandlingIntegration(TestIntegrationRegression):
             main_window.did_mount()
             
             # Проверяем, что операция прошла успешно
-            self.mock_home_presenter.return_value.load_initial_data.assert_called()
+            self.page.run_task.assert_any_call(self.mock_home_presenter.return_value.load_initial_data_async)
             
         except Exception as e:
             self.fail(f"Восстановление после ошибки не работает: {e}")
@@ -28,6 +28,10 @@ class TestMainWindow(ViewTestBase):
             'finance_tracker.views.main_window.get_db_session',
             return_value=self.mock_db_cm
         )
+        self.mock_get_read_session = self.add_patcher(
+            'finance_tracker.views.main_window.get_read_session',
+            return_value=self.mock_db_cm
+        )
         
         # Патчим get_total_balance
         self.mock_get_total_balance = self.add_patcher(
@@ -598,6 +602,10 @@ class TestMainWindowProperties(ViewTestBase):
             'finance_tracker.views.main_window.get_db_session',
             return_value=self.mock_db_cm
         )
+        self.mock_get_read_session = self.add_patcher(
+            'finance_tracker.views.main_window.get_read_session',
+            return_value=self.mock_db_cm
+        )
         
         # Патчим get_total_balance
         self.mock_get_total_balance = self.add_patcher(
@@ -0,0 +1,329 @@
+"""
+Тесты версионных миграций схемы БД.
+Проверяют тёплый старт без DDL, атомарность шагов и перестройку устаревшей схемы.
+"""
+
+import uuid
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import MetaData, Numeric, String, create_engine, event, inspect, text
+from sqlalchemy.orm import Session
+
+from finance_tracker.migrations import (
+    BASELINE_SCHEMA_VERSION,
+    SCHEMA_COMPONENT,
+    SEED_COMPONENT,
+    Migration,
+    Seed,
+    get_component_version,
+    get_target_version,
+    run_migrations,
+)
+from finance_tracker.models import Base, CategoryDB, TransactionDB
+from finance_tracker.models.types import MoneyType, UUIDType
+
+
+@pytest.fixture
+def file_engine(tmp_path):
+    """Engine на временном файле БД."""
+    engine = create_engine(f"sqlite:///{tmp_path / 'migrations.db'}")
+    yield engine
+    engine.dispose()
+
+
+def _schema_version(engine):
+    with engine.connect() as conn:
+        return get_component_version(conn, SCHEMA_COMPONENT)
+
+
+def _create_v1_schema(engine):
+    """Создаёт схему версии 1: ID в виде String(36), суммы в виде Numeric(10, 2)."""
+    legacy = MetaData()
+    for table in Base.metadata.sorted_tables:
+        copy = table.to_metadata(legacy)
+        for column in copy.columns:
+            if isinstance(column.type, UUIDType):
+                column.type = String(36)
+            elif isinstance(column.type, MoneyType):
+                column.type = Numeric(10, 2)
+    legacy.create_all(engine)
+
+
+def _add_note_column(connection):
+    connection.exec_driver_sql("ALTER TABLE categories ADD COLUMN note VARCHAR")
+
+
+def test_fresh_database_created_and_stamped(file_engine):
+    """Новая БД получает все таблицы моделей и текущую версию схемы."""
+    version = run_migrations(file_engine)
+
+    assert version == get_target_version()
+    assert _schema_version(file_engine) == version
+    table_names = set(inspect(file_engine).get_table_names())
+    assert set(Base.metadata.tables) <= table_names
+
+
+def test_warm_start_executes_single_select(file_engine):
+    """При совпадении версии выполняется ровно один SELECT без DDL."""
+    run_migrations(file_engine)
+
+    statements = []
+
+    @event.listens_for(file_engine, "before_cursor_execute")
+    def _capture(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    run_migrations(file_engine)
+
+    assert len(statements) == 1
+    assert statements[0].lstrip().upper().startswith("SELECT")
+
+
+def test_unversioned_uuid_database_keeps_data(file_engine):
+    """БД, созданная до появления миграций, принимается за версию 1 и мигрирует без потери данных."""
+    _create_v1_schema(file_engine)
+    category_id = str(uuid.uuid4())
+    with file_engine.begin() as conn:
+        conn.execute(text(
+            "INSERT INTO categories (id, name, type, is_system) VALUES (:id, 'Еда', 'EXPENSE', 0)"
+        ), {"id": category_id})
+        conn.execute(text(
+            "INSERT INTO transactions (id, amount, type, category_id, transaction_date) "
+            "VALUES (:id, 10, 'EXPENSE', :category_id, '2024-01-01')"
+        ), {"id": str(uuid.uuid4()), "category_id": category_id})
+
+    version = run_migrations(file_engine)
+
+    assert version == get_target_version()
+    with Session(file_engine) as session:
+        category = session.query(CategoryDB).one()
+        assert category.id == category_id
+        assert category.name == "Еда"
+        transaction = session.query(TransactionDB).join(CategoryDB).one()
+        assert transaction.category_id == category_id
+
+
+def test_uuid_columns_stored_as_16_byte_blobs(file_engine):
+    """После миграции ID хранятся как 16-байтовые BLOB, избыточные индексы по PK удалены."""
+    _create_v1_schema(file_engine)
+    with file_engine.begin() as conn:
+        conn.exec_driver_sql("CREATE INDEX ix_categories_id ON categories (id)")
+        conn.execute(text(
+            "INSERT INTO categories (id, name, type, is_system) VALUES (:id, 'Еда', 'EXPENSE', 0)"
+        ), {"id": str(uuid.uuid4())})
+
+    run_migrations(file_engine)
+
+    with file_engine.connect() as conn:
+        assert conn.exec_driver_sql("SELECT typeof(id), length(id) FROM categories").one() == ("blob", 16)
+    index_names = {index["name"] for index in inspect(file_engine).get_indexes("categories")}
+    assert "ix_categories_id" not in index_names
+
+
+def test_money_columns_converted_to_minor_units(file_engine):
+    """После миграции суммы хранятся целыми копейками и читаются как Decimal."""
+    _create_v1_schema(file_engine)
+    category_id = str(uuid.uuid4())
+    with file_engine.begin() as conn:
+        conn.execute(text(
+            "INSERT INTO categories (id, name, type, is_system) VALUES (:id, 'Еда', 'EXPENSE', 0)"
+        ), {"id": category_id})
+        for amount in ("150.50", "0.1", "99999999.99"):
+            conn.execute(text(
+                "INSERT INTO transactions (id, amount, type, category_id, transaction_date) "
+                "VALUES (:id, :amount, 'EXPENSE', :category_id, '2024-01-01')"
+            ), {"id": str(uuid.uuid4()), "amount": amount, "category_id": category_id})
+
+    run_migrations(file_engine)
+
+    with file_engine.connect() as conn:
+        stored = conn.exec_driver_sql("SELECT typeof(amount), amount FROM transactions ORDER BY amount").all()
+    assert stored == [("integer", 10), ("integer", 15050), ("integer", 9999999999)]
+    with Session(file_engine) as session:
+        amounts = sorted(t.amount for t in session.query(TransactionDB).all())
+    assert amounts == [Decimal("0.10"), Decimal("150.50"), Decimal("99999999.99")]
+
+
+def test_pending_steps_applied_in_order(file_engine):
+    """Шаги с версией выше текущей применяются по порядку и версия обновляется."""
+    run_migrations(file_engine, migrations=[])
+    assert _schema_version(file_engine) == BASELINE_SCHEMA_VERSION
+
+    applied = []
+    steps = [
+        Migration(3, "третий шаг", lambda conn: applied.append(3)),
+        Migration(2, "колонка note", lambda conn: (applied.append(2), _add_note_column(conn))),
+    ]
+
+    assert run_migrations(file_engine, migrations=steps) == 3
+    assert applied == [2, 3]
+    columns = {c["name"] for c in inspect(file_engine).get_columns("categories")}
+    assert "note" in columns
+
+
+def test_failed_step_rolls_back_all_changes(file_engine):
+    """Ошибка любого шага откатывает все изменения транзакции миграции."""
+    run_migrations(file_engine, migrations=[])
+
+    def _broken(connection):
+        connection.exec_driver_sql("SELECT * FROM missing_table")
+
+    steps = [
+        Migration(2, "колонка note", _add_note_column),
+        Migration(3, "ошибка", _broken),
+    ]
+
+    with pytest.raises(Exception):
+        run_migrations(file_engine, migrations=steps)
+
+    assert _schema_version(file_engine) == BASELINE_SCHEMA_VERSION
+    columns = {c["name"] for c in inspect(file_engine).get_columns("categories")}
+    assert "note" not in columns
+
+
+def test_newer_database_version_rejected(file_engine):
+    """БД с версией новее приложения не мигрируется."""
+    run_migrations(file_engine, migrations=[Migration(2, "шаг", lambda conn: None)])
+
+    with pytest.raises(RuntimeError):
+        run_migrations(file_engine, migrations=[])
+
+
+def test_legacy_integer_schema_rebuilt_in_place(file_engine):
+    """Устаревшая схема с Integer ID перестраивается с сохранением данных и связей."""
+    with file_engine.begin() as conn:
+        conn.exec_driver_sql(
+            "CREATE TABLE categories (id INTEGER PRIMARY KEY, name VARCHAR NOT NULL UNIQUE, "
+            "type VARCHAR(7) NOT NULL, is_system BOOLEAN, created_at DATETIME)"
+        )
+        conn.exec_driver_sql("CREATE INDEX ix_categories_id ON categories (id)")
+        conn.exec_driver_sql(
+            "CREATE TABLE transactions (id INTEGER PRIMARY KEY, amount NUMERIC(10, 2) NOT NULL, "
+            "type VARCHAR(7) NOT NULL, category_id INTEGER NOT NULL REFERENCES categories(id), "
+            "description VARCHAR, transaction_date DATE NOT NULL, created_at DATETIME)"
+        )
+        conn.exec_driver_sql(
+            "INSERT INTO categories VALUES (1, 'Еда', 'EXPENSE', 0, '2024-01-01 10:00:00.000000'), "
+            "(2, 'Зарплата', 'INCOME', 1, '2024-01-01 10:00:00.000000')"
+        )
+        conn.exec_driver_sql(
+            "INSERT INTO transactions VALUES "
+            "(1, 150.50, 'EXPENSE', 1, 'Магазин', '2024-02-01', '2024-02-01 12:00:00.000000'), "
+            "(2, 50000, 'INCOME', 2, 'Аванс', '2024-02-05', '2024-02-05 12:00:00.000000')"
+        )
+
+    assert run_migrations(file_engine) == get_target_version()
+
+    with Session(file_engine) as session:
+        categories = {c.name: c for c in session.query(CategoryDB).all()}
+        assert set(categories) == {"Еда", "Зарплата"}
+        for category in categories.values():
+            uuid.UUID(category.id)
+
+        transactions = {t.description: t for t in session.query(TransactionDB).all()}
+        assert transactions["Магазин"].category_id == categories["Еда"].id
+        assert transactions["Аванс"].category_id == categories["Зарплата"].id
+        # Колонка, отсутствовавшая в старой схеме, получает значение по умолчанию
+        assert transactions["Магазин"].updated_at is not None
+
+    table_names = set(inspect(file_engine).get_table_names())
+    assert not any(name.startswith("_legacy_") for name in table_names)
+
+
+def test_seed_applied_once_and_skipped_on_warm_start(file_engine):
+    """Начальные данные добавляются один раз; тёплый старт с seed - один SELECT."""
+    applied = []
+    seed = Seed(1, lambda conn: applied.append(1))
+
+    run_migrations(file_engine, seed=seed)
+    assert applied == [1]
+    with file_engine.connect() as conn:
+        assert get_component_version(conn, SEED_COMPONENT) == 1
+
+    statements = []
+
+    @event.listens_for(file_engine, "before_cursor_execute")
+    def _capture(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    run_migrations(file_engine, seed=seed)
+
+    assert applied == [1]
+    assert len(statements) == 1
+
+
+def test_seed_version_bump_reapplies_without_schema_change(file_engine):
+    """Новая версия начальных данных применяется при актуальной схеме."""
+    applied = []
+    run_migrations(file_engine, seed=Seed(1, lambda conn: applied.append(1)))
+    run_migrations(file_engine, seed=Seed(2, lambda conn: applied.append(2)))
+
+    assert applied == [1, 2]
+    with file_engine.connect() as conn:
+        assert get_component_version(conn, SEED_COMPONENT) == 2
+        assert get_component_version(conn, SCHEMA_COMPONENT) == get_target_version()
+
+
+def test_balance_ledger_built_from_existing_transactions(file_engine):
+    """Миграция строит журнал баланса по уже существующим транзакциям."""
+    _create_v1_schema(file_engine)
+    category_id = str(uuid.uuid4())
+    with file_engine.begin() as conn:
+        conn.execute(text(
+            "INSERT INTO categories (id, name, type, is_system) VALUES (:id, 'Еда', 'EXPENSE', 0)"
+        ), {"id": category_id})
+        for amount, day in (("150.50", "2024-01-01"), ("49.50", "2024-01-01"), ("10", "2024-01-02")):
+            conn.execute(text(
+                "INSERT INTO transactions (id, amount, type, category_id, transaction_date) "
+                "VALUES (:id, :amount, 'EXPENSE', :category_id, :day)"
+            ), {"id": str(uuid.uuid4()), "amount": amount, "category_id": category_id, "day": day})
+
+    run_migrations(file_engine)
+
+    with file_engine.connect() as conn:
+        assert conn.exec_driver_sql("SELECT balance, transaction_count FROM balance_totals").all() == [(-21000, 3)]
+        assert conn.exec_driver_sql(
+            "SELECT day, net, cumulative FROM daily_balances ORDER BY day"
+        ).all() == [("2024-01-01", -20000, -20000), ("2024-01-02", -1000, -21000)]
+        triggers = conn.exec_driver_sql(
+            "SELECT name FROM sqlite_master WHERE type = 'trigger' AND name LIKE 'trg_transactions_ledger_%'"
+        ).scalars().all()
+    assert len(triggers) == 3
+
+
+def test_import_fingerprint_column_added_with_unique_index(file_engine):
+    """Миграция добавляет отпечаток строки выписки и уникальный индекс в БД предыдущей версии."""
+    from finance_tracker.migrations import MIGRATIONS
+
+    run_migrations(file_engine, migrations=[step for step in MIGRATIONS if step.version < 7])
+    with file_engine.begin() as conn:
+        conn.exec_driver_sql("DROP INDEX ix_transactions_import_fingerprint")
+        conn.exec_driver_sql("ALTER TABLE transactions DROP COLUMN import_fingerprint")
+
+    assert run_migrations(file_engine) == get_target_version()
+    columns = {column["name"] for column in inspect(file_engine).get_columns("transactions")}
+    indexes = {index["name"]: index for index in inspect(file_engine).get_indexes("transactions")}
+    assert "import_fingerprint" in columns
+    assert indexes["ix_transactions_import_fingerprint"]["unique"]
+
+
+def test_ledger_insert_trigger_gets_bulk_insert_flag(file_engine):
+    """Миграция пересоздаёт триггер вставки журнала баланса с проверкой флага массовой вставки."""
+    from finance_tracker.migrations import MIGRATIONS
+
+    run_migrations(file_engine, migrations=[step for step in MIGRATIONS if step.version < 8])
+    with file_engine.begin() as conn:
+        conn.exec_driver_sql("DROP TRIGGER trg_transactions_ledger_insert")
+        conn.exec_driver_sql("DROP TABLE balance_ledger_bulk_insert")
+        conn.exec_driver_sql(
+            "CREATE TRIGGER trg_transactions_ledger_insert AFTER INSERT ON transactions BEGIN SELECT 1; END"
+        )
+
+    assert run_migrations(file_engine) == get_target_version()
+    with file_engine.connect() as conn:
+        trigger_sql = conn.exec_driver_sql(
+            "SELECT sql FROM sqlite_master WHERE type = 'trigger' AND name = 'trg_transactions_ledger_insert'"
+        ).scalar()
+    assert "balance_ledger_bulk_insert" in trigger_sql
+    assert "balance_ledger_bulk_insert" in inspect(file_engine).get_table_names()
@@ -0,0 +1,98 @@
+"""
+Тесты хранения денежных сумм в целых копейках (MoneyType).
+Проверяют преобразование Decimal <-> копейки и агрегаты SUM() в SQL.
+"""
+
+from datetime import date
+from decimal import Decimal
+
+import pytest
+from hypothesis import given, settings, strategies as st
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from finance_tracker.models import Base, CategoryDB, TransactionDB, TransactionType
+from finance_tracker.models.types import minor_to_money, money_to_minor
+from finance_tracker.services.balance_forecast_service import calculate_actual_balance
+from finance_tracker.services.transaction_service import get_total_balance
+
+money_strategy = st.decimals(
+    min_value=Decimal("-100000000"), max_value=Decimal("100000000"), places=2,
+    allow_nan=False, allow_infinity=False
+)
+
+
+@given(amount=money_strategy)
+def test_minor_units_roundtrip(amount):
+    """Сумма с двумя знаками после запятой восстанавливается без потерь."""
+    assert minor_to_money(money_to_minor(amount)) == amount
+
+
+@pytest.mark.parametrize("value, expected", [
+    (Decimal("0.005"), 1),
+    (Decimal("-0.005"), -1),
+    (Decimal("10.004"), 1000),
+    (0.1, 10),
+    ("123.45", 12345),
+    (7, 700),
+])
+def test_money_rounded_half_up_to_kopecks(value, expected):
+    """Суммы округляются до копеек по правилу ROUND_HALF_UP."""
+    assert money_to_minor(value) == expected
+
+
+def test_amount_stored_as_integer_and_read_as_decimal(db_session, sample_categories):
+    """Сумма хранится в БД как INTEGER и читается как Decimal с двумя знаками."""
+    db_session.add(TransactionDB(
+        amount=Decimal("150.5"), type=TransactionType.EXPENSE,
+        category_id=sample_categories["expense"][0].id, transaction_date=date(2024, 1, 1)
+    ))
+    db_session.commit()
+
+    raw = db_session.connection().exec_driver_sql("SELECT typeof(amount), amount FROM transactions").one()
+    assert tuple(raw) == ("integer", 15050)
+    amount = db_session.query(TransactionDB.amount).scalar()
+    assert amount == Decimal("150.50")
+    assert str(amount) == "150.50"
+
+
+@settings(max_examples=30, deadline=None)
+@given(entries=st.lists(
+    st.tuples(
+        st.sampled_from([TransactionType.INCOME, TransactionType.EXPENSE]),
+        st.decimals(min_value=Decimal("0.01"), max_value=Decimal("1000000"), places=2),
+        st.integers(min_value=1, max_value=28)
+    ),
+    max_size=20
+))
+def test_sql_balance_matches_python_sum(entries):
+    """SQL SUM() по копейкам совпадает с точной суммой Decimal."""
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    try:
+        categories = {
+            TransactionType.INCOME: CategoryDB(name="Доход", type=TransactionType.INCOME),
+            TransactionType.EXPENSE: CategoryDB(name="Расход", type=TransactionType.EXPENSE),
+        }
+        session.add_all(categories.values())
+        session.flush()
+        for transaction_type, amount, day in entries:
+            session.add(TransactionDB(
+                amount=amount, type=transaction_type, category_id=categories[transaction_type].id,
+                transaction_date=date(2024, 1, day)
+            ))
+        session.commit()
+
+        def _expected(up_to_day):
+            return sum(
+                (amount if transaction_type == TransactionType.INCOME else -amount
+                 for transaction_type, amount, day in entries if day <= up_to_day),
+                Decimal("0")
+            )
+
+        assert get_total_balance(session) == _expected(28)
+        assert calculate_actual_balance(session, date(2024, 1, 14)) == _expected(14)
+    finally:
+        session.close()
+        engine.dispose()
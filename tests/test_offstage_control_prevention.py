@@ -138,8 +138,9 @@ class TestOffstageControlPrevention(ViewTestBase):
                 self.assertIsNotNone(main_window.home_view)
                 
                 # В Flet did_mount() вызывается автоматически при установке controls,
-                # поэтому load_initial_data уже должен быть вызван
-                self.mock_presenter.return_value.load_initial_data.assert_called()
+                # поэтому load_initial_data_async уже должен быть запущен
+                load_initial_data_async = self.mock_presenter.return_value.load_initial_data_async
+                self.mock_page.run_task.assert_any_call(load_initial_data_async)
                 
                 # Симулируем добавление MainWindow на страницу
                 self.mock_page._controls_added = True
@@ -147,11 +148,11 @@ class TestOffstageControlPrevention(ViewTestBase):
                 # Повторный вызов did_mount безопасен
                 main_window.did_mount()
                 
-                # Проверяем, что load_initial_data был вызван (минимум 1 раз)
+                # Проверяем, что load_initial_data_async был запущен (минимум 1 раз)
                 self.assertGreaterEqual(
-                    self.mock_presenter.return_value.load_initial_data.call_count, 
+                    self.mock_page.run_task.call_args_list.count(((load_initial_data_async,),)),
                     1,
-                    "load_initial_data должен быть вызван хотя бы один раз"
+                    "load_initial_data_async должен быть запущен хотя бы один раз"
                 )
 
     def test_dialog_opening_after_page_ready(self):
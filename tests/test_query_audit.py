@@ -0,0 +1,83 @@
+"""
+Тесты инструмента аудита планов запросов (finance_tracker.tools.query_audit).
+"""
+
+from finance_tracker.bench.generator import SCALES
+from finance_tracker.bench.service_calls import SERVICE_CALLS, public_service_functions
+from finance_tracker.tools.query_audit import analyze_plan, normalize_sql, run_audit
+
+INDEXES = {
+    "transactions": {
+        "ix_transactions_transaction_date": ["transaction_date"],
+        "ix_transactions_date_type": ["transaction_date", "type"],
+    },
+    "loans": {"ix_loans_status": ["status"]},
+}
+
+
+def test_full_scan_detected_with_index_suggestion():
+    """Полный просмотр таблицы с фильтром даёт предложение индекса по колонке условия."""
+    sql = "SELECT transactions.amount FROM transactions WHERE transactions.category_id = ?"
+    result = analyze_plan(sql, ["SCAN transactions"], INDEXES)
+
+    assert result["full_scans"] == ["transactions"]
+    assert result["suggestions"][0]["ddl"] == (
+        "CREATE INDEX ix_transactions_category_id_amount ON transactions (category_id, amount)"
+    )
+    assert result["suggestions"][0]["covering"] is True
+
+
+def test_index_search_is_not_flagged():
+    """Поиск по индексу не считается проблемой, индекс попадает в список использованных."""
+    sql = "SELECT transactions.id FROM transactions WHERE transactions.transaction_date = ?"
+    plan = ["SEARCH transactions USING COVERING INDEX ix_transactions_date_type (transaction_date=?)"]
+    result = analyze_plan(sql, plan, INDEXES)
+
+    assert result["indexes"] == ["ix_transactions_date_type"]
+    assert result["full_scans"] == [] and result["temp_btrees"] == [] and result["suggestions"] == []
+
+
+def test_temp_btree_suggests_sort_columns():
+    """Временное B-дерево для ORDER BY даёт индекс с колонками условия и сортировки."""
+    sql = "SELECT loans.id, loans.name FROM loans WHERE loans.status = ? ORDER BY loans.name"
+    plan = ["SEARCH loans USING INDEX ix_loans_status (status=?)", "USE TEMP B-TREE FOR ORDER BY"]
+    result = analyze_plan(sql, plan, INDEXES)
+
+    assert result["temp_btrees"] == ["ORDER BY"]
+    assert result["suggestions"][0]["columns"] == ["status", "name", "id"]
+
+
+def test_existing_index_reported_instead_of_ddl():
+    """Если подходящий индекс уже объявлен, указывается он, а не новый DDL."""
+    sql = "SELECT transactions.id FROM transactions WHERE transactions.transaction_date >= ?"
+    result = analyze_plan(sql, ["SCAN transactions"], INDEXES)
+
+    assert result["suggestions"][0]["ddl"] is None
+    assert result["suggestions"][0]["existing_index"] == "ix_transactions_transaction_date"
+
+
+def test_normalize_sql_collapses_whitespace_and_in_lists():
+    assert normalize_sql("SELECT  *\n FROM t WHERE id IN (?, ?, ?)") == "SELECT * FROM t WHERE id IN (?, ...)"
+
+
+def test_run_audit_report_structure(tmp_path):
+    """Аудит выполняет вызовы на синтетической БД и строит отчёт с планами."""
+    calls = [call for call in SERVICE_CALLS if call.name in (
+        "transaction_service.get_by_date_range",
+        "loan_payment_service.get_payments_by_loan",
+    )]
+    report = run_audit(SCALES["small"], calls=calls, work_dir=str(tmp_path))
+
+    assert set(report["calls"]) == {call.name for call in calls}
+    for result in report["calls"].values():
+        assert result["error"] is None
+        assert result["statements"]
+    assert "ix_loan_payments_loan_id_scheduled_date" in report["index_usage"] or \
+        "ix_loan_payments_loan_id" in report["index_usage"]
+    assert "transaction_service.get_total_balance" in report["not_audited"]
+    assert report["summary"]["statements"] >= 2
+
+
+def test_every_service_call_targets_public_service_function():
+    """Имена вызовов реестра соответствуют существующим публичным функциям сервисов."""
+    assert {call.name for call in SERVICE_CALLS} <= set(public_service_functions())
@@ -0,0 +1,119 @@
+"""
+Тесты арифметического перехода к началу периода в generate_occurrences_for_period.
+Результат сверяется с перебором всех вхождений от start_date плановой транзакции.
+"""
+
+import json
+from datetime import date, timedelta
+from decimal import Decimal
+from unittest.mock import patch
+
+from hypothesis import given, settings, strategies as st
+
+from finance_tracker.models import (
+    EndConditionType,
+    IntervalUnit,
+    PlannedTransactionDB,
+    RecurrenceRuleDB,
+    RecurrenceType,
+    TransactionType,
+)
+from finance_tracker.services import recurrence_service
+from finance_tracker.services.recurrence_service import (
+    _skip_to_window,
+    compile_recurrence_rule,
+    generate_occurrences_for_period,
+)
+
+
+def _planned(start_date, recurrence_type, interval=1, interval_unit=None, weekdays=None, only_workdays=False,
+             end_condition_type=EndConditionType.NEVER, end_date=None, occurrences_count=None):
+    planned = PlannedTransactionDB(
+        id="00000000-0000-4000-8000-000000000001", amount=Decimal("100.00"), type=TransactionType.EXPENSE,
+        start_date=start_date, is_active=True
+    )
+    RecurrenceRuleDB(
+        planned_transaction=planned, recurrence_type=recurrence_type, interval=interval,
+        interval_unit=interval_unit, weekdays=json.dumps(weekdays) if weekdays is not None else None,
+        only_workdays=only_workdays, end_condition_type=end_condition_type, end_date=end_date,
+        occurrences_count=occurrences_count
+    )
+    return planned
+
+
+def _iterated(planned, start_date, end_date):
+    """Эталон: перебор всех вхождений от start_date плановой транзакции."""
+    with patch.object(recurrence_service, "_skip_to_window", lambda rule, window_start: (rule.start_date, 0)):
+        return generate_occurrences_for_period(None, planned, start_date, end_date)
+
+
+def test_daily_rule_jumps_without_iterating_its_history():
+    planned = _planned(date(2020, 1, 1), RecurrenceType.DAILY)
+
+    with patch.object(recurrence_service, "_next_occurrence", wraps=recurrence_service._next_occurrence) as next_date:
+        occurrences = generate_occurrences_for_period(None, planned, date(2025, 3, 1), date(2025, 3, 31))
+
+    assert occurrences == [date(2025, 3, 1) + timedelta(days=day) for day in range(31)]
+    assert next_date.call_count == 31
+
+
+def test_skip_counts_occurrences_before_window():
+    planned = _planned(date(2024, 1, 31), RecurrenceType.MONTHLY, interval=2)
+    assert _skip_to_window(compile_recurrence_rule(planned.recurrence_rule), date(2024, 12, 15)) == (date(2024, 11, 30), 5)
+
+    yearly = _planned(date(2020, 2, 29), RecurrenceType.YEARLY)
+    assert _skip_to_window(compile_recurrence_rule(yearly.recurrence_rule), date(2023, 6, 1)) == (date(2023, 2, 28), 3)
+
+    # Понедельник и четверг каждые две недели, начало - среда
+    weekly = _planned(date(2025, 1, 1), RecurrenceType.CUSTOM, interval=2, interval_unit=IntervalUnit.WEEKS,
+                      weekdays=[0, 3])
+    assert _skip_to_window(compile_recurrence_rule(weekly.recurrence_rule), date(2025, 2, 12)) == (date(2025, 2, 10), 6)
+
+    workdays = _planned(date(2020, 1, 1), RecurrenceType.DAILY, only_workdays=True)
+    assert _skip_to_window(compile_recurrence_rule(workdays.recurrence_rule), date(2025, 1, 1)) == (date(2020, 1, 1), 0)
+
+
+def test_after_count_rule_ends_inside_window():
+    planned = _planned(date(2024, 1, 10), RecurrenceType.WEEKLY, end_condition_type=EndConditionType.AFTER_COUNT,
+                       occurrences_count=30)
+
+    occurrences = generate_occurrences_for_period(None, planned, date(2024, 7, 1), date(2024, 12, 31))
+
+    assert occurrences == _iterated(planned, date(2024, 7, 1), date(2024, 12, 31))
+    assert occurrences[-1] == date(2024, 1, 10) + timedelta(weeks=29)
+
+
+@settings(max_examples=300, deadline=None)
+@given(
+    start_offset=st.integers(min_value=0, max_value=3 * 365),
+    rule=st.one_of(
+        st.tuples(st.sampled_from([RecurrenceType.DAILY, RecurrenceType.WEEKLY, RecurrenceType.MONTHLY,
+                                   RecurrenceType.YEARLY]), st.none(), st.none()),
+        st.tuples(st.just(RecurrenceType.CUSTOM), st.sampled_from(list(IntervalUnit)), st.none()),
+        st.tuples(st.just(RecurrenceType.CUSTOM), st.just(IntervalUnit.WEEKS),
+                  st.lists(st.integers(min_value=0, max_value=6), min_size=1, max_size=7, unique=True).map(sorted)),
+    ),
+    interval=st.integers(min_value=1, max_value=5),
+    only_workdays=st.booleans(),
+    end_condition=st.one_of(
+        st.just((EndConditionType.NEVER, None, None)),
+        st.integers(min_value=0, max_value=4 * 365).map(
+            lambda days: (EndConditionType.UNTIL_DATE, date(2020, 1, 1) + timedelta(days=days), None)),
+        st.integers(min_value=1, max_value=200).map(lambda count: (EndConditionType.AFTER_COUNT, None, count)),
+    ),
+    window_offset=st.integers(min_value=-60, max_value=5 * 365),
+    window_length=st.integers(min_value=1, max_value=90),
+)
+def test_fast_forward_matches_iteration(start_offset, rule, interval, only_workdays, end_condition,
+                                        window_offset, window_length):
+    """Свойство: вхождения в периоде совпадают с перебором от start_date."""
+    recurrence_type, interval_unit, weekdays = rule
+    end_condition_type, end_date, occurrences_count = end_condition
+    start_date = date(2020, 1, 1) + timedelta(days=start_offset)
+    planned = _planned(start_date, recurrence_type, interval, interval_unit, weekdays, only_workdays,
+                       end_condition_type, end_date, occurrences_count)
+    window_start = start_date + timedelta(days=window_offset)
+    window_end = window_start + timedelta(days=window_length - 1)
+
+    assert generate_occurrences_for_period(None, planned, window_start, window_end) == _iterated(
+        planned, window_start, window_end)
@@ -0,0 +1,158 @@
+"""
+Тесты полнотекстового поиска по описаниям (search_documents + FTS5 search_index).
+Проверяют синхронизацию индекса триггерами, префиксный поиск и ранжирование.
+"""
+
+from datetime import date
+from decimal import Decimal
+
+import pytest
+from hypothesis import given, settings, strategies as st
+from sqlalchemy import delete, func, select
+
+from finance_tracker.models import (
+    PendingPaymentDB,
+    PlannedTransactionDB,
+    SearchSourceType,
+    TransactionDB,
+    TransactionType,
+)
+from finance_tracker.models.models import search_documents_table
+from finance_tracker.services.search_service import (
+    build_match_query,
+    rebuild_search_index,
+    search_descriptions,
+)
+from db_test_helpers import add_test_categories, memory_db_session
+
+BASE_DATE = date(2024, 1, 1)
+
+
+@pytest.fixture
+def category_id(categories):
+    _, expense_id = categories
+    return expense_id
+
+
+def _transaction(session, category_id, description):
+    transaction = TransactionDB(
+        amount=Decimal("100.00"), type=TransactionType.EXPENSE, category_id=category_id,
+        description=description, transaction_date=BASE_DATE
+    )
+    session.add(transaction)
+    session.commit()
+    return transaction
+
+
+def _found_ids(session, search_text, source_types=None):
+    return {hit.source_id for hit in search_descriptions(session, search_text, source_types)}
+
+
+def test_build_match_query_quotes_words_as_prefixes():
+    assert build_match_query("Ёлка  на НГ") == '"Елка"* "на"* "НГ"*'
+    assert build_match_query('кофе" OR * NEAR(') == '"кофе"* "OR"* "NEAR"*'
+    assert build_match_query("  ,.!  ") is None
+
+
+def test_search_matches_word_prefix_case_and_yo(db_session, category_id):
+    tree = _transaction(db_session, category_id, "Новогодняя ЁЛКА")
+    coffee = _transaction(db_session, category_id, "кофе с собой")
+
+    assert _found_ids(db_session, "елк") == {tree.id}
+    assert _found_ids(db_session, "новогодн ёлка") == {tree.id}
+    assert _found_ids(db_session, "КОФ") == {coffee.id}
+    # Совпадение только с началом слова
+    assert _found_ids(db_session, "лка") == set()
+    assert search_descriptions(db_session, "...") == []
+
+
+def test_index_follows_insert_update_delete(db_session, category_id):
+    transaction = _transaction(db_session, category_id, "Аптека")
+    assert _found_ids(db_session, "аптека") == {transaction.id}
+
+    transaction.description = "Такси до дома"
+    db_session.commit()
+    assert _found_ids(db_session, "аптека") == set()
+    assert _found_ids(db_session, "такси") == {transaction.id}
+
+    transaction.description = None
+    db_session.commit()
+    assert _found_ids(db_session, "такси") == set()
+
+    transaction.description = "Такси в аэропорт"
+    db_session.commit()
+    db_session.delete(transaction)
+    db_session.commit()
+    assert _found_ids(db_session, "такси") == set()
+    assert db_session.execute(select(func.count()).select_from(search_documents_table)).scalar() == 0
+
+
+def test_search_covers_all_sources_and_filters_by_type(db_session, category_id):
+    transaction = _transaction(db_session, category_id, "Ремонт машины")
+    planned = PlannedTransactionDB(
+        amount=Decimal("500.00"), category_id=category_id, description="Ремонт квартиры",
+        type=TransactionType.EXPENSE, start_date=BASE_DATE
+    )
+    pending = PendingPaymentDB(amount=Decimal("300.00"), category_id=category_id, description="Ремонт велосипеда")
+    db_session.add_all([planned, pending])
+    db_session.commit()
+
+    hits = search_descriptions(db_session, "ремонт")
+    assert {(hit.source_type, hit.source_id) for hit in hits} == {
+        (SearchSourceType.TRANSACTION, transaction.id),
+        (SearchSourceType.PLANNED_TRANSACTION, planned.id),
+        (SearchSourceType.PENDING_PAYMENT, pending.id),
+    }
+    assert all("«Ремонт»" in hit.snippet for hit in hits)
+    assert _found_ids(db_session, "ремонт", [SearchSourceType.PENDING_PAYMENT]) == {pending.id}
+
+
+def test_search_ranks_denser_matches_first(db_session, category_id):
+    _transaction(db_session, category_id, "Подарок маме, цветы и открытка к празднику на работе")
+    best = _transaction(db_session, category_id, "Подарок")
+
+    hits = search_descriptions(db_session, "подарок")
+    assert [hit.source_id for hit in hits][0] == best.id
+    assert hits == sorted(hits, key=lambda hit: hit.rank)
+    assert len(search_descriptions(db_session, "подарок", limit=1)) == 1
+
+
+def test_rebuild_search_index_restores_documents(db_session, category_id):
+    transaction = _transaction(db_session, category_id, "Бензин")
+    db_session.execute(delete(search_documents_table))
+    db_session.commit()
+    assert _found_ids(db_session, "бензин") == set()
+
+    rebuild_search_index(db_session)
+    db_session.commit()
+    assert _found_ids(db_session, "бензин") == {transaction.id}
+
+
+_WORDS = ["молоко", "хлеб", "Кофе", "ёжик", "такси", "аренда", "Счёт"]
+
+
+@settings(max_examples=30, deadline=None)
+@given(
+    descriptions=st.lists(
+        st.one_of(st.none(), st.lists(st.sampled_from(_WORDS), min_size=1, max_size=3).map(" ".join)),
+        min_size=1, max_size=8
+    ),
+    word=st.sampled_from(_WORDS),
+    prefix_length=st.integers(min_value=2, max_value=4),
+)
+def test_search_equals_word_prefix_scan(descriptions, word, prefix_length):
+    """Свойство: поиск возвращает ровно те описания, где есть слово с таким началом."""
+    with memory_db_session() as session:
+        _, category_id = add_test_categories(session)
+        transactions = [_transaction(session, category_id, description) for description in descriptions]
+
+        prefix = word[:prefix_length].upper()
+        normalized_prefix = prefix.casefold().replace("ё", "е")
+        expected = {
+            transaction.id for transaction in transactions
+            if transaction.description and any(
+                part.casefold().replace("ё", "е").startswith(normalized_prefix)
+                for part in transaction.description.split()
+            )
+        }
+        assert _found_ids(session, prefix) == expected
@@ -0,0 +1,169 @@
+"""
+Тесты раздельных сессий чтения и записи (get_read_session / get_write_session).
+"""
+
+import threading
+import uuid
+
+import pytest
+from sqlalchemy.exc import OperationalError
+
+from finance_tracker import database
+from finance_tracker.models import CategoryDB, TransactionType
+
+
+def _new_category(name: str) -> CategoryDB:
+    return CategoryDB(id=str(uuid.uuid4()), name=name, type=TransactionType.EXPENSE, is_system=False)
+
+
+def test_sessions_require_initialized_db():
+    """До init_db() сессии чтения и записи недоступны."""
+    with pytest.raises(RuntimeError):
+        with database.get_read_session():
+            pass
+    with pytest.raises(RuntimeError):
+        with database.get_write_session():
+            pass
+
+
+def test_read_session_shared_within_thread(initialized_db):
+    """Вложенные сессии чтения в одном потоке совпадают, в другом потоке - нет."""
+    other = {}
+
+    def read_in_thread():
+        with database.get_read_session() as session:
+            other["session"] = session
+
+    with database.get_read_session() as outer:
+        with database.get_read_session() as inner:
+            assert inner is outer
+        thread = threading.Thread(target=read_in_thread)
+        thread.start()
+        thread.join()
+
+    assert other["session"] is not outer
+
+
+def test_read_session_rejects_writes(initialized_db):
+    """Сессия чтения не может изменять данные."""
+    with pytest.raises(OperationalError):
+        with database.get_read_session() as session:
+            session.add(_new_category("Запрещённая"))
+            session.flush()
+
+
+def test_write_session_commits_and_read_sees_changes(initialized_db):
+    """Изменения сессии записи фиксируются при выходе и видны сессии чтения."""
+    with database.get_write_session() as session:
+        session.add(_new_category("Новая"))
+
+    with database.get_read_session() as session:
+        category = session.query(CategoryDB).filter_by(name="Новая").one()
+
+    # expire_on_commit=False: атрибуты доступны после закрытия сессии
+    assert category.name == "Новая"
+
+
+def test_write_session_rolls_back_on_error(initialized_db):
+    """Ошибка внутри сессии записи откатывает изменения."""
+    with pytest.raises(ValueError):
+        with database.get_write_session() as session:
+            session.add(_new_category("Откатываемая"))
+            session.flush()
+            raise ValueError("ошибка")
+
+    with database.get_read_session() as session:
+        assert session.query(CategoryDB).filter_by(name="Откатываемая").count() == 0
+
+
+def test_read_not_blocked_by_open_write_transaction(initialized_db):
+    """Чтение в другом потоке не ждёт незавершённую пишущую транзакцию."""
+    write_started = threading.Event()
+    release_write = threading.Event()
+
+    def writer():
+        with database.get_write_session() as session:
+            session.add(_new_category("Незафиксированная"))
+            session.flush()
+            write_started.set()
+            release_write.wait(timeout=5)
+
+    thread = threading.Thread(target=writer)
+    thread.start()
+    try:
+        assert write_started.wait(timeout=5)
+        with database.get_read_session() as session:
+            # Читатель видит последний зафиксированный снимок
+            assert session.query(CategoryDB).filter_by(name="Незафиксированная").count() == 0
+    finally:
+        release_write.set()
+        thread.join()
+
+    with database.get_read_session() as session:
+        assert session.query(CategoryDB).filter_by(name="Незафиксированная").count() == 1
+
+
+def test_db_session_write_serialized_with_write_session(initialized_db):
+    """Незафиксированная запись через get_db_session блокирует get_write_session в другом потоке."""
+    written = threading.Event()
+
+    def writer():
+        with database.get_write_session() as session:
+            session.add(_new_category("Вторая"))
+        written.set()
+
+    with database.get_db_session() as session:
+        # Чтение блокировку не берёт
+        session.query(CategoryDB).count()
+        assert not session.info.get("write_lock_held")
+
+        session.add(_new_category("Первая"))
+        session.flush()
+        assert session.info["write_lock_held"]
+        thread = threading.Thread(target=writer)
+        thread.start()
+        assert not written.wait(timeout=0.3)
+
+        session.commit()
+        assert written.wait(timeout=5)
+        thread.join()
+        assert "write_lock_held" not in session.info
+
+    with database.get_read_session() as session:
+        assert session.query(CategoryDB).filter(CategoryDB.name.in_(["Первая", "Вторая"])).count() == 2
+
+
+def test_write_lock_released_by_rollback_in_other_thread(initialized_db):
+    """Запись, начатая в одном потоке и откаченная в другом, освобождает блокировку."""
+    flushed = threading.Event()
+    finish = threading.Event()
+    written = threading.Event()
+
+    def writer():
+        with database.get_write_session() as session:
+            session.add(_new_category("После отката"))
+        written.set()
+
+    with database.get_db_session() as session:
+        def flush():
+            session.add(_new_category("Откатываемая"))
+            session.flush()
+            flushed.set()
+            # Поток, начавший запись, жив до конца проверки
+            finish.wait(timeout=5)
+
+        flusher = threading.Thread(target=flush)
+        flusher.start()
+        try:
+            assert flushed.wait(timeout=5)
+            rollback = threading.Thread(target=session.rollback)
+            rollback.start()
+            rollback.join()
+            assert "write_lock_held" not in session.info
+
+            thread = threading.Thread(target=writer, daemon=True)
+            thread.start()
+            assert written.wait(timeout=5)
+        finally:
+            finish.set()
+            flusher.join()
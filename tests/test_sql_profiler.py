@@ -0,0 +1,122 @@
+"""
+Тесты профилировщика SQL-запросов (utils/sql_profiler.py).
+Проверяют подсчёт запросов в единицах работы, детектор N+1
+и отсутствие обработчиков событий в выключенном состоянии.
+"""
+
+import logging
+
+import pytest
+from sqlalchemy import create_engine, event, text
+
+from finance_tracker.utils import sql_profiler
+
+
+@pytest.fixture
+def engine():
+    engine = create_engine("sqlite:///:memory:")
+    yield engine
+    sql_profiler.uninstrument_engine(engine)
+    engine.dispose()
+
+
+@pytest.fixture
+def profiler():
+    """Включает профилировщик с порогом 3 повтора и выключает после теста."""
+    sql_profiler.configure(True, repeat_threshold=3)
+    yield sql_profiler
+    sql_profiler.configure(False)
+
+
+def test_disabled_profiler_registers_no_listeners(engine):
+    """В выключенном состоянии engine не получает обработчиков, track() ничего не создаёт."""
+    sql_profiler.configure(False)
+    sql_profiler.instrument_engine(engine)
+
+    assert not event.contains(engine, "before_cursor_execute", sql_profiler._before_cursor_execute)
+    with sql_profiler.track("Действие") as unit:
+        assert unit is None
+
+
+def test_statements_counted_per_unit(engine, profiler):
+    """Запросы учитываются во всех вложенных единицах работы."""
+    profiler.instrument_engine(engine)
+
+    with engine.connect() as conn:
+        with profiler.track("Действие") as action:
+            conn.execute(text("SELECT 1"))
+            with profiler.track("Сессия") as session_unit:
+                conn.execute(text("SELECT 2"))
+                conn.execute(text("SELECT 2"))
+
+    assert session_unit.statement_count == 2
+    assert action.statement_count == 3
+    assert action.statements["SELECT 2"] == 2
+    assert action.total_seconds >= session_unit.total_seconds > 0
+
+
+def test_repeated_statement_reported_as_n_plus_one(engine, profiler, caplog):
+    """Повтор одного запроса (с разными параметрами) сверх порога даёт предупреждение."""
+    profiler.instrument_engine(engine)
+
+    with caplog.at_level(logging.WARNING, logger=sql_profiler.__name__):
+        with engine.connect() as conn:
+            with profiler.track("Загрузка карточек") as unit:
+                for i in range(5):
+                    conn.execute(text("SELECT :value"), {"value": i})
+
+    assert profiler.summary(unit)["repeated"] == {"SELECT ?": 5}
+    warnings = [r.getMessage() for r in caplog.records if "N+1" in r.getMessage()]
+    assert len(warnings) == 1
+    assert "Загрузка карточек" in warnings[0]
+
+
+def test_nested_warning_not_repeated_by_enclosing_unit(engine, profiler, caplog):
+    """О повторе, найденном во вложенной единице работы, внешняя не предупреждает повторно."""
+    profiler.instrument_engine(engine)
+
+    with caplog.at_level(logging.WARNING, logger=sql_profiler.__name__):
+        with engine.connect() as conn:
+            with profiler.track("Действие"):
+                with profiler.track("Сессия"):
+                    for _ in range(4):
+                        conn.execute(text("SELECT 1"))
+
+    warnings = [r.getMessage() for r in caplog.records if "N+1" in r.getMessage()]
+    assert len(warnings) == 1
+    assert "'Сессия'" in warnings[0]
+
+
+def test_disabling_removes_listeners(engine, profiler):
+    """Выключение профилировщика снимает обработчики со всех engine."""
+    profiler.instrument_engine(engine)
+    assert event.contains(engine, "after_cursor_execute", sql_profiler._after_cursor_execute)
+
+    profiler.configure(False)
+
+    assert not event.contains(engine, "after_cursor_execute", sql_profiler._after_cursor_execute)
+
+
+def test_enabled_by_config_on_init_db(tmp_path):
+    """Config.sql_profiler_enabled включает профилировщик на engine записи и чтения."""
+    from finance_tracker import database
+    from finance_tracker.config import settings
+
+    original = (settings.db_path, settings.sql_profiler_enabled, settings.sql_profiler_repeat_threshold)
+    settings.db_path = str(tmp_path / "finance.db")
+    settings.sql_profiler_enabled = True
+    settings.sql_profiler_repeat_threshold = 2
+    try:
+        database.init_db()
+        assert sql_profiler.is_enabled()
+        with sql_profiler.track("Действие") as action:
+            with database.get_read_session() as session:
+                session.execute(text("SELECT 1"))
+            with database.get_db_session() as session:
+                session.execute(text("SELECT 2"))
+        assert action.statements["SELECT 1"] == 1
+        assert action.statements["SELECT 2"] == 1
+    finally:
+        database.close_db()
+        settings.db_path, settings.sql_profiler_enabled, settings.sql_profiler_repeat_threshold = original
+        sql_profiler.configure(False)
@@ -0,0 +1,151 @@
+"""
+Тесты потокового импорта банковских выписок (import_statement_csv).
+Проверяют разбор колонок, пачечное сохранение и идемпотентность повторного импорта.
+"""
+
+import io
+from datetime import date, timedelta
+from decimal import Decimal
+
+import pytest
+from hypothesis import given, settings, strategies as st
+
+from finance_tracker.models import TransactionDB, TransactionType
+from finance_tracker.services.balance_ledger_service import check_balance_ledger
+from finance_tracker.services.statement_import_service import (
+    StatementColumns,
+    import_statement_csv,
+)
+from finance_tracker.services.transaction_service import get_total_balance
+from db_test_helpers import add_test_categories, memory_db_session
+
+RUSSIAN_BANK = StatementColumns(
+    date="Дата операции", amount="Сумма", description="Описание",
+    date_format="%d.%m.%Y", delimiter=";", decimal_separator=",", encoding="cp1251"
+)
+
+
+def _csv(rows, header="date,amount,description"):
+    return io.StringIO("\n".join([header] + [",".join(row) for row in rows]) + "\n")
+
+
+def test_import_russian_statement_file(db_session, categories, tmp_path):
+    income_id, expense_id = categories
+    path = tmp_path / "statement.csv"
+    path.write_text(
+        "Дата операции;Сумма;Описание\n"
+        "01.03.2024;-1 234,56;Продукты\n"
+        "02.03.2024;50 000,00;Зарплата\n",
+        encoding="cp1251"
+    )
+
+    result = import_statement_csv(db_session, path, income_id, expense_id, RUSSIAN_BANK)
+
+    assert (result.imported_count, result.duplicate_count, result.error_count) == (2, 0, 0)
+    transactions = db_session.query(TransactionDB).order_by(TransactionDB.transaction_date).all()
+    assert [(t.transaction_date, t.amount, t.type, t.category_id, t.description) for t in transactions] == [
+        (date(2024, 3, 1), Decimal("1234.56"), TransactionType.EXPENSE, expense_id, "Продукты"),
+        (date(2024, 3, 2), Decimal("50000.00"), TransactionType.INCOME, income_id, "Зарплата"),
+    ]
+    assert get_total_balance(db_session) == Decimal("48765.44")
+
+
+def test_reimport_is_idempotent_and_keeps_same_day_repeats(db_session, categories):
+    income_id, expense_id = categories
+    rows = [
+        ("2024-01-05", "-150.00", "Кофе"),
+        ("2024-01-05", "-150.00", "кофе "),
+        ("2024-01-06", "-150.00", "Кофе"),
+    ]
+
+    first = import_statement_csv(db_session, _csv(rows), income_id, expense_id, chunk_size=2)
+    assert (first.imported_count, first.duplicate_count) == (3, 0)
+
+    # Расширенная выписка: повторяющийся период плюс новая строка
+    second = import_statement_csv(
+        db_session, _csv(rows + [("2024-01-06", "-150.00", "Кофе")]), income_id, expense_id, chunk_size=2
+    )
+    assert (second.imported_count, second.duplicate_count) == (1, 3)
+    assert db_session.query(TransactionDB).count() == 4
+    assert check_balance_ledger(db_session).is_consistent
+
+
+def test_invalid_rows_reported_by_line(db_session, categories):
+    income_id, expense_id = categories
+    rows = [
+        ("2024-01-05", "-10.00", "ok"),
+        ("05.01.2024", "-10.00", "bad date"),
+        ("2024-01-06", "abc", "bad amount"),
+        ("2024-01-06", "0", "zero"),
+        ("", "-5", "empty date"),
+    ]
+
+    result = import_statement_csv(db_session, _csv(rows), income_id, expense_id)
+
+    assert result.imported_count == 1
+    assert result.error_count == 4
+    assert [error.split(":")[0] for error in result.errors] == ["строка 3", "строка 4", "строка 5", "строка 6"]
+
+
+def test_unknown_category_reported_for_each_row(db_session, categories):
+    income_id, _ = categories
+    missing_category = "00000000-0000-4000-8000-000000000000"
+
+    result = import_statement_csv(
+        db_session, _csv([("2024-01-05", "100", "in"), ("2024-01-05", "-100", "out")]), income_id, missing_category
+    )
+
+    assert result.imported_count == 1
+    assert result.errors == [f"строка 3: category_id: категория {missing_category} не найдена"]
+
+
+def test_missing_columns_rejected(db_session, categories):
+    income_id, expense_id = categories
+    with pytest.raises(ValueError, match="amount"):
+        import_statement_csv(db_session, _csv([], header="date,sum,description"), income_id, expense_id)
+    with pytest.raises(ValueError):
+        import_statement_csv(db_session, _csv([]), income_id, expense_id, chunk_size=0)
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 10])
+def test_unsorted_statement_keeps_same_day_repeats(db_session, categories, chunk_size):
+    income_id, expense_id = categories
+    rows = [("2024-01-01", "-100", "Coffee"), ("2024-01-02", "-50", "Bus"), ("2024-01-01", "-100", "Coffee")]
+
+    first = import_statement_csv(db_session, _csv(rows), income_id, expense_id, chunk_size=chunk_size)
+    assert (first.imported_count, first.duplicate_count, first.error_count) == (3, 0, 0)
+
+    second = import_statement_csv(db_session, _csv(rows), income_id, expense_id, chunk_size=chunk_size)
+    assert (second.imported_count, second.duplicate_count, second.error_count) == (0, 3, 0)
+    assert db_session.query(TransactionDB).count() == 3
+
+
+@settings(max_examples=25, deadline=None)
+@given(
+    rows=st.lists(
+        st.tuples(
+            st.integers(min_value=0, max_value=10),
+            st.integers(min_value=-5000, max_value=5000).filter(bool),
+            st.sampled_from(["Кофе", "КОФЕ", "Такси", "Зарплата", ""]),
+        ),
+        max_size=40
+    ),
+    chunk_size=st.integers(min_value=1, max_value=15),
+)
+def test_import_twice_matches_statement(rows, chunk_size):
+    """Свойство: импорт дважды создаёт ровно одну транзакцию на строку при любом порядке строк."""
+    with memory_db_session() as session:
+        income_id, expense_id = add_test_categories(session)
+        statement = [
+            ((date(2024, 1, 1) + timedelta(days=day)).isoformat(), str(Decimal(minor).scaleb(-2)), description)
+            for day, minor, description in rows
+        ]
+
+        for attempt in range(2):
+            result = import_statement_csv(session, _csv(statement), income_id, expense_id, chunk_size=chunk_size)
+            assert result.error_count == 0
+            assert result.imported_count == (len(rows) if attempt == 0 else 0)
+            assert result.duplicate_count == (0 if attempt == 0 else len(rows))
+
+        assert session.query(TransactionDB).count() == len(rows)
+        assert get_total_balance(session) == sum((Decimal(minor).scaleb(-2) for _, minor, _ in rows), Decimal("0"))
@@ -0,0 +1,77 @@
+"""
+Тесты профилей хранения SQLite.
+Проверяют применение PRAGMA к соединениям и персистентность выбранного профиля.
+"""
+
+import os
+import tempfile
+
+import pytest
+from sqlalchemy import text
+
+from finance_tracker.config import Config
+from finance_tracker.database import create_db_engine
+
+config = Config()
+
+# Значения PRAGMA synchronous, возвращаемые SQLite
+_SYNCHRONOUS_CODES = {"OFF": 0, "NORMAL": 1, "FULL": 2, "EXTRA": 3}
+_TEMP_STORE_CODES = {"DEFAULT": 0, "FILE": 1, "MEMORY": 2}
+
+
+@pytest.mark.parametrize("profile_name", list(Config.STORAGE_PROFILES))
+def test_storage_profile_pragmas_applied(profile_name):
+    """Каждое новое соединение получает PRAGMA выбранного профиля."""
+    profile = Config.STORAGE_PROFILES[profile_name]
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        engine = create_db_engine(f"sqlite:///{os.path.join(tmp_dir, 'test.db')}", profile)
+        try:
+            with engine.connect() as conn:
+                assert conn.execute(text("PRAGMA journal_mode")).scalar().upper() == profile["journal_mode"]
+                assert conn.execute(text("PRAGMA synchronous")).scalar() == _SYNCHRONOUS_CODES[profile["synchronous"]]
+                assert conn.execute(text("PRAGMA cache_size")).scalar() == profile["cache_size"]
+                assert conn.execute(text("PRAGMA temp_store")).scalar() == _TEMP_STORE_CODES[profile["temp_store"]]
+                assert conn.execute(text("PRAGMA busy_timeout")).scalar() == profile["busy_timeout"]
+        finally:
+            engine.dispose()
+
+
+def test_unknown_storage_profile_falls_back_to_default():
+    """Неизвестный профиль в конфигурации заменяется профилем по умолчанию."""
+    original_profile = config.storage_profile
+    try:
+        config.storage_profile = "turbo"
+        assert config.get_storage_profile() == Config.STORAGE_PROFILES[Config.DEFAULT_STORAGE_PROFILE]
+    finally:
+        config.storage_profile = original_profile
+
+
+def test_get_storage_profile_returns_copy():
+    """Изменение возвращённого профиля не затрагивает STORAGE_PROFILES."""
+    profile = config.get_storage_profile()
+    profile["synchronous"] = "EXTRA"
+    assert config.get_storage_profile()["synchronous"] != "EXTRA"
+
+
+@pytest.mark.parametrize("profile_name", list(Config.STORAGE_PROFILES))
+def test_storage_profile_persistence(profile_name):
+    """Выбранный профиль хранения сохраняется и загружается из config.json."""
+    with tempfile.NamedTemporaryFile(mode='w+', delete=False) as tmp:
+        tmp_path = tmp.name
+
+    original_config_file = config.config_file
+    original_profile = config.storage_profile
+    config.config_file = tmp_path
+
+    try:
+        config.storage_profile = profile_name
+        config.save()
+        config.storage_profile = "unknown"
+        config.load()
+        assert config.storage_profile == profile_name
+    finally:
+        config.config_file = original_config_file
+        config.storage_profile = original_profile
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
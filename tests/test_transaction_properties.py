@@ -5,21 +5,33 @@ Property-based тесты для TransactionDB (Flet версия).
 - Property 6: Сохранение транзакции
 - Property 7: Обновление транзакции
 - Property 8: Удаление транзакции
+- Итоги по категориям с фильтрами (get_category_totals)
+- Постраничная выборка транзакций (get_transactions_page)
+- Массовое создание транзакций (create_transactions_bulk)
 """
 
 from datetime import date
 from contextlib import contextmanager
 from decimal import Decimal
+import pytest
 from hypothesis import given, strategies as st, settings
 from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker
 
 from finance_tracker.models import (
     Base,
+    TransactionCreate,
     TransactionDB,
     CategoryDB,
     TransactionType,
 )
+from finance_tracker.services import transaction_service
+from finance_tracker.services.transaction_service import (
+    TRANSACTION_SORTS,
+    create_transactions_bulk,
+    get_category_totals,
+    get_transactions_page,
+)
 
 # Создаём тестовый движок БД в памяти
 test_engine = create_engine(
@@ -195,3 +207,196 @@ class TestTransactionProperties:
             # Assert
             deleted_transaction = session.query(TransactionDB).filter_by(id=tx_id).first()
             assert deleted_transaction is None
+
+    @given(
+        rows=st.lists(
+            st.tuples(st.integers(min_value=0, max_value=3), amounts_strategy, dates_strategy),
+            min_size=0,
+            max_size=25
+        ),
+        start_date=st.one_of(st.none(), dates_strategy),
+        end_date=st.one_of(st.none(), dates_strategy),
+        transaction_type=st.one_of(st.none(), st.sampled_from(list(TransactionType))),
+        filter_category=st.booleans()
+    )
+    @settings(max_examples=50, deadline=None)
+    def test_category_totals_match_python_grouping(
+        self, rows, start_date, end_date, transaction_type, filter_category
+    ):
+        """
+        Итоги get_category_totals совпадают с группировкой отфильтрованных
+        транзакций в Python при любом сочетании фильтров.
+        """
+        with get_test_session() as session:
+            # Arrange: по две категории каждого типа
+            categories = [
+                CategoryDB(name=f"Cat_{i}", type=TransactionType.INCOME if i % 2 else TransactionType.EXPENSE)
+                for i in range(4)
+            ]
+            session.add_all(categories)
+            session.commit()
+            for index, amount, transaction_date in rows:
+                session.add(TransactionDB(
+                    amount=amount,
+                    type=categories[index].type,
+                    category_id=categories[index].id,
+                    transaction_date=transaction_date
+                ))
+            session.commit()
+            category_id = categories[0].id if filter_category else None
+
+            # Act
+            totals = get_category_totals(session, start_date, end_date, transaction_type, category_id)
+
+            # Assert
+            expected = {}
+            for index, amount, transaction_date in rows:
+                category = categories[index]
+                if start_date and transaction_date < start_date:
+                    continue
+                if end_date and transaction_date > end_date:
+                    continue
+                if transaction_type and category.type != transaction_type:
+                    continue
+                if category_id and category.id != category_id:
+                    continue
+                count, total = expected.get(category.id, (0, Decimal('0')))
+                expected[category.id] = (count + 1, total + amount)
+
+            assert {t.category_id: (t.count, t.total) for t in totals} == expected
+            assert [t.total for t in totals] == sorted((t.total for t in totals), reverse=True)
+            for item in totals:
+                category = next(c for c in categories if c.id == item.category_id)
+                assert (item.name, item.type) == (category.name, category.type)
+
+    @given(
+        rows=st.lists(
+            st.tuples(
+                st.integers(min_value=0, max_value=1),
+                st.sampled_from([Decimal('10.00'), Decimal('25.50'), Decimal('99.99')]),
+                st.dates(min_value=date(2024, 1, 1), max_value=date(2024, 1, 10)),
+                st.sampled_from(["Продукты", "ПРОДУКТЫ на неделю", "кафе", None])
+            ),
+            max_size=30
+        ),
+        sort=st.sampled_from(sorted(TRANSACTION_SORTS)),
+        page_size=st.integers(min_value=1, max_value=7),
+        search_text=st.sampled_from([None, "продукты", "КАФ"]),
+        min_amount=st.sampled_from([None, Decimal('25.50')])
+    )
+    @settings(max_examples=50, deadline=None)
+    def test_transaction_pages_cover_filtered_sorted_rows(
+        self, rows, sort, page_size, search_text, min_amount
+    ):
+        """
+        Страницы get_transactions_page по порядку дают все транзакции фильтра
+        ровно один раз в порядке сортировки, первая страница содержит итоги.
+        """
+        with get_test_session() as session:
+            # Arrange
+            categories = [
+                CategoryDB(name="Page_Inc", type=TransactionType.INCOME),
+                CategoryDB(name="Page_Exp", type=TransactionType.EXPENSE),
+            ]
+            session.add_all(categories)
+            session.commit()
+            for index, amount, transaction_date, description in rows:
+                session.add(TransactionDB(
+                    amount=amount,
+                    type=categories[index].type,
+                    category_id=categories[index].id,
+                    transaction_date=transaction_date,
+                    description=description
+                ))
+            session.commit()
+            expected = [
+                t for t in session.query(TransactionDB).all()
+                if (not search_text or (t.description and search_text.casefold() in t.description.casefold()))
+                and (min_amount is None or t.amount >= min_amount)
+            ]
+
+            # Act
+            pages = [get_transactions_page(
+                session, search_text=search_text, min_amount=min_amount, sort=sort, page_size=page_size
+            )]
+            while pages[-1].next_cursor is not None:
+                pages.append(get_transactions_page(
+                    session, search_text=search_text, min_amount=min_amount, sort=sort,
+                    page_size=page_size, cursor=pages[-1].next_cursor
+                ))
+
+            # Assert
+            items = [t for page in pages for t in page.items]
+            assert sorted(t.id for t in items) == sorted(t.id for t in expected)
+            assert all(len(page.items) == page_size for page in pages[:-1])
+            column_name, descending = TRANSACTION_SORTS[sort]
+            keys = [getattr(t, column_name) for t in items]
+            assert keys == sorted(keys, reverse=descending)
+            assert pages[0].total_count == len(expected)
+            assert pages[0].total_income == sum(
+                (t.amount for t in expected if t.type == TransactionType.INCOME), Decimal('0')
+            )
+            assert all(page.total_count is None for page in pages[1:])
+
+    def test_transaction_page_rejects_unknown_sort(self):
+        with get_test_session() as session:
+            with pytest.raises(ValueError):
+                get_transactions_page(session, sort="name_asc")
+
+    @given(
+        rows=st.lists(
+            st.tuples(
+                st.sampled_from(["valid", "model", "zero_amount", "bad_uuid", "unknown_category", "not_a_dict"]),
+                amounts_strategy,
+                dates_strategy,
+            ),
+            min_size=1, max_size=25
+        )
+    )
+    @settings(max_examples=30, deadline=None)
+    def test_bulk_create_reports_errors_per_item(self, rows):
+        """Элементы с ошибками пропускаются, остальные создаются в порядке входных данных."""
+        with get_test_session() as session:
+            category = CategoryDB(name="Продукты", type=TransactionType.EXPENSE)
+            session.add(category)
+            session.commit()
+
+            items = []
+            for kind, amount, transaction_date in rows:
+                item = {"amount": amount, "type": TransactionType.EXPENSE, "category_id": category.id,
+                        "transaction_date": transaction_date, "description": kind}
+                if kind == "model":
+                    item = TransactionCreate(**item)
+                elif kind == "zero_amount":
+                    item["amount"] = Decimal("0")
+                elif kind == "bad_uuid":
+                    item["category_id"] = "not-a-uuid"
+                elif kind == "unknown_category":
+                    item["category_id"] = "00000000-0000-4000-8000-000000000000"
+                elif kind == "not_a_dict":
+                    item = [amount]
+                items.append(item)
+
+            original_chunk_size = transaction_service.BULK_CHUNK_SIZE
+            transaction_service.BULK_CHUNK_SIZE = 4
+            try:
+                result = create_transactions_bulk(session, items)
+            finally:
+                transaction_service.BULK_CHUNK_SIZE = original_chunk_size
+
+            valid_positions = [i for i, (kind, _, _) in enumerate(rows) if kind in ("valid", "model")]
+            assert sorted(result.errors) == [i for i in range(len(rows)) if i not in valid_positions]
+            assert all(result.errors.values())
+            for position, (kind, _, _) in enumerate(rows):
+                if kind == "zero_amount":
+                    assert result.errors[position].startswith("amount:")
+                elif kind in ("bad_uuid", "unknown_category"):
+                    assert result.errors[position].startswith("category_id:")
+
+            created = {t.id: t for t in session.query(TransactionDB).all()}
+            assert len(result.created_ids) == len(valid_positions)
+            assert set(created) == set(result.created_ids)
+            for transaction_id, position in zip(result.created_ids, valid_positions):
+                _, amount, transaction_date = rows[position]
+                assert created[transaction_id].amount == amount
+                assert created[transaction_id].transaction_date == transaction_date
@@ -113,3 +113,20 @@ def test_pending_payment_uuid(db_session):
     assert pending.id is not None
     uuid.UUID(pending.id)
     assert pending.category_id == category.id
+
+
+def test_uuid_stored_as_16_bytes(db_session):
+    """UUID хранится в БД как 16-байтовый BLOB, в Python остаётся строкой."""
+    category = CategoryDB(name="Тест BLOB", type=TransactionType.EXPENSE)
+    db_session.add(category)
+    db_session.commit()
+
+    raw = db_session.connection().exec_driver_sql(
+        "SELECT typeof(id), length(id) FROM categories"
+    ).one()
+    assert tuple(raw) == ("blob", 16)
+
+    db_session.expire_all()
+    loaded = db_session.query(CategoryDB).filter_by(id=category.id).one()
+    assert isinstance(loaded.id, str)
+    assert loaded.id == category.id
@@ -124,3 +124,45 @@ def test_uuid_validation_in_pydantic_rejects_invalid(invalid_uuid):
             category_id=invalid_uuid # Invalid UUID
         )
 
+
+
+@given(valid_uuid_strategy())
+def test_uuid_bytes_roundtrip(value):
+    """
+    **Feature: uuid-migration, Property: компактное хранение UUID**
+
+    UUID кодируется в 16 байт и восстанавливается в ту же строку.
+    """
+    from finance_tracker.models.types import bytes_to_uuid, uuid_to_bytes
+
+    encoded = uuid_to_bytes(value)
+    assert len(encoded) == 16
+    assert bytes_to_uuid(encoded) == value
+
+
+@given(st.text(min_size=1, max_size=40).filter(lambda s: len(s) != 36))
+def test_non_uuid_strings_roundtrip(value):
+    """
+    **Feature: uuid-migration, Property: обратная совместимость не-UUID ID**
+
+    Строки, не являющиеся UUID, сохраняются без потерь и не принимаются за UUID.
+    """
+    from finance_tracker.models.types import bytes_to_uuid, uuid_to_bytes
+
+    assert bytes_to_uuid(uuid_to_bytes(value)) == value
+
+
+def test_non_uuid_ids_stored_as_text(db_session):
+    """ID, не являющиеся UUID, хранятся как TEXT и не совпадают с UUID того же размера."""
+    from sqlalchemy import text
+
+    ids = ["0123456789abcdef", "0000\x80\x80\x80\U00010000\x00", str(uuid.uuid4())]
+    for index, category_id in enumerate(ids):
+        db_session.add(CategoryDB(id=category_id, name=f"Категория {index}", type=TransactionType.EXPENSE))
+    db_session.commit()
+    db_session.expire_all()
+
+    assert [db_session.get(CategoryDB, category_id).id for category_id in ids] == ids
+    assert db_session.execute(text("SELECT typeof(id) FROM categories ORDER BY name")).scalars().all() == [
+        "text", "text", "blob"
+    ]
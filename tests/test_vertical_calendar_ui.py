@@ -12,6 +12,7 @@ UI тесты для вертикального календаря.
 import unittest
 from unittest.mock import Mock, MagicMock, patch
 from datetime import date
+from decimal import Decimal
 import calendar
 
 import flet as ft
@@ -518,5 +519,47 @@ class TestVerticalCalendarWithIndicators(unittest.TestCase):
                             "Last indicator row should have <= 3 elements")
 
 
+    def test_calendar_cell_shows_forecast_balance(self):
+        """
+        Тест: ячейка будущего дня показывает прогнозируемый баланс.
+
+        Проверяет:
+        - Краткую запись баланса под индикаторами (отрицательный - красным)
+        - Полный баланс в подсказке вместе с предупреждением о кассовом разрыве
+        - Отсутствие баланса в ячейках без прогноза
+        """
+        test_date = date(2024, 12, 15)
+        calendar_widget = CalendarWidget(on_date_selected=Mock(), initial_date=test_date)
+        calendar_widget.cash_gaps = [test_date]
+        calendar_widget.forecast_balances = {test_date: Decimal("-12345.67")}
+
+        cell = calendar_widget._build_day_cell(test_date)
+
+        balance_text = cell.content.controls[2]
+        self.assertEqual(balance_text.value, "-12,3к")
+        self.assertEqual(balance_text.color, ft.Colors.RED_700)
+        self.assertEqual(cell.tooltip, "Кассовый разрыв!\nПрогноз баланса: -12,345.67 ₽")
+
+        empty_cell = calendar_widget._build_day_cell(date(2024, 12, 16))
+        self.assertEqual(len(empty_cell.content.controls), 2)
+        self.assertIsNone(empty_cell.tooltip)
+
+    def test_forecast_balances_loaded_for_future_days_of_month(self):
+        """Тест: балансы запрашиваются одним вызовом для всех будущих дней месяца."""
+        today = date.today()
+        calendar_widget = CalendarWidget(on_date_selected=Mock(), initial_date=today)
+
+        with patch("finance_tracker.components.calendar_widget.get_read_session"), \
+                patch("finance_tracker.components.calendar_widget.get_cached_cash_gaps", return_value=[]), \
+                patch("finance_tracker.components.calendar_widget.get_cached_forecast_balances",
+                      side_effect=lambda session, days: {day: Decimal("1") for day in days}) as balances:
+            calendar_widget._update_cash_gaps()
+
+        balances.assert_called_once()
+        days_in_month = calendar.monthrange(today.year, today.month)[1]
+        self.assertEqual(sorted(calendar_widget.forecast_balances), [
+            today.replace(day=day) for day in range(today.day + 1, days_in_month + 1)
+        ])
+
 if __name__ == '__main__':
     unittest.main()